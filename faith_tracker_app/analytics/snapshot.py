@@ -0,0 +1,303 @@
+# faith_tracker_app/analytics/snapshot.py
+"""
+Columnar in-memory snapshot of the tracker tables, and vectorised statistics over it.
+
+AnalyticsSnapshot loads each table in one streamed pass (fetchmany batches) into
+NumPy arrays: dates become epoch days (computed by SQLite), books become indexes
+into books.ALL_BOOKS, and flags become booleans. refresh() is incremental: it
+appends the rows with an id above the last one loaded and re-reads only the older
+rows the changelog reports as updated since the previous refresh. A deletion
+since then triggers a full reload. Rows moved to the archive stay part of the
+history, and a full load includes the archive too.
+
+NumPy is optional for the app as a whole; only this module needs it.
+
+Run with: python -m faith_tracker_app.analytics.snapshot
+"""
+import datetime
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # The trackers themselves work without NumPy
+    np = None
+
+from faith_tracker_app.bible.books import ALL_BOOKS, canonical_book_name
+from faith_tracker_app.database import archive, connection
+
+LOAD_BATCH_SIZE = 10000
+
+# Epoch day stored for a missing or unparseable date
+MISSING_DAY = -2 ** 31
+
+# Index 0 collects books that aren't in the canon (as typed by the user)
+BOOK_NAMES = ["(other)"] + ALL_BOOKS
+_BOOK_IDS = {}
+
+# Upper edges (exclusive, in days) of the confession latency histogram buckets
+LATENCY_BUCKETS = [1, 8, 31, 91, 366]
+
+
+def _epoch_day(column):
+    """SQL expression for the days since 1970-01-01 of a 'YYYY-MM-DD...' column."""
+    return f"COALESCE(CAST(julianday(substr({column}, 1, 10)) - 2440587.5 AS INTEGER), {MISSING_DAY})"
+
+
+def _book_id(book):
+    book_id = _BOOK_IDS.get(book)
+    if book_id is None:
+        name = canonical_book_name(book)
+        book_id = _BOOK_IDS[book] = BOOK_NAMES.index(name) if name else 0
+    return book_id
+
+
+# Per table: (array name, SQL expression, NumPy dtype, Python converter or None), id first
+SNAPSHOT_COLUMNS = {
+    "bible_reading": [
+        ("id", "id", "int64", None),
+        ("day", _epoch_day("reading_date"), "int32", None),
+        ("book_id", "book", "int16", _book_id),
+        ("chapter", "COALESCE(chapter, 0)", "int16", None),
+    ],
+    "rosary_prayers": [
+        ("id", "id", "int64", None),
+        ("day", _epoch_day("prayer_date"), "int32", None),
+        ("mystery_id", "COALESCE(mystery_id, 0)", "int8", None),
+        ("weekday", "COALESCE(weekday, -1)", "int8", None),
+    ],
+    "sins_confession_log": [
+        ("id", "id", "int64", None),
+        ("day", _epoch_day("COALESCE(occurrence_date, created_at)"), "int32", None),
+        ("confessed", "COALESCE(confessed, 0)", "bool", None),
+        ("confession_day", _epoch_day("confession_date"), "int32", None),
+    ],
+}
+
+
+class TableSnapshot:
+    """The columns of one table as NumPy arrays, ordered by id."""
+
+    def __init__(self, table):
+        self.table = table
+        self.columns = SNAPSHOT_COLUMNS[table]
+        self.arrays = {name: np.empty(0, dtype) for name, _, dtype, _ in self.columns}
+        self.last_id = 0
+
+    def __len__(self):
+        return len(self.arrays["id"])
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def _read(self, cursor):
+        """Streams a cursor's rows into arrays, one fetchmany batch at a time."""
+        parts = {name: [] for name, _, _, _ in self.columns}
+        while True:
+            batch = cursor.fetchmany(LOAD_BATCH_SIZE)
+            if not batch:
+                break
+            for (name, _, dtype, convert), values in zip(self.columns, zip(*batch)):
+                if convert:
+                    values = [convert(value) for value in values]
+                parts[name].append(np.array(values, dtype=dtype))
+        return {name: np.concatenate(chunks) if chunks else np.empty(0, dtype)
+                for (name, _, dtype, _), chunks in zip(self.columns, parts.values())}
+
+    def _select(self, conn, where, params, with_archive=False):
+        select = ", ".join(sql for _, sql, _, _ in self.columns)
+        query = f"SELECT {select} FROM main.{self.table} WHERE {where}"
+        if with_archive:
+            query += f" UNION ALL SELECT {select} FROM archive.{self.table} WHERE {where}"
+            params = list(params) * 2
+        return self._read(conn.execute(query + " ORDER BY id", params))
+
+    def load(self, conn, with_archive=False):
+        """Replaces the arrays with the whole table (and its archive, if attached)."""
+        self.arrays = self._select(conn, "id > ?", (0,), with_archive)
+        self.last_id = int(self.arrays["id"][-1]) if len(self) else 0
+
+    def refresh(self, conn, since_seq):
+        """
+        Appends rows added since the last load and re-reads the older rows updated since changelog
+        seq since_seq. Returns (rows appended, rows updated), or None if a full load is needed.
+        """
+        deleted = conn.execute("""
+            SELECT 1 FROM changelog WHERE seq > ? AND table_name = ? AND operation = 'delete' LIMIT 1
+        """, (since_seq, self.table)).fetchone()
+        if deleted:
+            return None
+
+        updated = self._select(conn, """
+            id <= ? AND uuid IN (
+                SELECT row_uuid FROM changelog WHERE seq > ? AND table_name = ? AND operation = 'upsert')
+        """, (self.last_id, since_seq, self.table))
+        if len(updated["id"]):
+            positions = np.searchsorted(self.arrays["id"], updated["id"])
+            for name, _, _, _ in self.columns:
+                self.arrays[name][positions] = updated[name]
+
+        added = self._select(conn, "id > ?", (self.last_id,))
+        if len(added["id"]):
+            self.arrays = {name: np.concatenate([self.arrays[name], added[name]]) for name in self.arrays}
+            self.last_id = int(added["id"][-1])
+        return len(added["id"]), len(updated["id"])
+
+
+class AnalyticsSnapshot:
+    """Columnar snapshots of the three tracker tables, refreshed together."""
+
+    def __init__(self, include_archive: bool = True):
+        if np is None:
+            raise ImportError("The analytics snapshot needs NumPy (pip install numpy).")
+        self.include_archive = include_archive
+        self.tables = {table: TableSnapshot(table) for table in SNAPSHOT_COLUMNS}
+        self.last_seq = None
+
+    @property
+    def bible(self):
+        return self.tables["bible_reading"]
+
+    @property
+    def rosary(self):
+        return self.tables["rosary_prayers"]
+
+    @property
+    def sins(self):
+        return self.tables["sins_confession_log"]
+
+    def refresh(self):
+        """
+        Brings the snapshot up to date, reading all tables from one consistent database state.
+        Returns {table: {"appended", "updated", "reloaded"}}.
+        """
+        conn = connection.get_db_connection()
+        try:
+            # ATTACH isn't allowed inside a transaction
+            with_archive = self.include_archive and archive.attach_archive(conn)
+            conn.execute("BEGIN")
+            max_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changelog").fetchone()[0]
+            result = {}
+            for table, snapshot in self.tables.items():
+                counts = snapshot.refresh(conn, self.last_seq) if self.last_seq is not None else None
+                if counts is None:
+                    snapshot.load(conn, with_archive)
+                    result[table] = {"appended": len(snapshot), "updated": 0, "reloaded": True}
+                else:
+                    result[table] = {"appended": counts[0], "updated": counts[1], "reloaded": False}
+            self.last_seq = max_seq
+            conn.rollback()
+            return result
+        finally:
+            conn.close()
+
+
+def load_snapshot(include_archive: bool = True):
+    """Returns a freshly loaded AnalyticsSnapshot."""
+    snapshot = AnalyticsSnapshot(include_archive)
+    snapshot.refresh()
+    return snapshot
+
+
+def _today():
+    return (datetime.date.today() - datetime.date(1970, 1, 1)).days
+
+
+def readings_per_book_per_month(snapshot: AnalyticsSnapshot):
+    """
+    Returns {"books": [names], "months": ['YYYY-MM'], "counts": 2-D array [book, month]}
+    for the books with at least one reading.
+    """
+    days, book_ids = snapshot.bible["day"], snapshot.bible["book_id"]
+    valid = days != MISSING_DAY
+    months = days[valid].astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    if not months.size:
+        return {"books": [], "months": [], "counts": np.zeros((0, 0), np.int64)}
+
+    first, month_count = months.min(), int(months.max() - months.min() + 1)
+    cells = book_ids[valid].astype(np.int64) * month_count + (months - first)
+    counts = np.bincount(cells, minlength=len(BOOK_NAMES) * month_count).reshape(len(BOOK_NAMES), month_count)
+    read = np.flatnonzero(counts.any(axis=1))
+    labels = np.datetime_as_string(np.arange(first, first + month_count).astype("datetime64[M]"))
+    return {"books": [BOOK_NAMES[i] for i in read], "months": labels.tolist(), "counts": counts[read]}
+
+
+def rolling_rosary_frequency(snapshot: AnalyticsSnapshot, window: int = 30, until: str = None):
+    """
+    Returns {"dates": datetime64[D] array, "counts": prayers in the window days ending on each date}
+    from the first prayer up to until ('YYYY-MM-DD', default today or the last prayer if later).
+    Raises ValueError if window is less than 1.
+    """
+    if window < 1:
+        raise ValueError("window must be at least 1 day.")
+    days = snapshot.rosary["day"]
+    days = days[days != MISSING_DAY]
+    if days.size:
+        last = max(int(days.max()), _today()) if until is None else int(np.datetime64(until, "D").astype(np.int64))
+        days = days[days <= last]
+    if not days.size:
+        return {"dates": np.empty(0, "datetime64[D]"), "counts": np.zeros(0, np.int64)}
+
+    first = int(days.min())
+    daily = np.bincount(days - first, minlength=last - first + 1)[:last - first + 1]
+    cumulative = np.cumsum(daily)
+    counts = cumulative.copy()
+    counts[window:] -= cumulative[:-window]
+    return {"dates": np.arange(first, last + 1).astype("datetime64[D]"), "counts": counts}
+
+
+def confession_latency(snapshot: AnalyticsSnapshot):
+    """
+    Summarises the days between a sin (its occurrence date, else the day it was logged) and its
+    confession: count, mean, median, p90, max and a histogram over LATENCY_BUCKETS as
+    [("0 days", n), ("1-7 days", n), ...].
+    """
+    sins = snapshot.sins
+    confessed = sins["confessed"] & (sins["day"] != MISSING_DAY) & (sins["confession_day"] != MISSING_DAY)
+    latency = (sins["confession_day"][confessed] - sins["day"][confessed]).astype(np.int64)
+    latency = latency[latency >= 0]
+    if not latency.size:
+        return {"count": 0}
+
+    edges = [0] + LATENCY_BUCKETS + [max(int(latency.max()) + 1, LATENCY_BUCKETS[-1] + 1)]
+    histogram, _ = np.histogram(latency, bins=edges)
+    labels = [f"{low} days" if high - low == 1 else f"{low}-{high - 1} days" for low, high in zip(edges, edges[1:-1])]
+    labels.append(f"{edges[-2]}+ days")
+    median, p90 = np.percentile(latency, [50, 90])
+    return {
+        "count": int(latency.size),
+        "mean": float(latency.mean()),
+        "median": float(median),
+        "p90": float(p90),
+        "max": int(latency.max()),
+        "histogram": list(zip(labels, histogram.tolist())),
+    }
+
+
+def main():
+    connection.initialize_database(quiet=True)
+    try:
+        snapshot = load_snapshot()
+    except ImportError as e:
+        print(f"Error: {e}")
+        return 1
+
+    per_month = readings_per_book_per_month(snapshot)
+    totals = per_month["counts"].sum(axis=1)
+    print("Most read books:")
+    for index in np.argsort(-totals)[:5]:
+        print(f"  {per_month['books'][index]}: {totals[index]} reading(s)")
+
+    frequency = rolling_rosary_frequency(snapshot)
+    if frequency["counts"].size:
+        print(f"Rosaries in the last 30 days: {frequency['counts'][-1]}")
+
+    latency = confession_latency(snapshot)
+    if latency["count"]:
+        print(f"Confession latency: median {latency['median']:.0f} days, 90% within {latency['p90']:.0f} days")
+        for label, count in latency["histogram"]:
+            print(f"  {label}: {count}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
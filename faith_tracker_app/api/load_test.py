@@ -0,0 +1,138 @@
+# faith_tracker_app/api/load_test.py
+"""
+Load test for the HTTP JSON API: reports requests per second and latency percentiles.
+
+    python -m faith_tracker_app.api.load_test --url http://127.0.0.1:8765 --path /api/bible?limit=50
+
+Without --url, a server is started in-process on a temporary database seeded
+with --seed entries per tracker, so the numbers are reproducible on any machine.
+"""
+import argparse
+import http.client
+import os
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_load(url, paths, total_requests=5000, concurrency=8, use_etag=False, gzip=True):
+    """
+    Issues `total_requests` GETs spread over `concurrency` keep-alive client threads.
+    Returns a dictionary with throughput, latency percentiles (ms) and status counts.
+    """
+    target = urlsplit(url)
+    per_thread = [total_requests // concurrency + (1 if i < total_requests % concurrency else 0)
+                  for i in range(concurrency)]
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+
+    def worker(count):
+        client = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=30)
+        etags = {}
+        local_latencies = []
+        local_statuses = {}
+        for i in range(count):
+            path = paths[i % len(paths)]
+            headers = {"Accept-Encoding": "gzip"} if gzip else {}
+            if use_etag and path in etags:
+                headers["If-None-Match"] = etags[path]
+            start = time.perf_counter()
+            client.request("GET", path, headers=headers)
+            response = client.getresponse()
+            response.read()
+            local_latencies.append(time.perf_counter() - start)
+            local_statuses[response.status] = local_statuses.get(response.status, 0) + 1
+            if response.getheader("ETag"):
+                etags[path] = response.getheader("ETag")
+        client.close()
+        with lock:
+            latencies.extend(local_latencies)
+            for status, n in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + n
+
+    threads = [threading.Thread(target=worker, args=(count,)) for count in per_thread if count]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+        "statuses": statuses,
+    }
+
+
+def _start_local_server(seed):
+    """Starts an in-process server on a seeded temporary database. Returns (server, url, tmp_dir)."""
+    from faith_tracker_app.database import connection as db_connection
+    from faith_tracker_app.api import server as api_server
+    from faith_tracker_app.ui import commands
+
+    tmp_dir = tempfile.TemporaryDirectory()
+    db_connection.DATABASE_NAME = os.path.join(tmp_dir.name, "load_test.db")
+    db_connection.initialize_database(quiet=True)
+    lines = []
+    for i in range(seed):
+        lines.append(f"bible add John {i % 21 + 1} --start-verse 1 --end-verse 10 --notes n{i}")
+        lines.append(f"rosary log --date 2023-{i % 12 + 1:02d}-{i % 28 + 1:02d} --mysteries Joyful")
+        lines.append(f"sins add s{i} --date 2023-01-01")
+    commands.run_batch(lines, err=sys.stderr)
+
+    server = api_server.make_server(port=0, quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}", tmp_dir
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test for the Faith Tracker HTTP API.")
+    parser.add_argument("--url", help="Base URL of a running server (default: start one in-process)")
+    parser.add_argument("--path", action="append", dest="paths",
+                        help="Path to request; repeat for a mix (default: the three list endpoints)")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--etag", action="store_true", help="Send If-None-Match with the last ETag seen per path")
+    parser.add_argument("--seed", type=int, default=2000, help="Entries per tracker for the in-process server")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or ["/api/bible?limit=50", "/api/rosary?limit=50", "/api/sins?limit=50&status=unconfessed"]
+    server = tmp_dir = None
+    url = args.url
+    if url is None:
+        server, url, tmp_dir = _start_local_server(args.seed)
+
+    try:
+        result = run_load(url, paths, args.requests, args.concurrency, use_etag=args.etag)
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+            server.pool.close()
+            tmp_dir.cleanup()
+
+    print(f"{result['requests']} requests in {result['seconds']:.2f}s "
+          f"({result['requests_per_second']:.0f} req/s, concurrency {args.concurrency})")
+    print(f"latency p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms, max {result['max_ms']:.2f} ms")
+    print("statuses: " + ", ".join(f"{status}={n}" for status, n in sorted(result["statuses"].items())))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
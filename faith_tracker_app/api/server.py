@@ -0,0 +1,362 @@
+# faith_tracker_app/api/server.py
+"""
+Local HTTP JSON API for the three trackers, built on the standard library.
+
+Endpoints (resource is one of "bible", "rosary", "sins"):
+
+    GET  /api/<resource>?limit=N&cursor=C     Page of entries, most recent first
+    GET  /api/sins?status=unconfessed         (status: all, confessed, unconfessed)
+    GET  /api/<resource>/<id>                 A single entry
+    POST /api/<resource>                      Create an entry from a JSON body
+    POST /api/sins/<id>/confess               Mark a sin as confessed
+
+A created entry whose natural key is already logged is added as a separate entry,
+unless the body's "on_conflict" says otherwise (see schema.CONFLICT_MODES; "error"
+answers 409).
+
+List responses are {"items": [...], "next_cursor": "..."}; pass next_cursor back
+as `cursor` to get the following page. GET responses carry an ETag derived from
+the table's write generation, so unchanged data is answered with 304 after a
+single primary-key lookup. Responses are gzipped when the client accepts it.
+
+The server reads and writes the SQLite database whatever FAITH_TRACKER_STORAGE says,
+so it refuses to start with another storage backend.
+
+Run with: python -m faith_tracker_app.api.server --port 8765
+"""
+import argparse
+import base64
+import gzip
+import json
+import sqlite3
+import sys
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from faith_tracker_app.bible import bible_tracker
+from faith_tracker_app.rosary import rosary_tracker
+from faith_tracker_app.sins import sins_tracker
+from faith_tracker_app.database import archive, backends
+from faith_tracker_app.database import connection as db_connection
+from faith_tracker_app.database.compression import text_row
+from faith_tracker_app.database.concurrency import write_transaction
+from faith_tracker_app.database.pool import ConnectionPool
+from faith_tracker_app.database.schema import CONFLICT_MODES, INTERACTIVE_CONFLICT_MODE
+from faith_tracker_app.database.unit_of_work import insert_entry
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+GZIP_MIN_BYTES = 1024
+
+RESOURCES = {
+    "bible": {
+        "table": "bible_reading",
+        "columns": "id, book, chapter, start_verse, end_verse, reading_date, notes",
+        "sort_column": "reading_date",
+        "insert_sql": bible_tracker.INSERT_READING_SQL,
+        "build_row": bible_tracker.build_reading_row,
+        "after_insert": bible_tracker.record_readings_progress,
+    },
+    "rosary": {
+        "table": "rosary_prayers",
+        "columns": "id, prayer_date, mysteries, notes, created_at",
+        "sort_column": "prayer_date",
+        "insert_sql": rosary_tracker.INSERT_ROSARY_SQL,
+        "build_row": rosary_tracker.build_rosary_row,
+    },
+    "sins": {
+        "table": "sins_confession_log",
+        "columns": "id, sin_description, occurrence_date, confessed, confession_date, notes, created_at",
+        "sort_column": "created_at",
+        "insert_sql": sins_tracker.INSERT_SIN_SQL,
+        "build_row": sins_tracker.build_sin_row,
+    },
+}
+
+SIN_STATUS_FILTERS = {
+    "all": None,
+    "confessed": "confessed = TRUE",
+    "unconfessed": "confessed = FALSE",
+}
+
+
+class APIError(Exception):
+    """An error reported to the client as a JSON body with the given HTTP status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def encode_cursor(sort_value, entry_id):
+    """Encodes the position after the last returned entry as an opaque URL-safe string."""
+    raw = json.dumps([sort_value, entry_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Decodes a cursor produced by encode_cursor. Raises APIError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, entry_id = json.loads(raw)
+        return sort_value, int(entry_id)
+    except (ValueError, TypeError):
+        raise APIError(400, "Invalid cursor.")
+
+
+def get_write_generation(conn, table):
+    """Returns the table's write generation (bumped by triggers on every insert, update and delete)."""
+    row = conn.execute("SELECT generation FROM write_generation WHERE table_name = ?", (table,)).fetchone()
+    return row[0] if row else 0
+
+
+def etag_matches(if_none_match, etag):
+    """
+    Returns whether an If-None-Match header value (a comma-separated list of entity tags,
+    or "*") names etag. Compared weakly, as RFC 9110 asks for If-None-Match.
+    """
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    if "*" in tags:
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    return any((tag[2:] if tag.startswith("W/") else tag) == opaque for tag in tags)
+
+
+def list_entries(conn, resource, limit=DEFAULT_PAGE_SIZE, cursor=None, status="all"):
+    """
+    Returns one page of entries for a resource, most recent first, and the cursor for the next page.
+    Uses keyset pagination on (sort column, id), so every page costs one index range scan.
+    """
+    spec = RESOURCES[resource]
+    filters, params = [], []
+    if resource == "sins":
+        if status not in SIN_STATUS_FILTERS:
+            raise APIError(400, "status must be one of: all, confessed, unconfessed.")
+        if SIN_STATUS_FILTERS[status]:
+            filters.append(SIN_STATUS_FILTERS[status])
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor)
+        filters.append(f"({spec['sort_column']}, id) < (?, ?)")
+        params.extend([sort_value, last_id])
+
+    query = f"SELECT {spec['columns']} FROM {spec['table']}"
+    if filters:
+        query += " WHERE " + " AND ".join(filters)
+    query += f" ORDER BY {spec['sort_column']} DESC, id DESC LIMIT ?"
+    params.append(limit + 1)
+
+    rows = [text_row(row) for row in conn.execute(query, params).fetchall()]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][spec["sort_column"]], rows[-1]["id"])
+    return rows, next_cursor
+
+
+def get_entry(conn, resource, entry_id):
+    """Returns a single entry as a dictionary, or None if it doesn't exist."""
+    spec = RESOURCES[resource]
+    row = conn.execute(f"SELECT {spec['columns']} FROM {spec['table']} WHERE id = ?", (entry_id,)).fetchone()
+    return text_row(row) if row else None
+
+
+def create_entry(conn, resource, fields):
+    """
+    Validates and inserts an entry from a JSON object, whose optional "on_conflict" key is a
+    conflict mode. Returns the entry's id.
+    """
+    spec = RESOURCES[resource]
+    if not isinstance(fields, dict):
+        raise APIError(400, "Request body must be a JSON object.")
+    fields = dict(fields)
+    on_conflict = fields.pop("on_conflict", INTERACTIVE_CONFLICT_MODE)
+    if on_conflict not in CONFLICT_MODES:
+        raise APIError(400, f"on_conflict must be one of: {', '.join(CONFLICT_MODES)}.")
+    try:
+        row = spec["build_row"](**fields)
+    except (TypeError, ValueError) as e:
+        raise APIError(400, str(e))
+    # An archived entry is already logged too
+    archive.attach_archive(conn)
+    try:
+        with write_transaction(conn):
+            new_id, _ = insert_entry(conn, spec["insert_sql"], spec["table"], row, on_conflict)
+            if spec.get("after_insert"):
+                spec["after_insert"](conn, [row])
+            return new_id
+    except sqlite3.IntegrityError:
+        existing_id = db_connection.find_id_by_content_hash(conn, spec["table"], row[-1])
+        if existing_id is None and archive.is_attached(conn):
+            existing_id = db_connection.find_id_by_content_hash(conn, f"archive.{spec['table']}", row[-1])
+        raise APIError(409, f"This entry is already logged (ID: {existing_id}).")
+
+
+def confess_entry(conn, entry_id, fields):
+    """Marks a sin as confessed. Returns True if the entry changed."""
+    try:
+        row = sins_tracker.build_confession_row(entry_id, (fields or {}).get("confession_date"))
+    except ValueError as e:
+        raise APIError(400, str(e))
+    with write_transaction(conn):
+        return conn.execute(sins_tracker.CONFESS_SIN_SQL, row).rowcount > 0
+
+
+class TrackerRequestHandler(BaseHTTPRequestHandler):
+    """Request handler; the server instance provides `pool`."""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, so clients can reuse connections
+    disable_nagle_algorithm = True  # Headers and body are separate writes; don't wait for delayed ACKs
+    server_version = "FaithTrackerAPI/1.0"
+
+    def log_message(self, format, *args):
+        if not getattr(self.server, "quiet", False):
+            super().log_message(format, *args)
+
+    def _route(self):
+        """Splits the request path into (resource, entry id, action, query parameters)."""
+        parts = urlsplit(self.path)
+        segments = [s for s in parts.path.split("/") if s]
+        if len(segments) < 2 or segments[0] != "api" or segments[1] not in RESOURCES or len(segments) > 4:
+            raise APIError(404, "Not found.")
+        entry_id = None
+        if len(segments) >= 3:
+            try:
+                entry_id = int(segments[2])
+            except ValueError:
+                raise APIError(404, "Not found.")
+        action = segments[3] if len(segments) == 4 else None
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        return segments[1], entry_id, action, query
+
+    def _send_json(self, status, payload, etag=None):
+        body = json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if etag:
+            headers["ETag"] = etag
+        if len(body) >= GZIP_MIN_BYTES and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
+            headers["Vary"] = "Accept-Encoding"
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_not_modified(self, etag):
+        self.send_response(304)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _send_database_error(self, error):
+        self.log_error("Database error: %s", error)
+        self._send_json(500, {"error": "Database error."})
+
+    def _read_json_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            raise APIError(400, "Request body is not valid JSON.")
+
+    def do_GET(self):
+        try:
+            resource, entry_id, action, query = self._route()
+            if action:
+                raise APIError(404, "Not found.")
+            with self.server.pool.connection() as conn:
+                # Read the generation and the rows from one snapshot so the ETag always matches the body.
+                conn.execute("BEGIN")
+                generation = get_write_generation(conn, RESOURCES[resource]["table"])
+                # The ETag changes whenever the table is written, and differs per URL (page, filters).
+                etag = f'W/"{generation}-{zlib.crc32(self.path.encode("utf-8")):08x}"'
+                if etag_matches(self.headers.get("If-None-Match"), etag):
+                    self._send_not_modified(etag)
+                    return
+                if entry_id is not None:
+                    entry = get_entry(conn, resource, entry_id)
+                    if entry is None:
+                        raise APIError(404, f"Entry {entry_id} not found.")
+                    payload = entry
+                else:
+                    try:
+                        limit = min(int(query.get("limit", DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+                    except ValueError:
+                        raise APIError(400, "limit must be a whole number.")
+                    if limit <= 0:
+                        raise APIError(400, "limit must be positive.")
+                    items, next_cursor = list_entries(conn, resource, limit, query.get("cursor"),
+                                                      query.get("status", "all"))
+                    payload = {"items": items, "next_cursor": next_cursor}
+            self._send_json(200, payload, etag)
+        except APIError as e:
+            self._send_json(e.status, {"error": str(e)})
+        except sqlite3.Error as e:
+            self._send_database_error(e)
+
+    def do_POST(self):
+        try:
+            resource, entry_id, action, _ = self._route()
+            fields = self._read_json_body()
+            with self.server.pool.connection() as conn:
+                if entry_id is None and action is None:
+                    new_id = create_entry(conn, resource, fields)
+                    self._send_json(201, {"id": new_id})
+                elif resource == "sins" and entry_id is not None and action == "confess":
+                    changed = confess_entry(conn, entry_id, fields)
+                    if not changed:
+                        raise APIError(409, f"Sin entry ID {entry_id} not found or already confessed.")
+                    self._send_json(200, {"id": entry_id, "confessed": True})
+                else:
+                    raise APIError(404, "Not found.")
+        except APIError as e:
+            self._send_json(e.status, {"error": str(e)})
+        except sqlite3.Error as e:
+            self._send_database_error(e)
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8765, pool_size: int = 8, database: str = None, quiet: bool = False):
+    """Creates a threaded API server with its own connection pool. Call serve_forever() to run it."""
+    server = ThreadingHTTPServer((host, port), TrackerRequestHandler)
+    server.daemon_threads = True
+    server.pool = ConnectionPool(database, size=pool_size)
+    server.quiet = quiet
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Faith Tracker HTTP JSON API server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--pool-size", type=int, default=8)
+    parser.add_argument("--quiet", action="store_true", help="Don't log every request.")
+    args = parser.parse_args(argv)
+
+    # Requests run on pooled connections to the database file
+    try:
+        backends.require_sqlite("The API server")
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    db_connection.initialize_database(quiet=True)
+    server = make_server(args.host, args.port, args.pool_size, quiet=args.quiet)
+    print(f"Serving Faith Tracker API on http://{args.host}:{server.server_address[1]}/api/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.pool.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,11 @@
 # Main application file for Faith Tracker App
+import sys
+
 from faith_tracker_app.ui import cli
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Subcommands run non-interactively (see ui/commands.py)
+        from faith_tracker_app.ui import commands
+        sys.exit(commands.main(sys.argv[1:]))
     cli.main_menu()
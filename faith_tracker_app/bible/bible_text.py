@@ -0,0 +1,207 @@
+# faith_tracker_app/bible/bible_text.py
+"""
+Offline Bible text: the verses of a logged reading, read from a local text store.
+
+compile_text_store() converts a public-domain translation in the common
+"Book|Chapter|Verse|Text" line format (one verse per line, in canonical order)
+into two files:
+
+    bible_text.txt      the verse texts alone, each ending with a newline
+    bible_text.txt.idx  the byte offset of every verse, and per chapter its
+                        first verse number and where its verses start
+
+BibleText memory-maps the store and reads the index into an array, so opening
+it costs one read of the (~130 KB) index and no parsing of the text. The verses
+of a chapter are contiguous, so a range such as Genesis 1:1-31 is a single
+zero-copy memoryview slice of the mapping; only showing it decodes the bytes.
+
+The store is not bundled with the app; compile one from a translation of your choice:
+
+    python -m faith_tracker_app.bible.bible_text compile kjv.txt
+    python -m faith_tracker_app.bible.bible_text show John 3 16 17
+"""
+import argparse
+import array
+import functools
+import mmap
+import os
+import struct
+import sys
+
+from faith_tracker_app.bible.books import ALL_BOOKS, canonical_book_name
+from faith_tracker_app.database.connection import DATABASE_DIR
+
+# Path of the compiled text store; the index is the same path with INDEX_SUFFIX
+BIBLE_TEXT_NAME = os.environ.get("FAITH_TRACKER_BIBLE_TEXT") or os.path.join(DATABASE_DIR, "bible_text.txt")
+INDEX_SUFFIX = ".idx"
+
+# Index layout: header, one record per chapter, then verse_count + 1 uint32 byte offsets
+_INDEX_MAGIC = b"FTBX"
+_HEADER = struct.Struct("<4sIIQ")  # magic, chapters, verses, size of the text store
+_CHAPTER = struct.Struct("<BHHHI")  # book (position in ALL_BOOKS), chapter, first verse, verses, first offset index
+
+
+def _parse_source_line(line: str, line_number: int):
+    """Returns (book, chapter, verse, text) for one "Book|Chapter|Verse|Text" line (tabs also work)."""
+    separator = "|" if "|" in line else "\t"
+    parts = line.rstrip("\r\n").split(separator, 3)
+    book = canonical_book_name(parts[0]) if len(parts) == 4 else None
+    if book is None or not parts[1].isdigit() or not parts[2].isdigit():
+        raise ValueError(f"Line {line_number}: expected Book|Chapter|Verse|Text")
+    return book, int(parts[1]), int(parts[2]), " ".join(parts[3].split())
+
+
+def compile_text_store(source_path: str, store_path: str = None):
+    """
+    Builds the text store and its index from a "Book|Chapter|Verse|Text" file.
+    Verses must come in order within a chapter; a skipped verse number is stored as
+    an empty verse. Returns the number of verses. Raises ValueError for a malformed line.
+    """
+    store_path = store_path or BIBLE_TEXT_NAME
+    chapters, offsets = [], array.array("I")
+    current, next_verse, position = None, None, 0
+    with open(source_path, encoding="utf-8-sig") as source, open(store_path, "wb") as store:
+        for line_number, line in enumerate(source, 1):
+            if not line.strip():
+                continue
+            book, chapter, verse, text = _parse_source_line(line, line_number)
+            if (book, chapter) != current:
+                current, next_verse = (book, chapter), verse
+                chapters.append([ALL_BOOKS.index(book), chapter, verse, 0, len(offsets)])
+            elif verse < next_verse:
+                raise ValueError(f"Line {line_number}: {book} {chapter}:{verse} is out of order")
+            encoded = text.encode("utf-8") + b"\n"
+            for _ in range(verse - next_verse + 1):
+                offsets.append(position)
+                chapters[-1][3] += 1
+                position += 1  # The newline of a skipped, empty verse
+            position += len(encoded) - 1
+            store.write(b"\n" * (verse - next_verse) + encoded)
+            next_verse = verse + 1
+    offsets.append(position)
+
+    with open(store_path + INDEX_SUFFIX, "wb") as index:
+        index.write(_HEADER.pack(_INDEX_MAGIC, len(chapters), len(offsets) - 1, position))
+        index.write(b"".join(_CHAPTER.pack(*record) for record in chapters))
+        index.write(offsets.tobytes())
+    return len(offsets) - 1
+
+
+class BibleText:
+    """A memory-mapped text store (see compile_text_store). Close it, or use it as a context manager."""
+
+    def __init__(self, store_path: str = None):
+        store_path = store_path or BIBLE_TEXT_NAME
+        with open(store_path + INDEX_SUFFIX, "rb") as index:
+            data = index.read()
+        magic, chapter_count, verse_count, size = _HEADER.unpack_from(data)
+        if magic != _INDEX_MAGIC or os.path.getsize(store_path) != size:
+            raise ValueError(f"{store_path + INDEX_SUFFIX} is not the index of {store_path}; recompile the store.")
+        self.chapters = {}
+        for book_index, chapter, first_verse, verses, first in _CHAPTER.iter_unpack(
+                data[_HEADER.size:_HEADER.size + chapter_count * _CHAPTER.size]):
+            self.chapters[(ALL_BOOKS[book_index], chapter)] = (first_verse, verses, first)
+        self.offsets = array.array("I")
+        self.offsets.frombytes(data[_HEADER.size + chapter_count * _CHAPTER.size:])
+        self._file = open(store_path, "rb")
+        # An empty file can't be mapped
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._view = memoryview(self._map)
+
+    def passage(self, book: str, chapter: int, start_verse: int = None, end_verse: int = None):
+        """
+        Returns the verses as one memoryview of the mapped store (verses separated by newlines),
+        clipped to the chapter, or None if the store has no such chapter or verses.
+        Without verses, the whole chapter; with only start_verse, that verse. The view is only
+        valid until the store is closed.
+        """
+        found = self.chapters.get((canonical_book_name(book or ""), chapter))
+        if found is None:
+            return None
+        first_verse, verses, first = found
+        if start_verse is None:
+            start_verse, end_verse = first_verse, first_verse + verses - 1
+        elif end_verse is None:
+            end_verse = start_verse
+        start = max(start_verse, first_verse) - first_verse
+        end = min(end_verse, first_verse + verses - 1) - first_verse
+        if start > end:
+            return None
+        # Without the newline ending the last verse
+        return self._view[self.offsets[first + start]:self.offsets[first + end + 1] - 1]
+
+    def verses(self, book: str, chapter: int, start_verse: int = None, end_verse: int = None):
+        """Returns [(verse number, text)] for a passage, or [] if the store doesn't have it."""
+        text = self.passage(book, chapter, start_verse, end_verse)
+        if text is None:
+            return []
+        first_verse = self.chapters[(canonical_book_name(book), chapter)][0]
+        start = first_verse if start_verse is None else max(start_verse, first_verse)
+        return list(enumerate(str(text, "utf-8").split("\n"), start))
+
+    def close(self):
+        self._view.release()
+        if self._map:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+@functools.lru_cache(maxsize=1)
+def _open_store(store_path: str):
+    return BibleText(store_path)
+
+
+def get_passage_text(book: str, chapter: int, start_verse: int = None, end_verse: int = None):
+    """
+    Returns a passage as "16 For God so loved... 17 For God sent..." from the configured
+    store, or None if there is no store or it doesn't have the passage. The store stays
+    mapped for the life of the process.
+    """
+    try:
+        bible_text = _open_store(BIBLE_TEXT_NAME)
+    except (OSError, ValueError):
+        return None
+    verses = bible_text.verses(book, chapter, start_verse, end_verse)
+    return " ".join(f"{number} {text}" for number, text in verses) or None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile or read the offline Bible text store.")
+    parser.add_argument("--store", default=None, help=f"Text store path (default: {BIBLE_TEXT_NAME})")
+    operations = parser.add_subparsers(dest="operation", required=True)
+    compile_parser = operations.add_parser("compile", help="Compile a Book|Chapter|Verse|Text file into the store")
+    compile_parser.add_argument("source")
+    show_parser = operations.add_parser("show", help="Print a passage")
+    show_parser.add_argument("book")
+    show_parser.add_argument("chapter", type=int)
+    show_parser.add_argument("start_verse", type=int, nargs="?")
+    show_parser.add_argument("end_verse", type=int, nargs="?")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.operation == "compile":
+            verses = compile_text_store(args.source, args.store)
+            print(f"Compiled {verses} verses into {args.store or BIBLE_TEXT_NAME}.")
+            return 0
+        with BibleText(args.store) as bible_text:
+            verses = bible_text.verses(args.book, args.chapter, args.start_verse, args.end_verse)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    if not verses:
+        print(f"{args.book} {args.chapter} is not in the text store.")
+        return 1
+    for number, text in verses:
+        print(f"{number} {text}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,59 +1,161 @@
 # faith_tracker_app/bible/bible_tracker.py
 import datetime
-from faith_tracker_app.database.connection import get_db_connection
+import sqlite3
+import uuid
+from faith_tracker_app.bible import reading_plans
+from faith_tracker_app.bible.bible_text import get_passage_text
+from faith_tracker_app.database import archive
+from faith_tracker_app.database.compression import compress_text, lazy_row
+from faith_tracker_app.database.connection import natural_key_hash
+from faith_tracker_app.database.schema import INTERACTIVE_CONFLICT_MODE, list_columns
+from faith_tracker_app.database.backends import unit_of_work
+from faith_tracker_app.database.unit_of_work import insert_entry
+from faith_tracker_app.liturgy.liturgical_calendar import describe_day
 
-def add_bible_reading(book: str, chapter: int, start_verse: int = None, end_verse: int = None, notes: str = None):
+INSERT_READING_SQL = """
+    INSERT INTO bible_reading (book, chapter, start_verse, end_verse, reading_date, notes, uuid, content_hash)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+def check_verse_range(chapter: int, start_verse: int = None, end_verse: int = None):
+    """Raises ValueError unless chapter and verses are positive whole numbers and the range isn't reversed."""
+    for value, field_name in ((chapter, "chapter"), (start_verse, "start_verse"), (end_verse, "end_verse")):
+        if value is None and field_name != "chapter":
+            continue
+        if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+            raise ValueError(f"Invalid {field_name}: must be a whole number of 1 or more.")
+    if start_verse is not None and end_verse is not None and end_verse < start_verse:
+        raise ValueError("Invalid verse range: end_verse is before start_verse.")
+
+def build_reading_row(book: str, chapter: int, start_verse: int = None, end_verse: int = None, notes: str = None,
+                      reading_date: str = None):
     """
-    Adds a new Bible reading entry to the database.
-    Date of reading is automatically set to the current date and time.
+    Builds the parameter tuple for INSERT_READING_SQL.
+    Date of reading defaults to the current date and time ('YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS'
+    for past readings), and the entry gets a new uuid. Long notes are compressed (see compression.py).
+    Raises ValueError for a missing book, an invalid verse range or a malformed reading_date.
+    """
+    if not book:
+        raise ValueError("Book is required.")
+    check_verse_range(chapter, start_verse, end_verse)
+    if reading_date is None:
+        reading_date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    else:
+        try:
+            fmt = "%Y-%m-%d" if len(reading_date) == 10 else "%Y-%m-%d %H:%M:%S"
+            reading_date = datetime.datetime.strptime(reading_date, fmt).strftime("%Y-%m-%d %H:%M:%S")
+        except (TypeError, ValueError):
+            raise ValueError("Invalid reading_date format. Please use YYYY-MM-DD or YYYY-MM-DD HH:MM:SS.")
+    return (book, chapter, start_verse, end_verse, reading_date, compress_text(notes), uuid.uuid4().hex,
+            natural_key_hash(book, chapter, start_verse, end_verse, reading_date))
+
+def record_readings_progress(conn, rows):
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    Updates reading-plan progress for rows built by build_reading_row, inside the caller's
+    transaction. Every path that inserts with INSERT_READING_SQL should call this.
+    """
+    return reading_plans.record_plan_progress(conn, [(row[0], row[1], row[4]) for row in rows])
+
+class BibleRepository:
+    """Bible reading queries and writes on a given connection; the caller commits (see UnitOfWork)."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def insert(self, row, on_conflict: str = "error"):
+        """
+        Inserts a row built by build_reading_row and updates reading-plan progress.
+        Returns (id, written); see unit_of_work.insert_entry.
+        """
+        reading_id, written = insert_entry(self.conn, INSERT_READING_SQL, "bible_reading", row, on_conflict)
+        record_readings_progress(self.conn, [row])
+        return reading_id, written
+
+    def add_reading(self, book: str, chapter: int, start_verse: int = None, end_verse: int = None, notes: str = None,
+                    reading_date: str = None, on_conflict: str = "error"):
+        """Adds a reading (see build_reading_row). Returns (id, written)."""
+        return self.insert(build_reading_row(book, chapter, start_verse, end_verse, notes, reading_date), on_conflict)
+
+    @staticmethod
+    def list_query(start_date: str = None, end_date: str = None, with_notes: bool = True, projection: str = "full"):
+        """Returns (SELECT with a {table} placeholder, params, ORDER BY) for list_readings; see archive.select_rows."""
+        filters, params = archive.date_range_filters("reading_date", start_date, end_date)
+        query = f"SELECT {', '.join(list_columns('bible_reading', projection, with_notes))} FROM {{table}}"
+        if filters:
+            query += " WHERE " + " AND ".join(filters)
+        return query, params, "ORDER BY reading_date DESC, id DESC"
 
-    reading_date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    def list_readings(self, limit: int = None, start_date: str = None, end_date: str = None,
+                      include_archive: bool = False, with_notes: bool = True, projection: str = "full"):
+        """
+        Returns reading dictionaries; see get_all_bible_readings.
+        Raises ValueError for malformed dates or an unknown projection.
+        """
+        query, params, order_by = self.list_query(start_date, end_date, with_notes, projection)
+        include_archive = include_archive or archive.range_reaches_archive(self.conn, "bible_reading", start_date, end_date)
+        readings = archive.select_rows(self.conn, "bible_reading", query, params, order_by, limit, include_archive)
+        # Convert sqlite3.Row objects to dictionaries for easier use; long notes are decompressed when read
+        return [lazy_row(row) for row in readings]
 
+def add_bible_reading(book: str, chapter: int, start_verse: int = None, end_verse: int = None, notes: str = None,
+                      on_conflict: str = INTERACTIVE_CONFLICT_MODE, conn=None):
+    """
+    Adds a new Bible reading entry to the database.
+    Date of reading is automatically set to the current date and time.
+    on_conflict (see schema.CONFLICT_MODES) decides what happens if the same reading is already
+    logged: by default it is added as a separate entry; with "ignore" or "update" the existing
+    entry's id is returned.
+    conn: an open SQLite connection to use (and commit) instead of the configured storage backend.
+    """
     try:
-        cursor.execute("""
-            INSERT INTO bible_reading (book, chapter, start_verse, end_verse, reading_date, notes)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (book, chapter, start_verse, end_verse, reading_date, notes))
-        conn.commit()
+        with unit_of_work(conn, write=True) as uow:
+            reading_id, written = uow.bible.add_reading(book, chapter, start_verse, end_verse, notes,
+                                                        on_conflict=on_conflict)
+        if not written:
+            print(f"Reading {book} {chapter} is already logged (ID: {reading_id}).")
+            return reading_id
         print(f"Successfully added reading: {book} {chapter}" +
               (f":{start_verse}" if start_verse else "") +
               (f"-{end_verse}" if end_verse and start_verse else "") +
               (f":{end_verse}" if end_verse and not start_verse else "")
              )
-        return cursor.lastrowid
+        return reading_id
+    except sqlite3.IntegrityError:
+        print(f"Error adding Bible reading: {book} {chapter} is already logged for that time.")
+        return None
     except Exception as e:
         print(f"Error adding Bible reading: {e}")
         return None
-    finally:
-        conn.close()
 
-def get_all_bible_readings(limit: int = None):
+def get_all_bible_readings(limit: int = None, start_date: str = None, end_date: str = None, include_archive: bool = False,
+                           conn=None, with_notes: bool = True, projection: str = "full"):
     """
-    Retrieves all Bible reading entries, ordered by reading_date descending.
+    Retrieves all Bible reading entries, ordered by reading_date descending (latest logged first on ties).
+    start_date and end_date ('YYYY-MM-DD', inclusive) restrict the reading dates. Archived
+    readings are included when the range reaches back into the archive, or if include_archive is True.
+    with_notes=False leaves the notes out, so the listing doesn't read them.
+    projection (see schema.PROJECTIONS): "summary" leaves out the notes, "ids" returns only
+    id and reading_date, read from the date index alone.
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    query = "SELECT id, book, chapter, start_verse, end_verse, reading_date, notes FROM bible_reading ORDER BY reading_date DESC"
-    if limit:
-        query += f" LIMIT {int(limit)}"
-
     try:
-        cursor.execute(query)
-        readings = cursor.fetchall()
-        # Convert sqlite3.Row objects to dictionaries for easier use
-        return [dict(row) for row in readings]
+        with unit_of_work(conn) as uow:
+            return uow.bible.list_readings(limit, start_date, end_date, include_archive, with_notes, projection)
     except Exception as e:
         print(f"Error retrieving Bible readings: {e}")
         return []
-    finally:
-        conn.close()
 
-def format_reading_for_display(reading: dict):
-    """Formats a single reading dictionary for display."""
+def format_reading_compact(reading: dict):
+    """Formats a reading of the summary (or full) projection as one short line: id, date and passage."""
+    verse_info = f":{reading['start_verse']}" if reading['start_verse'] else ""
+    if reading['start_verse'] and reading['end_verse'] and reading['end_verse'] != reading['start_verse']:
+        verse_info += f"-{reading['end_verse']}"
+    return f"{reading['id']:>6}  {reading['reading_date'][:10]}  {reading['book']} {reading['chapter']}{verse_info}"
+
+def format_reading_for_display(reading: dict, liturgical: bool = False, with_text: bool = False):
+    """
+    Formats a single reading dictionary for display; liturgical adds the day's season and feast,
+    and with_text the verses read, on the next line, if the offline text store has them (see bible_text).
+    """
     verse_info = ""
     if reading['start_verse'] and reading['end_verse']:
         if reading['start_verse'] == reading['end_verse']:
@@ -65,7 +167,7 @@ def format_reading_for_display(reading: dict):
     elif reading['end_verse']: # Unlikely scenario if start_verse is None, but handle
         verse_info = f" (verse {reading['end_verse']})"
 
-    notes_info = f" (Notes: {reading['notes']})" if reading['notes'] else ""
+    notes_info = f" (Notes: {reading['notes']})" if reading.get('notes') else ""
     # Parse date for friendlier format
     try:
         date_obj = datetime.datetime.strptime(reading['reading_date'], "%Y-%m-%d %H:%M:%S")
@@ -73,7 +175,17 @@ def format_reading_for_display(reading: dict):
     except ValueError:
         formatted_date = reading['reading_date'] # Fallback to raw date string
 
-    return f"[{reading['id']}] {formatted_date} - {reading['book']} {reading['chapter']}{verse_info}{notes_info}"
+    day_info = ""
+    if liturgical:
+        description = describe_day(reading['reading_date'])
+        day_info = f" [{description}]" if description else ""
+
+    text_info = ""
+    if with_text:
+        passage = get_passage_text(reading['book'], reading['chapter'], reading['start_verse'], reading['end_verse'])
+        text_info = f"\n    {passage}" if passage else ""
+
+    return f"[{reading['id']}] {formatted_date} - {reading['book']} {reading['chapter']}{verse_info}{notes_info}{day_info}{text_info}"
 
 if __name__ == '__main__':
     # This block is for testing the module directly
@@ -0,0 +1,57 @@
+# faith_tracker_app/bible/books.py
+"""Canonical list of the 73 books of the Catholic Bible with their chapter counts."""
+
+OLD_TESTAMENT = [
+    ("Genesis", 50), ("Exodus", 40), ("Leviticus", 27), ("Numbers", 36), ("Deuteronomy", 34),
+    ("Joshua", 24), ("Judges", 21), ("Ruth", 4), ("1 Samuel", 31), ("2 Samuel", 24),
+    ("1 Kings", 22), ("2 Kings", 25), ("1 Chronicles", 29), ("2 Chronicles", 36), ("Ezra", 10),
+    ("Nehemiah", 13), ("Tobit", 14), ("Judith", 16), ("Esther", 16), ("1 Maccabees", 16),
+    ("2 Maccabees", 15), ("Job", 42), ("Psalms", 150), ("Proverbs", 31), ("Ecclesiastes", 12),
+    ("Song of Songs", 8), ("Wisdom", 19), ("Sirach", 51), ("Isaiah", 66), ("Jeremiah", 52),
+    ("Lamentations", 5), ("Baruch", 6), ("Ezekiel", 48), ("Daniel", 14), ("Hosea", 14),
+    ("Joel", 3), ("Amos", 9), ("Obadiah", 1), ("Jonah", 4), ("Micah", 7),
+    ("Nahum", 3), ("Habakkuk", 3), ("Zephaniah", 3), ("Haggai", 2), ("Zechariah", 14),
+    ("Malachi", 4),
+]
+
+NEW_TESTAMENT = [
+    ("Matthew", 28), ("Mark", 16), ("Luke", 24), ("John", 21), ("Acts", 28),
+    ("Romans", 16), ("1 Corinthians", 16), ("2 Corinthians", 13), ("Galatians", 6), ("Ephesians", 6),
+    ("Philippians", 4), ("Colossians", 4), ("1 Thessalonians", 5), ("2 Thessalonians", 3), ("1 Timothy", 6),
+    ("2 Timothy", 4), ("Titus", 3), ("Philemon", 1), ("Hebrews", 13), ("James", 5),
+    ("1 Peter", 5), ("2 Peter", 3), ("1 John", 5), ("2 John", 1), ("3 John", 1),
+    ("Jude", 1), ("Revelation", 22),
+]
+
+BOOKS = OLD_TESTAMENT + NEW_TESTAMENT
+CHAPTER_COUNTS = dict(BOOKS)
+OLD_TESTAMENT_BOOKS = [name for name, _ in OLD_TESTAMENT]
+NEW_TESTAMENT_BOOKS = [name for name, _ in NEW_TESTAMENT]
+ALL_BOOKS = OLD_TESTAMENT_BOOKS + NEW_TESTAMENT_BOOKS
+
+# Common alternative names, keyed in lower case
+BOOK_ALIASES = {
+    "psalm": "Psalms",
+    "song of solomon": "Song of Songs",
+    "canticle of canticles": "Song of Songs",
+    "qoheleth": "Ecclesiastes",
+    "ecclesiasticus": "Sirach",
+    "wisdom of solomon": "Wisdom",
+    "apocalypse": "Revelation",
+    "revelations": "Revelation",
+}
+
+_BOOKS_BY_LOWER_NAME = {name.lower(): name for name in ALL_BOOKS}
+_BOOKS_BY_LOWER_NAME.update(BOOK_ALIASES)
+
+
+def canonical_book_name(book: str):
+    """Returns the canonical name for a book as typed (e.g. "psalm" -> "Psalms"), or None if unknown."""
+    if not book:
+        return None
+    key = " ".join(book.lower().replace(".", "").split())
+    for prefix, number in (("first ", "1 "), ("second ", "2 "), ("third ", "3 "), ("i ", "1 "), ("ii ", "2 "), ("iii ", "3 ")):
+        if key.startswith(prefix):
+            key = number + key[len(prefix):]
+            break
+    return _BOOKS_BY_LOWER_NAME.get(key)
@@ -0,0 +1,280 @@
+# faith_tracker_app/bible/reading_plans.py
+"""
+Bible reading plans: day-by-day chapter assignments with incremental progress.
+
+A plan is stored as one reading_plans row: its books in reading order, the
+cumulative number of chapters due by the end of each day (a packed uint16
+array), and a bitmap of the chapters read so far plus its population count.
+add_bible_reading sets the bits for the chapters it logs, so a plan's status
+("ahead/behind by N chapters", "today's assignment") is a single primary-key
+lookup instead of a replay of the reading history.
+"""
+import bisect
+import datetime
+import struct
+
+from faith_tracker_app.bible.books import ALL_BOOKS, NEW_TESTAMENT_BOOKS, CHAPTER_COUNTS, canonical_book_name
+from faith_tracker_app.database.concurrency import write_transaction
+from faith_tracker_app.database.connection import get_db_connection
+
+PLAN_PRESETS = {
+    "bible-in-a-year": ("Whole Bible in a Year", ALL_BOOKS, 365),
+    "new-testament-90": ("New Testament in 90 Days", NEW_TESTAMENT_BOOKS, 90),
+}
+
+# Run by record_plan_progress for every batch of logged readings
+ACTIVE_PLANS_SQL = """
+    SELECT id, books, start_date, progress FROM reading_plans
+    WHERE active = TRUE AND start_date <= ?
+"""
+
+UPDATE_PLAN_PROGRESS_SQL = """
+    UPDATE reading_plans SET progress = ?, chapters_read = chapters_read + ? WHERE id = ?
+"""
+
+
+def pack_day_ends(day_ends):
+    return struct.pack(f"<{len(day_ends)}H", *day_ends)
+
+
+def unpack_day_ends(blob):
+    return struct.unpack(f"<{len(blob) // 2}H", blob)
+
+
+def generate_day_ends(total_chapters: int, days: int):
+    """Spreads total_chapters as evenly as possible over days; returns the cumulative count per day."""
+    return [round((day + 1) * total_chapters / days) for day in range(days)]
+
+
+class _PlanLayout:
+    """Maps between (book, chapter) and a chapter's position within a plan's book sequence."""
+
+    def __init__(self, books):
+        self.books = books
+        self.starts = []
+        position = 0
+        for book in books:
+            self.starts.append(position)
+            position += CHAPTER_COUNTS[book]
+        self.total_chapters = position
+        self.offsets = dict(zip(books, self.starts))
+
+    def position(self, book, chapter):
+        """Returns the plan position of a chapter, or None if it isn't part of the plan."""
+        offset = self.offsets.get(book)
+        if offset is None or not isinstance(chapter, int) or not 1 <= chapter <= CHAPTER_COUNTS[book]:
+            return None
+        return offset + chapter - 1
+
+    def chapter_at(self, position):
+        """Returns (book, chapter) for a plan position."""
+        index = bisect.bisect_right(self.starts, position) - 1
+        return self.books[index], position - self.starts[index] + 1
+
+
+def _parse_books(books):
+    canonical = []
+    for book in books:
+        name = canonical_book_name(book)
+        if name is None:
+            raise ValueError(f"Unknown book: {book}")
+        if name in canonical:
+            raise ValueError(f"Book listed twice: {name}")
+        canonical.append(name)
+    if not canonical:
+        raise ValueError("A reading plan needs at least one book.")
+    return canonical
+
+
+def create_reading_plan(name: str = None, books: list = None, days: int = None, start_date: str = None, preset: str = None):
+    """
+    Creates a reading plan and returns its id.
+    Either give a preset (see PLAN_PRESETS) or a list of books and a number of days;
+    explicit arguments override the preset's. start_date ('YYYY-MM-DD') defaults to today.
+    """
+    if preset is not None:
+        if preset not in PLAN_PRESETS:
+            print(f"Error: Unknown reading plan preset '{preset}'. Choose from: {', '.join(PLAN_PRESETS)}.")
+            return None
+        preset_name, preset_books, preset_days = PLAN_PRESETS[preset]
+        name, books, days = name or preset_name, books or preset_books, days or preset_days
+
+    try:
+        books = _parse_books(books or [])
+        if not days or days < 1:
+            raise ValueError("A reading plan needs at least one day.")
+        if start_date is None:
+            start_date = datetime.date.today().strftime("%Y-%m-%d")
+        else:
+            datetime.datetime.strptime(start_date, "%Y-%m-%d")
+    except ValueError as e:
+        print(f"Error: {e}")
+        return None
+
+    name = name or "Reading Plan"
+    layout = _PlanLayout(books)
+    day_ends = generate_day_ends(layout.total_chapters, days)
+    progress = bytes((layout.total_chapters + 7) // 8)
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        with write_transaction(conn):
+            cursor.execute("""
+                INSERT INTO reading_plans (name, books, start_date, days, total_chapters, day_ends, progress)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (name, ",".join(books), start_date, days, layout.total_chapters,
+                  pack_day_ends(day_ends), progress))
+        print(f"Created reading plan '{name}': {layout.total_chapters} chapters over {days} days from {start_date}.")
+        return cursor.lastrowid
+    except Exception as e:
+        print(f"Error creating reading plan: {e}")
+        return None
+    finally:
+        conn.close()
+
+
+def record_plan_progress(conn, readings):
+    """
+    Marks chapters as read in every active plan that includes them, inside the caller's transaction.
+    readings is an iterable of (book, chapter, reading_date) with reading_date starting 'YYYY-MM-DD';
+    a reading only counts for plans that had started by then. Returns the number of newly read chapters.
+    """
+    readings = [(canonical_book_name(book), chapter, reading_date[:10]) for book, chapter, reading_date in readings]
+    readings = [reading for reading in readings if reading[0] is not None]
+    if not readings:
+        return 0
+
+    plans = conn.execute(ACTIVE_PLANS_SQL, (max(reading[2] for reading in readings),)).fetchall()
+
+    newly_read_total = 0
+    for plan in plans:
+        layout = _PlanLayout(plan["books"].split(","))
+        bitmap = bytearray(plan["progress"])
+        newly_read = 0
+        for book, chapter, reading_date in readings:
+            if reading_date < plan["start_date"]:
+                continue
+            position = layout.position(book, chapter)
+            if position is None:
+                continue
+            mask = 1 << (position & 7)
+            if not bitmap[position >> 3] & mask:
+                bitmap[position >> 3] |= mask
+                newly_read += 1
+        if newly_read:
+            conn.execute(UPDATE_PLAN_PROGRESS_SQL, (bytes(bitmap), newly_read, plan["id"]))
+            newly_read_total += newly_read
+    return newly_read_total
+
+
+def get_reading_plans(active_only: bool = False):
+    """Retrieves reading plans (without their packed assignment data), newest first."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    query = "SELECT id, name, start_date, days, total_chapters, chapters_read, active FROM reading_plans"
+    if active_only:
+        query += " WHERE active = TRUE"
+    query += " ORDER BY id DESC"
+
+    try:
+        cursor.execute(query)
+        return [dict(row) for row in cursor.fetchall()]
+    except Exception as e:
+        print(f"Error retrieving reading plans: {e}")
+        return []
+    finally:
+        conn.close()
+
+
+def get_plan_status(plan_id: int, on_date: str = None):
+    """
+    Returns a plan's progress on on_date ('YYYY-MM-DD', default today) as a dictionary:
+    day (1-based), chapters_read, expected (chapters due by the end of that day),
+    ahead_by (negative when behind) and assignment, the list of
+    {"book", "chapter", "read"} entries due that day. Returns None if the plan doesn't exist.
+    """
+    if on_date is None:
+        day = datetime.date.today()
+    else:
+        day = datetime.datetime.strptime(on_date, "%Y-%m-%d").date()
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("SELECT * FROM reading_plans WHERE id = ?", (plan_id,))
+        plan = cursor.fetchone()
+    except Exception as e:
+        print(f"Error retrieving reading plan: {e}")
+        return None
+    finally:
+        conn.close()
+    if plan is None:
+        return None
+
+    day_ends = unpack_day_ends(plan["day_ends"])
+    day_index = (day - datetime.datetime.strptime(plan["start_date"], "%Y-%m-%d").date()).days
+    layout = _PlanLayout(plan["books"].split(","))
+    assignment = []
+    if day_index < 0:
+        expected = 0
+    elif day_index >= plan["days"]:
+        expected = plan["total_chapters"]
+    else:
+        expected = day_ends[day_index]
+        first = day_ends[day_index - 1] if day_index > 0 else 0
+        for position in range(first, expected):
+            book, chapter = layout.chapter_at(position)
+            read = bool(plan["progress"][position >> 3] & (1 << (position & 7)))
+            assignment.append({"book": book, "chapter": chapter, "read": read})
+
+    return {
+        "id": plan["id"],
+        "name": plan["name"],
+        "day": day_index + 1,
+        "days": plan["days"],
+        "chapters_read": plan["chapters_read"],
+        "total_chapters": plan["total_chapters"],
+        "expected": expected,
+        "ahead_by": plan["chapters_read"] - expected,
+        "assignment": assignment,
+    }
+
+
+def format_plan_status_for_display(status: dict):
+    """Formats a plan status dictionary for display."""
+    if status["day"] < 1:
+        schedule = f"starts in {1 - status['day']} day(s)"
+    elif status["day"] > status["days"]:
+        schedule = "schedule finished"
+    else:
+        schedule = f"day {status['day']} of {status['days']}"
+
+    if status["ahead_by"] > 0:
+        pace = f"ahead by {status['ahead_by']} chapter(s)"
+    elif status["ahead_by"] < 0:
+        pace = f"behind by {-status['ahead_by']} chapter(s)"
+    else:
+        pace = "on track"
+
+    lines = [f"[{status['id']}] {status['name']} - {schedule}, "
+             f"{status['chapters_read']}/{status['total_chapters']} chapters read, {pace}"]
+    if status["assignment"]:
+        today = ", ".join(f"{entry['book']} {entry['chapter']}" + (" (read)" if entry["read"] else "")
+                          for entry in status["assignment"])
+        lines.append(f"    Today: {today}")
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    from faith_tracker_app.database.connection import initialize_database
+    initialize_database()
+
+    print("\n--- Testing Reading Plans ---")
+    plan_id = create_reading_plan(preset="new-testament-90")
+    if plan_id:
+        print(format_plan_status_for_display(get_plan_status(plan_id)))
+    print("\n--- End Reading Plans Test ---")
@@ -0,0 +1,277 @@
+# faith_tracker_app/database/archive.py
+"""
+Hot/cold archival: old tracker rows move to a separate archive database file.
+
+archive_old_rows moves rows older than a horizon from the main ("hot") database
+into the archive file, ATTACHed as "archive", in small transactions. Reads query
+the hot tables only, unless the requested date range reaches back past the
+archive boundary recorded in archive_state, in which case select_rows
+transparently adds the archive tables with UNION ALL.
+
+Unconfessed sins are never archived, so the confession backlog stays hot.
+Moves are not written to the sync changelog: an archived row is still part of
+the user's history and must not be deleted from other devices.
+
+The archive tables keep the unique content_hash index, and inserts check it
+through without_archived(), so an archived entry is never logged again by a
+re-import, a batch re-run or a sync. Inserts don't change archived entries.
+
+Run with: python -m faith_tracker_app.database.archive [--horizon-days N]
+"""
+import argparse
+import datetime
+import os
+import sqlite3
+import sys
+
+from faith_tracker_app.database import connection
+from faith_tracker_app.database import schema
+from faith_tracker_app.database.concurrency import begin_write, commit_write, write_transaction
+
+ARCHIVE_HORIZON_DAYS = 365
+ARCHIVE_BATCH_SIZE = 1000
+
+# Path of the archive file; None means next to the main database, with an "_archive" suffix
+ARCHIVE_NAME = None
+
+# Archivable tables: date column compared against the horizon, and any extra condition
+ARCHIVE_TABLES = {
+    "bible_reading": ("reading_date", None),
+    "rosary_prayers": ("prayer_date", None),
+    "sins_confession_log": ("created_at", "confessed = TRUE"),
+}
+
+_TABLE_SCHEMAS = {
+    "bible_reading": schema.BIBLE_READING_TABLE_SCHEMA,
+    "rosary_prayers": schema.ROSARY_PRAYERS_TABLE_SCHEMA,
+    "sins_confession_log": schema.SINS_CONFESSION_LOG_TABLE_SCHEMA,
+}
+
+
+def get_archive_path(database: str = None):
+    """
+    Returns the archive file path for a main database file (default: the app's database).
+    ARCHIVE_NAME only replaces the archive of the app's database.
+    """
+    database = database or connection.DATABASE_NAME
+    if ARCHIVE_NAME and os.path.realpath(database) == os.path.realpath(connection.DATABASE_NAME):
+        return ARCHIVE_NAME
+    base, extension = os.path.splitext(database)
+    return f"{base}_archive{extension or '.db'}"
+
+
+def _main_database_path(conn):
+    """Returns the file of conn's main database, or None for an in-memory one."""
+    for row in conn.execute("PRAGMA database_list").fetchall():
+        if row[1] == "main":
+            return row[2] or None
+    return None
+
+
+def is_attached(conn):
+    return any(row[1] == "archive" for row in conn.execute("PRAGMA database_list").fetchall())
+
+
+def attach_archive(conn, create: bool = False):
+    """
+    ATTACHes the archive file of conn's database to conn as "archive". Returns False if there
+    is no archive file and create is False, or conn's database is in memory (it has no archive).
+    With create=True, the archive tables are created if needed, in a write transaction.
+    """
+    if is_attached(conn):
+        return True
+    database = _main_database_path(conn)
+    if database is None:
+        return False
+    path = get_archive_path(database)
+    if not create and not os.path.exists(path):
+        return False
+    conn.execute("ATTACH DATABASE ? AS archive", (path,))
+    if create:
+        with write_transaction(conn):
+            update_archive_schema(conn)
+    return True
+
+
+def update_archive_schema(conn):
+    """Creates the attached archive's missing tables, columns and indexes."""
+    for table, table_schema in _TABLE_SCHEMAS.items():
+        conn.execute(table_schema.replace(f"EXISTS {table} (", f"EXISTS archive.{table} ("))
+        # Tables of an older main database may have gained columns since the archive was created
+        archive_columns = {row[1] for row in conn.execute(f"PRAGMA archive.table_info({table})").fetchall()}
+        for row in conn.execute(f"PRAGMA main.table_info({table})").fetchall():
+            if row[1] not in archive_columns:
+                conn.execute(f"ALTER TABLE archive.{table} ADD COLUMN {row[1]} {row[2]}")
+        date_column = ARCHIVE_TABLES[table][0]
+        conn.execute(f"CREATE INDEX IF NOT EXISTS archive.idx_archive_{table}_{date_column} ON {table} ({date_column})")
+        # Sync looks up pulled rows by uuid (see sync.py)
+        conn.execute(f"CREATE INDEX IF NOT EXISTS archive.idx_archive_{table}_uuid ON {table} (uuid)")
+        hash_index = f"idx_archive_{table}_content_hash"
+        if not conn.execute("SELECT 1 FROM archive.sqlite_master WHERE name = ?", (hash_index,)).fetchone():
+            # Archives made before the index may hold an entry twice; like the main tables'
+            # backfill, only the first keeps its hash and the others stay for review.
+            conn.execute(f"""
+                UPDATE archive.{table} SET content_hash = NULL
+                WHERE content_hash IS NOT NULL AND id NOT IN (
+                    SELECT MIN(id) FROM archive.{table} WHERE content_hash IS NOT NULL GROUP BY content_hash)
+            """)
+            conn.execute(f"CREATE UNIQUE INDEX archive.{hash_index} ON {table} (content_hash)")
+
+
+def without_archived(conn, table, rows, on_conflict: str = "ignore"):
+    """
+    Returns the rows (built for table's insert SQL, content_hash last) whose entry isn't in
+    the archive attached to conn. Archived entries are left unchanged whatever on_conflict
+    is, except that "error" raises sqlite3.IntegrityError for them like a duplicate in the hot table.
+    """
+    if not rows or not is_attached(conn):
+        return rows
+    archived = set()
+    hashes = [row[-1] for row in rows if row[-1] is not None]
+    for start in range(0, len(hashes), ARCHIVE_BATCH_SIZE):
+        batch = hashes[start:start + ARCHIVE_BATCH_SIZE]
+        archived.update(row[0] for row in conn.execute(
+            f"SELECT content_hash FROM archive.{table} WHERE content_hash IN ({', '.join('?' * len(batch))})", batch))
+    if not archived:
+        return rows
+    if on_conflict == "error":
+        raise sqlite3.IntegrityError(f"UNIQUE constraint failed: archive.{table}.content_hash")
+    return [row for row in rows if row[-1] not in archived]
+
+
+def get_archive_boundary(conn, table):
+    """Returns the date ('YYYY-MM-DD') before which rows of table may be archived, or None."""
+    row = conn.execute("SELECT archived_before FROM archive_state WHERE table_name = ?", (table,)).fetchone()
+    return row[0] if row else None
+
+
+def archive_old_rows(horizon_days: int = None, batch_size: int = None, tables=None):
+    """
+    Moves rows older than horizon_days (default ARCHIVE_HORIZON_DAYS) from the hot tables to
+    the archive file, batch_size rows per transaction. Returns {table: rows moved}.
+    """
+    horizon_days = ARCHIVE_HORIZON_DAYS if horizon_days is None else horizon_days
+    batch_size = batch_size or ARCHIVE_BATCH_SIZE
+    cutoff = (datetime.date.today() - datetime.timedelta(days=horizon_days)).strftime("%Y-%m-%d")
+
+    conn = connection.get_db_connection()
+    moved = {}
+    try:
+        attach_archive(conn, create=True)
+        for table in tables or ARCHIVE_TABLES:
+            date_column, condition = ARCHIVE_TABLES[table]
+            where = f"{date_column} < ?" + (f" AND {condition}" if condition else "")
+            column_names = [row[1] for row in conn.execute(f"PRAGMA main.table_info({table})").fetchall()]
+            columns = ", ".join(column_names)
+            # A row logged again before inserts checked the archive is archived without its hash
+            content_hash = (f"CASE WHEN EXISTS (SELECT 1 FROM archive.{table} AS a WHERE a.content_hash = m.content_hash) "
+                            f"THEN NULL ELSE m.content_hash END")
+            selected = ", ".join(content_hash if column == "content_hash" else f"m.{column}" for column in column_names)
+            moved[table] = 0
+            while True:
+                begin_write(conn)
+                ids = [row[0] for row in conn.execute(
+                    f"SELECT id FROM main.{table} WHERE {where} ORDER BY id LIMIT ?", (cutoff, batch_size))]
+                if not ids:
+                    conn.rollback()
+                    break
+                placeholders = ", ".join("?" * len(ids))
+                conn.execute("INSERT OR REPLACE INTO main.sync_meta (key, value) VALUES ('suppress_changelog', '1')")
+                conn.execute(f"""
+                    INSERT INTO archive.{table} ({columns})
+                    SELECT {selected} FROM main.{table} AS m WHERE m.id IN ({placeholders})
+                """, ids)
+                conn.execute(f"DELETE FROM main.{table} WHERE id IN ({placeholders})", ids)
+                conn.execute("DELETE FROM main.sync_meta WHERE key = 'suppress_changelog'")
+                commit_write(conn)
+                moved[table] += len(ids)
+
+            with write_transaction(conn):
+                boundary = get_archive_boundary(conn, table)
+                conn.execute("""
+                    INSERT INTO archive_state (table_name, archived_before, rows_archived, archived_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(table_name) DO UPDATE SET
+                        archived_before = max(archived_before, excluded.archived_before),
+                        rows_archived = rows_archived + excluded.rows_archived,
+                        archived_at = excluded.archived_at
+                """, (table, max(cutoff, boundary or cutoff), moved[table],
+                      datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return moved
+
+
+def date_range_filters(date_column, start_date=None, end_date=None):
+    """
+    Returns (SQL conditions, parameters) restricting date_column to the inclusive range
+    start_date..end_date ('YYYY-MM-DD'). Works for date and date-time columns and keeps
+    the comparison usable by an index. Raises ValueError for malformed dates.
+    """
+    filters, params = [], []
+    if start_date:
+        datetime.datetime.strptime(start_date, "%Y-%m-%d")
+        filters.append(f"{date_column} >= ?")
+        params.append(start_date)
+    if end_date:
+        day_after = datetime.datetime.strptime(end_date, "%Y-%m-%d").date() + datetime.timedelta(days=1)
+        filters.append(f"{date_column} < ?")
+        params.append(day_after.strftime("%Y-%m-%d"))
+    return filters, params
+
+
+def range_reaches_archive(conn, table, start_date=None, end_date=None):
+    """True if a query for start_date..end_date may need rows from the archive."""
+    if start_date is None and end_date is None:
+        return False
+    boundary = get_archive_boundary(conn, table)
+    return boundary is not None and (start_date is None or start_date < boundary)
+
+
+def build_select_query(table, select_sql, order_by, limit=None, with_archive=False):
+    """
+    Returns the query select_rows runs for select_sql (which reads FROM {table}); with_archive
+    combines the hot and archive tables, and then needs the parameters twice.
+    """
+    if with_archive:
+        query = (f"SELECT * FROM ({select_sql.format(table=f'main.{table}')} "
+                 f"UNION ALL {select_sql.format(table=f'archive.{table}')}) {order_by}")
+    else:
+        query = f"{select_sql.format(table=table)} {order_by}"
+    if limit:
+        query += f" LIMIT {int(limit)}"
+    return query
+
+
+def select_rows(conn, table, select_sql, params, order_by, limit=None, include_archive=False):
+    """
+    Runs select_sql (which reads FROM {table}) against the hot table, or against the hot
+    and archive tables together when include_archive is True and an archive exists.
+    order_by and limit are applied to the combined result.
+    """
+    with_archive = include_archive and attach_archive(conn)
+    if with_archive:
+        params = list(params) * 2
+    return conn.execute(build_select_query(table, select_sql, order_by, limit, with_archive), params).fetchall()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Move old tracker rows to the archive database.")
+    parser.add_argument("--horizon-days", type=int, default=ARCHIVE_HORIZON_DAYS,
+                        help=f"Archive rows older than this many days (default: {ARCHIVE_HORIZON_DAYS})")
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    connection.initialize_database(quiet=True)
+    moved = archive_old_rows(args.horizon_days, args.batch_size)
+    for table, count in moved.items():
+        print(f"{table}: archived {count} row(s)")
+    print(f"Archive: {get_archive_path()}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
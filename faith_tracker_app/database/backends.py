@@ -0,0 +1,107 @@
+# faith_tracker_app/database/backends.py
+"""
+Storage backends for the Bible, Rosary and Sins trackers.
+
+A backend's unit_of_work() returns a context manager exposing .bible, .rosary and
+.sins repositories with the methods of the SQLite repositories (see unit_of_work.py).
+The tracker functions run each call in a unit of work of the configured backend:
+
+- "sqlite" (default): the database file at connection.DATABASE_NAME.
+- "memory": plain Python structures (memory_store.py) that last as long as the
+  process; for demos, ephemeral deployments and tests. Reading plans, the archive,
+  sync and the importer work on the SQLite database only (see require_sqlite).
+
+STORAGE_BACKEND holds a backend name or a StorageBackend instance, and defaults to
+the FAITH_TRACKER_STORAGE environment variable.
+"""
+import os
+
+from faith_tracker_app.database import connection
+from faith_tracker_app.database.unit_of_work import UnitOfWork
+
+STORAGE_BACKEND = os.environ.get("FAITH_TRACKER_STORAGE", "sqlite")
+
+
+class StorageBackend:
+    """Interface of a storage backend."""
+
+    name = None
+
+    def initialize(self, quiet: bool = False):
+        """Prepares the storage for use (e.g. creates tables); safe to call more than once."""
+        raise NotImplementedError
+
+    def unit_of_work(self, write: bool = False):
+        """
+        Returns a new unit of work context manager (see unit_of_work.UnitOfWork);
+        write=True for one that writes.
+        """
+        raise NotImplementedError
+
+
+class SQLiteBackend(StorageBackend):
+    """The SQLite database file at connection.DATABASE_NAME."""
+
+    name = "sqlite"
+
+    def initialize(self, quiet: bool = False):
+        connection.initialize_database(quiet)
+
+    def unit_of_work(self, write: bool = False):
+        return UnitOfWork(write=write)
+
+
+class MemoryBackend(StorageBackend):
+    """A pure-Python store private to this backend instance; nothing is saved."""
+
+    name = "memory"
+
+    def __init__(self):
+        # Imported here because memory_store imports the tracker modules, which import this one
+        from faith_tracker_app.database.memory_store import MemoryStore
+        self.store = MemoryStore()
+
+    def initialize(self, quiet: bool = False):
+        if not quiet:
+            print("Using in-memory storage: entries are kept until the app exits.")
+
+    def unit_of_work(self, write: bool = False):
+        # Units already take turns on the store's lock
+        from faith_tracker_app.database.memory_store import MemoryUnitOfWork
+        return MemoryUnitOfWork(self.store)
+
+
+BACKENDS = {"sqlite": SQLiteBackend, "memory": MemoryBackend}
+
+# One instance per backend name, so the memory store lives as long as the process
+_instances = {}
+
+
+def get_backend(backend=None):
+    """Returns the StorageBackend for a name or instance (default: STORAGE_BACKEND)."""
+    backend = backend or STORAGE_BACKEND
+    if isinstance(backend, StorageBackend):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown storage backend '{backend}'. Choose from: {', '.join(BACKENDS)}.")
+    if backend not in _instances:
+        _instances[backend] = BACKENDS[backend]()
+    return _instances[backend]
+
+
+def require_sqlite(feature: str):
+    """Raises ValueError naming feature unless the configured backend is SQLite."""
+    backend = get_backend()
+    if backend.name != "sqlite":
+        raise ValueError(f"{feature} works on the SQLite database only, not the '{backend.name}' storage backend "
+                         "(see FAITH_TRACKER_STORAGE).")
+
+
+def unit_of_work(conn=None, write: bool = False):
+    """
+    Returns a unit of work on conn (a SQLite connection) if given, else on the configured backend.
+    write=True for a unit that writes (see UnitOfWork).
+    """
+    if conn is not None:
+        return UnitOfWork(conn, write)
+    return get_backend().unit_of_work(write)
@@ -0,0 +1,233 @@
+# faith_tracker_app/database/compression.py
+"""
+Transparent compression of long free-text values (notes, sin descriptions).
+
+The row builders pass these values through compress_text(): text of
+COMPRESSION_THRESHOLD bytes or more is stored as a BLOB holding a small header
+(magic, dictionary id) and raw DEFLATE data, primed with a preset dictionary of
+words common in devotional notes. Shorter text, and text that doesn't shrink,
+stays plain TEXT, so existing rows and short notes read exactly as before. The
+dictionary id lets a better dictionary be added later (see train_dictionary)
+without breaking values written with an older one.
+
+Listings wrap their rows with lazy_row(): a compressed value is decompressed the
+first time it is read (by a formatter, JSON or CSV output), and never if it
+isn't. Listings that don't show notes can leave the column out altogether
+(with_notes=False), which keeps their scans to the small columns.
+
+Run with: python -m faith_tracker_app.database.compression [--rows N] for the size and scan-speed benchmark.
+"""
+import argparse
+import collections
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+import zlib
+
+COMPRESSION_THRESHOLD = 256
+
+_MAGIC = b"\x1fZ"
+
+# Preset dictionaries by id. DEFLATE finds matches best near the end of the dictionary,
+# so the most common words come last.
+DICTIONARIES = {
+    1: (
+        "Scripture passage verse chapter reflection meditation journal examination of conscience "
+        "forgiveness mercy grace peace patience humility charity gratitude temptation repentance "
+        "penance confession absolution sacrament Eucharist Mass adoration novena intention intentions "
+        "family friends work children parents husband wife brother sister neighbour community parish "
+        "Our Father Hail Mary Glory Be Apostles' Creed Hail Holy Queen decade decades "
+        "Joyful Sorrowful Glorious Luminous mysteries Rosary rosary Blessed Virgin Mary Our Lady "
+        "Holy Spirit Jesus Christ the Lord God Father Son prayer prayed praying pray "
+        "today this morning this evening tonight before after during while because about with "
+        "that this what when which would could should have been felt feel I was I am I have I "
+        "the and for to of in my me it is on a "
+    ).encode("utf-8"),
+}
+CURRENT_DICTIONARY = 1
+
+_WBITS = -15  # Raw DEFLATE: the header above replaces zlib's
+
+
+def is_compressed(value):
+    return isinstance(value, bytes) and value[:2] == _MAGIC
+
+
+def compress_text(value, dictionary_id: int = None):
+    """Returns value compressed if it is long text that shrinks, otherwise value unchanged."""
+    if not isinstance(value, str) or len(value) < COMPRESSION_THRESHOLD // 4:
+        return value
+    encoded = value.encode("utf-8")
+    if len(encoded) < COMPRESSION_THRESHOLD:
+        return value
+    dictionary_id = dictionary_id or CURRENT_DICTIONARY
+    compressor = zlib.compressobj(9, zlib.DEFLATED, _WBITS, zdict=DICTIONARIES[dictionary_id])
+    compressed = _MAGIC + bytes([dictionary_id]) + compressor.compress(encoded) + compressor.flush()
+    return compressed if len(compressed) < len(encoded) else value
+
+
+def decompress_text(value):
+    """
+    Returns the text of a value written by compress_text (plain values are returned as they are).
+    Raises ValueError if the value names a dictionary this version doesn't have.
+    """
+    if not is_compressed(value):
+        return value
+    if value[2] not in DICTIONARIES:
+        # e.g. a row synced from a database written with a newer dictionary
+        raise ValueError(f"Compressed text uses dictionary {value[2]}, which this version doesn't have.")
+    decompressor = zlib.decompressobj(_WBITS, zdict=DICTIONARIES[value[2]])
+    return (decompressor.decompress(value[3:]) + decompressor.flush()).decode("utf-8")
+
+
+class LazyTextRow(dict):
+    """
+    A row dictionary holding compressed values, decompressed (once) when first read through
+    [], get(), values(), items() or a copy such as dict(row) or json.dumps().
+    """
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if is_compressed(value):
+            value = decompress_text(value)
+            dict.__setitem__(self, key, value)
+        return value
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    # Overriding __iter__ makes dict(row) and {**row} go through __getitem__ instead of copying raw values
+    def __iter__(self):
+        return dict.__iter__(self)
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+
+def lazy_row(row):
+    """Returns a sqlite3.Row or dictionary as a dictionary; a LazyTextRow if it holds compressed values."""
+    row = dict(row)
+    if any(is_compressed(value) for value in row.values()):
+        return LazyTextRow(row)
+    return row
+
+
+def text_row(row):
+    """Returns a sqlite3.Row or dictionary as a plain dictionary with every value decompressed."""
+    return {key: decompress_text(value) for key, value in dict(row).items()}
+
+
+def train_dictionary(samples, size: int = 2048):
+    """
+    Builds a preset dictionary of up to size bytes from sample texts: their most frequent
+    words and word pairs, the most frequent last. Add it to DICTIONARIES under a new id.
+    """
+    counts = collections.Counter()
+    for sample in samples:
+        words = re.findall(r"[\w']+", sample)
+        counts.update(words)
+        counts.update(" ".join(pair) for pair in zip(words, words[1:]))
+    chosen, total = [], 0
+    for text, count in counts.most_common():
+        # A string is only worth a place if it repeats and is longer than a back-reference
+        if count < 2 or len(text) < 3:
+            continue
+        encoded = text.encode("utf-8") + b" "
+        if total + len(encoded) > size:
+            break
+        chosen.append(encoded)
+        total += len(encoded)
+    return b"".join(reversed(chosen))
+
+
+# Sentences the benchmark builds journal-length notes from
+_BENCHMARK_SENTENCES = [
+    "Prayed the Rosary with the family after dinner and offered a decade for my brother's job search.",
+    "Today's reading made me think about patience at work; I was short with a colleague this morning.",
+    "Felt distracted during the Sorrowful mysteries but returned to the intention for our parish.",
+    "Grateful for the grace of confession on Saturday and the peace that came afterwards.",
+    "The Lord's mercy in this chapter is striking: He waits for the prodigal son before he even repents.",
+    "Meditated on the Visitation and how Mary went in haste to serve her cousin Elizabeth.",
+    "Resolution for tomorrow: pray before checking my phone and be gentle with the children.",
+]
+
+
+def _benchmark_note(i):
+    count = 6 + i % 10
+    return " ".join(_BENCHMARK_SENTENCES[(i + k * 3) % len(_BENCHMARK_SENTENCES)] for k in range(count))
+
+
+def run_benchmark(rows: int = 20000):
+    """
+    Fills temporary databases with Bible readings carrying journal-length notes, stored plainly,
+    compressed, and compressed with a dictionary trained on them. Returns per variant the file
+    size and the best of three timings of a full listing without notes and of one that reads every note.
+    """
+    # Imported here because bible_tracker's row builder uses this module
+    from faith_tracker_app.bible import bible_tracker
+    from faith_tracker_app.database import connection
+
+    notes = [_benchmark_note(i) for i in range(rows)]
+    trained = train_dictionary(notes[:500])
+    DICTIONARIES[255] = trained
+    variants = {"plain": lambda note: note, "compressed": compress_text,
+                "compressed, trained dictionary": lambda note: compress_text(note, 255)}
+    results = {}
+    original_database_name = connection.DATABASE_NAME
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for label, encode in variants.items():
+                connection.DATABASE_NAME = os.path.join(tmp_dir, f"{len(results)}.db")
+                connection.initialize_database(quiet=True)
+                conn = sqlite3.connect(connection.DATABASE_NAME)
+                rows_built = []
+                for i, note in enumerate(notes):
+                    row = bible_tracker.build_reading_row("Psalms", i % 150 + 1, reading_date=f"2020-01-01 00:00:{i % 60:02d}")
+                    rows_built.append(row[:5] + (encode(note),) + row[6:7] + (f"{i:032x}",))
+                conn.executemany(bible_tracker.INSERT_READING_SQL, rows_built)
+                conn.commit()
+                conn.close()
+
+                timings = {}
+                for with_notes in (False, True):
+                    query, params, order_by = bible_tracker.BibleRepository.list_query(with_notes=with_notes)
+                    query = f"{query.format(table='bible_reading')} {order_by}"
+                    conn = connection.get_db_connection()
+                    best = None
+                    for _ in range(3):
+                        started = time.perf_counter()
+                        listed = [lazy_row(row) for row in conn.execute(query, params)]
+                        if with_notes:
+                            # As a formatter would, reading every note
+                            sum(len(row["notes"]) for row in listed)
+                        elapsed = time.perf_counter() - started
+                        best = elapsed if best is None else min(best, elapsed)
+                    timings[with_notes] = best
+                    conn.close()
+                results[label] = {"file_size": os.path.getsize(connection.DATABASE_NAME),
+                                  "list_without_notes": round(timings[False], 4),
+                                  "list_with_notes": round(timings[True], 4)}
+    finally:
+        connection.DATABASE_NAME = original_database_name
+        DICTIONARIES.pop(255, None)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark note compression: database size and listing speed.")
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args(argv)
+    for label, result in run_benchmark(args.rows).items():
+        print(f"{label}: {result['file_size'] / 1024:.0f} KiB, listing without notes {result['list_without_notes']}s, "
+              f"with notes {result['list_with_notes']}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,274 @@
+# faith_tracker_app/database/concurrency.py
+"""
+Writers in several processes at once: the CLI, an import, a sync and the API can
+all write the same database file.
+
+SQLite lets one connection write at a time. A writer that can't get the lock
+within the busy timeout fails with "database is locked", and a transaction that
+starts deferred, reads, and then writes can be refused at once, because waiting
+could deadlock. Write transactions therefore start with begin_write(),
+which runs BEGIN IMMEDIATE to take the write lock up front. While another
+connection holds it, SQLite waits up to LOCK_TIMEOUT, and begin_write() retries
+after a random delay of up to RETRY_BASE_DELAY * 2 ** attempt (capped at
+RETRY_MAX_DELAY); the jitter keeps waiting writers from retrying in lockstep.
+It gives up once it has retried RETRY_ATTEMPTS times and WRITE_TIMEOUT seconds
+have passed, so a writer waits at least as long as the connection's 5 s busy
+timeout let it before, and at most about WRITE_TIMEOUT + RETRY_MAX_DELAY +
+LOCK_TIMEOUT (6.1 s). Once the lock is held no statement in the transaction is
+refused for it, so the work itself never has to be replayed; commit_write()
+retries a COMMIT that has to wait for readers the same way. When the retries
+run out the OperationalError is raised, as before.
+
+Every process keeps counters of its write transactions (get_write_metrics):
+how many began and committed, how many attempts were retried, how long was
+spent waiting for the lock, and how many gave up.
+
+run_stress_test() starts processes that write through all three trackers at
+once and checks that no write was lost.
+
+Run with: python -m faith_tracker_app.database.concurrency [--processes N ...] [--writes N]
+"""
+import argparse
+import datetime
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from faith_tracker_app.database import connection
+
+# SQLite's own wait for the lock in each attempt, in seconds
+LOCK_TIMEOUT = 0.1
+RETRY_ATTEMPTS = 12
+RETRY_BASE_DELAY = 0.005
+RETRY_MAX_DELAY = 1.0
+# Seconds a writer keeps retrying for at least, as long as the busy timeout it had before
+WRITE_TIMEOUT = 5.0
+
+
+class WriteMetrics:
+    """Counters of this process's write transactions; see get_write_metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.began = 0
+            self.committed = 0
+            self.retries = 0
+            self.gave_up = 0
+            self.lock_wait = 0.0
+            self.max_lock_wait = 0.0
+
+    def record(self, counter: str, waited: float, retries: int):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+            self.retries += retries
+            self.lock_wait += waited
+            self.max_lock_wait = max(self.max_lock_wait, waited)
+
+    def snapshot(self):
+        with self._lock:
+            return {"began": self.began, "committed": self.committed, "retries": self.retries,
+                    "gave_up": self.gave_up, "lock_wait": round(self.lock_wait, 4),
+                    "max_lock_wait": round(self.max_lock_wait, 4)}
+
+
+METRICS = WriteMetrics()
+
+
+def get_write_metrics():
+    """
+    Returns this process's write counters: {"began", "committed", "retries", "gave_up",
+    "lock_wait" (seconds in total), "max_lock_wait" (seconds, one statement)}.
+    """
+    return METRICS.snapshot()
+
+
+def reset_write_metrics():
+    METRICS.reset()
+
+
+def is_lock_error(error):
+    """Returns whether an OperationalError means another connection holds a lock (SQLITE_BUSY)."""
+    message = str(error)
+    return "database is locked" in message or "database is busy" in message
+
+
+def _execute_with_retry(conn, run, counter):
+    """Runs run() until it gets past the lock (see the module docstring); records it under counter."""
+    previous_timeout = conn.execute("PRAGMA busy_timeout").fetchone()[0]
+    conn.execute(f"PRAGMA busy_timeout = {int(LOCK_TIMEOUT * 1000)}")
+    started = time.monotonic()
+    attempt = 0
+    try:
+        while True:
+            try:
+                run()
+                break
+            except sqlite3.OperationalError as e:
+                if not is_lock_error(e):
+                    raise
+                if attempt >= RETRY_ATTEMPTS and time.monotonic() - started >= WRITE_TIMEOUT:
+                    METRICS.record("gave_up", time.monotonic() - started, attempt)
+                    raise
+            time.sleep(random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)))
+            attempt += 1
+    finally:
+        conn.execute(f"PRAGMA busy_timeout = {previous_timeout}")
+    METRICS.record(counter, time.monotonic() - started, attempt)
+
+
+def begin_write(conn):
+    """
+    Starts a write transaction on conn with BEGIN IMMEDIATE, retrying while another connection
+    writes. Raises sqlite3.OperationalError if the lock can't be had, or conn is already in a transaction.
+    """
+    _execute_with_retry(conn, lambda: conn.execute("BEGIN IMMEDIATE"), "began")
+
+
+def commit_write(conn):
+    """Commits conn's transaction, retrying while readers keep it from finishing. Nothing to do outside a transaction."""
+    if conn.in_transaction:
+        _execute_with_retry(conn, conn.commit, "committed")
+
+
+@contextmanager
+def write_transaction(conn):
+    """Runs the block in a write transaction on conn: begin_write, then commit_write, or a rollback if it raises."""
+    begin_write(conn)
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    commit_write(conn)
+
+
+def _stress_worker(database, worker, writes, start, results):
+    """
+    Writes through the three trackers' functions once every worker is ready (start, a barrier);
+    puts (worker, failed calls, metrics) on results.
+    """
+    # Imported here because the tracker modules import this one (through unit_of_work)
+    from faith_tracker_app.bible import bible_tracker
+    from faith_tracker_app.database import concurrency
+    from faith_tracker_app.rosary import rosary_tracker
+    from faith_tracker_app.sins import sins_tracker
+
+    # This module may be running as __main__; the trackers record into the package's copy
+    connection.DATABASE_NAME = database
+    concurrency.reset_write_metrics()
+    failed = 0
+    first_day = datetime.date(2000, 1, 1) + datetime.timedelta(days=worker * writes)
+    start.wait()
+    # The tracker functions print each write; only the counts matter here
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            for i in range(writes):
+                if i % 3 == 0:
+                    result = bible_tracker.add_bible_reading("Psalms", i % 150 + 1, i + 1, i + 1 + worker,
+                                                             notes=f"worker {worker}")
+                elif i % 3 == 1:
+                    result = rosary_tracker.log_rosary_prayer(str(first_day + datetime.timedelta(days=i)))
+                else:
+                    entry_id = sins_tracker.add_sin_entry(f"Stress {worker}-{i}", str(first_day))
+                    result = entry_id and (i % 2 == 0 or sins_tracker.mark_sin_as_confessed(entry_id, str(first_day)))
+                failed += not result
+        finally:
+            sys.stdout = stdout
+    results.put((worker, failed, concurrency.get_write_metrics()))
+
+
+def run_stress_test(processes: int = 4, writes: int = 150, database: str = None):
+    """
+    Runs processes workers at once, each making writes tracker writes (readings, prayers,
+    sins, half of them then confessed) on database (default: a new temporary file).
+    Returns {"processes", "writes", "failed", "lost", "seconds", "writes_per_second", "metrics"}.
+    lost counts the writes that are missing from the database, seconds is the time from the workers'
+    common start until the last finished, and metrics adds up the workers'.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database = database or os.path.join(tmp_dir, "stress.db")
+        original_database_name = connection.DATABASE_NAME
+        try:
+            connection.DATABASE_NAME = database
+            connection.initialize_database(quiet=True)
+        finally:
+            connection.DATABASE_NAME = original_database_name
+        counts_before = _stress_counts(database)
+
+        context = multiprocessing.get_context("spawn")
+        start, results = context.Barrier(processes + 1), context.Queue()
+        workers = [context.Process(target=_stress_worker, args=(database, worker, writes, start, results))
+                   for worker in range(processes)]
+        for process in workers:
+            process.start()
+        # Process start-up (imports) isn't part of the timing
+        start.wait()
+        started = time.perf_counter()
+        reports = [results.get() for _ in workers]
+        for process in workers:
+            process.join()
+        seconds = time.perf_counter() - started
+
+        # What every worker wrote, by the same rule as _stress_worker
+        sins = sum(1 for i in range(writes) if i % 3 == 2)
+        expected = {"bible_reading": sum(1 for i in range(writes) if i % 3 == 0) * processes,
+                    "rosary_prayers": sum(1 for i in range(writes) if i % 3 == 1) * processes,
+                    "sins_confession_log": sins * processes,
+                    "confessed": sum(1 for i in range(writes) if i % 3 == 2 and i % 2) * processes}
+        counts = _stress_counts(database)
+        lost = sum(max(0, expected[key] - (counts[key] - counts_before[key])) for key in expected)
+
+    metrics = {}
+    for _, _, worker_metrics in reports:
+        for key, value in worker_metrics.items():
+            metrics[key] = max(metrics.get(key, 0), value) if key == "max_lock_wait" else metrics.get(key, 0) + value
+    metrics["lock_wait"] = round(metrics.get("lock_wait", 0.0), 4)
+    total_writes = processes * writes
+    return {"processes": processes, "writes": total_writes, "failed": sum(report[1] for report in reports),
+            "lost": lost, "seconds": round(seconds, 3), "writes_per_second": round(total_writes / seconds, 1),
+            "metrics": metrics}
+
+
+def _stress_counts(database):
+    conn = sqlite3.connect(database)
+    try:
+        counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                  for table in ("bible_reading", "rosary_prayers", "sins_confession_log")}
+        counts["confessed"] = conn.execute("SELECT COUNT(*) FROM sins_confession_log WHERE confessed").fetchone()[0]
+        return counts
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stress test concurrent writers from several processes.")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="Numbers of writer processes to try (default: 1 2 4 8)")
+    parser.add_argument("--writes", type=int, default=150, help="Writes per process (default: 150)")
+    args = parser.parse_args(argv)
+
+    lost = 0
+    for processes in args.processes:
+        result = run_stress_test(processes, args.writes)
+        metrics = result["metrics"]
+        print(f"{processes} process(es): {result['writes']} writes in {result['seconds']}s "
+              f"({result['writes_per_second']}/s), {result['failed']} failed, {result['lost']} lost; "
+              f"{metrics['retries']} retries, {metrics['lock_wait']}s waiting for the lock "
+              f"(longest {metrics['max_lock_wait']}s), {metrics['gave_up']} gave up")
+        lost += result["lost"] + result["failed"]
+    return 1 if lost else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
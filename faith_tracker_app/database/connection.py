@@ -1,28 +1,82 @@
 # faith_tracker_app/database/connection.py
+import hashlib
 import sqlite3
 import os
 
 DATABASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATABASE_NAME = os.path.join(DATABASE_DIR, "faith_tracker.db")
 
+def natural_key_hash(*values):
+    """Returns the content_hash of a natural key (see schema.NATURAL_KEYS). NULL and '' hash alike."""
+    key = "\x1f".join("" if value is None else str(value) for value in values)
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+def separate_entry_row(row):
+    """
+    Returns an insert row (uuid and content_hash last) keyed apart from the entries with
+    its natural key: its content_hash also covers its uuid.
+    """
+    return row[:-1] + (natural_key_hash(row[-1], row[-2]),)
+
+def register_functions(conn):
+    """Registers the SQL functions the schema's triggers and backfills use on conn."""
+    conn.create_function("natural_key_hash", -1, natural_key_hash, deterministic=True)
+
 def get_db_connection():
     """Establishes and returns a database connection."""
     conn = sqlite3.connect(DATABASE_NAME)
     conn.row_factory = sqlite3.Row # Allows accessing columns by name
+    register_functions(conn)
     return conn
 
-def initialize_database():
+FIND_BY_CONTENT_HASH_SQL = "SELECT id FROM {table} WHERE content_hash = ?"
+
+def find_id_by_content_hash(conn, table_name, content_hash):
+    """Returns the id of the row of table_name with content_hash, or None."""
+    row = conn.execute(FIND_BY_CONTENT_HASH_SQL.format(table=table_name), (content_hash,)).fetchone()
+    return row[0] if row else None
+
+def apply_column_migrations(cursor):
+    """
+    Adds columns from schema.COLUMN_MIGRATIONS that an existing database file is missing.
+    Tables that don't exist yet are skipped; they are created with all columns by
+    ALL_TABLE_SCHEMAS. Returns the backfill queries to run once the schema is complete.
+    """
+    from .schema import COLUMN_MIGRATIONS
+
+    backfills = []
+    for table, column, definition, backfill in COLUMN_MIGRATIONS:
+        existing = [row[1] for row in cursor.execute(f"PRAGMA table_info({table})").fetchall()]
+        if existing and column not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            if backfill:
+                backfills.append(backfill)
+    return backfills
+
+def initialize_database(quiet: bool = False):
     """Initializes the database with the defined schema if it doesn't exist."""
     # Import schemas here to avoid circular imports if schema.py needs connection
     from .schema import ALL_TABLE_SCHEMAS
 
     conn = get_db_connection()
     cursor = conn.cursor()
+    # Only takes effect on a new, empty file; lets maintenance return free pages without a full VACUUM
+    cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    # Existing files must gain any new columns before indexes on them are created
+    backfills = apply_column_migrations(cursor)
     for schema_query in ALL_TABLE_SCHEMAS:
         cursor.execute(schema_query)
+    for backfill in backfills:
+        cursor.execute(backfill)
     conn.commit()
+    # An archive made by an earlier version gains what the archive tables have since gained
+    from .archive import attach_archive, update_archive_schema
+    if attach_archive(conn):
+        update_archive_schema(conn)
+        conn.commit()
     conn.close()
-    print(f"Database at {DATABASE_NAME} initialized/verified.")
+    if not quiet:
+        print(f"Database at {DATABASE_NAME} initialized/verified.")
 
 if __name__ == '__main__':
     # This will create and initialize the DB when this script is run directly
@@ -0,0 +1,327 @@
+# faith_tracker_app/database/importer.py
+"""
+Bulk importer for large historical CSV files (e.g. exported spreadsheets).
+
+The file is read in chunks of lines. Worker processes parse and validate each
+chunk with the same row builders the trackers use (dates, verse ranges), and a
+single writer in this process applies the validated rows with executemany, one
+transaction per chunk. Rows whose natural key is already in the database are
+skipped (or have their notes updated), so re-importing a file adds nothing
+twice. Each transaction also advances the file's row in import_checkpoints, so
+an interrupted import resumes after the last committed chunk without importing
+anything twice.
+
+The first line is a header naming the columns; see IMPORT_KINDS for the columns
+of each kind. Quoted fields may not contain line breaks.
+
+Run with: python -m faith_tracker_app.database.importer FILE --kind {bible,rosary,sins} [--workers N]
+      or: python -m faith_tracker_app.database.importer --benchmark ROWS
+"""
+import argparse
+import collections
+import concurrent.futures
+import contextlib
+import csv
+import datetime
+import itertools
+import os
+import sys
+import tempfile
+import time
+
+from faith_tracker_app.bible import bible_tracker
+from faith_tracker_app.bible.books import CHAPTER_COUNTS
+from faith_tracker_app.database import archive, connection
+from faith_tracker_app.database.concurrency import begin_write, commit_write, write_transaction
+from faith_tracker_app.database.schema import upsert_sql
+from faith_tracker_app.rosary import rosary_tracker
+from faith_tracker_app.sins import sins_tracker
+
+# Data lines per chunk; each chunk is validated by one worker and committed in one transaction
+CHUNK_LINES = 20000
+
+# Validation errors kept in the summary (all of them are counted)
+MAX_REPORTED_ERRORS = 100
+
+
+def _to_int(value, field_name):
+    if value is None or not value.strip():
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Invalid {field_name}: must be a whole number.")
+
+
+def _required(fields, field_name):
+    value = (fields.get(field_name) or "").strip()
+    if not value:
+        raise ValueError(f"{field_name} is required.")
+    return value
+
+
+def _build_bible_row(fields):
+    return bible_tracker.build_reading_row(
+        _required(fields, "book"), _to_int(fields.get("chapter"), "chapter"),
+        _to_int(fields.get("start_verse"), "start_verse"), _to_int(fields.get("end_verse"), "end_verse"),
+        fields.get("notes") or None, _required(fields, "reading_date"))
+
+
+def _build_rosary_row(fields):
+    # Imported history keeps what was recorded; the weekday schedule is not filled in
+    return rosary_tracker.build_rosary_row(_required(fields, "prayer_date"), fields.get("mysteries") or None,
+                                           fields.get("notes") or None, default_mysteries=False)
+
+
+def _build_sin_row(fields):
+    return sins_tracker.build_sin_row(_required(fields, "sin_description"), fields.get("occurrence_date") or None,
+                                      fields.get("notes") or None)
+
+
+# Table each kind of entry is imported into
+IMPORT_TABLES = {"bible": "bible_reading", "rosary": "rosary_prayers", "sins": "sins_confession_log"}
+
+# kind: (insert SQL, row builder from a {column: value} dict, required columns, after_write(conn, rows) or None)
+IMPORT_KINDS = {
+    "bible": (bible_tracker.INSERT_READING_SQL, _build_bible_row, ("book", "chapter", "reading_date"),
+              bible_tracker.record_readings_progress),
+    "rosary": (rosary_tracker.INSERT_ROSARY_SQL, _build_rosary_row, ("prayer_date",), None),
+    "sins": (sins_tracker.INSERT_SIN_SQL, _build_sin_row, ("sin_description",), None),
+}
+
+
+def validate_chunk(kind, header, first_line_number, lines):
+    """
+    Parses and validates a chunk of CSV lines (runs in a worker process). Each line is parsed
+    on its own, so a malformed line (csv.Error) is reported like an invalid row.
+    Returns (number of lines, valid rows for the kind's insert SQL, [(line number, error)]).
+    """
+    build_row = IMPORT_KINDS[kind][1]
+    rows, errors = [], []
+    for offset, line in enumerate(lines):
+        try:
+            record = next(csv.reader((line,)), [])
+            if not any(value.strip() for value in record):
+                continue
+            rows.append(build_row(dict(zip(header, record))))
+        except csv.Error as e:
+            errors.append((first_line_number + offset, f"Malformed CSV line: {e}."))
+        except ValueError as e:
+            errors.append((first_line_number + offset, str(e)))
+    return len(lines), rows, errors
+
+
+def _read_chunks(f, chunk_lines, first_line_number):
+    while True:
+        lines = list(itertools.islice(f, chunk_lines))
+        if not lines:
+            return
+        yield first_line_number, lines
+        first_line_number += len(lines)
+
+
+def _validated_chunks(kind, header, chunks, workers):
+    """Yields validate_chunk results in file order, keeping at most two chunks per worker in flight."""
+    if workers <= 1:
+        for first_line_number, lines in chunks:
+            yield validate_chunk(kind, header, first_line_number, lines)
+        return
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = collections.deque()
+        for first_line_number, lines in chunks:
+            pending.append(pool.submit(validate_chunk, kind, header, first_line_number, lines))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _load_checkpoint(conn, source, kind, file_size, restart):
+    row = conn.execute("SELECT * FROM import_checkpoints WHERE source = ?", (source,)).fetchone()
+    if row is not None and not restart:
+        if row["kind"] != kind:
+            raise ValueError(f"{source} was imported as {row['kind']} entries, not {kind}.")
+        if row["file_size"] != file_size:
+            raise ValueError(f"{source} has changed since it was imported; use restart to import it from the beginning.")
+        return dict(row)
+    checkpoint = {"source": source, "kind": kind, "file_size": file_size, "lines_done": 0,
+                  "rows_imported": 0, "rows_failed": 0, "rows_duplicate": 0, "completed": False}
+    with write_transaction(conn):
+        _save_checkpoint(conn, checkpoint)
+    return checkpoint
+
+
+def _save_checkpoint(conn, checkpoint):
+    conn.execute("""
+        INSERT OR REPLACE INTO import_checkpoints
+            (source, kind, file_size, lines_done, rows_imported, rows_failed, rows_duplicate, completed, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, (checkpoint["source"], checkpoint["kind"], checkpoint["file_size"], checkpoint["lines_done"],
+          checkpoint["rows_imported"], checkpoint["rows_failed"], checkpoint["rows_duplicate"], checkpoint["completed"],
+          datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+
+
+def import_file(path: str, kind: str, workers: int = None, chunk_lines: int = None, restart: bool = False,
+                progress=None, on_conflict: str = "ignore"):
+    """
+    Imports a CSV file of kind entries ("bible", "rosary" or "sins"), resuming after the last
+    committed chunk of an earlier, interrupted import of the same file. restart=True imports the
+    file from the beginning again; rows it already imported are then duplicates.
+    on_conflict is "ignore" (skip entries already in the database) or "update" (replace their notes).
+    workers defaults to the number of CPUs; 1 validates in this process.
+    progress(summary) is called after each committed chunk.
+    Returns a summary dictionary: lines, imported, duplicates, failed, errors (the first MAX_REPORTED_ERRORS
+    as (line number, message)), resumed_from (data lines skipped) and seconds.
+    Raises ValueError for an unknown kind, missing columns or a changed file.
+    """
+    if kind not in IMPORT_KINDS:
+        raise ValueError(f"Unknown import kind '{kind}'. Choose from: {', '.join(IMPORT_KINDS)}.")
+    if on_conflict not in ("ignore", "update"):
+        raise ValueError("on_conflict must be 'ignore' or 'update' for imports.")
+    insert_sql, _, required_columns, after_write = IMPORT_KINDS[kind]
+    insert_sql = upsert_sql(insert_sql, on_conflict)
+    workers = workers or os.cpu_count() or 1
+    chunk_lines = chunk_lines or CHUNK_LINES
+    source = os.path.abspath(path)
+    started = time.monotonic()
+
+    conn = connection.get_db_connection()
+    try:
+        # Entries that have been archived since an earlier import are duplicates too
+        archive.attach_archive(conn)
+        with open(source, newline="", encoding="utf-8-sig") as f:
+            header = [column.strip().lower() for column in next(csv.reader([f.readline()]), [])]
+            missing = [column for column in required_columns if column not in header]
+            if missing:
+                raise ValueError(f"{source} is missing column(s): {', '.join(missing)}.")
+
+            checkpoint = _load_checkpoint(conn, source, kind, os.path.getsize(source), restart)
+            summary = {"lines": checkpoint["lines_done"], "imported": checkpoint["rows_imported"],
+                       "duplicates": checkpoint["rows_duplicate"], "failed": checkpoint["rows_failed"], "errors": [],
+                       "resumed_from": checkpoint["lines_done"], "seconds": 0.0}
+            if checkpoint["completed"]:
+                return summary
+
+            for _ in itertools.islice(f, checkpoint["lines_done"]):
+                pass
+            # Line numbers count the header as line 1
+            chunks = _read_chunks(f, chunk_lines, checkpoint["lines_done"] + 2)
+            for line_count, rows, errors in _validated_chunks(kind, header, chunks, workers):
+                # A row already in the database costs one probe of the content_hash index
+                begin_write(conn)
+                applied = conn.executemany(insert_sql, archive.without_archived(conn, IMPORT_TABLES[kind], rows)).rowcount
+                if after_write:
+                    after_write(conn, rows)
+                checkpoint["lines_done"] += line_count
+                checkpoint["rows_imported"] += applied
+                checkpoint["rows_duplicate"] += len(rows) - applied
+                checkpoint["rows_failed"] += len(errors)
+                _save_checkpoint(conn, checkpoint)
+                commit_write(conn)
+
+                summary.update(lines=checkpoint["lines_done"], imported=checkpoint["rows_imported"],
+                               duplicates=checkpoint["rows_duplicate"], failed=checkpoint["rows_failed"],
+                               seconds=round(time.monotonic() - started, 3))
+                summary["errors"].extend(errors[:MAX_REPORTED_ERRORS - len(summary["errors"])])
+                if progress:
+                    progress(summary)
+
+        checkpoint["completed"] = True
+        with write_transaction(conn):
+            _save_checkpoint(conn, checkpoint)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    summary["seconds"] = round(time.monotonic() - started, 3)
+    return summary
+
+
+def _print_progress(summary):
+    rate = (summary["lines"] - summary["resumed_from"]) / summary["seconds"] if summary["seconds"] else 0
+    print(f"\r{summary['lines']} lines, {summary['imported']} imported, {summary['failed']} failed "
+          f"({rate:,.0f} lines/s)", end="", file=sys.stderr, flush=True)
+
+
+def write_benchmark_file(path: str, rows: int):
+    """Writes a synthetic Bible reading CSV with rows data lines, about 1% of them invalid."""
+    books = list(CHAPTER_COUNTS.items())
+    day = datetime.date(2000, 1, 1)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["book", "chapter", "start_verse", "end_verse", "reading_date", "notes"])
+        for i in range(rows):
+            book, chapters = books[i % len(books)]
+            start_verse = i % 20 + 1
+            end_verse = start_verse + 5 if i % 100 else start_verse - 1  # Reversed range, rejected
+            reading_date = (day + datetime.timedelta(days=i // 10)).strftime("%Y-%m-%d")
+            writer.writerow([book, i % chapters + 1, start_verse, end_verse, reading_date, f"Imported reading {i}"])
+
+
+def run_benchmark(rows: int = 200000, workers: int = None, single_row_sample: int = 2000):
+    """
+    Measures import throughput into temporary databases: the add_bible_reading loop on a sample,
+    then import_file with one worker and with workers processes. Returns {label: rows per second}.
+    """
+    results = {}
+    original_database_name = connection.DATABASE_NAME
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_path = os.path.join(tmp_dir, "readings.csv")
+        write_benchmark_file(data_path, rows)
+        try:
+            connection.DATABASE_NAME = os.path.join(tmp_dir, "single_row.db")
+            connection.initialize_database(quiet=True)
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(open(os.devnull, "w")):
+                for i in range(single_row_sample):
+                    bible_tracker.add_bible_reading("Genesis", i % 50 + 1, 1, 5, f"Reading {i}")
+            results["add_bible_reading"] = single_row_sample / (time.perf_counter() - started)
+
+            for label, worker_count in (("import, 1 worker", 1), (f"import, {workers or os.cpu_count()} workers", workers)):
+                connection.DATABASE_NAME = os.path.join(tmp_dir, f"import_{worker_count}.db")
+                connection.initialize_database(quiet=True)
+                summary = import_file(data_path, "bible", workers=worker_count)
+                results[label] = summary["lines"] / summary["seconds"]
+        finally:
+            connection.DATABASE_NAME = original_database_name
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import a large CSV file of tracker entries.")
+    parser.add_argument("file", nargs="?", help="CSV file with a header line")
+    parser.add_argument("--kind", choices=sorted(IMPORT_KINDS), help="Kind of entries in the file")
+    parser.add_argument("--workers", type=int, help="Validation processes (default: number of CPUs)")
+    parser.add_argument("--chunk-lines", type=int, default=CHUNK_LINES,
+                        help=f"Lines per chunk and transaction (default: {CHUNK_LINES})")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint of an earlier import")
+    parser.add_argument("--on-conflict", choices=["ignore", "update"], default="ignore",
+                        help="Entries already in the database: skip them (default) or update their notes")
+    parser.add_argument("--benchmark", type=int, metavar="ROWS", help="Measure throughput on ROWS synthetic rows")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        for label, rate in run_benchmark(args.benchmark, args.workers).items():
+            print(f"{label}: {rate:,.0f} rows/s")
+        return 0
+    if not args.file or not args.kind:
+        parser.error("FILE and --kind are required unless --benchmark is given")
+
+    connection.initialize_database(quiet=True)
+    try:
+        summary = import_file(args.file, args.kind, args.workers, args.chunk_lines, args.restart, _print_progress,
+                              args.on_conflict)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(file=sys.stderr)
+    for line_number, message in summary["errors"]:
+        print(f"Line {line_number}: {message}", file=sys.stderr)
+    print(f"Imported {summary['imported']} {args.kind} entries ({summary['duplicates']} already present, "
+          f"{summary['failed']} invalid lines) in {summary['seconds']}s.")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
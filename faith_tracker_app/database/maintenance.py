@@ -0,0 +1,270 @@
+# faith_tracker_app/database/maintenance.py
+"""
+Online backup and routine database maintenance.
+
+backup_database copies the database with the sqlite3 backup API a few pages at
+a time, sleeping between steps, so the app can keep writing while a backup runs.
+
+run_maintenance runs the tasks in MAINTENANCE_TASKS that are due (statistics
+refresh, incremental vacuum, integrity check, confession backlog check) within
+a time budget. A progress handler interrupts a task that would overrun the
+budget; an interrupted task is not marked complete, so it is attempted again on
+the next run. File size and free-page statistics are reported before and after.
+
+Run with: python -m faith_tracker_app.database.maintenance [--budget SECONDS] [--force] [--backup [PATH]]
+"""
+import argparse
+import datetime
+import os
+import sqlite3
+import sys
+import time
+
+from faith_tracker_app.database import connection
+from faith_tracker_app.database.concurrency import write_transaction
+from faith_tracker_app.sins import backlog
+
+# Pages copied per backup step, and the pause between steps that lets writers in
+BACKUP_PAGES_PER_STEP = 256
+BACKUP_STEP_SLEEP = 0.005
+
+DEFAULT_TIME_BUDGET = 2.0
+
+# Pages released per incremental vacuum step, committed separately
+INCREMENTAL_VACUUM_PAGES = 256
+
+# Rows examined per table by ANALYZE; keeps statistics refreshes fast on large tables
+ANALYSIS_LIMIT = 400
+
+# SQLite virtual machine instructions between budget checks
+_PROGRESS_INTERVAL = 1000
+
+
+def get_database_stats(path: str = None):
+    """Returns file size, page and free-page statistics for a database file (default: the app's)."""
+    path = path or connection.DATABASE_NAME
+    conn = sqlite3.connect(path)
+    try:
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        freelist_count = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    finally:
+        conn.close()
+    return {
+        "file_size": os.path.getsize(path) if os.path.exists(path) else 0,
+        "page_size": page_size,
+        "page_count": page_count,
+        "freelist_count": freelist_count,
+        "free_bytes": freelist_count * page_size,
+        "auto_vacuum": {0: "none", 1: "full", 2: "incremental"}.get(auto_vacuum, str(auto_vacuum)),
+    }
+
+
+def format_stats_for_display(stats: dict):
+    """Formats a get_database_stats dictionary for display."""
+    return (f"{stats['file_size'] / 1024:.1f} KiB, {stats['page_count']} pages of {stats['page_size']} bytes, "
+            f"{stats['freelist_count']} free ({stats['free_bytes'] / 1024:.1f} KiB), auto_vacuum={stats['auto_vacuum']}")
+
+
+def default_backup_path():
+    """Returns a timestamped path in a "backups" directory next to the database."""
+    base = os.path.splitext(os.path.basename(connection.DATABASE_NAME))[0]
+    directory = os.path.join(os.path.dirname(os.path.abspath(connection.DATABASE_NAME)), "backups")
+    return os.path.join(directory, f"{base}-{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}.db")
+
+
+def backup_database(destination: str = None, pages_per_step: int = None, step_sleep: float = None, progress=None):
+    """
+    Copies the live database to destination (default: default_backup_path()) without blocking
+    writers for longer than one step. The copy is written to a temporary file and renamed into
+    place once complete. progress(status, remaining, total) is called after each step.
+    Returns a dictionary with the backup path, pages copied and seconds taken.
+    """
+    destination = destination or default_backup_path()
+    pages_per_step = pages_per_step or BACKUP_PAGES_PER_STEP
+    step_sleep = BACKUP_STEP_SLEEP if step_sleep is None else step_sleep
+    os.makedirs(os.path.dirname(os.path.abspath(destination)), exist_ok=True)
+    partial = destination + ".partial"
+
+    started = time.monotonic()
+    pages = 0
+
+    def on_step(status, remaining, total):
+        nonlocal pages
+        pages = total
+        if progress:
+            progress(status, remaining, total)
+
+    source = connection.get_db_connection()
+    target = sqlite3.connect(partial)
+    try:
+        source.backup(target, pages=pages_per_step, progress=on_step, sleep=step_sleep)
+    except Exception:
+        target.close()
+        os.remove(partial)
+        raise
+    finally:
+        source.close()
+    target.close()
+    os.replace(partial, destination)
+    return {"path": destination, "pages": pages, "seconds": round(time.monotonic() - started, 3)}
+
+
+def enable_incremental_vacuum():
+    """
+    Switches a database created before auto_vacuum was enabled to incremental mode.
+    This needs one full VACUUM, which rewrites the file and blocks writers while it runs.
+    """
+    conn = connection.get_db_connection()
+    try:
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+
+def _optimize(conn, deadline):
+    analyzed = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone()
+    conn.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+    if analyzed:
+        # Only re-analyzes tables whose statistics are likely to be out of date
+        conn.execute("PRAGMA optimize").fetchall()
+        return True, "optimized"
+    conn.execute("ANALYZE")
+    return True, "analyzed"
+
+
+def _incremental_vacuum(conn, deadline):
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        return True, "skipped: auto_vacuum is not incremental (see enable_incremental_vacuum)"
+    released = 0
+    while time.monotonic() < deadline:
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if not free_pages:
+            return True, f"released {released} page(s)"
+        # The pragma releases one page per step, so it has to be stepped to completion
+        conn.execute(f"PRAGMA incremental_vacuum({INCREMENTAL_VACUUM_PAGES})").fetchall()
+        conn.commit()
+        released += min(free_pages, INCREMENTAL_VACUUM_PAGES)
+    return False, f"released {released} page(s) before the time budget ran out"
+
+
+def _integrity_check(conn, deadline):
+    problems = [row[0] for row in conn.execute("PRAGMA integrity_check(20)").fetchall()]
+    if problems == ["ok"]:
+        return True, "ok"
+    return True, "; ".join(problems)
+
+
+def _sins_backlog_check(conn, deadline):
+    with write_transaction(conn):
+        differences = backlog.diff_backlog(conn)
+        if differences:
+            backlog.repair_backlog(conn)
+    if not differences:
+        return True, "ok"
+    return True, f"rebuilt {len(differences)} month(s) of the confession backlog summary"
+
+
+# (task, minimum days between completed runs, function(conn, deadline) -> (completed, result))
+MAINTENANCE_TASKS = [
+    ("optimize", 1, _optimize),
+    ("incremental_vacuum", 7, _incremental_vacuum),
+    ("integrity_check", 30, _integrity_check),
+    ("sins_backlog_check", 7, _sins_backlog_check),
+]
+
+
+def get_due_tasks(conn, now: datetime.datetime = None, force: bool = False):
+    """Returns the MAINTENANCE_TASKS entries whose interval has passed since they last completed."""
+    now = now or datetime.datetime.now()
+    last_completed = dict(conn.execute("SELECT task, last_completed FROM maintenance_runs").fetchall())
+    due = []
+    for task, interval_days, function in MAINTENANCE_TASKS:
+        last = last_completed.get(task)
+        if force or last is None or now - datetime.datetime.strptime(last, "%Y-%m-%d %H:%M:%S") >= datetime.timedelta(days=interval_days):
+            due.append((task, interval_days, function))
+    return due
+
+
+def run_maintenance(time_budget: float = None, force: bool = False):
+    """
+    Runs the due maintenance tasks, in MAINTENANCE_TASKS order, within time_budget seconds
+    (default DEFAULT_TIME_BUDGET). With force=True every task is treated as due.
+    Returns {"before": stats, "after": stats, "tasks": [{"task", "status", "result", "duration"}]},
+    where status is "completed", "interrupted" or "skipped" (no budget left).
+    """
+    time_budget = DEFAULT_TIME_BUDGET if time_budget is None else time_budget
+    before = get_database_stats()
+    deadline = time.monotonic() + time_budget
+    results = []
+
+    conn = connection.get_db_connection()
+    conn.set_progress_handler(lambda: 1 if time.monotonic() > deadline else 0, _PROGRESS_INTERVAL)
+    try:
+        for task, _, function in get_due_tasks(conn, force=force):
+            if time.monotonic() >= deadline:
+                results.append({"task": task, "status": "skipped", "result": "no time budget left", "duration": 0.0})
+                continue
+            started = time.monotonic()
+            try:
+                completed, result = function(conn, deadline)
+            except sqlite3.OperationalError as e:
+                if "interrupt" not in str(e):
+                    raise
+                conn.rollback()
+                completed, result = False, "interrupted at the time budget"
+            duration = round(time.monotonic() - started, 3)
+            now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+            # Recording the run must not be cut short by the budget
+            conn.set_progress_handler(None, 0)
+            with write_transaction(conn):
+                conn.execute("""
+                    INSERT INTO maintenance_runs (task, last_completed, last_attempted, duration, result)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(task) DO UPDATE SET
+                        last_completed = COALESCE(excluded.last_completed, last_completed),
+                        last_attempted = excluded.last_attempted,
+                        duration = excluded.duration,
+                        result = excluded.result
+                """, (task, now if completed else None, now, duration, result))
+            conn.set_progress_handler(lambda: 1 if time.monotonic() > deadline else 0, _PROGRESS_INTERVAL)
+            results.append({"task": task, "status": "completed" if completed else "interrupted",
+                            "result": result, "duration": duration})
+    finally:
+        conn.close()
+    return {"before": before, "after": get_database_stats(), "tasks": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Back up and maintain the Faith Tracker database.")
+    parser.add_argument("--budget", type=float, default=DEFAULT_TIME_BUDGET,
+                        help=f"Seconds available for maintenance tasks (default: {DEFAULT_TIME_BUDGET})")
+    parser.add_argument("--force", action="store_true", help="Run every task, even if it isn't due")
+    parser.add_argument("--backup", nargs="?", const="", metavar="PATH",
+                        help="Take an online backup first (default path: a backups directory next to the database)")
+    parser.add_argument("--enable-incremental-vacuum", action="store_true",
+                        help="One-time full VACUUM switching an older database to incremental vacuum")
+    args = parser.parse_args(argv)
+
+    connection.initialize_database(quiet=True)
+    if args.backup is not None:
+        backup = backup_database(args.backup or None)
+        print(f"Backed up {backup['pages']} pages to {backup['path']} in {backup['seconds']}s.")
+    if args.enable_incremental_vacuum:
+        enable_incremental_vacuum()
+
+    report = run_maintenance(args.budget, args.force)
+    print(f"Before: {format_stats_for_display(report['before'])}")
+    for task in report["tasks"]:
+        print(f"  {task['task']}: {task['status']} ({task['result']}, {task['duration']}s)")
+    if not report["tasks"]:
+        print("  No maintenance tasks are due.")
+    print(f"After:  {format_stats_for_display(report['after'])}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,259 @@
+# faith_tracker_app/database/memory_store.py
+"""
+Pure-Python storage for the in-memory backend (see backends.py).
+
+Each table keeps its rows in a dict by id, a dict from content_hash to id for the
+natural-key rule, and a list of (date, ..., id) sort keys kept in order with bisect,
+so listings and date ranges are read in order without sorting. A unit of work holds
+the store's lock and an undo log; rolling back replays the log backwards.
+
+The repositories take the same arguments, return the same values and raise the same
+exceptions as the SQLite ones, so the tracker functions can't tell them apart.
+Reading-plan progress, the archive and the sync changelog exist only in SQLite.
+"""
+import bisect
+import collections
+import datetime
+import sqlite3
+import threading
+
+from faith_tracker_app.bible.bible_tracker import build_reading_row
+from faith_tracker_app.database.compression import lazy_row
+from faith_tracker_app.database.connection import separate_entry_row
+from faith_tracker_app.database.schema import CONFLICT_MODES, list_columns
+from faith_tracker_app.rosary.rosary_tracker import Mysteries, WEEKDAY_NAMES, build_rosary_row
+from faith_tracker_app.sins.sins_tracker import build_sin_row, build_confession_row, summarize_backlog
+
+
+class MemoryTable:
+    """
+    Rows of one table. columns name the values of an inserted row tuple, defaults are set
+    on every new row, and sort_columns (ending with "id") order the listings.
+    """
+
+    def __init__(self, name, columns, sort_columns, defaults=None):
+        self.name = name
+        self.columns = columns
+        self.sort_columns = sort_columns
+        self.defaults = defaults or {}
+        self.rows = {}
+        self.ids_by_hash = {}
+        self.order = []
+        self.next_id = 1
+
+    def sort_key(self, row):
+        return tuple(row[column] for column in self.sort_columns)
+
+    def add(self, row):
+        self.rows[row["id"]] = row
+        self.ids_by_hash[row["content_hash"]] = row["id"]
+        bisect.insort(self.order, self.sort_key(row))
+
+    def remove(self, entry_id):
+        row = self.rows.pop(entry_id)
+        del self.ids_by_hash[row["content_hash"]]
+        del self.order[bisect.bisect_left(self.order, self.sort_key(row))]
+
+    def newest_first(self, start_date=None, end_date=None):
+        """Yields rows, latest first, whose first sort column is in start_date..end_date (inclusive)."""
+        low = bisect.bisect_left(self.order, (start_date,)) if start_date else 0
+        high = len(self.order)
+        if end_date:
+            day_after = datetime.datetime.strptime(end_date, "%Y-%m-%d").date() + datetime.timedelta(days=1)
+            high = bisect.bisect_left(self.order, (day_after.strftime("%Y-%m-%d"),))
+        for index in range(high - 1, low - 1, -1):
+            yield self.rows[self.order[index][-1]]
+
+
+class MemoryStore:
+    """The three tracker tables, guarded by one lock."""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.bible_reading = MemoryTable(
+            "bible_reading",
+            ("book", "chapter", "start_verse", "end_verse", "reading_date", "notes", "uuid", "content_hash"),
+            ("reading_date", "id"))
+        self.rosary_prayers = MemoryTable(
+            "rosary_prayers",
+            ("prayer_date", "mysteries", "notes", "mystery_id", "weekday", "uuid", "content_hash"),
+            ("prayer_date", "created_at", "id"))
+        self.sins_confession_log = MemoryTable(
+            "sins_confession_log",
+            ("sin_description", "occurrence_date", "notes", "uuid", "content_hash"),
+            ("created_at", "id"),
+            {"confessed": 0, "confession_date": None})
+
+
+class MemoryUnitOfWork:
+    """Unit of work on a MemoryStore; other units wait until it commits or rolls back."""
+
+    def __init__(self, store):
+        self.store = store
+        self._undo = []
+
+    def __enter__(self):
+        self.store.lock.acquire()
+        self._undo = []
+        self.bible = MemoryBibleRepository(self)
+        self.rosary = MemoryRosaryRepository(self)
+        self.sins = MemorySinsRepository(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self.commit()
+            else:
+                self.rollback()
+        finally:
+            self.store.lock.release()
+        return False
+
+    def commit(self):
+        self._undo = []
+
+    def rollback(self):
+        while self._undo:
+            table, entry_id, previous = self._undo.pop()
+            table.remove(entry_id)
+            if previous is not None:
+                table.add(previous)
+
+
+class _MemoryRepository:
+    table_name = None
+
+    def __init__(self, unit):
+        self.unit = unit
+        self.table = getattr(unit.store, self.table_name)
+
+    def insert(self, row, on_conflict: str = "error"):
+        """Inserts a row built for the table's INSERT statement. Returns (id, written)."""
+        if on_conflict not in CONFLICT_MODES:
+            raise ValueError(f"Unknown conflict mode '{on_conflict}'. Choose from: {', '.join(CONFLICT_MODES)}.")
+        values = dict(zip(self.table.columns, row))
+        existing_id = self.table.ids_by_hash.get(values["content_hash"])
+        if existing_id is not None and on_conflict == "add":
+            values = dict(zip(self.table.columns, separate_entry_row(row)))
+        elif existing_id is not None:
+            if on_conflict == "error":
+                raise sqlite3.IntegrityError(f"UNIQUE constraint failed: {self.table_name}.content_hash")
+            if on_conflict == "update" and self.table.rows[existing_id]["notes"] != values["notes"]:
+                self._update(existing_id, notes=values["notes"])
+                return existing_id, True
+            return existing_id, False
+
+        entry_id = self.table.next_id
+        self.table.next_id += 1
+        created_at = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        self.table.add({"id": entry_id, **self.table.defaults, **values, "created_at": created_at})
+        self.unit._undo.append((self.table, entry_id, None))
+        return entry_id, True
+
+    def _update(self, entry_id, **changes):
+        previous = self.table.rows[entry_id]
+        self.table.remove(entry_id)
+        self.table.add({**previous, **changes})
+        self.unit._undo.append((self.table, entry_id, previous))
+
+    def _list(self, rows, limit=None, with_notes=True, projection="full"):
+        columns = list_columns(self.table_name, projection, with_notes)
+        result = []
+        for row in rows:
+            if limit and len(result) >= limit:
+                break
+            result.append(lazy_row({column: row[column] for column in columns}))
+        return result
+
+
+class MemoryBibleRepository(_MemoryRepository):
+    table_name = "bible_reading"
+
+    def add_reading(self, book: str, chapter: int, start_verse: int = None, end_verse: int = None, notes: str = None,
+                    reading_date: str = None, on_conflict: str = "error"):
+        return self.insert(build_reading_row(book, chapter, start_verse, end_verse, notes, reading_date), on_conflict)
+
+    def list_readings(self, limit: int = None, start_date: str = None, end_date: str = None,
+                      include_archive: bool = False, with_notes: bool = True, projection: str = "full"):
+        _check_range(start_date, end_date)
+        return self._list(self.table.newest_first(start_date, end_date), limit, with_notes, projection)
+
+
+class MemoryRosaryRepository(_MemoryRepository):
+    table_name = "rosary_prayers"
+
+    def log_prayer(self, prayer_date: str = None, mysteries: str = None, notes: str = None,
+                   default_mysteries: bool = True, on_conflict: str = "error"):
+        return self.insert(build_rosary_row(prayer_date, mysteries, notes, default_mysteries), on_conflict)
+
+    def list_prayers(self, limit: int = None, start_date: str = None, end_date: str = None,
+                     include_archive: bool = False, with_notes: bool = True, projection: str = "full"):
+        _check_range(start_date, end_date)
+        return self._list(self.table.newest_first(start_date, end_date), limit, with_notes, projection)
+
+    def mystery_counts(self):
+        counts = {mystery.label: 0 for mystery in Mysteries}
+        totals = collections.Counter(row["mystery_id"] for row in self.table.rows.values())
+        for mystery_id, total in totals.items():
+            counts[Mysteries(mystery_id).label if mystery_id is not None else None] = total
+        return counts
+
+    def weekday_counts(self, by_mysteries: bool = False):
+        rows = [row for row in self.table.rows.values() if row["weekday"] is not None]
+        if by_mysteries:
+            counts = {name: {} for name in WEEKDAY_NAMES}
+            for (weekday, mystery_id), total in collections.Counter(
+                    (row["weekday"], row["mystery_id"]) for row in rows).items():
+                label = Mysteries(mystery_id).label if mystery_id is not None else None
+                counts[WEEKDAY_NAMES[weekday]][label] = total
+            return counts
+        counts = {name: 0 for name in WEEKDAY_NAMES}
+        for weekday, total in collections.Counter(row["weekday"] for row in rows).items():
+            counts[WEEKDAY_NAMES[weekday]] = total
+        return counts
+
+
+class MemorySinsRepository(_MemoryRepository):
+    table_name = "sins_confession_log"
+
+    def add_entry(self, sin_description: str, occurrence_date: str = None, notes: str = None,
+                  on_conflict: str = "error"):
+        return self.insert(build_sin_row(sin_description, occurrence_date, notes), on_conflict)
+
+    def confess(self, entry_id: int, confession_date: str = None):
+        confession_date, entry_id = build_confession_row(entry_id, confession_date)
+        row = self.table.rows.get(entry_id)
+        if row is None or row["confessed"]:
+            return False
+        self._update(entry_id, confessed=1, confession_date=confession_date)
+        return True
+
+    def is_confessed(self, entry_id: int):
+        row = self.table.rows.get(entry_id)
+        return bool(row["confessed"]) if row else None
+
+    def backlog_summary(self):
+        months = {}
+        for row in self.table.rows.values():
+            if not row["confessed"]:
+                month = (row["created_at"] or "")[:7]
+                count, oldest = months.get(month, (0, row["created_at"]))
+                months[month] = (count + 1, min(oldest, row["created_at"]))
+        return summarize_backlog([(month, count, oldest) for month, (count, oldest) in sorted(months.items())])
+
+    def list_entries(self, show_all: bool = True, show_confessed: bool = True, limit: int = None,
+                     start_date: str = None, end_date: str = None, include_archive: bool = False,
+                     with_notes: bool = True, projection: str = "full"):
+        _check_range(start_date, end_date)
+        rows = self.table.newest_first(start_date, end_date)
+        if not show_all:
+            rows = (row for row in rows if bool(row["confessed"]) == show_confessed)
+        return self._list(rows, limit, with_notes, projection)
+
+
+def _check_range(start_date, end_date):
+    """Raises ValueError for malformed dates, like archive.date_range_filters."""
+    for value in (start_date, end_date):
+        if value:
+            datetime.datetime.strptime(value, "%Y-%m-%d")
@@ -0,0 +1,72 @@
+# faith_tracker_app/database/pool.py
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from faith_tracker_app.database import connection
+
+
+class ConnectionPool:
+    """
+    A fixed-size pool of SQLite connections that can be shared between threads.
+    Connections are opened lazily, up to `size`, and handed out one thread at a time.
+    """
+
+    def __init__(self, database: str = None, size: int = 8, timeout: float = 30.0):
+        self.database = database or connection.DATABASE_NAME
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def _open(self):
+        conn = sqlite3.connect(self.database, timeout=self.timeout, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        connection.register_functions(conn)
+        return conn
+
+    def acquire(self):
+        """Returns an idle connection, opening a new one if the pool isn't full yet."""
+        if self._closed:
+            raise RuntimeError("Connection pool is closed.")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_open = self._opened < self.size
+            if can_open:
+                self._opened += 1
+        if can_open:
+            return self._open()
+        return self._idle.get(timeout=self.timeout)
+
+    def release(self, conn):
+        """Returns a connection to the pool, rolling back any unfinished transaction."""
+        if conn.in_transaction:
+            conn.rollback()
+        if self._closed:
+            conn.close()
+        else:
+            self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Context manager that borrows a connection for the duration of the block."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Closes all idle connections; connections still in use are closed on release."""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
@@ -0,0 +1,227 @@
+# faith_tracker_app/database/query_plans.py
+"""
+Query-plan regression guard for the statements the trackers issue.
+
+tracker_queries() lists every statement the Bible, Rosary and Sins repositories
+and the liturgical statistics run, built by the same constants and list_query()
+methods the repositories use, with representative parameters, and the forms
+that also read the archive (see archive.select_rows) when one is attached.
+check_query_plans() runs EXPLAIN QUERY PLAN on each and reports the plans that
+scan a table instead of searching an index, or sort in a temporary B-tree. A
+statement that has to read every row (the per-mysteries counts, unfiltered
+listings that stop at a LIMIT) names the tables it may scan.
+
+The test suite runs the check against a populated fixture database; run this
+module to see the plans on your own database.
+
+Run with: python -m faith_tracker_app.database.query_plans [--database PATH]
+"""
+import argparse
+import datetime
+import os
+import sqlite3
+import sys
+
+from faith_tracker_app.bible import bible_tracker, reading_plans
+from faith_tracker_app.database import archive, connection, schema
+from faith_tracker_app.liturgy import liturgical_calendar
+from faith_tracker_app.reminders import scheduler
+from faith_tracker_app.rosary import rosary_tracker
+from faith_tracker_app.sins import sins_tracker
+
+FIXTURE_ROWS = 3000
+
+# Date ranges used for the range-filtered listings
+_RANGE_START, _RANGE_END = "2024-03-01", "2024-03-31"
+
+
+def _listing(name, table, query, limit=20):
+    """Registry entry for a repository listing (select SQL, params, ORDER BY)."""
+    select_sql, params, order_by = query
+    # Without a filter, the listing walks the ordering index and stops at the limit
+    allowed_scans = () if " WHERE " in select_sql else (table,)
+    return (name, archive.build_select_query(table, select_sql, order_by, limit), params, allowed_scans)
+
+
+def tracker_queries(with_archive: bool = False):
+    """
+    Returns the registry as a list of (name, sql, params, tables the statement may scan).
+    Names start with the repository method that runs the statement. with_archive adds the
+    forms that combine the hot and archive tables; they need the archive attached.
+    """
+    reading = bible_tracker.build_reading_row("John", 3, 16, 17, reading_date="2024-03-02")
+    prayer = rosary_tracker.build_rosary_row("2024-03-02", "Joyful")
+    sin = sins_tracker.build_sin_row("Impatience", "2024-03-02")
+    queries = [
+        ("bible.insert", bible_tracker.INSERT_READING_SQL, reading, ()),
+        ("bible.insert (plan progress)", reading_plans.ACTIVE_PLANS_SQL, ("2024-03-02",),
+         # A handful of plans at most
+         ("reading_plans",)),
+        ("bible.insert (plan update)", reading_plans.UPDATE_PLAN_PROGRESS_SQL, (b"", 1, 1), ()),
+        ("rosary.insert", rosary_tracker.INSERT_ROSARY_SQL, prayer, ()),
+        ("sins.insert", sins_tracker.INSERT_SIN_SQL, sin, ()),
+        ("sins.confess", sins_tracker.CONFESS_SIN_SQL, sins_tracker.build_confession_row(1, "2024-03-03"), ()),
+        ("sins.is_confessed", sins_tracker.IS_CONFESSED_SQL, (1,), ()),
+        # Counts read every row; through the covering index they read no table rows
+        ("rosary.mystery_counts", rosary_tracker.MYSTERY_COUNTS_SQL, (), ("rosary_prayers",)),
+        ("rosary.weekday_counts", rosary_tracker.WEEKDAY_COUNTS_SQL, (), ("rosary_prayers",)),
+        ("rosary.weekday_counts (by mysteries)", rosary_tracker.WEEKDAY_MYSTERY_COUNTS_SQL, (), ("rosary_prayers",)),
+    ]
+    for name, table, sql, row in (("bible", "bible_reading", bible_tracker.INSERT_READING_SQL, reading),
+                                  ("rosary", "rosary_prayers", rosary_tracker.INSERT_ROSARY_SQL, prayer),
+                                  ("sins", "sins_confession_log", sins_tracker.INSERT_SIN_SQL, sin)):
+        for mode in schema.CONFLICT_MODES[1:]:
+            queries.append((f"{name}.insert ({mode})", schema.upsert_sql(sql, mode), row, ()))
+        queries.append((f"{name}.insert (existing id)", connection.FIND_BY_CONTENT_HASH_SQL.format(table=table),
+                        (row[-1],), ()))
+
+    ranges = {"": (None, None), " from": (_RANGE_START, None), " to": (None, _RANGE_END),
+              " from-to": (_RANGE_START, _RANGE_END)}
+    for label, (start, end) in ranges.items():
+        queries.append(_listing(f"bible.list_readings{label}", "bible_reading",
+                                bible_tracker.BibleRepository.list_query(start, end)))
+        queries.append(_listing(f"rosary.list_prayers{label}", "rosary_prayers",
+                                rosary_tracker.RosaryRepository.list_query(start, end)))
+        for status, (show_all, show_confessed) in (("all", (True, True)), ("confessed", (False, True)),
+                                                   ("unconfessed", (False, False))):
+            queries.append(_listing(f"sins.list_entries {status}{label}", "sins_confession_log",
+                                    sins_tracker.SinsRepository.list_query(show_all, show_confessed, start, end)))
+    # The compact and ids views; ids listings read only their ordering index
+    for projection in schema.PROJECTIONS[1:]:
+        for label, (start, end) in (("", (None, None)), (" from-to", (_RANGE_START, _RANGE_END))):
+            queries.append(_listing(f"bible.list_readings ({projection}){label}", "bible_reading",
+                                    bible_tracker.BibleRepository.list_query(start, end, projection=projection)))
+            queries.append(_listing(f"rosary.list_prayers ({projection}){label}", "rosary_prayers",
+                                    rosary_tracker.RosaryRepository.list_query(start, end, projection=projection)))
+            queries.append(_listing(f"sins.list_entries unconfessed ({projection}){label}", "sins_confession_log",
+                                    sins_tracker.SinsRepository.list_query(False, False, start, end,
+                                                                           projection=projection)))
+    # Run by the confession reminder's triggers on every change to the unconfessed sins
+    queries.append(("reminders.oldest_unconfessed", scheduler.OLDEST_UNCONFESSED_SQL, (), ()))
+    # The backlog summary has a row per month at most; its triggers look up a month's oldest sin
+    queries.append(("sins.backlog_summary", sins_tracker.BACKLOG_SUMMARY_SQL, (), ("sins_backlog",)))
+    queries.append(("sins.backlog_summary (month oldest)", schema.SINS_BACKLOG_OLDEST_SQL.format(month="?"),
+                    ("2024-03", "2024-03"), ()))
+
+    # Season and feast statistics over the tagged trackers
+    for table, column in liturgical_calendar.TAGGED_TABLES.items():
+        count_sql = liturgical_calendar.SEASON_COUNT_SQL.replace("{column}", column)
+        queries.append((f"liturgy.season_counts {table}", archive.build_select_query(table, count_sql, ""),
+                        (_RANGE_START, _RANGE_END), ()))
+        range_sql = liturgical_calendar.DATE_RANGE_SQL.replace("{column}", column)
+        for archived in (False, True) if with_archive else (False,):
+            suffix = ", with archive" if archived else ""
+            # The archive form runs the statement on each table, so it needs the parameters twice
+            repeat = 2 if archived else 1
+            queries.append((f"liturgy.feast_counts {table} (date range{suffix})",
+                            archive.build_select_query(table, range_sql, "", None, archived), (), ()))
+            for marian in ("", " AND c.marian = TRUE"):
+                feast_sql = liturgical_calendar.FEAST_COUNTS_SQL.format(table="{table}", column=column, marian=marian)
+                queries.append((f"liturgy.feast_counts {table} ({'Marian' if marian else 'all'}{suffix})",
+                                archive.build_select_query(table, feast_sql, "", None, archived),
+                                ("2020-01-01", "2024-12-31") * repeat, ()))
+    return queries
+
+
+def explain(conn, sql, params=()):
+    """Returns the EXPLAIN QUERY PLAN detail lines of a statement."""
+    return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()]
+
+
+def plan_problems(plan, allowed_scans=()):
+    """
+    Returns the lines of a plan that sort in a temporary B-tree or scan a table (with or
+    without an index) that isn't in allowed_scans. Scans of a subquery's result or of the
+    constant row of a SELECT without FROM read no table.
+    """
+    problems = []
+    for line in plan:
+        if "USE TEMP B-TREE" in line:
+            problems.append(line)
+        elif line.startswith(("SCAN (subquery", "SCAN CONSTANT ROW")):
+            continue
+        elif line.startswith("SCAN ") and line.split()[1] not in allowed_scans:
+            problems.append(line)
+    return problems
+
+
+def check_query_plans(conn, queries=None):
+    """
+    Returns {name: (plan, problem lines)} for the registry queries (with the archive forms if
+    conn has the archive attached) whose plans have problems.
+    """
+    failures = {}
+    for name, sql, params, allowed_scans in queries or tracker_queries(archive.is_attached(conn)):
+        plan = explain(conn, sql, params)
+        problems = plan_problems(plan, allowed_scans)
+        if problems:
+            failures[name] = (plan, problems)
+    return failures
+
+
+def build_fixture_database(path, rows: int = None):
+    """
+    Creates a database at path with rows entries per tracker, one a day from 2020 (half of
+    the sins confessed), a reading plan and the liturgical calendar of those years, and an
+    empty archive next to it, and runs ANALYZE so the planner sees realistic statistics.
+    """
+    rows = rows or FIXTURE_ROWS
+    original_database_name = connection.DATABASE_NAME
+    try:
+        connection.DATABASE_NAME = path
+        connection.initialize_database(quiet=True)
+    finally:
+        connection.DATABASE_NAME = original_database_name
+
+    first_day = datetime.date(2020, 1, 1)
+    days = [(first_day + datetime.timedelta(days=i)).strftime("%Y-%m-%d") for i in range(rows)]
+    conn = sqlite3.connect(path)
+    try:
+        archive.attach_archive(conn, create=True)
+        conn.executemany(bible_tracker.INSERT_READING_SQL, [
+            bible_tracker.build_reading_row(book, i % 20 + 1, reading_date=f"{day} 0{i % 10}:00:00")
+            for i, (day, book) in enumerate(zip(days, ["Genesis", "Psalms", "John", "Acts"] * rows))])
+        conn.executemany(rosary_tracker.INSERT_ROSARY_SQL, [rosary_tracker.build_rosary_row(day) for day in days])
+        conn.executemany(sins_tracker.INSERT_SIN_SQL, [
+            sins_tracker.build_sin_row(f"Sin {i}", day) for i, day in enumerate(days)])
+        # Spread created_at like entries logged over the years
+        conn.execute("UPDATE rosary_prayers SET created_at = prayer_date || ' 20:00:00'")
+        conn.execute("UPDATE sins_confession_log SET created_at = occurrence_date || ' 21:00:00'")
+        conn.execute("UPDATE sins_confession_log SET confessed = TRUE, confession_date = occurrence_date WHERE id % 2 = 0")
+        conn.execute("""
+            INSERT INTO reading_plans (name, books, start_date, days, day_ends, total_chapters, progress)
+            VALUES ('Fixture plan', 'John', '2023-01-01', 21, x'', 21, x'000000')
+        """)
+        liturgical_calendar.ensure_calendar(conn, 2020, int(days[-1][:4]))
+        conn.commit()
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show the query plans of the tracker queries.")
+    parser.add_argument("--database", default=None, help="Database to explain against (default: the app's database)")
+    args = parser.parse_args(argv)
+
+    path = args.database or connection.DATABASE_NAME
+    if not os.path.exists(path):
+        print(f"Error: {path} does not exist.")
+        return 1
+    conn = sqlite3.connect(path)
+    try:
+        archive.attach_archive(conn)
+        failures = check_query_plans(conn)
+        for name, sql, params, allowed_scans in tracker_queries(archive.is_attached(conn)):
+            marker = "!!" if name in failures else "ok"
+            print(f"{marker} {name}: {' | '.join(explain(conn, sql, params)) or '(no table access)'}")
+    finally:
+        conn.close()
+    print(f"{len(failures)} query plan problem(s).")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,5 @@
 # faith_tracker_app/database/schema.py
+import functools
 
 BIBLE_READING_TABLE_SCHEMA = """
 CREATE TABLE IF NOT EXISTS bible_reading (
@@ -8,8 +9,10 @@ CREATE TABLE IF NOT EXISTS bible_reading (
     start_verse INTEGER,
     end_verse INTEGER,
     reading_date TEXT NOT NULL, -- ISO format YYYY-MM-DD HH:MM:SS
-    notes TEXT,
-    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    notes TEXT, -- Long notes are stored compressed, as a BLOB (see database/compression.py)
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    uuid TEXT, -- Stable identity across database files (see database/sync.py)
+    content_hash TEXT -- natural_key_hash of NATURAL_KEYS["bible_reading"], unique
 );
 """
 
@@ -18,29 +21,450 @@ CREATE TABLE IF NOT EXISTS rosary_prayers (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     prayer_date TEXT NOT NULL, -- ISO format YYYY-MM-DD
     mysteries TEXT, -- Joyful, Sorrowful, Glorious, Luminous (optional)
-    notes TEXT,
-    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    notes TEXT, -- Long notes are stored compressed, as a BLOB (see database/compression.py)
+    mystery_id INTEGER, -- rosary_tracker.Mysteries value, NULL if mysteries is empty or not recognised
+    weekday INTEGER, -- 0=Monday .. 6=Sunday, derived from prayer_date
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    uuid TEXT, -- Stable identity across database files (see database/sync.py)
+    content_hash TEXT -- natural_key_hash of NATURAL_KEYS["rosary_prayers"], unique
 );
 """
 
 SINS_CONFESSION_LOG_TABLE_SCHEMA = """
 CREATE TABLE IF NOT EXISTS sins_confession_log (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
-    sin_description TEXT NOT NULL,
+    sin_description TEXT NOT NULL, -- Compressed like notes when long
     occurrence_date TEXT, -- ISO format YYYY-MM-DD (optional)
     confessed BOOLEAN DEFAULT FALSE,
     confession_date TEXT, -- ISO format YYYY-MM-DD (optional, if confessed)
-    notes TEXT,
+    notes TEXT, -- Long notes are stored compressed, as a BLOB (see database/compression.py)
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    uuid TEXT, -- Stable identity across database files (see database/sync.py)
+    content_hash TEXT -- natural_key_hash of NATURAL_KEYS["sins_confession_log"], unique
+);
+"""
+
+READING_PLANS_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reading_plans (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    books TEXT NOT NULL, -- Comma-separated canonical book names, in reading order
+    start_date TEXT NOT NULL, -- ISO format YYYY-MM-DD, day 1 of the plan
+    days INTEGER NOT NULL,
+    total_chapters INTEGER NOT NULL,
+    day_ends BLOB NOT NULL, -- Little-endian uint16 per day: chapters assigned up to and including that day
+    progress BLOB NOT NULL, -- Bitmap of chapters read, indexed by position in the plan
+    chapters_read INTEGER NOT NULL DEFAULT 0, -- Number of bits set in progress
+    active BOOLEAN DEFAULT TRUE,
     created_at TEXT DEFAULT CURRENT_TIMESTAMP
 );
 """
 
+# Indexes backing the "most recent first" listings and keyset pagination
+# (SQLite appends the rowid to every index, so these also order ties by id).
+INDEX_SCHEMAS = [
+    "CREATE INDEX IF NOT EXISTS idx_bible_reading_date ON bible_reading (reading_date);",
+    "CREATE INDEX IF NOT EXISTS idx_rosary_prayer_date ON rosary_prayers (prayer_date);",
+    # The tracker history orders same-day prayers by created_at; the API pages by id
+    "CREATE INDEX IF NOT EXISTS idx_rosary_prayer_date_created_at ON rosary_prayers (prayer_date, created_at);",
+    "CREATE INDEX IF NOT EXISTS idx_sins_created_at ON sins_confession_log (created_at);",
+    "CREATE INDEX IF NOT EXISTS idx_sins_confessed_created_at ON sins_confession_log (confessed, created_at);",
+    # Per-mystery and per-weekday counts are answered from these indexes alone
+    "CREATE INDEX IF NOT EXISTS idx_rosary_mystery ON rosary_prayers (mystery_id);",
+    "CREATE INDEX IF NOT EXISTS idx_rosary_weekday ON rosary_prayers (weekday, mystery_id);",
+]
+
+# Natural key of each tracker table, as SQL expressions. The row builders store
+# natural_key_hash() of the same values in content_hash, which has a unique index,
+# so inserts can skip or update duplicates with ON CONFLICT (see upsert_sql).
+# A sin without an occurrence date is keyed by the day it was logged (UTC).
+NATURAL_KEYS = {
+    "bible_reading": "book, chapter, start_verse, end_verse, reading_date",
+    "rosary_prayers": "prayer_date, mysteries",
+    "sins_confession_log": "sin_description, COALESCE(occurrence_date, substr(created_at, 1, 10))",
+}
+
+def _content_hash_backfill(table_name):
+    # Only the first row of each natural key gets a hash, so existing duplicates are kept
+    # (a NULL content_hash doesn't take part in the unique index) and can be reviewed.
+    return f"""
+        UPDATE {table_name} SET content_hash = natural_key_hash({NATURAL_KEYS[table_name]})
+        WHERE id IN (SELECT MIN(id) FROM {table_name} GROUP BY {NATURAL_KEYS[table_name]})
+    """
+
+NATURAL_KEY_INDEX_SCHEMAS = [
+    f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{table_name}_content_hash ON {table_name} (content_hash);"
+    for table_name in NATURAL_KEYS
+]
+
+# How inserts treat a row whose natural key already exists: "error" raises
+# sqlite3.IntegrityError, "ignore" skips it, "update" replaces its notes, and "add"
+# logs it as a separate entry (a second Rosary or the same sin again that day),
+# whose content_hash also covers its uuid (see unit_of_work.insert_entry).
+CONFLICT_MODES = ("error", "ignore", "update", "add")
+
+# Interactive logging (the tracker functions, single CLI commands, the API) adds every
+# entry; bulk paths (import, batch, sync) skip what is already logged.
+INTERACTIVE_CONFLICT_MODE = "add"
+
+_CONFLICT_CLAUSES = {
+    "error": "",
+    # The row is given a key of its own before it is inserted
+    "add": "",
+    "ignore": "ON CONFLICT(content_hash) DO NOTHING",
+    # The WHERE keeps an unchanged re-run from writing (and logging) anything
+    "update": "ON CONFLICT(content_hash) DO UPDATE SET notes = excluded.notes WHERE notes IS NOT excluded.notes",
+}
+
+@functools.lru_cache(maxsize=None)
+def upsert_sql(insert_sql, on_conflict="error"):
+    """Returns insert_sql (a tracker INSERT ... VALUES statement) with the ON CONFLICT clause for a mode."""
+    if on_conflict not in _CONFLICT_CLAUSES:
+        raise ValueError(f"Unknown conflict mode '{on_conflict}'. Choose from: {', '.join(CONFLICT_MODES)}.")
+    return f"{insert_sql.rstrip()} {_CONFLICT_CLAUSES[on_conflict]}".rstrip()
+
+# Columns the tracker listings return, by projection: "full" every listed field, "summary"
+# what a one-line listing shows (no notes), and "ids" the id with the columns the listing is
+# ordered by, which the ordering index covers, so no table row is read. Every projection
+# keeps the ORDER BY columns, which a listing combined with the archive sorts on.
+PROJECTIONS = ("full", "summary", "ids")
+
+LIST_COLUMNS = {
+    "bible_reading": {
+        "full": ("id", "book", "chapter", "start_verse", "end_verse", "reading_date", "notes"),
+        "summary": ("id", "book", "chapter", "start_verse", "end_verse", "reading_date"),
+        "ids": ("id", "reading_date"),
+    },
+    "rosary_prayers": {
+        "full": ("id", "prayer_date", "mysteries", "notes", "created_at"),
+        "summary": ("id", "prayer_date", "mysteries", "created_at"),
+        "ids": ("id", "prayer_date", "created_at"),
+    },
+    "sins_confession_log": {
+        "full": ("id", "sin_description", "occurrence_date", "confessed", "confession_date", "notes", "created_at"),
+        "summary": ("id", "sin_description", "occurrence_date", "confessed", "created_at"),
+        "ids": ("id", "created_at"),
+    },
+}
+
+def list_columns(table_name, projection="full", with_notes=True):
+    """Returns the LIST_COLUMNS of a table for a projection, without notes if with_notes is False."""
+    if projection not in PROJECTIONS:
+        raise ValueError(f"Unknown projection '{projection}'. Choose from: {', '.join(PROJECTIONS)}.")
+    return tuple(column for column in LIST_COLUMNS[table_name][projection] if with_notes or column != "notes")
+
+# Columns added after the first release, as (table, column, definition, backfill query).
+# initialize_database adds any that are missing from an existing database file and,
+# once the rest of the schema exists, runs the backfill for each column it added.
+COLUMN_MIGRATIONS = [
+    ("rosary_prayers", "mystery_id", "INTEGER", """
+        UPDATE rosary_prayers
+        SET mystery_id = CASE lower(trim(mysteries))
+                WHEN 'joyful' THEN 1 WHEN 'sorrowful' THEN 2 WHEN 'glorious' THEN 3 WHEN 'luminous' THEN 4
+            END,
+            mysteries = CASE lower(trim(mysteries))
+                WHEN 'joyful' THEN 'Joyful' WHEN 'sorrowful' THEN 'Sorrowful'
+                WHEN 'glorious' THEN 'Glorious' WHEN 'luminous' THEN 'Luminous'
+                ELSE mysteries
+            END
+    """),
+    ("rosary_prayers", "weekday", "INTEGER", """
+        UPDATE rosary_prayers SET weekday = (CAST(strftime('%w', prayer_date) AS INTEGER) + 6) % 7
+    """),
+    # The changelog triggers record every backfilled row, so existing history takes part in sync
+    ("bible_reading", "uuid", "TEXT", "UPDATE bible_reading SET uuid = lower(hex(randomblob(16))) WHERE uuid IS NULL"),
+    ("rosary_prayers", "uuid", "TEXT", "UPDATE rosary_prayers SET uuid = lower(hex(randomblob(16))) WHERE uuid IS NULL"),
+    ("sins_confession_log", "uuid", "TEXT", "UPDATE sins_confession_log SET uuid = lower(hex(randomblob(16))) WHERE uuid IS NULL"),
+] + [(table_name, "content_hash", "TEXT", _content_hash_backfill(table_name)) for table_name in NATURAL_KEYS] + [
+    ("import_checkpoints", "rows_duplicate", "INTEGER NOT NULL DEFAULT 0", None),
+]
+
+# Per-table counter bumped by triggers on every write, so readers (e.g. the HTTP API's
+# ETags) can tell whether a table changed with a single primary-key lookup.
+WRITE_GENERATION_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS write_generation (
+    table_name TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+"""
+
+TRACKER_TABLES = ["bible_reading", "rosary_prayers", "sins_confession_log"]
+
+def _write_generation_statements(table_name):
+    statements = [f"INSERT OR IGNORE INTO write_generation (table_name, generation) VALUES ('{table_name}', 0);"]
+    for event in ("INSERT", "UPDATE", "DELETE"):
+        statements.append(f"""
+CREATE TRIGGER IF NOT EXISTS {table_name}_{event.lower()}_generation
+AFTER {event} ON {table_name}
+BEGIN
+    UPDATE write_generation SET generation = generation + 1 WHERE table_name = '{table_name}';
+END;
+""")
+    return statements
+
+WRITE_GENERATION_SCHEMAS = [WRITE_GENERATION_TABLE_SCHEMA] + [
+    statement for table_name in TRACKER_TABLES for statement in _write_generation_statements(table_name)
+]
+
+# Change feed for sync between database files. Every insert, update and delete on a
+# tracker table appends (seq, table, row uuid, operation, origin replica, timestamp);
+# seq only ever grows, so "changes since N" is a range scan on the primary key.
+SYNC_META_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+) WITHOUT ROWID;
+"""
+
+CHANGELOG_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS changelog (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name TEXT NOT NULL,
+    row_uuid TEXT NOT NULL,
+    operation TEXT NOT NULL, -- 'upsert' or 'delete'
+    origin TEXT NOT NULL, -- replica_id of the database the change was first made in
+    changed_at TEXT NOT NULL -- YYYY-MM-DD HH:MM:SS.SSS (UTC) when it was first made
+);
+"""
+
+SYNC_PEERS_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_peers (
+    peer_id TEXT PRIMARY KEY, -- replica_id of the other database
+    last_seq INTEGER NOT NULL DEFAULT 0, -- Highest seq of the peer's changelog already pulled
+    synced_at TEXT
+) WITHOUT ROWID;
+"""
+
+def _changelog_statements(table_name):
+    statements = [
+        f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{table_name}_uuid ON {table_name} (uuid);",
+    ]
+    for event, row, operation in (("INSERT", "NEW", "upsert"), ("UPDATE", "NEW", "upsert"), ("DELETE", "OLD", "delete")):
+        # Writers set sync_meta.suppress_changelog inside their transaction when a change must
+        # not be logged: the sync engine writes a peer's entries itself, keeping their original
+        # origin and time, and archival moves rows without deleting them from the history.
+        statements.append(f"""
+CREATE TRIGGER IF NOT EXISTS {table_name}_{event.lower()}_changelog
+AFTER {event} ON {table_name}
+WHEN {row}.uuid IS NOT NULL AND NOT EXISTS (SELECT 1 FROM sync_meta WHERE key = 'suppress_changelog')
+BEGIN
+    INSERT INTO changelog (table_name, row_uuid, operation, origin, changed_at)
+    VALUES ('{table_name}', {row}.uuid, '{operation}',
+            (SELECT value FROM sync_meta WHERE key = 'replica_id'),
+            strftime('%Y-%m-%d %H:%M:%f', 'now'));
+END;
+""")
+    return statements
+
+CHANGELOG_SCHEMAS = [
+    SYNC_META_TABLE_SCHEMA,
+    "INSERT OR IGNORE INTO sync_meta (key, value) VALUES ('replica_id', lower(hex(randomblob(16))));",
+    CHANGELOG_TABLE_SCHEMA,
+    "CREATE INDEX IF NOT EXISTS idx_changelog_row ON changelog (row_uuid, seq);",
+    SYNC_PEERS_TABLE_SCHEMA,
+] + [statement for table_name in TRACKER_TABLES for statement in _changelog_statements(table_name)]
+
+# Rows moved to the archive database (see database/archive.py): every archived row of a
+# table is older than archived_before, so reads of more recent dates skip the archive.
+ARCHIVE_STATE_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archive_state (
+    table_name TEXT PRIMARY KEY,
+    archived_before TEXT NOT NULL, -- ISO format YYYY-MM-DD
+    rows_archived INTEGER NOT NULL DEFAULT 0,
+    archived_at TEXT
+) WITHOUT ROWID;
+"""
+
+MAINTENANCE_RUNS_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS maintenance_runs (
+    task TEXT PRIMARY KEY, -- see database/maintenance.py MAINTENANCE_TASKS
+    last_completed TEXT, -- ISO format YYYY-MM-DD HH:MM:SS, NULL until a run finishes within its budget
+    last_attempted TEXT,
+    duration REAL, -- Seconds taken by the last attempt
+    result TEXT
+) WITHOUT ROWID;
+"""
+
+IMPORT_CHECKPOINTS_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS import_checkpoints (
+    source TEXT PRIMARY KEY, -- Absolute path of the imported file (see database/importer.py)
+    kind TEXT NOT NULL, -- bible, rosary or sins
+    file_size INTEGER NOT NULL, -- Size when the import started; a different size restarts the import
+    lines_done INTEGER NOT NULL DEFAULT 0, -- Data lines already committed
+    rows_imported INTEGER NOT NULL DEFAULT 0,
+    rows_failed INTEGER NOT NULL DEFAULT 0,
+    rows_duplicate INTEGER NOT NULL DEFAULT 0, -- Valid rows already in the database
+    completed BOOLEAN DEFAULT FALSE,
+    updated_at TEXT
+) WITHOUT ROWID;
+"""
+
+# Cache of liturgy/liturgical_calendar.py, filled a year at a time for queries that join
+# against it (the calendar is computed, never edited)
+LITURGICAL_CALENDAR_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS liturgical_calendar (
+    day TEXT PRIMARY KEY, -- ISO format YYYY-MM-DD
+    season_id INTEGER NOT NULL, -- liturgical_calendar.Season
+    feast TEXT, -- Principal celebration of the day, if any
+    rank INTEGER, -- liturgical_calendar.Rank of the feast
+    marian BOOLEAN NOT NULL DEFAULT FALSE
+) WITHOUT ROWID;
+"""
+
+LITURGICAL_CALENDAR_INDEX_SCHEMAS = [
+    # Feast-day joins visit only the days with a celebration, grouped by feast
+    "CREATE INDEX IF NOT EXISTS idx_liturgical_feast ON liturgical_calendar (feast, marian, day) WHERE feast IS NOT NULL;",
+]
+
+# Next due time of each reminder (see reminders/scheduler.py). Triggers on the tracker
+# tables keep due_at current on every write path, so the scheduler only reads these rows.
+REMINDER_SCHEDULE_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reminder_schedule (
+    reminder TEXT PRIMARY KEY, -- 'rosary' or 'confession'
+    delay TEXT NOT NULL, -- SQLite date modifier: rosary, the local time of day; confession, the age that is due
+    due_at TEXT, -- YYYY-MM-DD HH:MM:SS (UTC) when it next fires, NULL while nothing is pending
+    last_sent TEXT -- YYYY-MM-DD HH:MM:SS (UTC)
+) WITHOUT ROWID;
+"""
+
+# A reminder that was sent waits this long before it is repeated
+REMINDER_REPEAT = "+1 day"
+
+# The oldest unconfessed sin's due time, not before the repeat of the last reminder
+_CONFESSION_DUE_SQL = f"""max(
+        (SELECT datetime(created_at, reminder_schedule.delay) FROM sins_confession_log
+         WHERE confessed = FALSE ORDER BY created_at LIMIT 1),
+        COALESCE(datetime(last_sent, '{REMINDER_REPEAT}'), ''))"""
+
+REMINDER_SCHEMAS = [
+    REMINDER_SCHEDULE_TABLE_SCHEMA,
+    "INSERT OR IGNORE INTO reminder_schedule (reminder, delay) VALUES ('rosary', '+20 hours'), ('confession', '+30 days');",
+    # Schedules missing from an existing database: today's reminder unless today is logged
+    """
+    UPDATE reminder_schedule SET due_at = datetime(max(
+        COALESCE((SELECT date(MAX(prayer_date), '+1 day') FROM rosary_prayers), ''), date('now', 'localtime')), delay, 'utc')
+    WHERE reminder = 'rosary' AND due_at IS NULL;
+    """,
+    f"UPDATE reminder_schedule SET due_at = {_CONFESSION_DUE_SQL} WHERE reminder = 'confession' AND due_at IS NULL;",
+    # A prayer moves the reminder to the day after it
+    """
+CREATE TRIGGER IF NOT EXISTS rosary_prayers_insert_reminder
+AFTER INSERT ON rosary_prayers
+BEGIN
+    UPDATE reminder_schedule SET due_at = max(COALESCE(due_at, ''), datetime(NEW.prayer_date, '+1 day', delay, 'utc'))
+    WHERE reminder = 'rosary';
+END;
+""",
+    # A new sin can only bring the confession reminder forward; any change to the unconfessed
+    # set recomputes it from the oldest unconfessed sin (an index lookup)
+    """
+CREATE TRIGGER IF NOT EXISTS sins_confession_log_insert_reminder
+AFTER INSERT ON sins_confession_log
+WHEN NOT NEW.confessed
+BEGIN
+    UPDATE reminder_schedule SET due_at = min(COALESCE(due_at, '9999-12-31'), datetime(NEW.created_at, delay))
+    WHERE reminder = 'confession';
+END;
+""",
+    f"""
+CREATE TRIGGER IF NOT EXISTS sins_confession_log_update_reminder
+AFTER UPDATE OF confessed ON sins_confession_log
+WHEN OLD.confessed IS NOT NEW.confessed
+BEGIN
+    UPDATE reminder_schedule SET due_at = {_CONFESSION_DUE_SQL} WHERE reminder = 'confession';
+END;
+""",
+    f"""
+CREATE TRIGGER IF NOT EXISTS sins_confession_log_delete_reminder
+AFTER DELETE ON sins_confession_log
+WHEN NOT OLD.confessed
+BEGIN
+    UPDATE reminder_schedule SET due_at = {_CONFESSION_DUE_SQL} WHERE reminder = 'confession';
+END;
+""",
+]
+
+# Unconfessed sins per month they were logged (see sins/backlog.py). Triggers on
+# sins_confession_log keep it in step on every write path, so backlog queries read
+# these few rows instead of filtering the log.
+SINS_BACKLOG_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sins_backlog (
+    month TEXT PRIMARY KEY, -- YYYY-MM of created_at; months without a backlog have no row
+    unconfessed INTEGER NOT NULL,
+    oldest TEXT -- created_at of the month's oldest unconfessed sin
+) WITHOUT ROWID;
+"""
+
+# The summary computed from the log itself: the backfill, and what sins/backlog.py checks against
+SINS_BACKLOG_FROM_LOG_SQL = """
+    SELECT COALESCE(substr(created_at, 1, 7), '') AS month, COUNT(*) AS unconfessed, MIN(created_at) AS oldest
+    FROM sins_confession_log WHERE confessed = FALSE
+"""
+
+# The oldest unconfessed sin logged in a month ('YYYY-MM')
+SINS_BACKLOG_OLDEST_SQL = """SELECT created_at FROM sins_confession_log
+        WHERE confessed = FALSE AND created_at >= {month} AND created_at < {month} || '-32'
+        ORDER BY created_at LIMIT 1"""
+
+_BACKLOG_MONTH = "COALESCE(substr({row}.created_at, 1, 7), '')"
+
+# Counts a sin row in, if it is unconfessed
+_BACKLOG_ADD_SQL = f"""
+    INSERT INTO sins_backlog (month, unconfessed, oldest)
+    SELECT {_BACKLOG_MONTH.format(row="NEW")}, 1, NEW.created_at WHERE NOT NEW.confessed
+    ON CONFLICT(month) DO UPDATE SET unconfessed = unconfessed + 1, oldest = min(oldest, excluded.oldest);"""
+
+# Counts a sin row out, if it was unconfessed; the month's oldest is looked up again in the
+# (confessed, created_at) index, and a month left without a backlog is removed
+_BACKLOG_REMOVE_SQL = f"""
+    UPDATE sins_backlog SET unconfessed = unconfessed - 1, oldest = ({SINS_BACKLOG_OLDEST_SQL.format(month="sins_backlog.month")})
+    WHERE month = {_BACKLOG_MONTH.format(row="OLD")} AND NOT OLD.confessed;
+    DELETE FROM sins_backlog WHERE month = {_BACKLOG_MONTH.format(row="OLD")} AND unconfessed <= 0;"""
+
+SINS_BACKLOG_SCHEMAS = [
+    SINS_BACKLOG_TABLE_SCHEMA,
+    # Fills the summary of an existing database, once: before its triggers exist
+    f"""
+    INSERT OR IGNORE INTO sins_backlog (month, unconfessed, oldest)
+    {SINS_BACKLOG_FROM_LOG_SQL}
+        AND NOT EXISTS (SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'sins_confession_log_insert_backlog')
+    GROUP BY 1;
+    """,
+    f"""
+CREATE TRIGGER IF NOT EXISTS sins_confession_log_insert_backlog
+AFTER INSERT ON sins_confession_log
+WHEN NOT NEW.confessed
+BEGIN{_BACKLOG_ADD_SQL}
+END;
+""",
+    # Confessing, and sync or "update" conflicts rewriting a row
+    f"""
+CREATE TRIGGER IF NOT EXISTS sins_confession_log_update_backlog
+AFTER UPDATE OF confessed, created_at ON sins_confession_log
+WHEN OLD.confessed IS NOT NEW.confessed OR OLD.created_at IS NOT NEW.created_at
+BEGIN{_BACKLOG_REMOVE_SQL}{_BACKLOG_ADD_SQL}
+END;
+""",
+    f"""
+CREATE TRIGGER IF NOT EXISTS sins_confession_log_delete_backlog
+AFTER DELETE ON sins_confession_log
+WHEN NOT OLD.confessed
+BEGIN{_BACKLOG_REMOVE_SQL}
+END;
+""",
+]
+
 # List of all schemas to be created
 ALL_TABLE_SCHEMAS = [
     BIBLE_READING_TABLE_SCHEMA,
     ROSARY_PRAYERS_TABLE_SCHEMA,
     SINS_CONFESSION_LOG_TABLE_SCHEMA,
-]
+    READING_PLANS_TABLE_SCHEMA,
+    ARCHIVE_STATE_TABLE_SCHEMA,
+    MAINTENANCE_RUNS_TABLE_SCHEMA,
+    IMPORT_CHECKPOINTS_TABLE_SCHEMA,
+    LITURGICAL_CALENDAR_TABLE_SCHEMA,
+] + INDEX_SCHEMAS + LITURGICAL_CALENDAR_INDEX_SCHEMAS + NATURAL_KEY_INDEX_SCHEMAS + WRITE_GENERATION_SCHEMAS + CHANGELOG_SCHEMAS + REMINDER_SCHEMAS + SINS_BACKLOG_SCHEMAS
 
 if __name__ == "__main__":
     # This part is for testing or manual setup if needed
@@ -0,0 +1,225 @@
+# faith_tracker_app/database/sync.py
+"""
+Incremental sync between two Faith Tracker database files (e.g. laptop and phone).
+
+Every tracker row has a stable uuid, and triggers append each insert, update and
+delete to the changelog with a monotonically increasing seq, the replica it was
+made in and when. Syncing pulls, in each direction, only the peer's changelog
+entries past the watermark saved from the previous sync, so the cost depends on
+the number of changes rather than on the size of the databases.
+
+Conflicts are resolved per row by last writer wins on (changed_at, origin): the
+change with the later timestamp is kept, and equal timestamps fall back to the
+larger replica id, so both databases always converge to the same state.
+
+A pulled row whose natural key (content_hash) another local row already holds is
+skipped, so the local copy is kept, and a change to a row this database has
+archived is applied to the archived copy (see archive.py).
+
+Run with: python -m faith_tracker_app.database.sync OTHER_DB [--database THIS_DB]
+"""
+import argparse
+import datetime
+import sqlite3
+import sys
+
+from faith_tracker_app.bible import reading_plans
+from faith_tracker_app.database import archive, connection
+from faith_tracker_app.database.concurrency import begin_write, commit_write
+from faith_tracker_app.database.schema import TRACKER_TABLES
+
+# Rows are fetched from the peer in groups of this many uuids per query
+FETCH_BATCH_SIZE = 500
+
+
+def get_replica_id(conn):
+    """Returns this database's replica id."""
+    return conn.execute("SELECT value FROM sync_meta WHERE key = 'replica_id'").fetchone()[0]
+
+
+def get_changes_since(conn, last_seq: int = 0):
+    """
+    Returns the changelog entries after last_seq, collapsed to the latest entry per row,
+    in seq order, together with the highest seq read.
+    """
+    latest = {}
+    max_seq = last_seq
+    cursor = conn.execute("""
+        SELECT seq, table_name, row_uuid, operation, origin, changed_at
+        FROM changelog WHERE seq > ? ORDER BY seq
+    """, (last_seq,))
+    for seq, table_name, row_uuid, operation, origin, changed_at in cursor:
+        key = (table_name, row_uuid)
+        latest.pop(key, None)  # Re-insert so dict order follows the latest seq
+        latest[key] = (seq, table_name, row_uuid, operation, origin, changed_at)
+        max_seq = seq
+    return list(latest.values()), max_seq
+
+
+def _latest_local_version(conn, row_uuid):
+    row = conn.execute("""
+        SELECT changed_at, origin FROM changelog WHERE row_uuid = ? ORDER BY seq DESC LIMIT 1
+    """, (row_uuid,)).fetchone()
+    return (row[0], row[1]) if row else None
+
+
+def _table_columns(conn, table_name):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table_name})").fetchall()]
+
+
+def _fetch_rows(conn, table_name, uuids):
+    """Returns {uuid: row dict} for the given uuids, querying in batches."""
+    rows = {}
+    for start in range(0, len(uuids), FETCH_BATCH_SIZE):
+        batch = uuids[start:start + FETCH_BATCH_SIZE]
+        placeholders = ", ".join("?" * len(batch))
+        for row in conn.execute(f"SELECT * FROM {table_name} WHERE uuid IN ({placeholders})", batch):
+            rows[row["uuid"]] = dict(row)
+    return rows
+
+
+def _apply_upsert(dst, table_name, cols, peer_row, has_archive):
+    """
+    Writes a peer row to dst: updates the row with its uuid, in the archive tables if dst has
+    archived it, or inserts it. Returns False, writing nothing, if another row of dst, hot or
+    archived, already holds its natural key.
+    """
+    target = f"main.{table_name}"
+    if has_archive and dst.execute(f"SELECT 1 FROM archive.{table_name} WHERE uuid = ?", (peer_row["uuid"],)).fetchone():
+        target = f"archive.{table_name}"
+    for holder in ([f"main.{table_name}", f"archive.{table_name}"] if has_archive else [target]):
+        owner = dst.execute(f"SELECT uuid FROM {holder} WHERE content_hash = ?", (peer_row.get("content_hash"),)).fetchone()
+        if owner is not None and owner[0] != peer_row["uuid"]:
+            return False
+    updates = ", ".join(f"{c} = excluded.{c}" for c in cols if c != "uuid")
+    if target.startswith("archive."):
+        assignments = ", ".join(f"{c} = ?" for c in cols if c != "uuid")
+        dst.execute(f"UPDATE {target} SET {assignments} WHERE uuid = ?",
+                    [peer_row[c] for c in cols if c != "uuid"] + [peer_row["uuid"]])
+        return True
+    cursor = dst.execute(f"""
+        INSERT INTO {target} ({", ".join(cols)}) VALUES ({", ".join("?" * len(cols))})
+        ON CONFLICT(uuid) DO UPDATE SET {updates}
+    """, [peer_row[c] for c in cols])
+    return cursor.rowcount > 0
+
+
+def pull_changes(dst, src):
+    """
+    Applies src's changes since the last pull to dst, in one dst transaction.
+    Both arguments are connections with row_factory = sqlite3.Row.
+    Returns a dictionary with the number of entries read, applied and skipped.
+    """
+    dst_id, src_id = get_replica_id(dst), get_replica_id(src)
+    if dst_id == src_id:
+        raise ValueError("Both databases have the same replica id; they are copies of one file.")
+
+    row = dst.execute("SELECT last_seq FROM sync_peers WHERE peer_id = ?", (src_id,)).fetchone()
+    changes, max_seq = get_changes_since(src, row[0] if row else 0)
+    stats = {"read": len(changes), "applied": 0, "skipped": 0}
+
+    # Decide which changes win before touching dst, so the peer rows can be fetched in batches
+    winners = []
+    for seq, table_name, row_uuid, operation, origin, changed_at in changes:
+        local = _latest_local_version(dst, row_uuid)
+        if origin == dst_id or table_name not in TRACKER_TABLES or (local is not None and local >= (changed_at, origin)):
+            stats["skipped"] += 1
+            continue
+        winners.append((table_name, row_uuid, operation, origin, changed_at))
+
+    # ATTACH can't run inside the transaction below
+    has_archive = archive.is_attached(dst) or (not dst.in_transaction and archive.attach_archive(dst))
+    peer_rows = {}
+    for table_name in TRACKER_TABLES:
+        uuids = [w[1] for w in winners if w[0] == table_name and w[2] == "upsert"]
+        if uuids:
+            peer_rows[table_name] = _fetch_rows(src, table_name, uuids)
+
+    try:
+        if not dst.in_transaction:
+            begin_write(dst)
+        dst.execute("INSERT OR REPLACE INTO sync_meta (key, value) VALUES ('suppress_changelog', '1')")
+        columns = {table_name: [c for c in _table_columns(dst, table_name) if c != "id"] for table_name in TRACKER_TABLES}
+        readings = []
+        for table_name, row_uuid, operation, origin, changed_at in winners:
+            if operation == "delete":
+                dst.execute(f"DELETE FROM main.{table_name} WHERE uuid = ?", (row_uuid,))
+                # The row may have been archived here since the peer pulled it
+                if has_archive:
+                    dst.execute(f"DELETE FROM archive.{table_name} WHERE uuid = ?", (row_uuid,))
+            else:
+                peer_row = peer_rows[table_name].get(row_uuid)
+                if peer_row is None:
+                    # Deleted in src after this entry; its delete entry comes later in the feed
+                    stats["skipped"] += 1
+                    continue
+                cols = [c for c in columns[table_name] if c in peer_row]
+                # The same entry made separately on both devices (e.g. by importing one file
+                # twice) has two uuids but one natural key; the local copy is kept.
+                if not _apply_upsert(dst, table_name, cols, peer_row, has_archive):
+                    stats["skipped"] += 1
+                    continue
+                if table_name == "bible_reading":
+                    readings.append((peer_row["book"], peer_row["chapter"], peer_row["reading_date"]))
+            dst.execute("""
+                INSERT INTO changelog (table_name, row_uuid, operation, origin, changed_at) VALUES (?, ?, ?, ?, ?)
+            """, (table_name, row_uuid, operation, origin, changed_at))
+            stats["applied"] += 1
+
+        # Readings from the other device count towards this database's reading plans too
+        reading_plans.record_plan_progress(dst, readings)
+        dst.execute("DELETE FROM sync_meta WHERE key = 'suppress_changelog'")
+        dst.execute("""
+            INSERT INTO sync_peers (peer_id, last_seq, synced_at) VALUES (?, ?, ?)
+            ON CONFLICT(peer_id) DO UPDATE SET last_seq = excluded.last_seq, synced_at = excluded.synced_at
+        """, (src_id, max_seq, datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+        commit_write(dst)
+    except Exception:
+        dst.rollback()
+        raise
+    return stats
+
+
+def _open(path):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def sync_databases(local_path: str, remote_path: str):
+    """
+    Syncs two database files in both directions. Both are initialized first if needed.
+    Returns {"pulled": stats, "pushed": stats} as seen from local_path.
+    """
+    original_database_name = connection.DATABASE_NAME
+    try:
+        for path in (local_path, remote_path):
+            connection.DATABASE_NAME = path
+            connection.initialize_database(quiet=True)
+    finally:
+        connection.DATABASE_NAME = original_database_name
+
+    local, remote = _open(local_path), _open(remote_path)
+    try:
+        pulled = pull_changes(local, remote)
+        pushed = pull_changes(remote, local)
+        return {"pulled": pulled, "pushed": pushed}
+    finally:
+        local.close()
+        remote.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sync this Faith Tracker database with another database file.")
+    parser.add_argument("other", help="Path of the other database file")
+    parser.add_argument("--database", default=None, help="Path of this database (default: the app's database)")
+    args = parser.parse_args(argv)
+
+    result = sync_databases(args.database or connection.DATABASE_NAME, args.other)
+    print(f"Pulled {result['pulled']['applied']} change(s) ({result['pulled']['skipped']} skipped), "
+          f"pushed {result['pushed']['applied']} change(s) ({result['pushed']['skipped']} skipped).")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
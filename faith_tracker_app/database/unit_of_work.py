@@ -0,0 +1,93 @@
+# faith_tracker_app/database/unit_of_work.py
+"""
+Unit of work: any mix of tracker operations in one transaction.
+
+    with UnitOfWork() as uow:
+        uow.bible.add_reading("John", 3)
+        uow.rosary.log_prayer(mysteries="Joyful")
+        uow.sins.confess(entry_id)
+
+The repositories (uow.bible, uow.rosary, uow.sins) run on the unit's connection and
+raise on errors instead of printing. Everything is committed together when the block
+ends, or rolled back if it raises. Given a connection (row_factory = sqlite3.Row), the
+unit runs on it and leaves it open; otherwise it opens and closes its own.
+
+A unit made with write=True takes the write lock when it starts (see concurrency.py),
+so while other processes write it waits and retries instead of failing part way.
+It also attaches the archive, if there is one, so inserts see archived entries.
+
+The module-level tracker functions are thin wrappers that each run one unit of work
+on the configured storage backend (see backends.py).
+"""
+from faith_tracker_app.database import archive
+from faith_tracker_app.database.concurrency import begin_write, commit_write
+from faith_tracker_app.database.connection import get_db_connection, find_id_by_content_hash, separate_entry_row
+from faith_tracker_app.database.schema import upsert_sql
+
+
+def insert_entry(conn, insert_sql: str, table_name: str, row, on_conflict: str = "error"):
+    """
+    Inserts a row built for insert_sql, handling an already logged entry per on_conflict
+    (see schema.CONFLICT_MODES); an archived entry is left unchanged (see archive.without_archived).
+    Returns (id, written); written is False if nothing changed.
+    Raises sqlite3.IntegrityError for a duplicate when on_conflict is "error".
+    """
+    if on_conflict == "add":
+        if (find_id_by_content_hash(conn, table_name, row[-1]) is not None
+                or not archive.without_archived(conn, table_name, [row])):
+            row = separate_entry_row(row)
+        return conn.execute(upsert_sql(insert_sql, "error"), row).lastrowid, True
+    if not archive.without_archived(conn, table_name, [row], on_conflict):
+        return find_id_by_content_hash(conn, f"archive.{table_name}", row[-1]), False
+    cursor = conn.execute(upsert_sql(insert_sql, on_conflict), row)
+    if on_conflict == "error":
+        return cursor.lastrowid, True
+    return find_id_by_content_hash(conn, table_name, row[-1]), cursor.rowcount > 0
+
+
+class UnitOfWork:
+    """Context manager sharing one connection and one transaction between the tracker repositories."""
+
+    def __init__(self, conn=None, write: bool = False):
+        self._injected_conn = conn
+        self.write = write
+        self.conn = None
+
+    def __enter__(self):
+        # Imported here because the tracker modules import this one
+        from faith_tracker_app.bible.bible_tracker import BibleRepository
+        from faith_tracker_app.rosary.rosary_tracker import RosaryRepository
+        from faith_tracker_app.sins.sins_tracker import SinsRepository
+
+        self.conn = self._injected_conn or get_db_connection()
+        self.bible = BibleRepository(self.conn)
+        self.rosary = RosaryRepository(self.conn)
+        self.sins = SinsRepository(self.conn)
+        if self.write and not self.conn.in_transaction:
+            try:
+                archive.attach_archive(self.conn)
+                begin_write(self.conn)
+            except Exception:
+                if self._injected_conn is None:
+                    self.conn.close()
+                raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                commit_write(self.conn)
+            else:
+                self.conn.rollback()
+        finally:
+            if self._injected_conn is None:
+                self.conn.close()
+        return False
+
+    def commit(self):
+        """Commits the work so far; later operations start a new transaction."""
+        commit_write(self.conn)
+
+    def rollback(self):
+        """Discards the work since the last commit."""
+        self.conn.rollback()
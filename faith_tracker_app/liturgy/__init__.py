@@ -0,0 +1 @@
+# Liturgy module initialization
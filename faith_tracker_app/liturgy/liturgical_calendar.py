@@ -0,0 +1,343 @@
+# faith_tracker_app/liturgy/liturgical_calendar.py
+"""
+Liturgical calendar: the season and principal celebration of every day.
+
+year_calendar() computes a civil year once (Easter by the Gregorian computus, then
+the moveable feasts and season boundaries from it) and memoises it, so formatting a
+listing is a dictionary lookup per row. ensure_calendar() caches the same days in
+the liturgical_calendar table for queries that join against it (feast_counts).
+A liturgical year is contiguous from the First Sunday of Advent, so season_counts()
+answers each season with one date-range COUNT on the tracker's date index.
+
+This follows the General Roman Calendar with simplifications: only solemnities,
+feasts and the Marian memorials are listed, and Epiphany, Ascension and Corpus
+Christi stay on their universal dates rather than moving to a Sunday.
+
+Run with: python -m faith_tracker_app.liturgy.liturgical_calendar [YEAR]
+"""
+import collections
+import datetime
+import enum
+import functools
+import sys
+
+from faith_tracker_app.database import archive
+from faith_tracker_app.database.concurrency import write_transaction
+from faith_tracker_app.database.connection import get_db_connection
+
+
+class Season(enum.IntEnum):
+    """Liturgical seasons, as stored in liturgical_calendar.season_id."""
+    ADVENT = 1
+    CHRISTMAS = 2
+    ORDINARY_TIME = 3
+    LENT = 4
+    TRIDUUM = 5
+    EASTER = 6
+
+    @property
+    def label(self):
+        if self is Season.TRIDUUM:
+            return "Easter Triduum"
+        return self.name.replace("_", " ").title()
+
+
+class Rank(enum.IntEnum):
+    """Rank of a celebration; a lower value takes precedence."""
+    PRINCIPAL = 0  # Easter Triduum, Ash Wednesday, Holy Week and the privileged Sundays
+    SOLEMNITY = 1
+    FEAST = 2
+    MEMORIAL = 3
+    OPTIONAL_MEMORIAL = 4
+
+    @property
+    def label(self):
+        return self.name.replace("_", " ").capitalize()
+
+
+LiturgicalDay = collections.namedtuple("LiturgicalDay", "season feast rank marian")
+
+# (month, day, name, rank, Marian, celebration of the Lord)
+FIXED_CELEBRATIONS = [
+    (1, 1, "Mary, the Holy Mother of God", Rank.SOLEMNITY, True, False),
+    (1, 6, "Epiphany of the Lord", Rank.SOLEMNITY, False, True),
+    (2, 2, "Presentation of the Lord", Rank.FEAST, False, True),
+    (2, 11, "Our Lady of Lourdes", Rank.OPTIONAL_MEMORIAL, True, False),
+    (3, 19, "Saint Joseph, Spouse of the Blessed Virgin Mary", Rank.SOLEMNITY, False, False),
+    (3, 25, "Annunciation of the Lord", Rank.SOLEMNITY, True, True),
+    (5, 13, "Our Lady of Fatima", Rank.OPTIONAL_MEMORIAL, True, False),
+    (5, 31, "Visitation of the Blessed Virgin Mary", Rank.FEAST, True, False),
+    (6, 24, "Nativity of Saint John the Baptist", Rank.SOLEMNITY, False, False),
+    (6, 29, "Saints Peter and Paul, Apostles", Rank.SOLEMNITY, False, False),
+    (7, 16, "Our Lady of Mount Carmel", Rank.OPTIONAL_MEMORIAL, True, False),
+    (8, 6, "Transfiguration of the Lord", Rank.FEAST, False, True),
+    (8, 15, "Assumption of the Blessed Virgin Mary", Rank.SOLEMNITY, True, False),
+    (8, 22, "Queenship of the Blessed Virgin Mary", Rank.MEMORIAL, True, False),
+    (9, 8, "Nativity of the Blessed Virgin Mary", Rank.FEAST, True, False),
+    (9, 14, "Exaltation of the Holy Cross", Rank.FEAST, False, True),
+    (9, 15, "Our Lady of Sorrows", Rank.MEMORIAL, True, False),
+    (10, 7, "Our Lady of the Rosary", Rank.MEMORIAL, True, False),
+    (11, 1, "All Saints", Rank.SOLEMNITY, False, False),
+    # Ranks with the solemnities, and is kept on a Sunday
+    (11, 2, "All Souls", Rank.SOLEMNITY, False, False),
+    (11, 21, "Presentation of the Blessed Virgin Mary", Rank.MEMORIAL, True, False),
+    (12, 8, "Immaculate Conception of the Blessed Virgin Mary", Rank.SOLEMNITY, True, False),
+    (12, 12, "Our Lady of Guadalupe", Rank.OPTIONAL_MEMORIAL, True, False),
+    (12, 25, "Nativity of the Lord", Rank.SOLEMNITY, False, True),
+]
+
+# (days after Easter Sunday, name, rank, Marian, celebration of the Lord)
+EASTER_CELEBRATIONS = [
+    (-46, "Ash Wednesday", Rank.PRINCIPAL, False, False),
+    (-7, "Palm Sunday of the Passion of the Lord", Rank.PRINCIPAL, False, True),
+    (-3, "Holy Thursday", Rank.PRINCIPAL, False, True),
+    (-2, "Good Friday", Rank.PRINCIPAL, False, True),
+    (-1, "Holy Saturday", Rank.PRINCIPAL, False, True),
+    (0, "Easter Sunday", Rank.PRINCIPAL, False, True),
+    (7, "Divine Mercy Sunday", Rank.PRINCIPAL, False, True),
+    (39, "Ascension of the Lord", Rank.SOLEMNITY, False, True),
+    (49, "Pentecost Sunday", Rank.SOLEMNITY, False, False),
+    (50, "Mary, Mother of the Church", Rank.MEMORIAL, True, False),
+    (56, "Most Holy Trinity", Rank.SOLEMNITY, False, True),
+    (60, "Most Holy Body and Blood of Christ", Rank.SOLEMNITY, False, True),
+    (68, "Most Sacred Heart of Jesus", Rank.SOLEMNITY, False, True),
+    (69, "Immaculate Heart of the Blessed Virgin Mary", Rank.MEMORIAL, True, False),
+]
+
+# Tracker tables tagged with the calendar, and their date columns
+TAGGED_TABLES = {"bible_reading": "reading_date", "rosary_prayers": "prayer_date"}
+
+SEASON_COUNT_SQL = "SELECT COUNT(*) AS total FROM {table} WHERE {column} >= ? AND {column} < ?"
+
+# One subquery per end, so each reads a single entry of the date index instead of all of it
+DATE_RANGE_SQL = "SELECT (SELECT MIN({column}) FROM {table}) AS first, (SELECT MAX({column}) FROM {table}) AS last"
+
+FEAST_COUNTS_SQL = """
+    SELECT c.feast, COUNT(*) AS total
+    FROM liturgical_calendar c JOIN {table} t ON t.{column} >= c.day AND t.{column} < date(c.day, '+1 day')
+    WHERE c.feast IS NOT NULL AND c.day BETWEEN ? AND ?{marian}
+    GROUP BY c.feast
+"""
+
+INSERT_CALENDAR_SQL = """
+    INSERT OR IGNORE INTO liturgical_calendar (day, season_id, feast, rank, marian) VALUES (?, ?, ?, ?, ?)
+"""
+
+_DAY = datetime.timedelta(days=1)
+
+
+def easter_sunday(year: int):
+    """Returns the date of Easter Sunday in the Gregorian calendar (anonymous computus)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 19 * l) // 433
+    month, day = divmod(h + l - 7 * m + 90, 25)
+    return datetime.date(year, month, (h + l - 7 * m + 33 * month + 19) % 32)
+
+
+def first_sunday_of_advent(year: int):
+    """The Sunday falling between November 27 and December 3."""
+    december_3 = datetime.date(year, 12, 3)
+    return december_3 - datetime.timedelta(days=(december_3.weekday() + 1) % 7)
+
+
+def baptism_of_the_lord(year: int):
+    """The Sunday after January 6, which ends the Christmas season."""
+    january_7 = datetime.date(year, 1, 7)
+    return january_7 + datetime.timedelta(days=(6 - january_7.weekday()) % 7)
+
+
+def liturgical_year_of(day: datetime.date):
+    """Returns the liturgical year a date belongs to; it begins on the First Sunday of Advent of the year before."""
+    return day.year + 1 if day >= first_sunday_of_advent(day.year) else day.year
+
+
+def season_spans(liturgical_year: int):
+    """Returns the seasons of a liturgical year in order, as (Season, first day, last day)."""
+    easter = easter_sunday(liturgical_year)
+    ash_wednesday = easter - datetime.timedelta(days=46)
+    holy_thursday = easter - datetime.timedelta(days=3)
+    pentecost = easter + datetime.timedelta(days=49)
+    christmas = datetime.date(liturgical_year - 1, 12, 25)
+    baptism = baptism_of_the_lord(liturgical_year)
+    return [
+        (Season.ADVENT, first_sunday_of_advent(liturgical_year - 1), christmas - _DAY),
+        (Season.CHRISTMAS, christmas, baptism),
+        (Season.ORDINARY_TIME, baptism + _DAY, ash_wednesday - _DAY),
+        (Season.LENT, ash_wednesday, holy_thursday - _DAY),
+        (Season.TRIDUUM, holy_thursday, easter - _DAY),
+        (Season.EASTER, easter, pentecost),
+        (Season.ORDINARY_TIME, pentecost + _DAY, first_sunday_of_advent(liturgical_year) - _DAY),
+    ]
+
+
+def _celebrations(year: int):
+    """Returns {date: (name, rank, marian, of the Lord)} for the celebrations of a civil year, before precedence."""
+    easter = easter_sunday(year)
+    palm_sunday = easter - datetime.timedelta(days=7)
+    celebrations = {}
+
+    def add(day, name, rank, marian, of_the_lord):
+        current = celebrations.get(day)
+        if current is None or rank <= current[1]:
+            celebrations[day] = (name, rank, marian, of_the_lord)
+
+    for month, day_of_month, name, rank, marian, of_the_lord in FIXED_CELEBRATIONS:
+        day = datetime.date(year, month, day_of_month)
+        # Solemnities displaced by Holy Week, the Easter octave or a Sunday of Advent or Lent
+        if (month, day_of_month) == (3, 19) and palm_sunday <= day:
+            day = palm_sunday - _DAY
+        elif (month, day_of_month) == (3, 25) and palm_sunday <= day <= easter + datetime.timedelta(days=7):
+            day = easter + datetime.timedelta(days=8)
+        elif (month, day_of_month) in ((3, 19), (3, 25), (12, 8)) and day.weekday() == 6:
+            day += _DAY
+        add(day, name, rank, marian, of_the_lord)
+
+    christmas = datetime.date(year, 12, 25)
+    holy_family = christmas + datetime.timedelta(days=7 - (christmas.weekday() + 1) % 7 or 7)
+    add(holy_family if holy_family.year == year else datetime.date(year, 12, 30),
+        "Holy Family of Jesus, Mary and Joseph", Rank.FEAST, False, True)
+    add(baptism_of_the_lord(year), "Baptism of the Lord", Rank.FEAST, False, True)
+    advent = first_sunday_of_advent(year)
+    add(advent, "First Sunday of Advent", Rank.PRINCIPAL, False, False)
+    add(advent - datetime.timedelta(days=7), "Our Lord Jesus Christ, King of the Universe", Rank.SOLEMNITY, False, True)
+    for offset, name, rank, marian, of_the_lord in EASTER_CELEBRATIONS:
+        add(easter + datetime.timedelta(days=offset), name, rank, marian, of_the_lord)
+    return celebrations
+
+
+@functools.lru_cache(maxsize=32)
+def year_calendar(year: int):
+    """Returns {'YYYY-MM-DD': LiturgicalDay} for every day of a civil year. Memoised."""
+    easter = easter_sunday(year)
+    celebrations = _celebrations(year)
+    calendar = {}
+    for liturgical_year in (year, year + 1):
+        for season, first, last in season_spans(liturgical_year):
+            day = max(first, datetime.date(year, 1, 1))
+            while day <= last and day.year == year:
+                feast = celebrations.get(day)
+                if feast is not None:
+                    name, rank, marian, of_the_lord = feast
+                    # Memorials give way to Sundays, Lent and the Easter octave; on a Sunday
+                    # only solemnities and celebrations of the Lord are kept
+                    if rank >= Rank.MEMORIAL and (day.weekday() == 6 or season in (Season.LENT, Season.TRIDUUM)
+                                                  or easter <= day <= easter + datetime.timedelta(days=7)):
+                        feast = None
+                    elif rank == Rank.FEAST and day.weekday() == 6 and not of_the_lord:
+                        feast = None
+                if feast is None:
+                    calendar[day.isoformat()] = LiturgicalDay(season, None, None, False)
+                else:
+                    calendar[day.isoformat()] = LiturgicalDay(season, feast[0], feast[1], feast[2])
+                day += _DAY
+    return calendar
+
+
+def liturgical_day(date_text: str):
+    """Returns the LiturgicalDay of a 'YYYY-MM-DD...' date, or None if it can't be parsed."""
+    try:
+        day = datetime.datetime.strptime(date_text[:10], "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+    return year_calendar(day.year)[day.isoformat()]
+
+
+def describe_day(date_text: str):
+    """Returns e.g. "Lent" or "Assumption of the Blessed Virgin Mary (Ordinary Time)", or None."""
+    day = liturgical_day(date_text)
+    if day is None:
+        return None
+    return f"{day.feast} ({day.season.label})" if day.feast else day.season.label
+
+
+def _is_cached(conn, year: int):
+    # Years are written whole, so their last day marks them as cached
+    return conn.execute("SELECT 1 FROM liturgical_calendar WHERE day = ?", (f"{year}-12-31",)).fetchone() is not None
+
+
+def ensure_calendar(conn, first_year: int, last_year: int):
+    """Caches the calendar of the civil years first_year..last_year in liturgical_calendar, inside the caller's transaction."""
+    for year in range(first_year, last_year + 1):
+        if _is_cached(conn, year):
+            continue
+        conn.executemany(INSERT_CALENDAR_SQL, [
+            (date_text, int(day.season), day.feast, int(day.rank) if day.rank is not None else None, day.marian)
+            for date_text, day in year_calendar(year).items()])
+
+
+def season_counts(table: str, liturgical_year: int = None):
+    """
+    Returns {season label: entries} for a tagged tracker table (see TAGGED_TABLES) over a
+    liturgical year (default: the current one), in calendar order. Each season span is one
+    indexed range count; archived entries are included when the year reaches the archive.
+    """
+    liturgical_year = liturgical_year or liturgical_year_of(datetime.date.today())
+    column = TAGGED_TABLES[table]
+    conn = get_db_connection()
+
+    try:
+        counts = {}
+        for season, first, last in season_spans(liturgical_year):
+            start, end = first.isoformat(), last.isoformat()
+            include_archive = archive.range_reaches_archive(conn, table, start, end)
+            rows = archive.select_rows(conn, table, SEASON_COUNT_SQL.replace("{column}", column),
+                                       (start, (last + _DAY).isoformat()), "", None, include_archive)
+            counts[season.label] = counts.get(season.label, 0) + sum(row["total"] for row in rows)
+        return counts
+    except Exception as e:
+        print(f"Error counting entries per season: {e}")
+        return {}
+    finally:
+        conn.close()
+
+
+def feast_counts(table: str, marian_only: bool = False):
+    """
+    Returns {feast: entries} for a tagged tracker table, most frequent first: the entries
+    dated on each feast day, archived entries included. The calendar is cached for the
+    years the table covers first.
+    """
+    column = TAGGED_TABLES[table]
+    conn = get_db_connection()
+
+    try:
+        # Every date may be a feast, so the archive is read whenever rows have been archived
+        include_archive = archive.get_archive_boundary(conn, table) is not None
+        ranges = archive.select_rows(conn, table, DATE_RANGE_SQL.replace("{column}", column), (), "", None,
+                                     include_archive)
+        firsts = [row["first"] for row in ranges if row["first"] is not None]
+        if not firsts:
+            return {}
+        first, last = min(firsts), max(row["last"] for row in ranges if row["last"] is not None)
+        first_year, last_year = int(first[:4]), int(last[:4])
+        # Only a year not cached yet takes the write lock
+        if not all(_is_cached(conn, year) for year in range(first_year, last_year + 1)):
+            with write_transaction(conn):
+                ensure_calendar(conn, first_year, last_year)
+        query = FEAST_COUNTS_SQL.format(table="{table}", column=column,
+                                        marian=" AND c.marian = TRUE" if marian_only else "")
+        counts = {}
+        for row in archive.select_rows(conn, table, query, (first[:10], last[:10]), "", None, include_archive):
+            counts[row["feast"]] = counts.get(row["feast"], 0) + row["total"]
+        return dict(sorted(counts.items(), key=lambda item: -item[1]))
+    except Exception as e:
+        print(f"Error counting entries per feast: {e}")
+        return {}
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    year = int(sys.argv[1]) if len(sys.argv) > 1 else datetime.date.today().year
+    print(f"Liturgical year {year}:")
+    for season, first, last in season_spans(year):
+        print(f"  {season.label}: {first} to {last}")
+    print(f"\nCelebrations in {year}:")
+    for date_text, day in year_calendar(year).items():
+        if day.feast and day.rank <= Rank.FEAST:
+            print(f"  {date_text} {day.feast} ({day.rank.label})")
@@ -0,0 +1 @@
+# Reminders module initialization
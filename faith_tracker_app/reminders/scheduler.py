@@ -0,0 +1,213 @@
+# faith_tracker_app/reminders/scheduler.py
+"""
+Reminders: "no Rosary logged today" and "unconfessed sins older than 30 days".
+
+Each reminder's next due time lives in one row of reminder_schedule. Triggers on
+rosary_prayers and sins_confession_log move it on every write, whichever path made
+it (tracker functions, batch, import, sync, the API): a prayer pushes the Rosary
+reminder to the evening after its date, and the confession reminder follows the
+oldest unconfessed sin. The database is single-user, so this is the user's schedule.
+
+ReminderScheduler loads those rows into a min-heap keyed by due time, so finding
+what is due reads only the schedule, never the tracker tables. Due reminders are
+rescheduled and, once that is committed, passed to a notifier: the Rosary reminder
+moves to the next evening, the confession reminder REMINDER_REPEAT later while the
+backlog lasts. start() runs the checks in a background thread, sleeping until the
+next due time (at most POLL_INTERVAL, so writes made elsewhere are picked up).
+
+The delays can be changed in the table, e.g.
+    UPDATE reminder_schedule SET delay = '+21 hours' WHERE reminder = 'rosary';
+
+Run with: python -m faith_tracker_app.reminders.scheduler [--watch] [--notify-file PATH]
+"""
+import argparse
+import datetime
+import heapq
+import sys
+import threading
+
+from faith_tracker_app.database import connection
+from faith_tracker_app.database.concurrency import write_transaction
+from faith_tracker_app.database.schema import REMINDER_REPEAT
+
+POLL_INTERVAL = 60.0
+
+# Reschedules a reminder that was just sent; parameters are (now, now, reminder)
+RESCHEDULE_SQL = {
+    # The same time tomorrow (local time), unless a prayer already moved it further
+    "rosary": """
+        UPDATE reminder_schedule SET due_at = max(due_at, datetime(date(?, 'localtime'), '+1 day', delay, 'utc')),
+            last_sent = ?
+        WHERE reminder = ?
+    """,
+    "confession": f"""
+        UPDATE reminder_schedule SET due_at = datetime(?, '{REMINDER_REPEAT}'), last_sent = ? WHERE reminder = ?
+    """,
+}
+
+OLDEST_UNCONFESSED_SQL = """
+    SELECT created_at FROM sins_confession_log WHERE confessed = FALSE ORDER BY created_at LIMIT 1
+"""
+
+
+def _utc_now():
+    return datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def reminder_message(conn, reminder: str):
+    """Returns the text of a due reminder."""
+    if reminder == "rosary":
+        return "No Rosary logged today."
+    oldest = conn.execute(OLDEST_UNCONFESSED_SQL).fetchone()
+    since = f", the oldest logged on {oldest[0][:10]}" if oldest else ""
+    return f"You have unconfessed sins older than the confession interval{since}."
+
+
+class Notifier:
+    """Delivers reminders; subclass and implement notify()."""
+
+    def notify(self, reminder: str, message: str, due_at: str):
+        raise NotImplementedError
+
+
+class StdoutNotifier(Notifier):
+    """Prints reminders to standard output (or another text stream)."""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def notify(self, reminder, message, due_at):
+        print(f"Reminder: {message}", file=self.stream or sys.stdout, flush=True)
+
+
+class FileNotifier(Notifier):
+    """Appends reminders to a text file, one tab-separated line each: due time, reminder, message."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def notify(self, reminder, message, due_at):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(f"{due_at}\t{reminder}\t{message}\n")
+
+
+class ReminderScheduler:
+    """Min-heap of (due time, reminder) loaded from reminder_schedule; see the module docstring."""
+
+    def __init__(self, notifier: Notifier = None, poll_interval: float = None):
+        self.notifier = notifier or StdoutNotifier()
+        self.poll_interval = POLL_INTERVAL if poll_interval is None else poll_interval
+        self.heap = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def load(self, conn):
+        """Replaces the heap with the pending reminders of reminder_schedule."""
+        self.heap = [(row[0], row[1]) for row in
+                     conn.execute("SELECT due_at, reminder FROM reminder_schedule WHERE due_at IS NOT NULL")]
+        heapq.heapify(self.heap)
+
+    def next_due(self):
+        """Returns (due time, reminder) of the next reminder, or None."""
+        return self.heap[0] if self.heap else None
+
+    def run_due(self, now: str = None):
+        """
+        Sends every reminder due at now ('YYYY-MM-DD HH:MM:SS' UTC, default the current time)
+        once its rescheduling is committed. Returns the [(reminder, message)] sent.
+        """
+        now = now or _utc_now()
+        conn = connection.get_db_connection()
+        try:
+            # Most checks find nothing due, and reading the schedule needs no lock
+            self.load(conn)
+            if not self.heap or self.heap[0][0] > now:
+                return []
+            # Under the write lock, so two schedulers can't both take the same reminder
+            with write_transaction(conn):
+                self.load(conn)
+                due = []
+                while self.heap and self.heap[0][0] <= now:
+                    due.append(heapq.heappop(self.heap))
+                messages = []
+                for due_at, reminder in due:
+                    messages.append((reminder, reminder_message(conn, reminder), due_at))
+                    conn.execute(RESCHEDULE_SQL[reminder], (now, now, reminder))
+            # Only now, so a failed commit can't send a reminder that is sent again later
+            for reminder, message, due_at in messages:
+                self.notifier.notify(reminder, message, due_at)
+            self.load(conn)
+            return [(reminder, message) for reminder, message, _ in messages]
+        finally:
+            conn.close()
+
+    def _seconds_until_next(self):
+        upcoming = self.next_due()
+        if upcoming is None:
+            return self.poll_interval
+        due_at = datetime.datetime.strptime(upcoming[0], "%Y-%m-%d %H:%M:%S").replace(tzinfo=datetime.timezone.utc)
+        remaining = (due_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds()
+        return min(max(remaining, 0.0), self.poll_interval)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_due()
+            except Exception as e:
+                print(f"Error checking reminders: {e}")
+            self._stop.wait(self._seconds_until_next())
+
+    def start(self):
+        """Starts checking reminders in a daemon thread. Returns the thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="reminder-scheduler", daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: float = None):
+        """Stops the background thread and waits for it to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+def get_schedule():
+    """Returns the reminder_schedule rows as dictionaries, or [] on error."""
+    conn = connection.get_db_connection()
+    try:
+        rows = conn.execute("SELECT reminder, delay, due_at, last_sent FROM reminder_schedule ORDER BY reminder")
+        return [dict(row) for row in rows.fetchall()]
+    except Exception as e:
+        print(f"Error retrieving the reminder schedule: {e}")
+        return []
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Send the reminders that are due.")
+    parser.add_argument("--watch", action="store_true", help="Keep running and send reminders as they fall due")
+    parser.add_argument("--notify-file", help="Append reminders to this file instead of printing them")
+    args = parser.parse_args(argv)
+
+    connection.initialize_database(quiet=True)
+    notifier = FileNotifier(args.notify_file) if args.notify_file else StdoutNotifier()
+    scheduler = ReminderScheduler(notifier)
+    if not args.watch:
+        scheduler.run_due()
+        for row in get_schedule():
+            print(f"{row['reminder']}: next due {row['due_at'] or 'when needed'} (UTC)")
+        return 0
+    scheduler.start()
+    try:
+        while True:
+            threading.Event().wait(3600)
+    except KeyboardInterrupt:
+        scheduler.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,69 +1,248 @@
 # faith_tracker_app/rosary/rosary_tracker.py
 import datetime
-from faith_tracker_app.database.connection import get_db_connection
+import enum
+import sqlite3
+import uuid
+from faith_tracker_app.database import archive
+from faith_tracker_app.database.compression import compress_text, lazy_row
+from faith_tracker_app.database.connection import natural_key_hash
+from faith_tracker_app.database.schema import INTERACTIVE_CONFLICT_MODE, list_columns
+from faith_tracker_app.database.backends import unit_of_work
+from faith_tracker_app.database.unit_of_work import insert_entry
+from faith_tracker_app.liturgy.liturgical_calendar import describe_day
 
-def log_rosary_prayer(prayer_date: str = None, mysteries: str = None, notes: str = None):
+class Mysteries(enum.IntEnum):
+    """The four sets of mysteries, as stored in rosary_prayers.mystery_id."""
+    JOYFUL = 1
+    SORROWFUL = 2
+    GLORIOUS = 3
+    LUMINOUS = 4
+
+    @property
+    def label(self):
+        return self.name.capitalize()
+
+WEEKDAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Traditional weekday schedule, indexed by datetime.date.weekday() (0 = Monday)
+MYSTERIES_SCHEDULE = [
+    Mysteries.JOYFUL,     # Monday
+    Mysteries.SORROWFUL,  # Tuesday
+    Mysteries.GLORIOUS,   # Wednesday
+    Mysteries.LUMINOUS,   # Thursday
+    Mysteries.SORROWFUL,  # Friday
+    Mysteries.JOYFUL,     # Saturday
+    Mysteries.GLORIOUS,   # Sunday
+]
+
+def parse_mysteries(mysteries: str):
     """
-    Logs a Rosary prayer session.
-    If prayer_date is None, the current date is used.
-    prayer_date should be in 'YYYY-MM-DD' format if provided.
+    Returns the Mysteries member for a free-text name such as "joyful" or "Glorious ",
+    or None if the text doesn't name one of the four sets.
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    if not mysteries:
+        return None
+    return Mysteries.__members__.get(mysteries.strip().upper())
+
+def get_scheduled_mysteries(prayer_date: str = None):
+    """Returns the Mysteries traditionally prayed on prayer_date ('YYYY-MM-DD', default today)."""
+    if prayer_date is None:
+        day = datetime.date.today()
+    else:
+        day = datetime.datetime.strptime(prayer_date, "%Y-%m-%d").date()
+    return MYSTERIES_SCHEDULE[day.weekday()]
+
+INSERT_ROSARY_SQL = """
+    INSERT INTO rosary_prayers (prayer_date, mysteries, notes, mystery_id, weekday, uuid, content_hash)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+MYSTERY_COUNTS_SQL = "SELECT mystery_id, COUNT(*) AS total FROM rosary_prayers GROUP BY mystery_id"
 
+WEEKDAY_COUNTS_SQL = "SELECT weekday, COUNT(*) AS total FROM rosary_prayers GROUP BY weekday"
+
+WEEKDAY_MYSTERY_COUNTS_SQL = """
+    SELECT weekday, mystery_id, COUNT(*) AS total FROM rosary_prayers
+    GROUP BY weekday, mystery_id
+"""
+
+def build_rosary_row(prayer_date: str = None, mysteries: str = None, notes: str = None, default_mysteries: bool = True):
+    """
+    Builds the parameter tuple for INSERT_ROSARY_SQL.
+    If prayer_date is None, the current date is used.
+    Recognised mysteries are stored under their canonical name and enum id; if mysteries is
+    None and default_mysteries is True, the scheduled mysteries for the date are used.
+    The entry gets a new uuid. Long notes are compressed (see compression.py).
+    Raises ValueError if prayer_date is not in 'YYYY-MM-DD' format.
+    """
     if prayer_date is None:
-        prayer_date = datetime.date.today().strftime("%Y-%m-%d")
+        day = datetime.date.today()
+        prayer_date = day.strftime("%Y-%m-%d")
     else:
-        # Validate date format
         try:
-            datetime.datetime.strptime(prayer_date, "%Y-%m-%d")
+            day = datetime.datetime.strptime(prayer_date, "%Y-%m-%d").date()
         except ValueError:
-            print("Error: Invalid prayer_date format. Please use YYYY-MM-DD.")
-            conn.close()
-            return None
+            raise ValueError("Invalid prayer_date format. Please use YYYY-MM-DD.")
+
+    if mysteries is None and default_mysteries:
+        mystery = MYSTERIES_SCHEDULE[day.weekday()]
+    else:
+        mystery = parse_mysteries(mysteries)
+    if mystery is not None:
+        mysteries = mystery.label
+    return (prayer_date, mysteries, compress_text(notes), int(mystery) if mystery is not None else None, day.weekday(),
+            uuid.uuid4().hex, natural_key_hash(prayer_date, mysteries))
+
+class RosaryRepository:
+    """Rosary prayer queries and writes on a given connection; the caller commits (see UnitOfWork)."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def insert(self, row, on_conflict: str = "error"):
+        """Inserts a row built by build_rosary_row. Returns (id, written); see unit_of_work.insert_entry."""
+        return insert_entry(self.conn, INSERT_ROSARY_SQL, "rosary_prayers", row, on_conflict)
+
+    def log_prayer(self, prayer_date: str = None, mysteries: str = None, notes: str = None,
+                   default_mysteries: bool = True, on_conflict: str = "error"):
+        """Logs a prayer (see build_rosary_row). Returns (id, written)."""
+        return self.insert(build_rosary_row(prayer_date, mysteries, notes, default_mysteries), on_conflict)
+
+    @staticmethod
+    def list_query(start_date: str = None, end_date: str = None, with_notes: bool = True, projection: str = "full"):
+        """Returns (SELECT with a {table} placeholder, params, ORDER BY) for list_prayers; see archive.select_rows."""
+        filters, params = archive.date_range_filters("prayer_date", start_date, end_date)
+        query = f"SELECT {', '.join(list_columns('rosary_prayers', projection, with_notes))} FROM {{table}}"
+        if filters:
+            query += " WHERE " + " AND ".join(filters)
+        return query, params, "ORDER BY prayer_date DESC, created_at DESC, id DESC"
+
+    def list_prayers(self, limit: int = None, start_date: str = None, end_date: str = None,
+                     include_archive: bool = False, with_notes: bool = True, projection: str = "full"):
+        """
+        Returns prayer dictionaries; see get_rosary_prayer_history.
+        Raises ValueError for malformed dates or an unknown projection.
+        """
+        query, params, order_by = self.list_query(start_date, end_date, with_notes, projection)
+        include_archive = include_archive or archive.range_reaches_archive(self.conn, "rosary_prayers", start_date, end_date)
+        prayers = archive.select_rows(self.conn, "rosary_prayers", query, params, order_by, limit, include_archive)
+        return [lazy_row(row) for row in prayers]
 
+    def mystery_counts(self):
+        """Returns the number of prayers per set of mysteries; see get_mystery_counts."""
+        rows = self.conn.execute(MYSTERY_COUNTS_SQL)
+        counts = {mystery.label: 0 for mystery in Mysteries}
+        for row in rows.fetchall():
+            label = Mysteries(row['mystery_id']).label if row['mystery_id'] is not None else None
+            counts[label] = row['total']
+        return counts
+
+    def weekday_counts(self, by_mysteries: bool = False):
+        """Returns the number of prayers per weekday; see get_weekday_counts."""
+        if by_mysteries:
+            rows = self.conn.execute(WEEKDAY_MYSTERY_COUNTS_SQL)
+            counts = {name: {} for name in WEEKDAY_NAMES}
+            for row in rows.fetchall():
+                if row['weekday'] is None: # Legacy rows with an unparseable prayer_date
+                    continue
+                label = Mysteries(row['mystery_id']).label if row['mystery_id'] is not None else None
+                counts[WEEKDAY_NAMES[row['weekday']]][label] = row['total']
+        else:
+            rows = self.conn.execute(WEEKDAY_COUNTS_SQL)
+            counts = {name: 0 for name in WEEKDAY_NAMES}
+            for row in rows.fetchall():
+                if row['weekday'] is not None:
+                    counts[WEEKDAY_NAMES[row['weekday']]] = row['total']
+        return counts
+
+def log_rosary_prayer(prayer_date: str = None, mysteries: str = None, notes: str = None, default_mysteries: bool = True,
+                      on_conflict: str = INTERACTIVE_CONFLICT_MODE, conn=None):
+    """
+    Logs a Rosary prayer session.
+    If prayer_date is None, the current date is used.
+    prayer_date should be in 'YYYY-MM-DD' format if provided.
+    If mysteries is None, the mysteries scheduled for that weekday are recorded
+    unless default_mysteries is False.
+    on_conflict (see schema.CONFLICT_MODES) decides what happens if the same mysteries are already
+    logged for that date: by default the prayer is logged as a separate one; with "ignore" or
+    "update" the existing entry's id is returned.
+    conn: an open SQLite connection to use (and commit) instead of the configured storage backend.
+    """
     try:
-        cursor.execute("""
-            INSERT INTO rosary_prayers (prayer_date, mysteries, notes)
-            VALUES (?, ?, ?)
-        """, (prayer_date, mysteries, notes))
-        conn.commit()
+        row = build_rosary_row(prayer_date, mysteries, notes, default_mysteries)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return None
+    prayer_date, mysteries = row[0], row[1]
+
+    try:
+        with unit_of_work(conn, write=True) as uow:
+            log_id, written = uow.rosary.insert(row, on_conflict)
+        if not written:
+            print(f"Rosary prayer for {prayer_date} is already logged (ID: {log_id}).")
+            return log_id
         print(f"Successfully logged Rosary prayer for {prayer_date}" +
               (f" (Mysteries: {mysteries})" if mysteries else "") +
               (f" - Notes: {notes}" if notes else "")
              )
-        return cursor.lastrowid
+        return log_id
+    except sqlite3.IntegrityError:
+        print(f"Error logging Rosary prayer: already logged for {prayer_date}" +
+              (f" with the {mysteries} mysteries." if mysteries else "."))
+        return None
     except Exception as e:
         print(f"Error logging Rosary prayer: {e}")
         return None
-    finally:
-        conn.close()
 
-def get_rosary_prayer_history(limit: int = None):
+def get_rosary_prayer_history(limit: int = None, start_date: str = None, end_date: str = None, include_archive: bool = False,
+                              conn=None, with_notes: bool = True, projection: str = "full"):
     """
-    Retrieves all Rosary prayer entries, ordered by prayer_date descending.
+    Retrieves all Rosary prayer entries, ordered by prayer_date descending (latest logged first on ties).
+    start_date and end_date ('YYYY-MM-DD', inclusive) restrict the prayer dates. Archived
+    prayers are included when the range reaches back into the archive, or if include_archive is True.
+    with_notes=False leaves the notes out, so the listing doesn't read them.
+    projection (see schema.PROJECTIONS): "summary" leaves out the notes, "ids" returns only
+    id, prayer_date and created_at, read from the date index alone.
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    query = "SELECT id, prayer_date, mysteries, notes, created_at FROM rosary_prayers ORDER BY prayer_date DESC, created_at DESC"
-    if limit:
-        query += f" LIMIT {int(limit)}"
-
     try:
-        cursor.execute(query)
-        prayers = cursor.fetchall()
-        return [dict(row) for row in prayers]
+        with unit_of_work(conn) as uow:
+            return uow.rosary.list_prayers(limit, start_date, end_date, include_archive, with_notes, projection)
     except Exception as e:
         print(f"Error retrieving Rosary prayer history: {e}")
         return []
-    finally:
-        conn.close()
 
-def format_rosary_log_for_display(log_entry: dict):
-    """Formats a single rosary log entry dictionary for display."""
+def get_mystery_counts(conn=None):
+    """
+    Returns the number of logged prayers per set of mysteries, e.g. {"Joyful": 12, ...}.
+    Prayers without recognised mysteries are counted under None.
+    """
+    try:
+        with unit_of_work(conn) as uow:
+            return uow.rosary.mystery_counts()
+    except Exception as e:
+        print(f"Error retrieving Rosary mystery counts: {e}")
+        return {}
+
+def get_weekday_counts(by_mysteries: bool = False, conn=None):
+    """
+    Returns the number of logged prayers per weekday, e.g. {"Monday": 3, ...}.
+    With by_mysteries=True, each weekday maps to a {mysteries label: count} dictionary instead.
+    """
+    try:
+        with unit_of_work(conn) as uow:
+            return uow.rosary.weekday_counts(by_mysteries)
+    except Exception as e:
+        print(f"Error retrieving Rosary weekday counts: {e}")
+        return {}
+
+def format_rosary_log_compact(log_entry: dict):
+    """Formats a prayer of the summary (or full) projection as one short line: id, date and mysteries."""
+    return f"{log_entry['id']:>6}  {log_entry['prayer_date']}  {log_entry['mysteries'] or '-'}"
+
+def format_rosary_log_for_display(log_entry: dict, liturgical: bool = False):
+    """Formats a single rosary log entry dictionary for display; liturgical adds the day's season and feast."""
     mysteries_info = f" - Mysteries: {log_entry['mysteries']}" if log_entry['mysteries'] else ""
-    notes_info = f" - Notes: {log_entry['notes']}" if log_entry['notes'] else ""
+    notes_info = f" - Notes: {log_entry['notes']}" if log_entry.get('notes') else ""
 
     # Parse date for friendlier format if needed, though it's already YYYY-MM-DD
     # For consistency, let's ensure it's just the date part
@@ -73,7 +252,12 @@ def format_rosary_log_for_display(log_entry: dict):
     except ValueError:
         formatted_date = log_entry['prayer_date'] # Fallback
 
-    return f"[{log_entry['id']}] {formatted_date}{mysteries_info}{notes_info}"
+    day_info = ""
+    if liturgical:
+        description = describe_day(log_entry['prayer_date'])
+        day_info = f" [{description}]" if description else ""
+
+    return f"[{log_entry['id']}] {formatted_date}{mysteries_info}{notes_info}{day_info}"
 
 if __name__ == '__main__':
     # This block is for testing the module directly
@@ -105,6 +289,9 @@ if __name__ == '__main__':
     else:
         print("No Rosary prayers logged yet.")
 
+    print("\nPrayers per set of mysteries:", get_mystery_counts())
+    print("Prayers per weekday:", get_weekday_counts())
+
     # Test invalid date format
     print("\nTesting invalid date format:")
     log_rosary_prayer(prayer_date="26-10-2023")
@@ -0,0 +1,109 @@
+# faith_tracker_app/sins/backlog.py
+"""
+Consistency check of the maintained confession backlog.
+
+The sins_backlog table (see schema.SINS_BACKLOG_SCHEMAS) holds, per month, the
+number of unconfessed sins logged and when the oldest of them was logged.
+Triggers update it in the same transaction as every insert, confession, sync
+rewrite and delete, so get_sin_log(show_all=False, show_confessed=False) is no
+longer needed just to count the backlog (see sins_tracker.get_backlog_summary).
+
+check_backlog() rebuilds the summary from sins_confession_log and reports where
+the stored rows differ; with repair=True it replaces them with the rebuilt ones.
+The maintenance run does this weekly.
+
+Run with: python -m faith_tracker_app.sins.backlog [--repair]
+"""
+import argparse
+import sys
+
+from faith_tracker_app.database import connection
+from faith_tracker_app.database.concurrency import begin_write, commit_write
+from faith_tracker_app.database.schema import SINS_BACKLOG_FROM_LOG_SQL
+from faith_tracker_app.sins.sins_tracker import BACKLOG_SUMMARY_SQL
+
+
+def rebuild_backlog(conn):
+    """Returns {month: (unconfessed, oldest)} computed from the sin log itself."""
+    return {row[0]: (row[1], row[2]) for row in conn.execute(f"{SINS_BACKLOG_FROM_LOG_SQL} GROUP BY 1")}
+
+
+def diff_backlog(conn):
+    """
+    Returns a row {"month", "log_unconfessed", "log_oldest", "summary_unconfessed", "summary_oldest"}
+    for every month where the stored summary differs from the log (a month missing on one side
+    counts 0, oldest None there), in month order. [] if they agree.
+    """
+    expected = rebuild_backlog(conn)
+    stored = {row[0]: (row[1], row[2]) for row in conn.execute(BACKLOG_SUMMARY_SQL)}
+    differences = []
+    for month in sorted(expected.keys() | stored.keys()):
+        log, summary = expected.get(month, (0, None)), stored.get(month, (0, None))
+        if log != summary:
+            differences.append({"month": month, "log_unconfessed": log[0], "log_oldest": log[1],
+                                "summary_unconfessed": summary[0], "summary_oldest": summary[1]})
+    return differences
+
+
+def repair_backlog(conn):
+    """Replaces the stored summary with the one rebuilt from the log; the caller commits."""
+    conn.execute("DELETE FROM sins_backlog")
+    conn.execute(f"INSERT INTO sins_backlog (month, unconfessed, oldest) {SINS_BACKLOG_FROM_LOG_SQL} GROUP BY 1")
+
+
+def check_backlog(repair: bool = False, conn=None):
+    """
+    Diffs the stored backlog summary against the sin log (see diff_backlog) and, with repair=True,
+    rebuilds it when they differ. Returns the differences found, or None on error.
+    conn: an open SQLite connection to use (and commit) instead of the configured database.
+    """
+    own_connection = conn is None
+    conn = conn or connection.get_db_connection()
+    try:
+        # One transaction, so a concurrent write can't show up as a difference; a repair
+        # takes the write lock up front, as a read transaction may not be let to write
+        if not conn.in_transaction:
+            if repair:
+                begin_write(conn)
+            else:
+                conn.execute("BEGIN")
+        differences = diff_backlog(conn)
+        if differences and repair:
+            repair_backlog(conn)
+        commit_write(conn)
+        return differences
+    except Exception as e:
+        conn.rollback()
+        print(f"Error checking the confession backlog: {e}")
+        return None
+    finally:
+        if own_connection:
+            conn.close()
+
+
+def format_difference(row: dict):
+    """Formats one difference returned by diff_backlog."""
+    return (f"{row['month'] or 'unknown month'}: log has {row['log_unconfessed']} unconfessed "
+            f"(oldest {row['log_oldest']}), summary has {row['summary_unconfessed']} (oldest {row['summary_oldest']})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the maintained confession backlog against the sin log.")
+    parser.add_argument("--repair", action="store_true", help="Rebuild the summary if it differs")
+    args = parser.parse_args(argv)
+
+    connection.initialize_database(quiet=True)
+    differences = check_backlog(args.repair)
+    if differences is None:
+        return 1
+    for difference in differences:
+        print(format_difference(difference))
+    if not differences:
+        print("The confession backlog summary matches the sin log.")
+        return 0
+    print("Rebuilt the summary from the sin log." if args.repair else "Run with --repair to rebuild the summary.")
+    return 0 if args.repair else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,71 +1,177 @@
 # faith_tracker_app/sins/sins_tracker.py
 import datetime
-from faith_tracker_app.database.connection import get_db_connection
+import sqlite3
+import uuid
+from faith_tracker_app.database import archive
+from faith_tracker_app.database.compression import compress_text, lazy_row
+from faith_tracker_app.database.connection import natural_key_hash
+from faith_tracker_app.database.schema import INTERACTIVE_CONFLICT_MODE, list_columns
+from faith_tracker_app.database.backends import unit_of_work
+from faith_tracker_app.database.unit_of_work import insert_entry
 
-def add_sin_entry(sin_description: str, occurrence_date: str = None, notes: str = None):
+INSERT_SIN_SQL = """
+    INSERT INTO sins_confession_log (sin_description, occurrence_date, confessed, notes, uuid, content_hash)
+    VALUES (?, ?, FALSE, ?, ?, ?)
+"""
+
+CONFESS_SIN_SQL = """
+    UPDATE sins_confession_log
+    SET confessed = TRUE, confession_date = ?
+    WHERE id = ? AND confessed = FALSE
+"""
+
+IS_CONFESSED_SQL = "SELECT confessed FROM sins_confession_log WHERE id = ?"
+
+# The maintained per-month summary of unconfessed sins (see schema.SINS_BACKLOG_SCHEMAS)
+BACKLOG_SUMMARY_SQL = "SELECT month, unconfessed, oldest FROM sins_backlog ORDER BY month"
+
+def summarize_backlog(months):
+    """
+    Returns {"unconfessed": total, "oldest": created_at of the oldest unconfessed sin or None,
+    "by_month": {"YYYY-MM": count}} from (month, unconfessed, oldest) rows in month order.
+    """
+    by_month = {month: count for month, count, _ in months}
+    oldest = min((oldest for _, _, oldest in months if oldest is not None), default=None)
+    return {"unconfessed": sum(by_month.values()), "oldest": oldest, "by_month": by_month}
+
+def _check_date(value: str, field_name: str):
+    """Raises ValueError if value is not in 'YYYY-MM-DD' format."""
+    try:
+        datetime.datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise ValueError(f"Invalid {field_name} format. Please use YYYY-MM-DD.")
+
+def build_sin_row(sin_description: str, occurrence_date: str = None, notes: str = None):
+    """
+    Builds the parameter tuple for INSERT_SIN_SQL.
+    The entry gets a new uuid. Without an occurrence_date, its natural key uses the day it is
+    logged (UTC, like created_at). A long description or notes are compressed (see compression.py).
+    Raises ValueError if occurrence_date is given and not in 'YYYY-MM-DD' format.
+    """
+    if occurrence_date:
+        _check_date(occurrence_date, "occurrence_date")
+    key_date = occurrence_date or datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%d")
+    return (compress_text(sin_description), occurrence_date, compress_text(notes), uuid.uuid4().hex,
+            natural_key_hash(sin_description, key_date))
+
+def build_confession_row(entry_id: int, confession_date: str = None):
+    """
+    Builds the parameter tuple for CONFESS_SIN_SQL.
+    If confession_date is None, the current date is used.
+    """
+    if confession_date is None:
+        confession_date = datetime.date.today().strftime("%Y-%m-%d")
+    else:
+        _check_date(confession_date, "confession_date")
+    return (confession_date, entry_id)
+
+class SinsRepository:
+    """Sin log queries and writes on a given connection; the caller commits (see UnitOfWork)."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def insert(self, row, on_conflict: str = "error"):
+        """Inserts a row built by build_sin_row. Returns (id, written); see unit_of_work.insert_entry."""
+        return insert_entry(self.conn, INSERT_SIN_SQL, "sins_confession_log", row, on_conflict)
+
+    def add_entry(self, sin_description: str, occurrence_date: str = None, notes: str = None,
+                  on_conflict: str = "error"):
+        """Adds an unconfessed entry (see build_sin_row). Returns (id, written)."""
+        return self.insert(build_sin_row(sin_description, occurrence_date, notes), on_conflict)
+
+    def confess(self, entry_id: int, confession_date: str = None):
+        """
+        Marks an unconfessed entry as confessed (see build_confession_row).
+        Returns False if the entry doesn't exist or was already confessed.
+        """
+        return self.conn.execute(CONFESS_SIN_SQL, build_confession_row(entry_id, confession_date)).rowcount > 0
+
+    def is_confessed(self, entry_id: int):
+        """Returns whether an entry is confessed, or None if there is no such entry."""
+        row = self.conn.execute(IS_CONFESSED_SQL, (entry_id,)).fetchone()
+        return bool(row['confessed']) if row else None
+
+    def backlog_summary(self):
+        """Returns the unconfessed backlog from the maintained summary; see summarize_backlog."""
+        return summarize_backlog([tuple(row) for row in self.conn.execute(BACKLOG_SUMMARY_SQL)])
+
+    @staticmethod
+    def list_query(show_all: bool = True, show_confessed: bool = True, start_date: str = None, end_date: str = None,
+                   with_notes: bool = True, projection: str = "full"):
+        """Returns (SELECT with a {table} placeholder, params, ORDER BY) for list_entries; see archive.select_rows."""
+        base_query = f"SELECT {', '.join(list_columns('sins_confession_log', projection, with_notes))} FROM {{table}}"
+        filters, params = archive.date_range_filters("created_at", start_date, end_date)
+        if not show_all:
+            if show_confessed:
+                filters.append("confessed = TRUE")
+            else:
+                filters.append("confessed = FALSE")
+
+        if filters:
+            base_query += " WHERE " + " AND ".join(filters)
+        return base_query, params, "ORDER BY created_at DESC, id DESC"
+
+    def list_entries(self, show_all: bool = True, show_confessed: bool = True, limit: int = None,
+                     start_date: str = None, end_date: str = None, include_archive: bool = False,
+                     with_notes: bool = True, projection: str = "full"):
+        """Returns entry dictionaries; see get_sin_log. Raises ValueError for malformed dates or an unknown projection."""
+        query, params, order_by = self.list_query(show_all, show_confessed, start_date, end_date, with_notes,
+                                                  projection)
+        include_archive = include_archive or archive.range_reaches_archive(self.conn, "sins_confession_log", start_date, end_date)
+        entries = archive.select_rows(self.conn, "sins_confession_log", query, params, order_by, limit, include_archive)
+        return [lazy_row(row) for row in entries]
+
+def add_sin_entry(sin_description: str, occurrence_date: str = None, notes: str = None,
+                  on_conflict: str = INTERACTIVE_CONFLICT_MODE, conn=None):
     """
     Adds a new sin entry to the log.
     occurrence_date should be in 'YYYY-MM-DD' format if provided.
     Sins are initially marked as not confessed.
+    on_conflict (see schema.CONFLICT_MODES) decides what happens if the same sin is already logged
+    for that day: by default it is added as a separate entry; with "ignore" or "update" the
+    existing entry's id is returned.
+    conn: an open SQLite connection to use (and commit) instead of the configured storage backend.
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    if occurrence_date:
-        try:
-            datetime.datetime.strptime(occurrence_date, "%Y-%m-%d")
-        except ValueError:
-            print("Error: Invalid occurrence_date format. Please use YYYY-MM-DD.")
-            conn.close()
-            return None
+    try:
+        row = build_sin_row(sin_description, occurrence_date, notes)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return None
 
     try:
-        cursor.execute("""
-            INSERT INTO sins_confession_log (sin_description, occurrence_date, confessed, notes)
-            VALUES (?, ?, FALSE, ?)
-        """, (sin_description, occurrence_date, notes))
-        conn.commit()
+        with unit_of_work(conn, write=True) as uow:
+            entry_id, written = uow.sins.insert(row, on_conflict)
+        if not written:
+            print(f"Sin entry '{sin_description}' is already logged (ID: {entry_id}).")
+            return entry_id
         print(f"Successfully added sin entry: '{sin_description}'")
-        return cursor.lastrowid
+        return entry_id
+    except sqlite3.IntegrityError:
+        print(f"Error adding sin entry: '{sin_description}' is already logged for that day.")
+        return None
     except Exception as e:
         print(f"Error adding sin entry: {e}")
         return None
-    finally:
-        conn.close()
 
-def mark_sin_as_confessed(entry_id: int, confession_date: str = None):
+def mark_sin_as_confessed(entry_id: int, confession_date: str = None, conn=None):
     """
     Marks a specific sin entry as confessed.
     confession_date should be in 'YYYY-MM-DD' format. If None, current date is used.
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    if confession_date is None:
-        confession_date = datetime.date.today().strftime("%Y-%m-%d")
-    else:
-        try:
-            datetime.datetime.strptime(confession_date, "%Y-%m-%d")
-        except ValueError:
-            print("Error: Invalid confession_date format. Please use YYYY-MM-DD.")
-            conn.close()
-            return False
+    try:
+        confession_date = build_confession_row(entry_id, confession_date)[0]
+    except ValueError as e:
+        print(f"Error: {e}")
+        return False
 
     try:
-        cursor.execute("""
-            UPDATE sins_confession_log
-            SET confessed = TRUE, confession_date = ?
-            WHERE id = ? AND confessed = FALSE
-        """, (confession_date, entry_id))
-        conn.commit()
-        if cursor.rowcount > 0:
-            print(f"Sin entry ID {entry_id} marked as confessed on {confession_date}.")
-            return True
-        else:
+        with unit_of_work(conn, write=True) as uow:
+            if uow.sins.confess(entry_id, confession_date):
+                print(f"Sin entry ID {entry_id} marked as confessed on {confession_date}.")
+                return True
             # Could be ID not found, or already confessed
-            cursor.execute("SELECT confessed FROM sins_confession_log WHERE id = ?", (entry_id,))
-            result = cursor.fetchone()
-            if result and result['confessed']:
+            if uow.sins.is_confessed(entry_id):
                 print(f"Sin entry ID {entry_id} was already marked as confessed.")
             else:
                 print(f"Sin entry ID {entry_id} not found or could not be updated.")
@@ -73,54 +179,71 @@ def mark_sin_as_confessed(entry_id: int, confession_date: str = None):
     except Exception as e:
         print(f"Error marking sin as confessed: {e}")
         return False
-    finally:
-        conn.close()
 
-def get_sin_log(show_all: bool = True, show_confessed: bool = True, limit: int = None):
+def get_sin_log(show_all: bool = True, show_confessed: bool = True, limit: int = None,
+                start_date: str = None, end_date: str = None, include_archive: bool = False, conn=None,
+                with_notes: bool = True, projection: str = "full"):
     """
     Retrieves sin entries.
     - show_all: If True, ignores show_confessed and returns all.
     - show_confessed: If False and show_all is False, only shows unconfessed sins.
                       If True and show_all is False, only shows confessed sins.
-    Ordered by created_at descending.
+    - start_date, end_date: 'YYYY-MM-DD' (inclusive) range of the date the entry was logged.
+      Archived (confessed) entries are included when the range reaches back into the
+      archive, or if include_archive is True.
+    - with_notes: If False, the notes are left out, so the listing doesn't read them.
+    - projection (see schema.PROJECTIONS): "summary" leaves out the notes and confession date,
+      "ids" returns only id and created_at, read from an index alone.
+    Ordered by created_at descending (latest logged first on ties).
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    base_query = "SELECT id, sin_description, occurrence_date, confessed, confession_date, notes, created_at FROM sins_confession_log"
-    filters = []
-    params = []
-
-    if not show_all:
-        if show_confessed:
-            filters.append("confessed = TRUE")
-        else:
-            filters.append("confessed = FALSE")
-
-    if filters:
-        base_query += " WHERE " + " AND ".join(filters)
-
-    base_query += " ORDER BY created_at DESC"
-
-    if limit:
-        base_query += f" LIMIT {int(limit)}"
-
     try:
-        cursor.execute(base_query, tuple(params))
-        entries = cursor.fetchall()
-        return [dict(row) for row in entries]
+        with unit_of_work(conn) as uow:
+            return uow.sins.list_entries(show_all, show_confessed, limit, start_date, end_date, include_archive,
+                                         with_notes, projection)
     except Exception as e:
         print(f"Error retrieving sin log: {e}")
         return []
-    finally:
-        conn.close()
+
+def get_backlog_summary(conn=None):
+    """
+    Returns the unconfessed backlog: {"unconfessed": count, "oldest": when the oldest unconfessed
+    sin was logged, "by_month": {"YYYY-MM": count}}. It is read from a summary kept up to date on
+    every write, not counted from the log. Returns {} on error.
+    """
+    try:
+        with unit_of_work(conn) as uow:
+            return uow.sins.backlog_summary()
+    except Exception as e:
+        print(f"Error retrieving the confession backlog: {e}")
+        return {}
+
+def format_backlog_summary(summary: dict):
+    """Formats a backlog summary (see get_backlog_summary) for display."""
+    if not summary.get("unconfessed"):
+        return "No unconfessed sins."
+    lines = [f"{summary['unconfessed']} unconfessed sin(s), the oldest logged on {(summary['oldest'] or '?')[:10]}."]
+    lines += [f"  {month or 'unknown'}: {count}" for month, count in summary["by_month"].items()]
+    return "\n".join(lines)
+
+# Longest description shown by the compact listing
+COMPACT_DESCRIPTION_WIDTH = 60
+
+def format_sin_entry_compact(entry: dict):
+    """
+    Formats an entry of the summary (or full) projection as one short line: id, date logged,
+    [x] if confessed, and the description, shortened to COMPACT_DESCRIPTION_WIDTH.
+    """
+    description = entry['sin_description']
+    if len(description) > COMPACT_DESCRIPTION_WIDTH:
+        description = description[:COMPACT_DESCRIPTION_WIDTH - 3] + "..."
+    return f"{entry['id']:>6}  {entry['created_at'][:10]}  [{'x' if entry['confessed'] else ' '}] {description}"
 
 def format_sin_entry_for_display(entry: dict):
     """Formats a single sin entry dictionary for display."""
     status = "Confessed" if entry['confessed'] else "Not Confessed"
     occurrence_info = f" (Occurred: {entry['occurrence_date']})" if entry['occurrence_date'] else ""
     confession_info = f" (Confessed on: {entry['confession_date']})" if entry['confessed'] and entry['confession_date'] else ""
-    notes_info = f" - Notes: {entry['notes']}" if entry['notes'] else ""
+    notes_info = f" - Notes: {entry['notes']}" if entry.get('notes') else ""
 
     return (f"[{entry['id']}] {status} - \"{entry['sin_description']}\""
             f"{occurrence_info}{confession_info}{notes_info}"
@@ -0,0 +1,23 @@
+# faith_tracker_app/tests/helpers.py
+"""Shared fixtures for the test cases."""
+import os
+import tempfile
+import unittest
+
+from faith_tracker_app.database import connection
+
+
+class TempDatabaseTestCase(unittest.TestCase):
+    """
+    Points the app at a new temporary database file (self.database, in self.tmp_dir) for
+    each test, shared by all connections, with its archive file next to it; the original
+    is restored after tearDown.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.original_database_name = connection.DATABASE_NAME
+        self.addCleanup(setattr, connection, "DATABASE_NAME", self.original_database_name)
+        self.database = connection.DATABASE_NAME = os.path.join(self.tmp_dir.name, "test.db")
+        connection.initialize_database(quiet=True)
@@ -0,0 +1,87 @@
+# faith_tracker_app/tests/test_analytics.py
+import unittest
+import os
+
+# Temporarily adjust path to import app modules
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from faith_tracker_app.analytics import snapshot as analytics
+from faith_tracker_app.bible import bible_tracker
+from faith_tracker_app.database import connection, importer
+from faith_tracker_app.rosary import rosary_tracker
+from faith_tracker_app.sins import sins_tracker
+from faith_tracker_app.tests.helpers import TempDatabaseTestCase
+
+
+@unittest.skipIf(analytics.np is None, "NumPy is not installed")
+class TestAnalyticsSnapshot(TempDatabaseTestCase):
+
+    def _import(self, kind, lines):
+        path = os.path.join(self.tmp_dir.name, f"{kind}.csv")
+        with open(path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        importer.import_file(path, kind, workers=1, restart=True)
+
+    def test_readings_per_book_per_month(self):
+        self._import("bible", ["book,chapter,reading_date",
+                               "Mark,1,2023-01-05", "Mark,2,2023-01-20", "psalm,23,2023-03-01", "Mark,3,2023-03-02",
+                               "Gospel of Thomas,1,2023-03-03"])
+        stats = analytics.readings_per_book_per_month(analytics.load_snapshot())
+        self.assertEqual(stats["months"], ["2023-01", "2023-02", "2023-03"])
+        self.assertEqual(stats["books"], ["(other)", "Psalms", "Mark"])
+        self.assertEqual(stats["counts"].tolist(), [[0, 0, 1], [0, 0, 1], [2, 0, 1]])
+
+    def test_rolling_rosary_frequency(self):
+        for day in ("2023-10-01", "2023-10-02", "2023-10-02", "2023-10-05"):
+            rosary_tracker.log_rosary_prayer(day, default_mysteries=False, on_conflict="ignore")
+        rosary_tracker.log_rosary_prayer("2023-10-02", "Luminous")
+        frequency = analytics.rolling_rosary_frequency(analytics.load_snapshot(), window=3, until="2023-10-08")
+        self.assertEqual(str(frequency["dates"][0]), "2023-10-01")
+        self.assertEqual(frequency["counts"].tolist(), [1, 3, 3, 2, 1, 1, 1, 0])
+
+        # An earlier until stops the series there; later prayers are left out
+        frequency = analytics.rolling_rosary_frequency(analytics.load_snapshot(), window=3, until="2023-10-03")
+        self.assertEqual(str(frequency["dates"][-1]), "2023-10-03")
+        self.assertEqual(frequency["counts"].tolist(), [1, 3, 3])
+        frequency = analytics.rolling_rosary_frequency(analytics.load_snapshot(), until="2023-09-30")
+        self.assertEqual(frequency["counts"].size, 0)
+        with self.assertRaises(ValueError):
+            analytics.rolling_rosary_frequency(analytics.load_snapshot(), window=0)
+
+    def test_confession_latency(self):
+        for day, confessed_on in (("2023-10-01", "2023-10-01"), ("2023-10-01", "2023-10-05"),
+                                  ("2023-09-01", "2023-10-05"), ("2023-10-04", None)):
+            entry_id = sins_tracker.add_sin_entry(f"Sin on {day} {confessed_on}", day)
+            if confessed_on:
+                sins_tracker.mark_sin_as_confessed(entry_id, confessed_on)
+        latency = analytics.confession_latency(analytics.load_snapshot())
+        self.assertEqual((latency["count"], latency["median"], latency["max"]), (3, 4.0, 34))
+        self.assertEqual(latency["histogram"][:4], [("0 days", 1), ("1-7 days", 1), ("8-30 days", 0), ("31-90 days", 1)])
+
+    def test_incremental_refresh(self):
+        first = sins_tracker.add_sin_entry("Pride", "2023-10-01")
+        snapshot = analytics.load_snapshot()
+        self.assertEqual(len(snapshot.sins), 1)
+
+        sins_tracker.add_sin_entry("Envy", "2023-10-02")
+        sins_tracker.mark_sin_as_confessed(first, "2023-10-03")
+        bible_tracker.add_bible_reading("John", 1)
+        result = snapshot.refresh()
+        self.assertEqual(result["sins_confession_log"], {"appended": 1, "updated": 1, "reloaded": False})
+        self.assertEqual(result["bible_reading"], {"appended": 1, "updated": 0, "reloaded": False})
+        self.assertEqual(snapshot.sins["confessed"].tolist(), [True, False])
+        self.assertEqual(analytics.confession_latency(snapshot)["max"], 2)
+
+        self.assertEqual(snapshot.refresh()["sins_confession_log"], {"appended": 0, "updated": 0, "reloaded": False})
+
+        conn = connection.get_db_connection()
+        conn.execute("DELETE FROM sins_confession_log WHERE id = ?", (first,))
+        conn.commit()
+        conn.close()
+        self.assertTrue(snapshot.refresh()["sins_confession_log"]["reloaded"])
+        self.assertEqual(len(snapshot.sins), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
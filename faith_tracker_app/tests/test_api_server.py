@@ -0,0 +1,137 @@
+# faith_tracker_app/tests/test_api_server.py
+import unittest
+import gzip
+import http.client
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+
+# Temporarily adjust path to import app modules
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from faith_tracker_app.database import connection
+from faith_tracker_app.api import server as api_server
+
+
+class TestAPIServer(unittest.TestCase):
+
+    def setUp(self):
+        """Start a server on an ephemeral port backed by a temporary database file."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.database = os.path.join(self.tmp_dir.name, "test.db")
+        self.original_database_name = connection.DATABASE_NAME
+        connection.DATABASE_NAME = self.database
+        connection.initialize_database(quiet=True)
+
+        self.server = api_server.make_server(port=0, pool_size=2, database=self.database, quiet=True)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.client = http.client.HTTPConnection("127.0.0.1", self.server.server_address[1], timeout=10)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.server.pool.close()
+        connection.DATABASE_NAME = self.original_database_name
+        self.tmp_dir.cleanup()
+
+    def request(self, method, path, body=None, headers=None):
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        self.client.request(method, path, body=data, headers=headers or {})
+        response = self.client.getresponse()
+        raw = response.read()
+        if response.getheader("Content-Encoding") == "gzip":
+            raw = gzip.decompress(raw)
+        return response, (json.loads(raw) if raw else None)
+
+    def test_create_and_get(self):
+        response, payload = self.request("POST", "/api/bible", {"book": "John", "chapter": 3, "start_verse": 16})
+        self.assertEqual(response.status, 201)
+        response, entry = self.request("GET", f"/api/bible/{payload['id']}")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(entry["book"], "John")
+        self.assertEqual(entry["start_verse"], 16)
+
+    def test_validation_errors(self):
+        response, payload = self.request("POST", "/api/rosary", {"prayer_date": "01-10-2023"})
+        self.assertEqual(response.status, 400)
+        self.assertIn("YYYY-MM-DD", payload["error"])
+        response, _ = self.request("POST", "/api/sins", {"unknown_field": 1})
+        self.assertEqual(response.status, 400)
+        response, _ = self.request("GET", "/api/psalms")
+        self.assertEqual(response.status, 404)
+
+    def test_cursor_pagination(self):
+        for day in range(1, 8):
+            self.request("POST", "/api/rosary", {"prayer_date": f"2023-10-0{day}"})
+        seen = []
+        cursor = None
+        while True:
+            path = "/api/rosary?limit=3" + (f"&cursor={cursor}" if cursor else "")
+            response, page = self.request("GET", path)
+            self.assertEqual(response.status, 200)
+            seen.extend(entry["prayer_date"] for entry in page["items"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(seen, [f"2023-10-0{day}" for day in range(7, 0, -1)])
+
+    def test_etag_follows_write_generation(self):
+        self.request("POST", "/api/sins", {"sin_description": "Envy"})
+        response, _ = self.request("GET", "/api/sins?status=unconfessed")
+        etag = response.getheader("ETag")
+        self.assertIsNotNone(etag)
+
+        response, _ = self.request("GET", "/api/sins?status=unconfessed", headers={"If-None-Match": etag})
+        self.assertEqual(response.status, 304)
+
+        response, _ = self.request("POST", "/api/sins/1/confess", {"confession_date": "2023-10-05"})
+        self.assertEqual(response.status, 200)
+        response, page = self.request("GET", "/api/sins?status=unconfessed", headers={"If-None-Match": etag})
+        self.assertEqual(response.status, 200)
+        self.assertEqual(page["items"], [])
+
+        response, _ = self.request("POST", "/api/sins/1/confess", {})
+        self.assertEqual(response.status, 409)
+
+    def test_if_none_match_lists_and_wildcard(self):
+        response, _ = self.request("GET", "/api/rosary")
+        etag = response.getheader("ETag")
+        for header in (f'"other", {etag}', etag[2:], "*"):
+            with self.subTest(header=header):
+                response, _ = self.request("GET", "/api/rosary", headers={"If-None-Match": header})
+                self.assertEqual(response.status, 304)
+        response, _ = self.request("GET", "/api/rosary", headers={"If-None-Match": 'W/"0-00000000"'})
+        self.assertEqual(response.status, 200)
+
+    def test_database_errors_are_reported_as_500(self):
+        conn = sqlite3.connect(self.database)
+        conn.execute("DROP TABLE rosary_prayers")
+        conn.commit()
+        conn.close()
+        response, payload = self.request("GET", "/api/rosary")
+        self.assertEqual(response.status, 500)
+        self.assertEqual(payload, {"error": "Database error."})
+        # The connection is still usable afterwards
+        response, _ = self.request("GET", "/api/bible")
+        self.assertEqual(response.status, 200)
+
+    def test_pooled_connections_have_the_app_functions(self):
+        with self.server.pool.connection() as conn:
+            self.assertEqual(conn.execute("SELECT natural_key_hash('John', 3)").fetchone()[0],
+                             connection.natural_key_hash("John", 3))
+
+    def test_gzip_large_responses(self):
+        for i in range(40):
+            self.request("POST", "/api/bible", {"book": "Psalms", "chapter": i + 1, "notes": "x" * 40})
+        response, page = self.request("GET", "/api/bible?limit=40", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.getheader("Content-Encoding"), "gzip")
+        self.assertEqual(len(page["items"]), 40)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+# faith_tracker_app/tests/test_archive.py
+import unittest
+import os
+import datetime
+import io
+import sqlite3
+
+# Temporarily adjust path to import app modules
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from faith_tracker_app.bible import bible_tracker
+from faith_tracker_app.rosary import rosary_tracker
+from faith_tracker_app.sins import sins_tracker
+from faith_tracker_app.database import archive, connection, importer
+from faith_tracker_app.ui import commands
+from faith_tracker_app.tests.helpers import TempDatabaseTestCase
+
+
+class TestArchive(TempDatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.today = datetime.date.today()
+
+    def _date(self, days_ago):
+        return (self.today - datetime.timedelta(days=days_ago)).strftime("%Y-%m-%d")
+
+    def _execute(self, query, params=()):
+        conn = connection.get_db_connection()
+        try:
+            rows = conn.execute(query, params).fetchall()
+            conn.commit()
+            return rows
+        finally:
+            conn.close()
+
+    def test_archive_moves_old_rows_in_batches(self):
+        for days_ago in (800, 600, 400, 10, 1):
+            rosary_tracker.log_rosary_prayer(prayer_date=self._date(days_ago))
+        moved = archive.archive_old_rows(horizon_days=365, batch_size=2)
+        self.assertEqual(moved["rosary_prayers"], 3)
+        self.assertEqual(self._execute("SELECT COUNT(*) FROM rosary_prayers")[0][0], 2)
+        self.assertTrue(os.path.exists(archive.get_archive_path()))
+
+        archived = sqlite3.connect(archive.get_archive_path()).execute("SELECT COUNT(*) FROM rosary_prayers").fetchone()[0]
+        self.assertEqual(archived, 3)
+        # Moving rows is not a deletion, so nothing is queued for sync
+        self.assertEqual(self._execute("SELECT COUNT(*) FROM changelog WHERE operation = 'delete'")[0][0], 0)
+
+    def test_reads_include_archive_only_when_range_reaches_it(self):
+        for days_ago in (500, 400, 5):
+            rosary_tracker.log_rosary_prayer(prayer_date=self._date(days_ago))
+        archive.archive_old_rows(horizon_days=365)
+
+        self.assertEqual(len(rosary_tracker.get_rosary_prayer_history()), 1)
+        self.assertEqual(len(rosary_tracker.get_rosary_prayer_history(start_date=self._date(30))), 1)
+        history = rosary_tracker.get_rosary_prayer_history(start_date=self._date(450))
+        self.assertEqual([p["prayer_date"] for p in history], [self._date(5), self._date(400)])
+        self.assertEqual(len(rosary_tracker.get_rosary_prayer_history(end_date=self._date(450))), 1)
+        self.assertEqual(len(rosary_tracker.get_rosary_prayer_history(include_archive=True, limit=2)), 2)
+
+    def test_bible_readings_and_confessed_sins(self):
+        bible_tracker.add_bible_reading("Ruth", 1)
+        self._execute("UPDATE bible_reading SET reading_date = ?", (self._date(400) + " 08:00:00",))
+        bible_tracker.add_bible_reading("Ruth", 2)
+
+        old_confessed = sins_tracker.add_sin_entry("Old and confessed")
+        sins_tracker.mark_sin_as_confessed(old_confessed, self._date(390))
+        sins_tracker.add_sin_entry("Old but not confessed")
+        self._execute("UPDATE sins_confession_log SET created_at = ?", (self._date(400) + " 08:00:00",))
+
+        moved = archive.archive_old_rows(horizon_days=365)
+        self.assertEqual(moved, {"bible_reading": 1, "rosary_prayers": 0, "sins_confession_log": 1})
+
+        self.assertEqual([r["chapter"] for r in bible_tracker.get_all_bible_readings()], [2])
+        readings = bible_tracker.get_all_bible_readings(start_date=self._date(401), end_date=self._date(399))
+        self.assertEqual([r["chapter"] for r in readings], [1])
+
+        self.assertEqual([e["sin_description"] for e in sins_tracker.get_sin_log(show_all=False, show_confessed=False)],
+                         ["Old but not confessed"])
+        self.assertEqual(len(sins_tracker.get_sin_log(start_date=self._date(500))), 2)
+
+    def test_archived_entries_are_not_logged_again(self):
+        path = os.path.join(self.tmp_dir.name, "rosary.csv")
+        with open(path, "w") as f:
+            f.write(f"prayer_date,mysteries\n{self._date(800)},Joyful\n{self._date(700)},Glorious\n")
+        self.assertEqual(importer.import_file(path, "rosary", workers=1)["imported"], 2)
+        archive.archive_old_rows(horizon_days=365)
+
+        summary = importer.import_file(path, "rosary", workers=1, restart=True)
+        self.assertEqual((summary["imported"], summary["duplicates"]), (0, 2))
+        batch = commands.run_batch([f"rosary log --date {self._date(800)} --mysteries Joyful"], err=io.StringIO())
+        self.assertEqual(batch["unchanged"], 1)
+        self.assertIsNotNone(rosary_tracker.log_rosary_prayer(self._date(700), "Glorious", on_conflict="ignore"))
+        self.assertIsNone(rosary_tracker.log_rosary_prayer(self._date(700), "Glorious", on_conflict="error"))
+        self.assertEqual(len(rosary_tracker.get_rosary_prayer_history(include_archive=True)), 2)
+
+    def test_older_archive_gains_the_unique_hash_index(self):
+        for days_ago in (800, 700):
+            rosary_tracker.log_rosary_prayer(prayer_date=self._date(days_ago))
+        archive.archive_old_rows(horizon_days=365)
+        # As left by a version without the index: one entry archived twice
+        conn = sqlite3.connect(archive.get_archive_path())
+        conn.execute("DROP INDEX idx_archive_rosary_prayers_content_hash")
+        conn.execute("UPDATE rosary_prayers SET content_hash = (SELECT MIN(content_hash) FROM rosary_prayers)")
+        conn.commit()
+        conn.close()
+
+        connection.initialize_database(quiet=True)
+        conn = sqlite3.connect(archive.get_archive_path())
+        hashes = [row[0] for row in conn.execute("SELECT content_hash FROM rosary_prayers ORDER BY id")]
+        with self.assertRaises(sqlite3.IntegrityError):
+            conn.execute("INSERT INTO rosary_prayers (prayer_date, content_hash) VALUES ('2000-01-01', ?)", (hashes[0],))
+        conn.close()
+        self.assertIsNotNone(hashes[0])
+        self.assertIsNone(hashes[1])
+
+    def test_invalid_range(self):
+        self.assertEqual(sins_tracker.get_sin_log(start_date="last year"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,193 @@
+# faith_tracker_app/tests/test_backends.py
+import unittest
+import contextlib
+import io
+import json
+import sqlite3
+import os
+import tempfile
+
+# Temporarily adjust path to import app modules
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from faith_tracker_app.database import backends, connection
+from faith_tracker_app.bible import bible_tracker
+from faith_tracker_app.rosary import rosary_tracker
+from faith_tracker_app.sins import sins_tracker
+from faith_tracker_app.ui import commands
+from faith_tracker_app.tests.helpers import TempDatabaseTestCase
+
+
+class BackendContract:
+    """Behaviour every storage backend must share; run through the tracker functions."""
+
+    def make_backend(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        super().setUp()
+        self.original_backend = backends.STORAGE_BACKEND
+        self.backend = self.make_backend()
+        self.backend.initialize(quiet=True)
+        backends.STORAGE_BACKEND = self.backend
+
+    def tearDown(self):
+        backends.STORAGE_BACKEND = self.original_backend
+
+    def test_bible_readings_newest_first_with_range_and_limit(self):
+        bible_tracker.add_bible_reading("Genesis", 1)
+        with self.backend.unit_of_work() as uow:
+            uow.bible.add_reading("Exodus", 3, reading_date="2024-01-05")
+            uow.bible.add_reading("Ruth", 1, reading_date="2024-01-06 08:00:00")
+            uow.bible.add_reading("Ruth", 2, reading_date="2024-01-06 08:00:00")
+
+        readings = bible_tracker.get_all_bible_readings()
+        self.assertEqual([(r["book"], r["chapter"]) for r in readings],
+                         [("Genesis", 1), ("Ruth", 2), ("Ruth", 1), ("Exodus", 3)])
+        self.assertEqual(list(readings[0]), ["id", "book", "chapter", "start_verse", "end_verse", "reading_date", "notes"])
+        in_range = bible_tracker.get_all_bible_readings(start_date="2024-01-05", end_date="2024-01-06", limit=2)
+        self.assertEqual([r["chapter"] for r in in_range], [2, 1])
+        self.assertEqual(bible_tracker.get_all_bible_readings(start_date="5 Jan"), [])
+
+    def test_conflict_modes(self):
+        first = rosary_tracker.log_rosary_prayer("2024-02-01", "Joyful", "morning")
+        self.assertIsNone(rosary_tracker.log_rosary_prayer("2024-02-01", "joyful", on_conflict="error"))
+        self.assertEqual(rosary_tracker.log_rosary_prayer("2024-02-01", "Joyful", on_conflict="ignore"), first)
+        self.assertEqual(rosary_tracker.log_rosary_prayer("2024-02-01", "Joyful", "evening", on_conflict="update"), first)
+        self.assertIsNone(rosary_tracker.log_rosary_prayer("2024-02-01", "Joyful", on_conflict="sometimes"))
+
+        history = rosary_tracker.get_rosary_prayer_history()
+        self.assertEqual(len(history), 1)
+        self.assertEqual(history[0]["notes"], "evening")
+
+        # By default a second Rosary that day is a separate entry
+        second = rosary_tracker.log_rosary_prayer("2024-02-01", "Joyful")
+        self.assertNotIn(second, (None, first))
+        self.assertIsNotNone(rosary_tracker.log_rosary_prayer("2024-02-01", "Joyful"))
+        self.assertEqual(len(rosary_tracker.get_rosary_prayer_history()), 3)
+        self.assertEqual(rosary_tracker.log_rosary_prayer("2024-02-01", "Joyful", on_conflict="ignore"), first)
+
+    def test_rosary_counts(self):
+        rosary_tracker.log_rosary_prayer("2024-02-05")  # Monday: Joyful
+        rosary_tracker.log_rosary_prayer("2024-02-06", "Glorious")
+        rosary_tracker.log_rosary_prayer("2024-02-06", "Unlisted")
+        self.assertEqual(rosary_tracker.get_mystery_counts(),
+                         {"Joyful": 1, "Sorrowful": 0, "Glorious": 1, "Luminous": 0, None: 1})
+        self.assertEqual(rosary_tracker.get_weekday_counts()["Tuesday"], 2)
+        self.assertEqual(rosary_tracker.get_weekday_counts(by_mysteries=True)["Tuesday"], {"Glorious": 1, None: 1})
+
+    def test_sins_confession_and_filters(self):
+        first = sins_tracker.add_sin_entry("Impatience", "2024-03-01")
+        sins_tracker.add_sin_entry("Gossip")
+        self.assertTrue(sins_tracker.mark_sin_as_confessed(first, "2024-03-02"))
+        self.assertFalse(sins_tracker.mark_sin_as_confessed(first))
+        self.assertFalse(sins_tracker.mark_sin_as_confessed(999))
+
+        unconfessed = sins_tracker.get_sin_log(show_all=False, show_confessed=False)
+        self.assertEqual([e["sin_description"] for e in unconfessed], ["Gossip"])
+        confessed = sins_tracker.get_sin_log(show_all=False, show_confessed=True)
+        self.assertEqual(confessed[0]["confession_date"], "2024-03-02")
+        self.assertTrue(confessed[0]["confessed"])
+        self.assertEqual([e["sin_description"] for e in sins_tracker.get_sin_log()], ["Gossip", "Impatience"])
+
+    def test_sins_backlog_summary(self):
+        self.assertEqual(sins_tracker.get_backlog_summary(), {"unconfessed": 0, "oldest": None, "by_month": {}})
+        first = sins_tracker.add_sin_entry("Impatience", "2024-03-01")
+        sins_tracker.add_sin_entry("Gossip")
+        sins_tracker.add_sin_entry("Sloth")
+        summary = sins_tracker.get_backlog_summary()
+        self.assertEqual(summary["unconfessed"], 3)
+        self.assertEqual(sum(summary["by_month"].values()), 3)
+        self.assertEqual(summary["oldest"], sins_tracker.get_sin_log()[-1]["created_at"])
+
+        sins_tracker.mark_sin_as_confessed(first, "2024-03-02")
+        self.assertEqual(sins_tracker.get_backlog_summary()["unconfessed"], 2)
+
+    def test_list_projections(self):
+        bible_tracker.add_bible_reading("John", 3, 16, 17, notes="God so loved the world")
+        rosary_tracker.log_rosary_prayer("2024-02-06", "Glorious", "evening")
+        sins_tracker.add_sin_entry("Impatience", "2024-03-01", notes="at work")
+
+        self.assertEqual(list(bible_tracker.get_all_bible_readings(projection="summary")[0]),
+                         ["id", "book", "chapter", "start_verse", "end_verse", "reading_date"])
+        self.assertEqual(list(bible_tracker.get_all_bible_readings(projection="ids")[0]), ["id", "reading_date"])
+        self.assertEqual(list(rosary_tracker.get_rosary_prayer_history(projection="summary")[0]),
+                         ["id", "prayer_date", "mysteries", "created_at"])
+        self.assertEqual(list(rosary_tracker.get_rosary_prayer_history(projection="ids")[0]),
+                         ["id", "prayer_date", "created_at"])
+        self.assertEqual(list(sins_tracker.get_sin_log(projection="summary")[0]),
+                         ["id", "sin_description", "occurrence_date", "confessed", "created_at"])
+        self.assertEqual(list(sins_tracker.get_sin_log(show_all=False, show_confessed=False, projection="ids")[0]), ["id", "created_at"])
+        self.assertEqual(sins_tracker.get_sin_log(projection="everything"), [])
+
+    def test_unit_of_work_rolls_back(self):
+        with self.assertRaises(sqlite3.IntegrityError):
+            with self.backend.unit_of_work() as uow:
+                entry_id, _ = uow.sins.add_entry("Pride", "2024-03-01")
+                uow.sins.confess(entry_id, "2024-03-02")
+                uow.rosary.log_prayer("2024-03-01", "Sorrowful")
+                uow.rosary.log_prayer("2024-03-01", "Sorrowful")
+        self.assertEqual(sins_tracker.get_sin_log(), [])
+        self.assertEqual(rosary_tracker.get_rosary_prayer_history(), [])
+
+        # The rolled back natural keys are free again
+        self.assertIsNotNone(sins_tracker.add_sin_entry("Pride", "2024-03-01"))
+
+    def test_cli_writes_and_lists_the_same_storage(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(commands.main(["sins", "add", "Pride", "--date", "2024-03-01"]), 0)
+            self.assertEqual(commands.main(["rosary", "log", "--date", "2024-03-01"]), 0)
+        entry_id = sins_tracker.get_sin_log()[0]["id"]
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(commands.main(["sins", "confess", str(entry_id)]), 0)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(commands.main(["--format", "json", "sins", "list", "--status", "confessed"]), 0)
+        self.assertEqual([entry["id"] for entry in json.loads(output.getvalue())], [entry_id])
+        self.assertEqual(len(rosary_tracker.get_rosary_prayer_history()), 1)
+
+
+class TestSQLiteBackend(BackendContract, TempDatabaseTestCase):
+
+    def make_backend(self):
+        return backends.SQLiteBackend()
+
+
+class TestMemoryBackend(BackendContract, unittest.TestCase):
+
+    def make_backend(self):
+        return backends.MemoryBackend()
+
+    def test_memory_backend_never_touches_the_database_file(self):
+        self.original_database_name = connection.DATABASE_NAME
+        connection.DATABASE_NAME = os.path.join(tempfile.gettempdir(), "does-not-exist", "test.db")
+        try:
+            self.assertIsNotNone(bible_tracker.add_bible_reading("Jonah", 1))
+            self.assertEqual(len(bible_tracker.get_all_bible_readings()), 1)
+        finally:
+            connection.DATABASE_NAME = self.original_database_name
+
+    def test_sqlite_only_commands_are_rejected(self):
+        for argv in (["archive"], ["import", "readings.csv", "--kind", "bible"], ["rosary", "stats", "--by", "season"],
+                     ["sins", "backlog", "--repair"]):
+            with self.subTest(argv=argv), contextlib.redirect_stderr(io.StringIO()) as err:
+                self.assertEqual(commands.main(argv), 1)
+                self.assertIn("SQLite database only", err.getvalue())
+        with self.assertRaises(ValueError):
+            backends.require_sqlite("Sync")
+
+
+class TestGetBackend(unittest.TestCase):
+
+    def test_names_resolve_to_one_instance(self):
+        self.assertIs(backends.get_backend("memory"), backends.get_backend("memory"))
+        self.assertIsInstance(backends.get_backend("sqlite"), backends.SQLiteBackend)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            backends.get_backend("redis")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+# faith_tracker_app/tests/test_bible_text.py
+import unittest
+import os
+import tempfile
+
+# Temporarily adjust path to import app modules
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from faith_tracker_app.bible import bible_text, bible_tracker
+
+SOURCE = """\
+Genesis|1|1|In the beginning God created the heaven and the earth.
+Genesis|1|2|And the earth was without form, and void.
+Genesis|1|3|And God said, Let there be light: and there was light.
+Genesis|2|1|Thus the heavens and the earth were finished.
+Psalm|23|1|The LORD is my shepherd; I shall not want.
+Psalm|23|3|He restoreth my soul.
+John|3|16|For God so loved the world, that he gave his only begotten Son.
+John|3|17|For God sent not his Son into the world to condemn the world.
+"""
+
+
+class TestBibleText(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        source_path = os.path.join(self.tmp_dir.name, "source.txt")
+        with open(source_path, "w", encoding="utf-8") as source:
+            source.write(SOURCE)
+        self.store_path = os.path.join(self.tmp_dir.name, "bible_text.txt")
+        self.verse_count = bible_text.compile_text_store(source_path, self.store_path)
+        self.bible_text = bible_text.BibleText(self.store_path)
+
+    def tearDown(self):
+        self.bible_text.close()
+        self.tmp_dir.cleanup()
+
+    def test_compile_fills_skipped_verses(self):
+        self.assertEqual(self.verse_count, 9)
+        self.assertEqual(self.bible_text.verses("Psalms", 23),
+                         [(1, "The LORD is my shepherd; I shall not want."), (2, ""), (3, "He restoreth my soul.")])
+
+    def test_passage_is_a_slice_of_the_mapping(self):
+        passage = self.bible_text.passage("Genesis", 1, 2, 3)
+        self.assertIsInstance(passage, memoryview)
+        self.assertEqual(bytes(passage), b"And the earth was without form, and void.\n"
+                                         b"And God said, Let there be light: and there was light.")
+        passage.release()
+
+    def test_ranges_are_clipped_to_the_chapter(self):
+        self.assertEqual([number for number, _ in self.bible_text.verses("john", 3, 1, 40)], [16, 17])
+        self.assertEqual(len(self.bible_text.verses("Genesis", 1)), 3)
+        self.assertEqual(self.bible_text.verses("Genesis", 1, 3)[0][0], 3)
+        self.assertEqual(self.bible_text.verses("Genesis", 1, 4, 9), [])
+        self.assertEqual(self.bible_text.verses("Exodus", 1), [])
+
+    def test_stale_index_is_rejected(self):
+        with open(self.store_path, "ab") as store:
+            store.write(b"extra\n")
+        with self.assertRaises(ValueError):
+            bible_text.BibleText(self.store_path)
+
+    def test_malformed_source_line(self):
+        source_path = os.path.join(self.tmp_dir.name, "bad.txt")
+        with open(source_path, "w", encoding="utf-8") as source:
+            source.write("Genesis|1|1|In the beginning\nHezekiah|1|1|No such book\n")
+        with self.assertRaises(ValueError):
+            bible_text.compile_text_store(source_path, os.path.join(self.tmp_dir.name, "bad_store.txt"))
+
+    def test_reading_display_with_text(self):
+        original_name = bible_text.BIBLE_TEXT_NAME
+        bible_text.BIBLE_TEXT_NAME = self.store_path
+        try:
+            reading = {"id": 4, "book": "John", "chapter": 3, "start_verse": 16, "end_verse": 17,
+                       "reading_date": "2024-03-02 09:00:00", "notes": None}
+            self.assertEqual(bible_tracker.format_reading_for_display(reading, with_text=True),
+                             "[4] 2024-03-02 09:00 AM - John 3:16-17\n"
+                             "    16 For God so loved the world, that he gave his only begotten Son. "
+                             "17 For God sent not his Son into the world to condemn the world.")
+            reading["book"] = "Exodus"
+            self.assertEqual(bible_tracker.format_reading_for_display(reading, with_text=True),
+                             "[4] 2024-03-02 09:00 AM - Exodus 3:16-17")
+        finally:
+            bible_text.BIBLE_TEXT_NAME = original_name
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,7 @@ import unittest
 import sqlite3
 import os
 import datetime
+import time
 
 # Temporarily adjust path to import app modules
 import sys
@@ -18,11 +19,7 @@ TEST_DB_NAME = ":memory:"
 class TestBibleTracker(unittest.TestCase):
 
     def setUp(self):
-        """Set up a new in-memory database for each test."""
-        # Monkey patch the get_db_connection to use the in-memory DB for tests
-        self.original_get_db_connection = bible_tracker.get_db_connection
-        bible_tracker.get_db_connection = lambda: self.get_test_db_connection()
-
+        """Set up a new in-memory database for each test; it is passed to the tracker functions as conn."""
         self.conn = self.get_test_db_connection()
         self.cursor = self.conn.cursor()
         self._initialize_schema()
@@ -39,13 +36,12 @@ class TestBibleTracker(unittest.TestCase):
         self.conn.commit()
 
     def tearDown(self):
-        """Close the database connection and restore original get_db_connection."""
+        """Close the database connection."""
         self.conn.close()
-        bible_tracker.get_db_connection = self.original_get_db_connection
 
 
     def test_add_bible_reading(self):
-        reading_id = bible_tracker.add_bible_reading("Genesis", 1, 1, 5, "Creation")
+        reading_id = bible_tracker.add_bible_reading("Genesis", 1, 1, 5, "Creation", conn=self.conn)
         self.assertIsNotNone(reading_id, "Should return an ID on successful insert.")
 
         # Verify by fetching directly
@@ -66,7 +62,7 @@ class TestBibleTracker(unittest.TestCase):
 
 
     def test_add_bible_reading_minimal(self):
-        reading_id = bible_tracker.add_bible_reading("Psalm", 23)
+        reading_id = bible_tracker.add_bible_reading("Psalm", 23, conn=self.conn)
         self.assertIsNotNone(reading_id)
 
         self.cursor.execute("SELECT * FROM bible_reading WHERE id = ?", (reading_id,))
@@ -79,32 +75,32 @@ class TestBibleTracker(unittest.TestCase):
         self.assertIsNone(entry["notes"])
 
     def test_get_all_bible_readings(self):
-        bible_tracker.add_bible_reading("John", 1, 1, 10)
+        bible_tracker.add_bible_reading("John", 1, 1, 10, conn=self.conn)
         # Adding a slight delay to ensure distinct timestamps for ordering test
         import time
         time.sleep(0.01)
-        bible_tracker.add_bible_reading("Acts", 2, 1, 4)
+        bible_tracker.add_bible_reading("Acts", 2, 1, 4, conn=self.conn)
 
-        readings = bible_tracker.get_all_bible_readings()
+        readings = bible_tracker.get_all_bible_readings(conn=self.conn)
         self.assertEqual(len(readings), 2)
         # Readings should be ordered by date DESC, so Acts should be first
         self.assertEqual(readings[0]["book"], "Acts")
         self.assertEqual(readings[1]["book"], "John")
 
     def test_get_all_bible_readings_limit(self):
-        bible_tracker.add_bible_reading("1 Corinthians", 13)
+        bible_tracker.add_bible_reading("1 Corinthians", 13, conn=self.conn)
         time.sleep(0.01)
-        bible_tracker.add_bible_reading("Ephesians", 2)
+        bible_tracker.add_bible_reading("Ephesians", 2, conn=self.conn)
         time.sleep(0.01)
-        bible_tracker.add_bible_reading("Philippians", 4)
+        bible_tracker.add_bible_reading("Philippians", 4, conn=self.conn)
 
-        readings = bible_tracker.get_all_bible_readings(limit=2)
+        readings = bible_tracker.get_all_bible_readings(limit=2, conn=self.conn)
         self.assertEqual(len(readings), 2)
         self.assertEqual(readings[0]["book"], "Philippians") # Most recent
         self.assertEqual(readings[1]["book"], "Ephesians")
 
     def test_get_all_bible_readings_empty(self):
-        readings = bible_tracker.get_all_bible_readings()
+        readings = bible_tracker.get_all_bible_readings(conn=self.conn)
         self.assertEqual(len(readings), 0)
 
     def test_format_reading_for_display(self):
@@ -122,7 +118,7 @@ class TestBibleTracker(unittest.TestCase):
 
         # Start and end verse same
         reading4 = {"id": 4, "reading_date": "2023-01-04 13:00:00", "book": "Matthew", "chapter": 5, "start_verse": 3, "end_verse": 3, "notes": "Beatitude"}
-        self.assertEqual(bible_tracker.format_reading_for_display(reading4), "[4] 2023-01-04 13:00 PM - Matthew 5:3 (Notes: Beatitude)")
+        self.assertEqual(bible_tracker.format_reading_for_display(reading4), "[4] 2023-01-04 01:00 PM - Matthew 5:3 (Notes: Beatitude)")
 
 
 if __name__ == '__main__':
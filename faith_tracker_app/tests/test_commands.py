@@ -0,0 +1,128 @@
+# faith_tracker_app/tests/test_commands.py
+import unittest
+import io
+import os
+import json
+import tempfile
+
+# Temporarily adjust path to import app modules
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from faith_tracker_app.database import connection
+from faith_tracker_app.ui import commands
+from faith_tracker_app.tests.helpers import TempDatabaseTestCase
+
+
+class TestCommands(TempDatabaseTestCase):
+
+    def _count(self, table):
+        conn = connection.get_db_connection()
+        try:
+            return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_batch_commands(self):
+        lines = [
+            "# comment lines and blank lines are skipped",
+            "",
+            'bible add "Song of Songs" 2 --start-verse 1 --end-verse 7',
+            "bible add John 3 --start-verse 16",
+            "rosary log --date 2023-10-01 --mysteries Joyful",
+            "sins add 'Impatience' --date 2023-10-02",
+            "sins confess 1 --date 2023-10-03",
+        ]
+        out, err = io.StringIO(), io.StringIO()
+        summary = commands.run_batch(lines, chunk_size=2, out=out, err=err)
+        self.assertEqual(summary, {"applied": 5, "failed": 0, "unchanged": 0})
+        self.assertEqual(err.getvalue(), "")
+        self.assertEqual(self._count("bible_reading"), 2)
+        self.assertEqual(self._count("rosary_prayers"), 1)
+        self.assertEqual(self._count("sins_confession_log"), 1)
+
+    def test_batch_reports_invalid_lines(self):
+        lines = [
+            "rosary log --date 01-10-2023",
+            "bible add John",
+            "sins confess 42",
+            "rosary log --date 2023-10-01",
+        ]
+        err = io.StringIO()
+        summary = commands.run_batch(lines, out=io.StringIO(), err=err)
+        self.assertEqual(summary, {"applied": 1, "failed": 2, "unchanged": 1})
+        self.assertIn("line 1:", err.getvalue())
+        self.assertIn("line 2:", err.getvalue())
+        self.assertEqual(self._count("rosary_prayers"), 1)
+
+    def test_batch_reports_duplicates_with_on_conflict_error(self):
+        lines = [
+            "rosary log --date 2024-01-01 --mysteries Joyful",
+            "bible add John 3",
+            "rosary log --date 2024-01-01 --mysteries Joyful",
+            "rosary log --date 2024-01-02 --mysteries Joyful",
+        ]
+        err = io.StringIO()
+        summary = commands.run_batch(lines, out=io.StringIO(), err=err, on_conflict="error")
+        self.assertEqual(summary, {"applied": 3, "failed": 1, "unchanged": 0})
+        self.assertEqual(err.getvalue(), "line 3: this entry is already logged\n")
+        self.assertEqual(self._count("rosary_prayers"), 2)
+
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", dir=self.tmp_dir.name, delete=False) as f:
+            f.write("rosary log --date 2024-01-01 --mysteries Joyful --on-conflict error\n")
+        stderr, sys.stderr = sys.stderr, io.StringIO()
+        try:
+            self.assertEqual(commands.main(["batch", f.name]), 1)
+            self.assertIn("already logged", sys.stderr.getvalue())
+        finally:
+            sys.stderr = stderr
+
+    def test_batch_jsonl(self):
+        lines = [
+            json.dumps({"op": "bible add", "book": "Genesis", "chapter": 1, "start_verse": 1, "end_verse": 31}),
+            json.dumps({"op": "sins add", "sin_description": "Gossip", "occurrence_date": "2023-10-02"}),
+            json.dumps({"op": "bible list"}),
+            "[1, 2]",
+        ]
+        err = io.StringIO()
+        summary = commands.run_batch(lines, out=io.StringIO(), err=err, input_format="jsonl")
+        self.assertEqual(summary, {"applied": 2, "failed": 2, "unchanged": 0})
+        self.assertEqual(self._count("bible_reading"), 1)
+
+    def test_batch_listing_sees_earlier_writes(self):
+        out = io.StringIO()
+        commands.run_batch(["rosary log --date 2023-10-01", "rosary list"], output_format="json", out=out, err=io.StringIO())
+        listed = json.loads(out.getvalue())
+        self.assertEqual(len(listed), 1)
+        self.assertEqual(listed[0]["prayer_date"], "2023-10-01")
+
+    def test_batch_compact_and_ids_views(self):
+        out = io.StringIO()
+        commands.run_batch(["bible add John 3 --start-verse 16 --end-verse 17 --notes 'God so loved the world'",
+                            "sins add " + "x" * 80,
+                            "bible list --view compact", "bible list --view ids", "sins list --view compact"],
+                           output_format="text", out=out, err=io.StringIO())
+        compact, ids, sin = out.getvalue().splitlines()
+        self.assertRegex(compact, r"^\s+1  \d{4}-\d{2}-\d{2}  John 3:16-17$")
+        self.assertRegex(ids, r"^1\t\d{4}-\d{2}-\d{2}$")
+        self.assertRegex(sin, r"^\s+1  \d{4}-\d{2}-\d{2}  \[ \] x{57}\.\.\.$")
+
+    def test_write_rows_csv(self):
+        out = io.StringIO()
+        commands.write_rows([{"id": 1, "book": "John"}, {"id": 2, "book": "Acts"}], "csv", out=out)
+        self.assertEqual(out.getvalue().splitlines(), ["id,book", "1,John", "2,Acts"])
+
+    def test_main_single_commands(self):
+        stdout = sys.stdout
+        sys.stdout = io.StringIO()
+        try:
+            self.assertEqual(commands.main(["--format", "json", "sins", "add", "Pride"]), 0)
+            self.assertEqual(json.loads(sys.stdout.getvalue()), {"id": 1})
+            self.assertEqual(commands.main(["sins", "confess", "1"]), 0)
+            self.assertEqual(commands.main(["sins", "confess", "1"]), 1)
+        finally:
+            sys.stdout = stdout
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+# faith_tracker_app/tests/test_compression.py
+import unittest
+import json
+import os
+import sqlite3
+
+# Temporarily adjust path to import app modules
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from faith_tracker_app.database import backends, compression, connection
+from faith_tracker_app.database.connection import natural_key_hash
+from faith_tracker_app.sins import sins_tracker
+from faith_tracker_app.rosary import rosary_tracker
+from faith_tracker_app.tests.helpers import TempDatabaseTestCase
+
+LONG_NOTE = ("Prayed the Sorrowful mysteries this evening with the family and offered each decade "
+             "for a friend who is ill. ") * 8
+
+
+class TestCompressText(unittest.TestCase):
+
+    def test_round_trip(self):
+        compressed = compression.compress_text(LONG_NOTE)
+        self.assertTrue(compression.is_compressed(compressed))
+        self.assertLess(len(compressed), len(LONG_NOTE) // 4)
+        self.assertEqual(compression.decompress_text(compressed), LONG_NOTE)
+
+    def test_short_text_stays_plain(self):
+        self.assertEqual(compression.compress_text("Felt lazy"), "Felt lazy")
+        short = "x" * (compression.COMPRESSION_THRESHOLD - 1)
+        self.assertEqual(compression.compress_text(short), short)
+        self.assertIsNone(compression.compress_text(None))
+        self.assertEqual(compression.decompress_text("plain"), "plain")
+
+    def test_trained_dictionary(self):
+        compression.DICTIONARIES[200] = compression.train_dictionary([LONG_NOTE, LONG_NOTE])
+        try:
+            compressed = compression.compress_text(LONG_NOTE, 200)
+            self.assertEqual(compressed[2], 200)
+            self.assertLessEqual(len(compressed), len(compression.compress_text(LONG_NOTE)))
+            self.assertEqual(compression.decompress_text(compressed), LONG_NOTE)
+        finally:
+            compression.DICTIONARIES.pop(200)
+
+    def test_unknown_dictionary(self):
+        compressed = compression.compress_text(LONG_NOTE)
+        with self.assertRaisesRegex(ValueError, "dictionary 99"):
+            compression.decompress_text(compressed[:2] + bytes([99]) + compressed[3:])
+
+    def test_lazy_row_decompresses_on_access(self):
+        row = compression.lazy_row({"id": 1, "notes": compression.compress_text(LONG_NOTE)})
+        self.assertIsInstance(row, compression.LazyTextRow)
+        self.assertTrue(compression.is_compressed(dict.__getitem__(row, "notes")))
+        self.assertEqual(json.loads(json.dumps(row))["notes"], LONG_NOTE)
+        self.assertEqual(dict(row), {"id": 1, "notes": LONG_NOTE})
+        self.assertEqual(row.get("notes"), LONG_NOTE)
+        self.assertIs(type(compression.lazy_row({"id": 2, "notes": "short"})), dict)
+
+
+class TestCompressedNotesInTheDatabase(TempDatabaseTestCase):
+
+    def test_long_values_are_stored_compressed(self):
+        description = "Impatience " + LONG_NOTE
+        row = sins_tracker.build_sin_row(description, "2024-03-01", LONG_NOTE)
+        self.assertEqual(row[-1], natural_key_hash(description, "2024-03-01"))
+        entry_id = sins_tracker.add_sin_entry(description, "2024-03-01", LONG_NOTE)
+
+        conn = sqlite3.connect(connection.DATABASE_NAME)
+        stored = conn.execute("SELECT typeof(sin_description), typeof(notes), length(notes) FROM sins_confession_log "
+                              "WHERE id = ?", (entry_id,)).fetchone()
+        conn.close()
+        self.assertEqual(stored[:2], ("blob", "blob"))
+        self.assertLess(stored[2], len(LONG_NOTE) // 4)
+
+        entry = sins_tracker.get_sin_log()[0]
+        self.assertEqual((entry["sin_description"], entry["notes"]), (description, LONG_NOTE))
+        # Re-logging the same notes writes nothing
+        self.assertEqual(sins_tracker.add_sin_entry(description, "2024-03-01", LONG_NOTE, on_conflict="update"),
+                         entry_id)
+
+    def test_listing_without_notes(self):
+        rosary_tracker.log_rosary_prayer("2024-03-01", "Joyful", LONG_NOTE)
+        prayers = rosary_tracker.get_rosary_prayer_history(with_notes=False)
+        self.assertNotIn("notes", prayers[0])
+        self.assertEqual(rosary_tracker.format_rosary_log_for_display(prayers[0]), "[1] 2024-03-01 - Mysteries: Joyful")
+        self.assertEqual(rosary_tracker.get_rosary_prayer_history()[0]["notes"], LONG_NOTE)
+
+    def test_memory_backend(self):
+        original_backend = backends.STORAGE_BACKEND
+        backends.STORAGE_BACKEND = backends.MemoryBackend()
+        try:
+            rosary_tracker.log_rosary_prayer("2024-03-01", "Joyful", LONG_NOTE)
+            self.assertEqual(rosary_tracker.get_rosary_prayer_history()[0]["notes"], LONG_NOTE)
+            self.assertNotIn("notes", rosary_tracker.get_rosary_prayer_history(with_notes=False)[0])
+        finally:
+            backends.STORAGE_BACKEND = original_backend
+
+
+if __name__ == '__main__':
+    unittest.main()
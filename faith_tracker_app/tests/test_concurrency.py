@@ -0,0 +1,133 @@
+# faith_tracker_app/tests/test_concurrency.py
+import unittest
+import contextlib
+import io
+import os
+import sqlite3
+import threading
+import time
+from unittest import mock
+
+# Temporarily adjust path to import app modules
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from faith_tracker_app.database import concurrency, connection
+from faith_tracker_app.bible import reading_plans
+from faith_tracker_app.database import archive
+from faith_tracker_app.reminders import scheduler
+from faith_tracker_app.sins import backlog, sins_tracker
+from faith_tracker_app.tests.helpers import TempDatabaseTestCase
+
+
+class TestConcurrentWriters(TempDatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        concurrency.reset_write_metrics()
+        # Released from a timer thread
+        self.holder = sqlite3.connect(connection.DATABASE_NAME, check_same_thread=False)
+        # Cleanups run last first, so this runs after any release timer has finished
+        self.addCleanup(self.holder.close)
+
+    def hold_write_lock(self, seconds):
+        """Takes the write lock on another connection and releases it after seconds, in a thread."""
+        self.holder.execute("BEGIN IMMEDIATE")
+        release = threading.Timer(seconds, self.holder.rollback)
+        release.start()
+        self.addCleanup(release.join)
+
+    def test_writer_waits_and_retries_for_the_lock(self):
+        self.hold_write_lock(0.4)
+        conn = connection.get_db_connection()
+        try:
+            concurrency.begin_write(conn)
+            self.assertTrue(conn.in_transaction)
+            conn.execute("INSERT INTO sins_confession_log (sin_description) VALUES ('Impatience')")
+            concurrency.commit_write(conn)
+            # The connection's own busy timeout is restored
+            self.assertEqual(conn.execute("PRAGMA busy_timeout").fetchone()[0], 5000)
+        finally:
+            conn.close()
+
+        metrics = concurrency.get_write_metrics()
+        self.assertEqual((metrics["began"], metrics["committed"], metrics["gave_up"]), (1, 1, 0))
+        self.assertGreater(metrics["retries"], 0)
+        self.assertGreater(metrics["lock_wait"], 0.3)
+
+    def test_retries_are_bounded(self):
+        self.hold_write_lock(0.5)
+        conn = connection.get_db_connection()
+        try:
+            with mock.patch.object(concurrency, "RETRY_ATTEMPTS", 2), mock.patch.object(concurrency, "LOCK_TIMEOUT", 0.01), \
+                    mock.patch.object(concurrency, "WRITE_TIMEOUT", 0):
+                started = time.monotonic()
+                with self.assertRaises(sqlite3.OperationalError):
+                    concurrency.begin_write(conn)
+                self.assertLess(time.monotonic() - started, 1.0)
+            self.assertFalse(conn.in_transaction)
+        finally:
+            conn.close()
+        metrics = concurrency.get_write_metrics()
+        self.assertEqual((metrics["began"], metrics["gave_up"], metrics["retries"]), (0, 1, 2))
+
+    def test_retries_last_the_write_timeout(self):
+        self.hold_write_lock(1.0)
+        conn = connection.get_db_connection()
+        try:
+            with mock.patch.object(concurrency, "RETRY_ATTEMPTS", 0), mock.patch.object(concurrency, "LOCK_TIMEOUT", 0.01), \
+                    mock.patch.object(concurrency, "WRITE_TIMEOUT", 0.3):
+                started = time.monotonic()
+                with self.assertRaises(sqlite3.OperationalError):
+                    concurrency.begin_write(conn)
+                self.assertGreaterEqual(time.monotonic() - started, 0.3)
+        finally:
+            conn.close()
+        self.assertGreater(concurrency.get_write_metrics()["retries"], 0)
+
+    def test_tracker_writes_wait_instead_of_failing(self):
+        self.hold_write_lock(0.3)
+        with contextlib.redirect_stdout(io.StringIO()):
+            entry_id = sins_tracker.add_sin_entry("Impatience", "2024-03-01")
+            self.assertIsNotNone(entry_id)
+            self.hold_write_lock(0.3)
+            self.assertTrue(sins_tracker.mark_sin_as_confessed(entry_id, "2024-03-02"))
+        self.assertEqual(concurrency.get_write_metrics()["committed"], 2)
+
+    def test_maintenance_writers_wait_instead_of_failing(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.hold_write_lock(0.3)
+            self.assertIsNotNone(reading_plans.create_reading_plan(preset="new-testament-90"))
+            self.hold_write_lock(0.3)
+            self.assertEqual(backlog.check_backlog(repair=True), [])
+            self.hold_write_lock(0.3)
+            self.assertEqual(archive.archive_old_rows(horizon_days=365), {table: 0 for table in archive.ARCHIVE_TABLES})
+            self.hold_write_lock(0.3)
+            scheduler.ReminderScheduler(scheduler.StdoutNotifier(io.StringIO())).run_due()
+        self.assertEqual(concurrency.get_write_metrics()["gave_up"], 0)
+        self.assertGreater(concurrency.get_write_metrics()["retries"], 0)
+
+    def test_write_transaction_rolls_back_on_error(self):
+        conn = connection.get_db_connection()
+        try:
+            with self.assertRaises(ValueError):
+                with concurrency.write_transaction(conn):
+                    conn.execute("INSERT INTO sins_confession_log (sin_description) VALUES ('Impatience')")
+                    raise ValueError("stop")
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM sins_confession_log").fetchone()[0], 0)
+        finally:
+            conn.close()
+
+
+class TestStress(unittest.TestCase):
+
+    def test_no_writes_are_lost_across_processes(self):
+        single = concurrency.run_stress_test(processes=1, writes=60)
+        several = concurrency.run_stress_test(processes=4, writes=60)
+        for result in (single, several):
+            self.assertEqual((result["failed"], result["lost"], result["metrics"]["gave_up"]), (0, 0, 0))
+        self.assertEqual(several["writes"], 240)
+
+
+if __name__ == '__main__':
+    unittest.main()
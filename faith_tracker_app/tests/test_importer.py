@@ -0,0 +1,107 @@
+# faith_tracker_app/tests/test_importer.py
+import unittest
+import os
+
+# Temporarily adjust path to import app modules
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from faith_tracker_app.bible import bible_tracker
+from faith_tracker_app.database import connection, importer
+from faith_tracker_app.tests.helpers import TempDatabaseTestCase
+
+
+class TestImporter(TempDatabaseTestCase):
+
+    def _write(self, name, lines):
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        return path
+
+    def _count(self, table):
+        conn = connection.get_db_connection()
+        try:
+            return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_import_validates_like_the_trackers(self):
+        path = self._write("rosary.csv", [
+            "Prayer_Date,Mysteries,Notes",
+            "2020-01-06,Joyful,Epiphany",
+            "06/01/2020,Joyful,",
+            "",
+            "2020-01-07,,\"Quiet, early\"",
+            ",Glorious,",
+        ])
+        summary = importer.import_file(path, "rosary", workers=1)
+        self.assertEqual((summary["imported"], summary["failed"]), (2, 2))
+        self.assertEqual([line for line, _ in summary["errors"]], [3, 6])
+        self.assertIn("YYYY-MM-DD", summary["errors"][0][1])
+
+        conn = connection.get_db_connection()
+        rows = conn.execute("SELECT prayer_date, mysteries, notes FROM rosary_prayers ORDER BY id").fetchall()
+        conn.close()
+        self.assertEqual([tuple(r) for r in rows], [("2020-01-06", "Joyful", "Epiphany"), ("2020-01-07", None, "Quiet, early")])
+
+    def test_malformed_lines_are_rejected_rows(self):
+        path = self._write("sins.csv", [
+            "sin_description,occurrence_date",
+            "Impatience,2020-01-06",
+            "x" * 200000 + ",2020-01-07",
+            "Gossip,2020-01-08",
+        ])
+        summary = importer.import_file(path, "sins", workers=1)
+        self.assertEqual((summary["imported"], summary["failed"]), (2, 1))
+        self.assertEqual(summary["errors"][0][0], 3)
+        self.assertIn("Malformed CSV line", summary["errors"][0][1])
+
+    def test_verse_ranges_and_worker_processes(self):
+        lines = ["book,chapter,start_verse,end_verse,reading_date"]
+        lines += [f"John,{i % 21 + 1},1,10,2021-03-{i % 28 + 1:02d}" for i in range(30)]
+        lines += ["John,3,16,1,2021-03-01", "John,three,,,2021-03-01", "John,0,,,2021-03-01"]
+        path = self._write("bible.csv", lines)
+        summary = importer.import_file(path, "bible", workers=2, chunk_lines=7)
+        self.assertEqual((summary["lines"], summary["imported"], summary["failed"]), (33, 30, 3))
+        self.assertEqual([line for line, _ in summary["errors"]], [32, 33, 34])
+        self.assertEqual(self._count("bible_reading"), 30)
+
+    def test_interrupted_import_resumes_from_checkpoint(self):
+        path = self._write("sins.csv", ["sin_description,occurrence_date"] +
+                           [f"Entry {i},2019-05-{i % 28 + 1:02d}" for i in range(25)])
+
+        def interrupt(summary):
+            raise KeyboardInterrupt
+        with self.assertRaises(KeyboardInterrupt):
+            importer.import_file(path, "sins", workers=1, chunk_lines=10, progress=interrupt)
+        self.assertEqual(self._count("sins_confession_log"), 10)
+
+        summary = importer.import_file(path, "sins", workers=1, chunk_lines=10)
+        self.assertEqual((summary["resumed_from"], summary["imported"]), (10, 25))
+        self.assertEqual(self._count("sins_confession_log"), 25)
+        # A completed import is not repeated
+        self.assertEqual(importer.import_file(path, "sins", workers=1)["resumed_from"], 25)
+        self.assertEqual(self._count("sins_confession_log"), 25)
+
+        with open(path, "a") as f:
+            f.write("Entry 25,2019-06-01\n")
+        with self.assertRaises(ValueError):
+            importer.import_file(path, "sins", workers=1)
+
+    def test_missing_columns(self):
+        path = self._write("bad.csv", ["book,chapter", "John,1"])
+        with self.assertRaises(ValueError):
+            importer.import_file(path, "bible", workers=1)
+
+    def test_build_reading_row_checks_verse_range(self):
+        with self.assertRaises(ValueError):
+            bible_tracker.build_reading_row("John", 3, 16, 10)
+        with self.assertRaises(ValueError):
+            bible_tracker.build_reading_row("John", 3, reading_date="2021-13-01")
+        row = bible_tracker.build_reading_row("John", 3, 16, 16, reading_date="2021-03-01")
+        self.assertEqual(row[4], "2021-03-01 00:00:00")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+# faith_tracker_app/tests/test_liturgical_calendar.py
+import unittest
+import datetime
+import os
+
+# Temporarily adjust path to import app modules
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from faith_tracker_app.liturgy import liturgical_calendar
+from faith_tracker_app.liturgy.liturgical_calendar import Season, Rank
+from faith_tracker_app.database import archive, concurrency, connection
+from faith_tracker_app.database.backends import unit_of_work
+from faith_tracker_app.bible import bible_tracker
+from faith_tracker_app.rosary import rosary_tracker
+from faith_tracker_app.tests.helpers import TempDatabaseTestCase
+
+
+class TestLiturgicalCalendar(unittest.TestCase):
+
+    def test_easter_sunday(self):
+        self.assertEqual(liturgical_calendar.easter_sunday(2024), datetime.date(2024, 3, 31))
+        self.assertEqual(liturgical_calendar.easter_sunday(2025), datetime.date(2025, 4, 20))
+        self.assertEqual(liturgical_calendar.easter_sunday(2038), datetime.date(2038, 4, 25))
+
+    def test_seasons_and_principal_days(self):
+        ash_wednesday = liturgical_calendar.liturgical_day("2024-02-14")
+        self.assertEqual((ash_wednesday.season, ash_wednesday.feast), (Season.LENT, "Ash Wednesday"))
+        self.assertEqual(liturgical_calendar.liturgical_day("2024-03-29").season, Season.TRIDUUM)
+        self.assertEqual(liturgical_calendar.liturgical_day("2024-12-01").feast, "First Sunday of Advent")
+        self.assertEqual(liturgical_calendar.liturgical_day("2025-01-12").season, Season.CHRISTMAS)
+        self.assertEqual(liturgical_calendar.liturgical_day("2025-01-13").season, Season.ORDINARY_TIME)
+        self.assertEqual(liturgical_calendar.liturgical_year_of(datetime.date(2024, 12, 1)), 2025)
+
+    def test_every_day_has_one_season(self):
+        for year in (2023, 2024, 2038):
+            calendar = liturgical_calendar.year_calendar(year)
+            self.assertEqual(len(calendar), (datetime.date(year + 1, 1, 1) - datetime.date(year, 1, 1)).days)
+
+    def test_transferred_solemnities(self):
+        # The Annunciation falls in Holy Week in 2024 and moves to the Monday after the Easter octave
+        self.assertIsNone(liturgical_calendar.liturgical_day("2024-03-25").feast)
+        annunciation = liturgical_calendar.liturgical_day("2024-04-08")
+        self.assertEqual((annunciation.feast, annunciation.rank), ("Annunciation of the Lord", Rank.SOLEMNITY))
+        # The Immaculate Conception gives way to the Second Sunday of Advent
+        self.assertEqual(liturgical_calendar.liturgical_day("2024-12-09").feast,
+                         "Immaculate Conception of the Blessed Virgin Mary")
+
+    def test_marian_days_and_sunday_precedence(self):
+        self.assertTrue(liturgical_calendar.liturgical_day("2024-10-07").marian)
+        self.assertTrue(liturgical_calendar.liturgical_day("2024-05-20").marian)  # Mary, Mother of the Church
+        # Our Lady of the Rosary falls on a Sunday in 2029
+        self.assertIsNone(liturgical_calendar.liturgical_day("2029-10-07").feast)
+
+    def test_describe_day(self):
+        self.assertEqual(liturgical_calendar.describe_day("2024-08-15 07:30:00"),
+                         "Assumption of the Blessed Virgin Mary (Ordinary Time)")
+        self.assertEqual(liturgical_calendar.describe_day("2024-03-05"), "Lent")
+        self.assertIsNone(liturgical_calendar.describe_day("15 Aug 2024"))
+
+    def test_formatters_add_the_day_only_when_asked(self):
+        reading = {"id": 1, "book": "Luke", "chapter": 1, "start_verse": None, "end_verse": None,
+                   "reading_date": "2024-08-15 07:30:00", "notes": None}
+        self.assertEqual(bible_tracker.format_reading_for_display(reading), "[1] 2024-08-15 07:30 AM - Luke 1")
+        self.assertTrue(bible_tracker.format_reading_for_display(reading, liturgical=True).endswith(
+            " [Assumption of the Blessed Virgin Mary (Ordinary Time)]"))
+        prayer = {"id": 2, "prayer_date": "2024-12-25", "mysteries": "Joyful", "notes": None}
+        self.assertEqual(rosary_tracker.format_rosary_log_for_display(prayer, liturgical=True),
+                         "[2] 2024-12-25 - Mysteries: Joyful [Nativity of the Lord (Christmas)]")
+
+
+class TestLiturgicalStatistics(TempDatabaseTestCase):
+
+    def test_season_counts(self):
+        for day in ("2024-12-08", "2024-12-25", "2025-01-20", "2025-03-05", "2025-04-18", "2025-11-29", "2025-11-30"):
+            rosary_tracker.log_rosary_prayer(day)
+        counts = liturgical_calendar.season_counts("rosary_prayers", 2025)
+        self.assertEqual(counts, {"Advent": 1, "Christmas": 1, "Ordinary Time": 2, "Lent": 1, "Easter Triduum": 1,
+                                  "Easter": 0})
+
+    def test_feast_counts_include_the_archive(self):
+        for day in ("2020-08-15", "2021-10-07", datetime.date.today().isoformat()):
+            rosary_tracker.log_rosary_prayer(day)
+        archive.archive_old_rows(horizon_days=365)
+        rosary_tracker.log_rosary_prayer("2024-08-15")
+
+        self.assertEqual(liturgical_calendar.feast_counts("rosary_prayers", marian_only=True),
+                         {"Assumption of the Blessed Virgin Mary": 2, "Our Lady of the Rosary": 1})
+
+    def test_feast_counts_join_the_cached_calendar(self):
+        for day in ("2023-08-15", "2024-08-15", "2024-10-07", "2024-10-08"):
+            rosary_tracker.log_rosary_prayer(day)
+        with unit_of_work() as uow:
+            uow.bible.add_reading("Luke", 1, reading_date="2024-08-15 07:30:00")
+
+        self.assertEqual(liturgical_calendar.feast_counts("rosary_prayers", marian_only=True),
+                         {"Assumption of the Blessed Virgin Mary": 2, "Our Lady of the Rosary": 1})
+        self.assertEqual(liturgical_calendar.feast_counts("bible_reading"),
+                         {"Assumption of the Blessed Virgin Mary": 1})
+
+        conn = connection.get_db_connection()
+        try:
+            cached = conn.execute("SELECT COUNT(*) FROM liturgical_calendar").fetchone()[0]
+        finally:
+            conn.close()
+        self.assertEqual(cached, 365 + 366)
+
+        # The years are cached now, so counting again doesn't take the write lock
+        concurrency.reset_write_metrics()
+        liturgical_calendar.feast_counts("rosary_prayers")
+        self.assertEqual(concurrency.get_write_metrics()["began"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+# faith_tracker_app/tests/test_maintenance.py
+import unittest
+import os
+import sqlite3
+
+# Temporarily adjust path to import app modules
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from faith_tracker_app.database import connection, maintenance
+from faith_tracker_app.tests.helpers import TempDatabaseTestCase
+
+
+class TestMaintenance(TempDatabaseTestCase):
+
+    def _execute(self, query, params=()):
+        conn = connection.get_db_connection()
+        try:
+            rows = conn.execute(query, params).fetchall()
+            conn.commit()
+            return rows
+        finally:
+            conn.close()
+
+    def _add_notes(self, count):
+        conn = connection.get_db_connection()
+        conn.executemany("INSERT INTO rosary_prayers (prayer_date, notes) VALUES (?, ?)",
+                         [("2023-10-01", "x" * 2000) for _ in range(count)])
+        conn.commit()
+        conn.close()
+
+    def test_backup_in_steps_copies_all_rows(self):
+        self._add_notes(200)
+        steps = []
+        destination = os.path.join(self.tmp_dir.name, "backups", "copy.db")
+        result = maintenance.backup_database(destination, pages_per_step=16, step_sleep=0,
+                                             progress=lambda status, remaining, total: steps.append(remaining))
+        self.assertEqual(result["path"], destination)
+        self.assertGreater(len(steps), 1)
+        self.assertEqual(steps[-1], 0)
+        self.assertFalse(os.path.exists(destination + ".partial"))
+        copy = sqlite3.connect(destination)
+        self.assertEqual(copy.execute("SELECT COUNT(*) FROM rosary_prayers").fetchone()[0], 200)
+        copy.close()
+
+    def test_run_maintenance_releases_free_pages(self):
+        self.assertEqual(maintenance.get_database_stats()["auto_vacuum"], "incremental")
+        self._add_notes(200)
+        self._execute("DELETE FROM rosary_prayers")
+        self.assertGreater(maintenance.get_database_stats()["freelist_count"], 0)
+
+        report = maintenance.run_maintenance(time_budget=10)
+        self.assertEqual([(t["task"], t["status"]) for t in report["tasks"]],
+                         [("optimize", "completed"), ("incremental_vacuum", "completed"),
+                          ("integrity_check", "completed"), ("sins_backlog_check", "completed")])
+        self.assertEqual(report["tasks"][2]["result"], "ok")
+        self.assertEqual(report["tasks"][3]["result"], "ok")
+        self.assertGreater(report["before"]["freelist_count"], 0)
+        self.assertEqual(report["after"]["freelist_count"], 0)
+        self.assertLess(report["after"]["file_size"], report["before"]["file_size"])
+        self.assertEqual(self._execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'sqlite_stat1'")[0][0], 1)
+
+        # Nothing is due again straight away, unless forced
+        self.assertEqual(maintenance.run_maintenance(time_budget=10)["tasks"], [])
+        self.assertEqual(len(maintenance.run_maintenance(time_budget=10, force=True)["tasks"]), 4)
+
+    def test_exhausted_budget_leaves_tasks_due(self):
+        report = maintenance.run_maintenance(time_budget=0)
+        self.assertEqual({t["status"] for t in report["tasks"]}, {"skipped"})
+        completed = self._execute("SELECT COUNT(*) FROM maintenance_runs WHERE last_completed IS NOT NULL")[0][0]
+        self.assertEqual(completed, 0)
+        self.assertEqual(len(maintenance.run_maintenance(time_budget=10)["tasks"]), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
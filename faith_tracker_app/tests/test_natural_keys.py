@@ -0,0 +1,119 @@
+# faith_tracker_app/tests/test_natural_keys.py
+import unittest
+import io
+import os
+import sqlite3
+
+# Temporarily adjust path to import app modules
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from faith_tracker_app.bible import bible_tracker
+from faith_tracker_app.rosary import rosary_tracker
+from faith_tracker_app.sins import sins_tracker
+from faith_tracker_app.database import connection, importer, sync
+from faith_tracker_app.ui import commands
+from faith_tracker_app.tests.helpers import TempDatabaseTestCase
+
+
+class TestNaturalKeys(TempDatabaseTestCase):
+
+    def _query(self, query, params=()):
+        conn = connection.get_db_connection()
+        try:
+            return conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+
+    def test_conflict_modes(self):
+        first = rosary_tracker.log_rosary_prayer("2023-10-02", "Joyful", "Morning")
+        self.assertIsNone(rosary_tracker.log_rosary_prayer("2023-10-02", "joyful", on_conflict="error"))
+        self.assertEqual(rosary_tracker.log_rosary_prayer("2023-10-02", "Joyful", on_conflict="ignore"), first)
+        self.assertEqual(rosary_tracker.log_rosary_prayer("2023-10-02", "Joyful", "Evening", on_conflict="update"), first)
+        self.assertEqual([tuple(r) for r in self._query("SELECT id, notes FROM rosary_prayers")], [(first, "Evening")])
+        # Other mysteries on the same day are a different entry
+        self.assertIsNotNone(rosary_tracker.log_rosary_prayer("2023-10-02", "Sorrowful"))
+
+    def test_sin_key_uses_occurrence_date(self):
+        self.assertIsNotNone(sins_tracker.add_sin_entry("Impatience", "2023-10-01"))
+        self.assertIsNotNone(sins_tracker.add_sin_entry("Impatience", "2023-10-02"))
+        self.assertIsNone(sins_tracker.add_sin_entry("Impatience", "2023-10-02", on_conflict="error"))
+        self.assertIsNotNone(sins_tracker.add_sin_entry("Impatience"))
+        self.assertEqual(len(sins_tracker.get_sin_log()), 3)
+
+    def test_interactive_logging_adds_separate_entries(self):
+        first = rosary_tracker.log_rosary_prayer("2023-10-02")
+        second = rosary_tracker.log_rosary_prayer("2023-10-02")
+        self.assertNotIn(second, (None, first))
+        self.assertIsNotNone(sins_tracker.add_sin_entry("Impatience"))
+        self.assertIsNotNone(sins_tracker.add_sin_entry("Impatience"))
+        self.assertEqual(len(sins_tracker.get_sin_log()), 2)
+
+        # Single commands add too; a batch of the same entry skips it
+        stdout, sys.stdout = sys.stdout, io.StringIO()
+        try:
+            self.assertEqual(commands.main(["rosary", "log", "--date", "2023-10-02"]), 0)
+            self.assertEqual(commands.main(["rosary", "log", "--date", "2023-10-02", "--on-conflict", "error"]), 1)
+        finally:
+            sys.stdout = stdout
+        self.assertEqual(commands.run_batch(["rosary log --date 2023-10-02"], err=io.StringIO())["unchanged"], 1)
+        self.assertEqual(self._query("SELECT COUNT(*) FROM rosary_prayers")[0][0], 3)
+        # Only the first entry holds the natural key, so bulk paths still find it
+        self.assertEqual(rosary_tracker.log_rosary_prayer("2023-10-02", on_conflict="ignore"), first)
+
+    def test_batch_rerun_adds_nothing(self):
+        lines = ["bible add John 3 --start-verse 16", "rosary log --date 2023-10-01", "sins add Pride --date 2023-10-01"]
+        first = commands.run_batch(lines, err=io.StringIO())
+        self.assertEqual(first, {"applied": 3, "failed": 0, "unchanged": 0})
+        # bible add stamps the current time, so only the dated entries are duplicates on a re-run
+        second = commands.run_batch(lines[1:], err=io.StringIO())
+        self.assertEqual(second, {"applied": 0, "failed": 0, "unchanged": 2})
+        third = commands.run_batch(lines[1:], err=io.StringIO(), on_conflict="error")
+        self.assertEqual(third, {"applied": 0, "failed": 2, "unchanged": 0})
+        self.assertEqual(self._query("SELECT COUNT(*) FROM sins_confession_log")[0][0], 1)
+
+    def test_reimport_and_sync_do_not_duplicate(self):
+        path = os.path.join(self.tmp_dir.name, "readings.csv")
+        with open(path, "w") as f:
+            f.write("book,chapter,reading_date,notes\n")
+            f.writelines(f"Mark,{chapter},2022-01-{chapter:02d},\n" for chapter in range(1, 17))
+        self.assertEqual(importer.import_file(path, "bible", workers=1)["imported"], 16)
+        summary = importer.import_file(path, "bible", workers=1, restart=True)
+        self.assertEqual((summary["imported"], summary["duplicates"]), (0, 16))
+
+        # The same file imported on another device has new uuids but the same natural keys
+        other = os.path.join(self.tmp_dir.name, "other.db")
+        connection.DATABASE_NAME = other
+        connection.initialize_database(quiet=True)
+        importer.import_file(path, "bible", workers=1)
+        bible_tracker.add_bible_reading("Mark", 16, notes="Only on the other device")
+        connection.DATABASE_NAME = self.database
+
+        result = sync.sync_databases(connection.DATABASE_NAME, other)
+        self.assertEqual(result["pulled"]["applied"], 1)
+        self.assertEqual(self._query("SELECT COUNT(*) FROM bible_reading")[0][0], 17)
+
+    def test_migration_keeps_existing_duplicates(self):
+        legacy = os.path.join(self.tmp_dir.name, "legacy.db")
+        conn = sqlite3.connect(legacy)
+        conn.execute("""
+            CREATE TABLE bible_reading (id INTEGER PRIMARY KEY AUTOINCREMENT, book TEXT NOT NULL,
+                chapter INTEGER NOT NULL, start_verse INTEGER, end_verse INTEGER, reading_date TEXT NOT NULL,
+                notes TEXT, created_at TEXT DEFAULT CURRENT_TIMESTAMP)
+        """)
+        conn.executemany("INSERT INTO bible_reading (book, chapter, reading_date) VALUES (?, ?, ?)",
+                         [("Ruth", 1, "2020-01-01 08:00:00")] * 2 + [("Ruth", 2, "2020-01-01 08:00:00")])
+        conn.commit()
+        conn.close()
+
+        connection.DATABASE_NAME = legacy
+        connection.initialize_database(quiet=True)
+        rows = self._query("SELECT id, content_hash FROM bible_reading ORDER BY id")
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]["content_hash"], bible_tracker.build_reading_row("Ruth", 1, reading_date="2020-01-01 08:00:00")[-1])
+        self.assertIsNone(rows[1]["content_hash"])
+        self.assertIsNotNone(rows[2]["content_hash"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+# faith_tracker_app/tests/test_query_plans.py
+import unittest
+import os
+import sqlite3
+import tempfile
+
+# Temporarily adjust path to import app modules
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from faith_tracker_app.database import archive, query_plans
+from faith_tracker_app.bible.bible_tracker import BibleRepository
+from faith_tracker_app.rosary.rosary_tracker import RosaryRepository
+from faith_tracker_app.sins.sins_tracker import SinsRepository
+
+# Repository methods that only build a row or a query and call one of the registered methods
+DELEGATING_METHODS = {"add_reading", "log_prayer", "add_entry", "list_query"}
+
+
+class TestQueryPlans(unittest.TestCase):
+    """EXPLAIN QUERY PLAN of every registered tracker statement, on a populated, analyzed database."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        path = query_plans.build_fixture_database(os.path.join(cls.tmp_dir.name, "fixture.db"))
+        cls.conn = sqlite3.connect(path)
+        archive.attach_archive(cls.conn)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.conn.close()
+        cls.tmp_dir.cleanup()
+
+    def test_tracker_queries_use_indexes(self):
+        queries = query_plans.tracker_queries(with_archive=True)
+        self.assertIn("liturgy.feast_counts rosary_prayers (date range, with archive)", [query[0] for query in queries])
+        for name, sql, params, allowed_scans in queries:
+            with self.subTest(query=name):
+                plan = query_plans.explain(self.conn, sql, params)
+                self.assertEqual(query_plans.plan_problems(plan, allowed_scans), [],
+                                 f"{name} has a regressed plan: {plan}\n{sql}")
+
+    def test_ids_listings_read_only_an_index(self):
+        ids_queries = [query for query in query_plans.tracker_queries() if "(ids)" in query[0]]
+        self.assertEqual(len(ids_queries), 6)
+        for name, sql, params, _ in ids_queries:
+            with self.subTest(query=name):
+                plan = query_plans.explain(self.conn, sql, params)
+                self.assertTrue(all("COVERING INDEX" in line for line in plan if line.startswith(("SCAN", "SEARCH"))),
+                                f"{name} reads table rows: {plan}")
+
+    def test_registry_covers_every_repository_method(self):
+        registered = {name.split()[0] for name, _, _, _ in query_plans.tracker_queries()}
+        for prefix, repository in (("bible", BibleRepository), ("rosary", RosaryRepository), ("sins", SinsRepository)):
+            for method in dir(repository):
+                if not method.startswith("_") and method not in DELEGATING_METHODS:
+                    self.assertIn(f"{prefix}.{method}", registered)
+
+    def test_guard_flags_table_scans_and_temp_sorts(self):
+        queries = [
+            ("filter on an unindexed column", "SELECT id FROM sins_confession_log WHERE notes = ?", ("x",), ()),
+            ("order by an unindexed column", "SELECT id FROM bible_reading ORDER BY notes LIMIT 5", (),
+             ("bible_reading",)),
+            ("range on an index, sorted on another column",
+             "SELECT id FROM rosary_prayers WHERE prayer_date > ? ORDER BY notes", ("2024-01-01",), ()),
+        ]
+        failures = query_plans.check_query_plans(self.conn, queries)
+        self.assertEqual(sorted(failures), sorted(name for name, _, _, _ in queries))
+        self.assertIn("USE TEMP B-TREE FOR ORDER BY", failures["order by an unindexed column"][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
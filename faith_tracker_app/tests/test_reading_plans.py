@@ -0,0 +1,81 @@
+# faith_tracker_app/tests/test_reading_plans.py
+import unittest
+import os
+import datetime
+
+# Temporarily adjust path to import app modules
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from faith_tracker_app.bible import bible_tracker, reading_plans
+from faith_tracker_app.bible.books import ALL_BOOKS, CHAPTER_COUNTS, canonical_book_name
+from faith_tracker_app.tests.helpers import TempDatabaseTestCase
+
+
+class TestReadingPlans(TempDatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.today = datetime.date.today()
+
+    def _date(self, days_from_today):
+        return (self.today + datetime.timedelta(days=days_from_today)).strftime("%Y-%m-%d")
+
+    def test_canonical_book_names(self):
+        self.assertEqual(len(ALL_BOOKS), 73)
+        self.assertEqual(sum(CHAPTER_COUNTS[book] for book in ALL_BOOKS[-27:]), 260)
+        self.assertEqual(canonical_book_name("psalm"), "Psalms")
+        self.assertEqual(canonical_book_name("First  Corinthians"), "1 Corinthians")
+        self.assertEqual(canonical_book_name("Song of Solomon"), "Song of Songs")
+        self.assertIsNone(canonical_book_name("Hezekiah"))
+
+    def test_generated_assignments(self):
+        day_ends = reading_plans.generate_day_ends(260, 90)
+        self.assertEqual(len(day_ends), 90)
+        self.assertEqual(day_ends[-1], 260)
+        self.assertTrue(all(2 <= b - a <= 3 for a, b in zip([0] + day_ends, day_ends)))
+        blob = reading_plans.pack_day_ends(day_ends)
+        self.assertEqual(len(blob), 180)
+        self.assertEqual(list(reading_plans.unpack_day_ends(blob)), day_ends)
+
+    def test_progress_and_todays_assignment(self):
+        plan_id = reading_plans.create_reading_plan(books=["Mark", "John"], days=37, start_date=self._date(-1))
+        status = reading_plans.get_plan_status(plan_id)
+        self.assertEqual(status["day"], 2)
+        self.assertEqual(status["expected"], 2)
+        self.assertEqual(status["ahead_by"], -2)
+        self.assertEqual([(e["book"], e["chapter"]) for e in status["assignment"]], [("Mark", 2)])
+
+        bible_tracker.add_bible_reading("Mark", 1)
+        bible_tracker.add_bible_reading("Mark", 2, 1, 10)
+        bible_tracker.add_bible_reading("Mark", 2, 11, 28) # Same chapter again doesn't count twice
+        bible_tracker.add_bible_reading("Genesis", 1)      # Not part of the plan
+        bible_tracker.add_bible_reading("john", 21)
+
+        status = reading_plans.get_plan_status(plan_id)
+        self.assertEqual(status["chapters_read"], 3)
+        self.assertEqual(status["ahead_by"], 1)
+        self.assertEqual(status["assignment"], [{"book": "Mark", "chapter": 2, "read": True}])
+
+        last_day = reading_plans.get_plan_status(plan_id, self._date(35))
+        self.assertEqual(last_day["assignment"], [{"book": "John", "chapter": 21, "read": True}])
+        self.assertEqual(last_day["ahead_by"], 3 - 37)
+
+    def test_plan_not_started(self):
+        plan_id = reading_plans.create_reading_plan(preset="new-testament-90", start_date=self._date(3))
+        bible_tracker.add_bible_reading("Matthew", 1)
+        status = reading_plans.get_plan_status(plan_id)
+        self.assertEqual(status["chapters_read"], 0)
+        self.assertEqual(status["expected"], 0)
+        self.assertEqual(status["assignment"], [])
+        self.assertIn("starts in 3 day(s)", reading_plans.format_plan_status_for_display(status))
+
+    def test_invalid_plans(self):
+        self.assertIsNone(reading_plans.create_reading_plan(books=["Hezekiah"], days=10))
+        self.assertIsNone(reading_plans.create_reading_plan(books=["Mark"], days=0))
+        self.assertIsNone(reading_plans.create_reading_plan(preset="psalms-forever"))
+        self.assertIsNone(reading_plans.get_plan_status(999))
+
+
+if __name__ == '__main__':
+    unittest.main()
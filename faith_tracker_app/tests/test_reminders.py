@@ -0,0 +1,130 @@
+# faith_tracker_app/tests/test_reminders.py
+import unittest
+import datetime
+import os
+import sqlite3
+import threading
+from unittest import mock
+
+# Temporarily adjust path to import app modules
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from faith_tracker_app.database import concurrency, connection
+from faith_tracker_app.reminders import scheduler
+from faith_tracker_app.rosary import rosary_tracker
+from faith_tracker_app.sins import sins_tracker
+from faith_tracker_app.tests.helpers import TempDatabaseTestCase
+
+
+class RecordingNotifier(scheduler.Notifier):
+
+    def __init__(self):
+        self.sent = []
+        self.event = threading.Event()
+
+    def notify(self, reminder, message, due_at):
+        self.sent.append((reminder, due_at))
+        self.event.set()
+
+
+class TestReminderScheduler(TempDatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.notifier = RecordingNotifier()
+        self.scheduler = scheduler.ReminderScheduler(self.notifier)
+
+    def tearDown(self):
+        self.scheduler.stop()
+
+    def due_at(self, reminder):
+        return {row["reminder"]: row["due_at"] for row in scheduler.get_schedule()}[reminder]
+
+    def add_old_sin(self, description, created_at):
+        conn = connection.get_db_connection()
+        try:
+            conn.execute("INSERT INTO sins_confession_log (sin_description, confessed, created_at) VALUES (?, FALSE, ?)",
+                         (description, created_at))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def test_rosary_reminder_moves_past_logged_days(self):
+        today = datetime.date.today()
+        self.assertEqual(self.due_at("rosary")[:10],
+                         datetime.datetime.combine(today, datetime.time(20)).astimezone(datetime.timezone.utc)
+                         .strftime("%Y-%m-%d"))
+        rosary_tracker.log_rosary_prayer(today.strftime("%Y-%m-%d"))
+        tomorrow_evening = datetime.datetime.combine(today + datetime.timedelta(days=1), datetime.time(20))
+        self.assertEqual(self.due_at("rosary"),
+                         tomorrow_evening.astimezone(datetime.timezone.utc).strftime("%Y-%m-%d %H:%M:%S"))
+        # Logging an older day doesn't bring it back
+        rosary_tracker.log_rosary_prayer("2020-01-01")
+        self.assertEqual(self.due_at("rosary"),
+                         tomorrow_evening.astimezone(datetime.timezone.utc).strftime("%Y-%m-%d %H:%M:%S"))
+
+    def test_confession_reminder_follows_the_oldest_unconfessed_sin(self):
+        self.assertIsNone(self.due_at("confession"))
+        self.add_old_sin("Impatience", "2024-01-10 09:00:00")
+        self.add_old_sin("Gossip", "2024-01-01 08:00:00")
+        self.assertEqual(self.due_at("confession"), "2024-01-31 08:00:00")
+
+        conn = connection.get_db_connection()
+        gossip_id = conn.execute("SELECT id FROM sins_confession_log WHERE sin_description = 'Gossip'").fetchone()[0]
+        conn.close()
+        sins_tracker.mark_sin_as_confessed(gossip_id)
+        self.assertEqual(self.due_at("confession"), "2024-02-09 09:00:00")
+        sins_tracker.add_sin_entry("Pride")  # Logged now: due in 30 days, later than the backlog
+        self.assertEqual(self.due_at("confession"), "2024-02-09 09:00:00")
+
+    def test_run_due_notifies_and_reschedules(self):
+        self.add_old_sin("Gossip", "2024-01-01 08:00:00")
+        self.assertEqual(self.scheduler.run_due("2024-01-30 00:00:00"), [])
+        sent = self.scheduler.run_due("2024-02-01 12:00:00")
+        self.assertEqual([reminder for reminder, _ in sent], ["confession"])
+        self.assertIn("2024-01-01", sent[0][1])
+        self.assertEqual(self.notifier.sent, [("confession", "2024-01-31 08:00:00")])
+        self.assertEqual(self.due_at("confession"), "2024-02-02 12:00:00")
+        self.assertEqual(self.scheduler.next_due()[1], "confession")
+
+        # Confessing the backlog clears it
+        sins_tracker.mark_sin_as_confessed(1)
+        self.assertIsNone(self.due_at("confession"))
+
+    def test_reminders_are_sent_after_the_reschedule_is_committed(self):
+        self.add_old_sin("Gossip", "2024-01-01 08:00:00")
+        concurrency.reset_write_metrics()
+        self.assertEqual(self.scheduler.run_due("2024-01-30 00:00:00"), [])
+        # Nothing was due, so the write lock wasn't taken
+        self.assertEqual(concurrency.get_write_metrics()["began"], 0)
+
+        schedule_when_sent = []
+        self.notifier.notify = lambda reminder, message, due_at: schedule_when_sent.append(self.due_at(reminder))
+        self.scheduler.run_due("2024-02-01 12:00:00")
+        self.assertEqual(schedule_when_sent, ["2024-02-02 12:00:00"])
+
+        # A reschedule that can't be committed sends nothing
+        schedule_when_sent.clear()
+        with mock.patch.object(scheduler, "write_transaction", side_effect=sqlite3.OperationalError("database is locked")):
+            with self.assertRaises(sqlite3.OperationalError):
+                self.scheduler.run_due("2024-02-03 12:00:00")
+        self.assertEqual(schedule_when_sent, [])
+
+    def test_background_thread_sends_due_reminders(self):
+        self.add_old_sin("Gossip", "2024-01-01 08:00:00")
+        self.scheduler.poll_interval = 0.05
+        self.scheduler.start()
+        self.assertTrue(self.notifier.event.wait(5))
+        self.scheduler.stop(5)
+        self.assertIn(("confession", "2024-01-31 08:00:00"), self.notifier.sent)
+
+    def test_file_notifier(self):
+        path = os.path.join(self.tmp_dir.name, "reminders.txt")
+        scheduler.FileNotifier(path).notify("rosary", "No Rosary logged today.", "2024-02-01 19:00:00")
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "2024-02-01 19:00:00\trosary\tNo Rosary logged today.\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
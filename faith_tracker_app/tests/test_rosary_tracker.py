@@ -10,16 +10,14 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..',
 
 from faith_tracker_app.rosary import rosary_tracker
 from faith_tracker_app.database import schema
+from faith_tracker_app.tests.helpers import TempDatabaseTestCase
 
 TEST_DB_NAME = ":memory:"
 
 class TestRosaryTracker(unittest.TestCase):
 
     def setUp(self):
-        """Set up a new in-memory database for each test."""
-        self.original_get_db_connection = rosary_tracker.get_db_connection
-        rosary_tracker.get_db_connection = lambda: self.get_test_db_connection()
-
+        """Set up a new in-memory database for each test; it is passed to the tracker functions as conn."""
         self.conn = self.get_test_db_connection()
         self.cursor = self.conn.cursor()
         self._initialize_schema()
@@ -36,10 +34,9 @@ class TestRosaryTracker(unittest.TestCase):
 
     def tearDown(self):
         self.conn.close()
-        rosary_tracker.get_db_connection = self.original_get_db_connection
 
     def test_log_rosary_prayer_today_default_date(self):
-        log_id = rosary_tracker.log_rosary_prayer(mysteries="Joyful", notes="Morning")
+        log_id = rosary_tracker.log_rosary_prayer(mysteries="Joyful", notes="Morning", conn=self.conn)
         self.assertIsNotNone(log_id)
 
         self.cursor.execute("SELECT * FROM rosary_prayers WHERE id = ?", (log_id,))
@@ -51,7 +48,7 @@ class TestRosaryTracker(unittest.TestCase):
 
     def test_log_rosary_prayer_specific_date(self):
         test_date = "2023-03-15"
-        log_id = rosary_tracker.log_rosary_prayer(prayer_date=test_date, mysteries="Sorrowful")
+        log_id = rosary_tracker.log_rosary_prayer(prayer_date=test_date, mysteries="Sorrowful", conn=self.conn)
         self.assertIsNotNone(log_id)
 
         self.cursor.execute("SELECT * FROM rosary_prayers WHERE id = ?", (log_id,))
@@ -60,7 +57,7 @@ class TestRosaryTracker(unittest.TestCase):
         self.assertEqual(entry["mysteries"], "Sorrowful")
 
     def test_log_rosary_prayer_invalid_date_format(self):
-        log_id = rosary_tracker.log_rosary_prayer(prayer_date="15-03-2023")
+        log_id = rosary_tracker.log_rosary_prayer(prayer_date="15-03-2023", conn=self.conn)
         self.assertIsNone(log_id, "Should return None for invalid date format.")
         # Also check that nothing was inserted
         self.cursor.execute("SELECT COUNT(*) FROM rosary_prayers WHERE prayer_date = '15-03-2023'")
@@ -69,13 +66,13 @@ class TestRosaryTracker(unittest.TestCase):
 
 
     def test_get_rosary_prayer_history(self):
-        rosary_tracker.log_rosary_prayer(prayer_date="2023-10-01", mysteries="Joyful")
+        rosary_tracker.log_rosary_prayer(prayer_date="2023-10-01", mysteries="Joyful", conn=self.conn)
         import time; time.sleep(0.01) # Ensure created_at is different for ordering
-        rosary_tracker.log_rosary_prayer(prayer_date="2023-10-03", mysteries="Glorious")
+        rosary_tracker.log_rosary_prayer(prayer_date="2023-10-03", mysteries="Glorious", conn=self.conn)
         import time; time.sleep(0.01)
-        rosary_tracker.log_rosary_prayer(prayer_date="2023-10-02", mysteries="Sorrowful")
+        rosary_tracker.log_rosary_prayer(prayer_date="2023-10-02", mysteries="Sorrowful", conn=self.conn)
 
-        history = rosary_tracker.get_rosary_prayer_history()
+        history = rosary_tracker.get_rosary_prayer_history(conn=self.conn)
         self.assertEqual(len(history), 3)
         # Ordered by prayer_date DESC, then created_at DESC
         self.assertEqual(history[0]["mysteries"], "Glorious") # 2023-10-03
@@ -85,30 +82,30 @@ class TestRosaryTracker(unittest.TestCase):
     def test_get_rosary_prayer_history_same_date_ordering(self):
         # Log two entries for the same date, ensure created_at ordering
         today = datetime.date.today().strftime("%Y-%m-%d")
-        rosary_tracker.log_rosary_prayer(prayer_date=today, mysteries="First")
+        rosary_tracker.log_rosary_prayer(prayer_date=today, mysteries="First", conn=self.conn)
         import time; time.sleep(0.02) # Ensure distinct created_at
-        rosary_tracker.log_rosary_prayer(prayer_date=today, mysteries="Second")
+        rosary_tracker.log_rosary_prayer(prayer_date=today, mysteries="Second", conn=self.conn)
 
-        history = rosary_tracker.get_rosary_prayer_history(limit=2)
+        history = rosary_tracker.get_rosary_prayer_history(limit=2, conn=self.conn)
         self.assertEqual(len(history), 2)
         self.assertEqual(history[0]["mysteries"], "Second") # Logged later
         self.assertEqual(history[1]["mysteries"], "First")  # Logged earlier
 
 
     def test_get_rosary_prayer_history_limit(self):
-        rosary_tracker.log_rosary_prayer(prayer_date="2023-09-01")
+        rosary_tracker.log_rosary_prayer(prayer_date="2023-09-01", conn=self.conn)
         import time; time.sleep(0.01)
-        rosary_tracker.log_rosary_prayer(prayer_date="2023-09-03")
+        rosary_tracker.log_rosary_prayer(prayer_date="2023-09-03", conn=self.conn)
         import time; time.sleep(0.01)
-        rosary_tracker.log_rosary_prayer(prayer_date="2023-09-02")
+        rosary_tracker.log_rosary_prayer(prayer_date="2023-09-02", conn=self.conn)
 
-        history = rosary_tracker.get_rosary_prayer_history(limit=2)
+        history = rosary_tracker.get_rosary_prayer_history(limit=2, conn=self.conn)
         self.assertEqual(len(history), 2)
         self.assertEqual(history[0]["prayer_date"], "2023-09-03")
         self.assertEqual(history[1]["prayer_date"], "2023-09-02")
 
     def test_get_rosary_prayer_history_empty(self):
-        history = rosary_tracker.get_rosary_prayer_history()
+        history = rosary_tracker.get_rosary_prayer_history(conn=self.conn)
         self.assertEqual(len(history), 0)
 
     def test_format_rosary_log_for_display(self):
@@ -125,5 +122,80 @@ class TestRosaryTracker(unittest.TestCase):
         self.assertEqual(rosary_tracker.format_rosary_log_for_display(log4), "[4] 2023-01-04")
 
 
+class TestRosaryMysteries(TempDatabaseTestCase):
+    """Mysteries normalisation, weekday schedule and aggregate queries, on a temporary database file."""
+
+    def setUp(self):
+        super().setUp()
+        from faith_tracker_app.database import connection
+        self.connection = connection
+
+    def _fetch(self, log_id):
+        conn = self.connection.get_db_connection()
+        try:
+            return conn.execute("SELECT * FROM rosary_prayers WHERE id = ?", (log_id,)).fetchone()
+        finally:
+            conn.close()
+
+    def test_mysteries_are_normalised(self):
+        for day, text in (("2023-10-02", "Joyful"), ("2023-10-09", "joyful"), ("2023-10-16", " JOYFUL ")):
+            entry = self._fetch(rosary_tracker.log_rosary_prayer(prayer_date=day, mysteries=text))
+            self.assertEqual(entry["mysteries"], "Joyful")
+            self.assertEqual(entry["mystery_id"], rosary_tracker.Mysteries.JOYFUL)
+
+        entry = self._fetch(rosary_tracker.log_rosary_prayer(prayer_date="2023-10-02", mysteries="Seven Sorrows"))
+        self.assertEqual(entry["mysteries"], "Seven Sorrows")
+        self.assertIsNone(entry["mystery_id"])
+
+    def test_scheduled_mysteries_default(self):
+        self.assertEqual(rosary_tracker.get_scheduled_mysteries("2023-10-05"), rosary_tracker.Mysteries.LUMINOUS) # Thursday
+        self.assertEqual(rosary_tracker.get_scheduled_mysteries("2023-10-06"), rosary_tracker.Mysteries.SORROWFUL) # Friday
+
+        entry = self._fetch(rosary_tracker.log_rosary_prayer(prayer_date="2023-10-08")) # Sunday
+        self.assertEqual(entry["mysteries"], "Glorious")
+        self.assertEqual(entry["weekday"], 6)
+
+        entry = self._fetch(rosary_tracker.log_rosary_prayer(prayer_date="2023-10-08", default_mysteries=False))
+        self.assertIsNone(entry["mysteries"])
+
+    def test_mystery_and_weekday_counts(self):
+        rosary_tracker.log_rosary_prayer(prayer_date="2023-10-02", mysteries="joyful")    # Monday
+        rosary_tracker.log_rosary_prayer(prayer_date="2023-10-03", mysteries="Glorious ") # Tuesday
+        rosary_tracker.log_rosary_prayer(prayer_date="2023-10-09", mysteries="Joyful")    # Monday
+        rosary_tracker.log_rosary_prayer(prayer_date="2023-10-09", default_mysteries=False)
+
+        counts = rosary_tracker.get_mystery_counts()
+        self.assertEqual(counts, {"Joyful": 2, "Sorrowful": 0, "Glorious": 1, "Luminous": 0, None: 1})
+
+        weekdays = rosary_tracker.get_weekday_counts()
+        self.assertEqual(weekdays["Monday"], 3)
+        self.assertEqual(weekdays["Tuesday"], 1)
+        self.assertEqual(weekdays["Sunday"], 0)
+
+        by_mysteries = rosary_tracker.get_weekday_counts(by_mysteries=True)
+        self.assertEqual(by_mysteries["Monday"], {"Joyful": 2, None: 1})
+
+    def test_legacy_database_is_migrated(self):
+        legacy_path = os.path.join(self.tmp_dir.name, "legacy.db")
+        conn = sqlite3.connect(legacy_path)
+        conn.execute("""
+            CREATE TABLE rosary_prayers (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, prayer_date TEXT NOT NULL,
+                mysteries TEXT, notes TEXT, created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.executemany("INSERT INTO rosary_prayers (prayer_date, mysteries) VALUES (?, ?)",
+                         [("2023-10-02", "sorrowful"), ("2023-10-08", "Glorious "), ("2023-10-09", None)])
+        conn.commit()
+        conn.close()
+
+        self.connection.DATABASE_NAME = legacy_path
+        self.connection.initialize_database(quiet=True)
+        self.assertEqual(rosary_tracker.get_mystery_counts()["Sorrowful"], 1)
+        self.assertEqual(rosary_tracker.get_mystery_counts()["Glorious"], 1)
+        self.assertEqual(rosary_tracker.get_weekday_counts()["Monday"], 2)
+        self.assertEqual(self._fetch(2)["mysteries"], "Glorious")
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,128 @@
+# faith_tracker_app/tests/test_sins_backlog.py
+import unittest
+import contextlib
+import io
+import json
+import os
+
+# Temporarily adjust path to import app modules
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from faith_tracker_app.database import connection, schema
+from faith_tracker_app.sins import backlog, sins_tracker
+from faith_tracker_app.ui import commands
+from faith_tracker_app.tests.helpers import TempDatabaseTestCase
+
+
+class TestSinsBacklog(TempDatabaseTestCase):
+
+    def execute(self, sql, params=()):
+        conn = connection.get_db_connection()
+        try:
+            rows = conn.execute(sql, params).fetchall()
+            conn.commit()
+            return rows
+        finally:
+            conn.close()
+
+    def add_sin(self, description, created_at, confessed=False):
+        self.execute("INSERT INTO sins_confession_log (sin_description, confessed, created_at) VALUES (?, ?, ?)",
+                      (description, confessed, created_at))
+        return self.execute("SELECT id FROM sins_confession_log WHERE sin_description = ?", (description,))[0][0]
+
+    def assertConsistent(self):
+        self.assertEqual(backlog.check_backlog(), [])
+
+    def test_every_write_path_keeps_the_summary(self):
+        first = self.add_sin("Impatience", "2024-01-20 08:00:00")
+        self.add_sin("Gossip", "2024-01-05 21:00:00")
+        third = self.add_sin("Sloth", "2024-03-02 07:00:00")
+        self.add_sin("Pride", "2024-03-09 07:00:00", confessed=True)
+        self.assertEqual(sins_tracker.get_backlog_summary(),
+                         {"unconfessed": 3, "oldest": "2024-01-05 21:00:00",
+                          "by_month": {"2024-01": 2, "2024-03": 1}})
+        self.assertConsistent()
+
+        # Confessing the month's oldest moves it on; confessing its last one removes the month
+        gossip = self.execute("SELECT id FROM sins_confession_log WHERE sin_description = 'Gossip'")[0][0]
+        self.assertTrue(sins_tracker.mark_sin_as_confessed(gossip, "2024-02-01"))
+        self.assertEqual(tuple(self.execute("SELECT month, unconfessed, oldest FROM sins_backlog WHERE month = '2024-01'")[0]),
+                         ("2024-01", 1, "2024-01-20 08:00:00"))
+        self.assertTrue(sins_tracker.mark_sin_as_confessed(third, "2024-03-03"))
+        self.assertEqual(sins_tracker.get_backlog_summary()["by_month"], {"2024-01": 1})
+        self.assertConsistent()
+
+        # A sync rewriting a row moves it between months; un-confessing counts it again
+        self.execute("UPDATE sins_confession_log SET created_at = '2024-02-11 09:00:00' WHERE id = ?", (first,))
+        self.execute("UPDATE sins_confession_log SET confessed = FALSE WHERE id = ?", (third,))
+        self.assertEqual(sins_tracker.get_backlog_summary()["by_month"], {"2024-02": 1, "2024-03": 1})
+        self.assertConsistent()
+
+        self.execute("DELETE FROM sins_confession_log WHERE id = ?", (first,))
+        self.assertEqual(sins_tracker.get_backlog_summary(),
+                         {"unconfessed": 1, "oldest": "2024-03-02 07:00:00", "by_month": {"2024-03": 1}})
+        self.assertConsistent()
+
+    def test_tracker_functions_update_the_summary_in_their_transaction(self):
+        entry_id = sins_tracker.add_sin_entry("Impatience", "2024-03-01")
+        self.assertEqual(sins_tracker.get_backlog_summary()["unconfessed"], 1)
+        # A rejected duplicate writes nothing, so counts nothing
+        self.assertIsNone(sins_tracker.add_sin_entry("Impatience", "2024-03-01", on_conflict="error"))
+        self.assertEqual(sins_tracker.get_backlog_summary()["unconfessed"], 1)
+        sins_tracker.mark_sin_as_confessed(entry_id, "2024-03-02")
+        self.assertEqual(sins_tracker.get_backlog_summary(), {"unconfessed": 0, "oldest": None, "by_month": {}})
+        self.assertConsistent()
+
+    def test_existing_database_is_backfilled_once(self):
+        self.add_sin("Impatience", "2023-12-20 08:00:00")
+        conn = connection.get_db_connection()
+        for trigger in ("insert", "update", "delete"):
+            conn.execute(f"DROP TRIGGER sins_confession_log_{trigger}_backlog")
+        conn.execute("DROP TABLE sins_backlog")
+        conn.execute("INSERT INTO sins_confession_log (sin_description, created_at) VALUES ('Gossip', '2024-01-05 21:00:00')")
+        conn.commit()
+        conn.close()
+
+        connection.initialize_database(quiet=True)
+        connection.initialize_database(quiet=True)
+        self.assertEqual(sins_tracker.get_backlog_summary(),
+                         {"unconfessed": 2, "oldest": "2023-12-20 08:00:00",
+                          "by_month": {"2023-12": 1, "2024-01": 1}})
+        self.assertConsistent()
+
+    def test_checker_reports_and_repairs_drift(self):
+        self.add_sin("Impatience", "2024-01-20 08:00:00")
+        self.add_sin("Sloth", "2024-03-02 07:00:00")
+        self.execute("UPDATE sins_backlog SET unconfessed = 5 WHERE month = '2024-01'")
+        self.execute("DELETE FROM sins_backlog WHERE month = '2024-03'")
+        self.execute("INSERT INTO sins_backlog VALUES ('2022-07', 1, '2022-07-01 00:00:00')")
+
+        differences = backlog.check_backlog()
+        self.assertEqual([(d["month"], d["log_unconfessed"], d["summary_unconfessed"]) for d in differences],
+                         [("2022-07", 0, 1), ("2024-01", 1, 5), ("2024-03", 1, 0)])
+        self.assertEqual(len(backlog.check_backlog()), 3)  # Checking alone changes nothing
+
+        self.assertEqual(len(backlog.check_backlog(repair=True)), 3)
+        self.assertConsistent()
+        self.assertEqual(sins_tracker.get_backlog_summary()["by_month"], {"2024-01": 1, "2024-03": 1})
+
+    def test_cli(self):
+        self.add_sin("Impatience", "2024-01-20 08:00:00")
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.assertEqual(commands.main(["--format", "json", "sins", "backlog"]), 0)
+        self.assertEqual(json.loads(out.getvalue())["by_month"], {"2024-01": 1})
+
+        self.execute("DELETE FROM sins_backlog")
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.assertEqual(commands.main(["sins", "backlog", "--check"]), 1)
+            self.assertEqual(commands.main(["sins", "backlog", "--check", "--repair"]), 0)
+            self.assertEqual(commands.main(["sins", "backlog"]), 0)
+        self.assertIn("2024-01: log has 1 unconfessed", out.getvalue())
+        self.assertIn("1 unconfessed sin(s), the oldest logged on 2024-01-20.", out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
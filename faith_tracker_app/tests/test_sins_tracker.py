@@ -16,9 +16,6 @@ TEST_DB_NAME = ":memory:"
 class TestSinsTracker(unittest.TestCase):
 
     def setUp(self):
-        self.original_get_db_connection = sins_tracker.get_db_connection
-        sins_tracker.get_db_connection = lambda: self.get_test_db_connection()
-
         self.conn = self.get_test_db_connection()
         self.cursor = self.conn.cursor()
         self._initialize_schema()
@@ -35,10 +32,9 @@ class TestSinsTracker(unittest.TestCase):
 
     def tearDown(self):
         self.conn.close()
-        sins_tracker.get_db_connection = self.original_get_db_connection
 
     def test_add_sin_entry(self):
-        entry_id = sins_tracker.add_sin_entry("Test sin", occurrence_date="2023-04-01", notes="A note")
+        entry_id = sins_tracker.add_sin_entry("Test sin", occurrence_date="2023-04-01", notes="A note", conn=self.conn)
         self.assertIsNotNone(entry_id)
 
         self.cursor.execute("SELECT * FROM sins_confession_log WHERE id = ?", (entry_id,))
@@ -51,7 +47,7 @@ class TestSinsTracker(unittest.TestCase):
         self.assertIsNone(entry["confession_date"])
 
     def test_add_sin_entry_minimal(self):
-        entry_id = sins_tracker.add_sin_entry("Another sin")
+        entry_id = sins_tracker.add_sin_entry("Another sin", conn=self.conn)
         self.assertIsNotNone(entry_id)
         self.cursor.execute("SELECT * FROM sins_confession_log WHERE id = ?", (entry_id,))
         entry = self.cursor.fetchone()
@@ -61,7 +57,7 @@ class TestSinsTracker(unittest.TestCase):
         self.assertFalse(entry["confessed"])
 
     def test_add_sin_entry_invalid_date(self):
-        entry_id = sins_tracker.add_sin_entry("Sin with bad date", occurrence_date="bad-date-format")
+        entry_id = sins_tracker.add_sin_entry("Sin with bad date", occurrence_date="bad-date-format", conn=self.conn)
         self.assertIsNone(entry_id)
         self.cursor.execute("SELECT COUNT(*) FROM sins_confession_log WHERE sin_description = 'Sin with bad date'")
         count = self.cursor.fetchone()[0]
@@ -69,8 +65,8 @@ class TestSinsTracker(unittest.TestCase):
 
 
     def test_mark_sin_as_confessed_default_date(self):
-        entry_id = sins_tracker.add_sin_entry("To be confessed")
-        self.assertTrue(sins_tracker.mark_sin_as_confessed(entry_id))
+        entry_id = sins_tracker.add_sin_entry("To be confessed", conn=self.conn)
+        self.assertTrue(sins_tracker.mark_sin_as_confessed(entry_id, conn=self.conn))
 
         self.cursor.execute("SELECT * FROM sins_confession_log WHERE id = ?", (entry_id,))
         entry = self.cursor.fetchone()
@@ -78,9 +74,9 @@ class TestSinsTracker(unittest.TestCase):
         self.assertEqual(entry["confession_date"], datetime.date.today().strftime("%Y-%m-%d"))
 
     def test_mark_sin_as_confessed_specific_date(self):
-        entry_id = sins_tracker.add_sin_entry("Another to confess")
+        entry_id = sins_tracker.add_sin_entry("Another to confess", conn=self.conn)
         confession_d = "2023-05-10"
-        self.assertTrue(sins_tracker.mark_sin_as_confessed(entry_id, confession_date=confession_d))
+        self.assertTrue(sins_tracker.mark_sin_as_confessed(entry_id, confession_date=confession_d, conn=self.conn))
 
         self.cursor.execute("SELECT * FROM sins_confession_log WHERE id = ?", (entry_id,))
         entry = self.cursor.fetchone()
@@ -88,32 +84,32 @@ class TestSinsTracker(unittest.TestCase):
         self.assertEqual(entry["confession_date"], confession_d)
 
     def test_mark_sin_as_confessed_invalid_date(self):
-        entry_id = sins_tracker.add_sin_entry("Confession bad date")
-        self.assertFalse(sins_tracker.mark_sin_as_confessed(entry_id, confession_date="not-a-date"))
+        entry_id = sins_tracker.add_sin_entry("Confession bad date", conn=self.conn)
+        self.assertFalse(sins_tracker.mark_sin_as_confessed(entry_id, confession_date="not-a-date", conn=self.conn))
         self.cursor.execute("SELECT confessed FROM sins_confession_log WHERE id = ?", (entry_id,))
         entry = self.cursor.fetchone()
         self.assertFalse(entry["confessed"])
 
 
     def test_mark_sin_as_confessed_already_confessed(self):
-        entry_id = sins_tracker.add_sin_entry("Already done")
-        sins_tracker.mark_sin_as_confessed(entry_id, "2023-01-01")
+        entry_id = sins_tracker.add_sin_entry("Already done", conn=self.conn)
+        sins_tracker.mark_sin_as_confessed(entry_id, "2023-01-01", conn=self.conn)
         # Try to mark again
-        self.assertFalse(sins_tracker.mark_sin_as_confessed(entry_id, "2023-01-02"))
+        self.assertFalse(sins_tracker.mark_sin_as_confessed(entry_id, "2023-01-02", conn=self.conn))
 
         self.cursor.execute("SELECT confession_date FROM sins_confession_log WHERE id = ?", (entry_id,))
         entry = self.cursor.fetchone()
         self.assertEqual(entry["confession_date"], "2023-01-01") # Should retain original date
 
     def test_mark_sin_as_confessed_non_existent_id(self):
-        self.assertFalse(sins_tracker.mark_sin_as_confessed(999)) # Non-existent ID
+        self.assertFalse(sins_tracker.mark_sin_as_confessed(999, conn=self.conn)) # Non-existent ID
 
     def test_get_sin_log_all(self):
-        sins_tracker.add_sin_entry("Sin 1", occurrence_date="2023-10-01")
-        id2 = sins_tracker.add_sin_entry("Sin 2", occurrence_date="2023-10-02")
-        sins_tracker.mark_sin_as_confessed(id2, "2023-10-03")
+        sins_tracker.add_sin_entry("Sin 1", occurrence_date="2023-10-01", conn=self.conn)
+        id2 = sins_tracker.add_sin_entry("Sin 2", occurrence_date="2023-10-02", conn=self.conn)
+        sins_tracker.mark_sin_as_confessed(id2, "2023-10-03", conn=self.conn)
 
-        log = sins_tracker.get_sin_log(show_all=True)
+        log = sins_tracker.get_sin_log(show_all=True, conn=self.conn)
         self.assertEqual(len(log), 2)
         # Ordered by created_at DESC, so Sin 2 (id2) should be first
         self.assertEqual(log[0]["sin_description"], "Sin 2")
@@ -121,45 +117,45 @@ class TestSinsTracker(unittest.TestCase):
 
 
     def test_get_sin_log_unconfessed(self):
-        sins_tracker.add_sin_entry("Unconfessed 1")
-        id_conf = sins_tracker.add_sin_entry("Confessed 1")
-        sins_tracker.mark_sin_as_confessed(id_conf)
-        sins_tracker.add_sin_entry("Unconfessed 2")
+        sins_tracker.add_sin_entry("Unconfessed 1", conn=self.conn)
+        id_conf = sins_tracker.add_sin_entry("Confessed 1", conn=self.conn)
+        sins_tracker.mark_sin_as_confessed(id_conf, conn=self.conn)
+        sins_tracker.add_sin_entry("Unconfessed 2", conn=self.conn)
 
-        log = sins_tracker.get_sin_log(show_all=False, show_confessed=False)
+        log = sins_tracker.get_sin_log(show_all=False, show_confessed=False, conn=self.conn)
         self.assertEqual(len(log), 2)
         self.assertTrue(all(not entry["confessed"] for entry in log))
         self.assertEqual(log[0]["sin_description"], "Unconfessed 2") # Most recent unconfessed
         self.assertEqual(log[1]["sin_description"], "Unconfessed 1")
 
     def test_get_sin_log_confessed(self):
-        sins_tracker.add_sin_entry("Unconfessed A")
-        id_conf1 = sins_tracker.add_sin_entry("Confessed B")
-        sins_tracker.mark_sin_as_confessed(id_conf1, "2023-10-01")
-        id_conf2 = sins_tracker.add_sin_entry("Confessed C")
-        sins_tracker.mark_sin_as_confessed(id_conf2, "2023-10-02")
+        sins_tracker.add_sin_entry("Unconfessed A", conn=self.conn)
+        id_conf1 = sins_tracker.add_sin_entry("Confessed B", conn=self.conn)
+        sins_tracker.mark_sin_as_confessed(id_conf1, "2023-10-01", conn=self.conn)
+        id_conf2 = sins_tracker.add_sin_entry("Confessed C", conn=self.conn)
+        sins_tracker.mark_sin_as_confessed(id_conf2, "2023-10-02", conn=self.conn)
 
 
-        log = sins_tracker.get_sin_log(show_all=False, show_confessed=True)
+        log = sins_tracker.get_sin_log(show_all=False, show_confessed=True, conn=self.conn)
         self.assertEqual(len(log), 2)
         self.assertTrue(all(entry["confessed"] for entry in log))
         self.assertEqual(log[0]["sin_description"], "Confessed C") # Most recent confessed by creation time
         self.assertEqual(log[1]["sin_description"], "Confessed B")
 
     def test_get_sin_log_limit(self):
-        sins_tracker.add_sin_entry("S1")
+        sins_tracker.add_sin_entry("S1", conn=self.conn)
         import time; time.sleep(0.01)
-        sins_tracker.add_sin_entry("S2")
+        sins_tracker.add_sin_entry("S2", conn=self.conn)
         import time; time.sleep(0.01)
-        sins_tracker.add_sin_entry("S3")
+        sins_tracker.add_sin_entry("S3", conn=self.conn)
 
-        log = sins_tracker.get_sin_log(show_all=True, limit=2)
+        log = sins_tracker.get_sin_log(show_all=True, limit=2, conn=self.conn)
         self.assertEqual(len(log), 2)
         self.assertEqual(log[0]["sin_description"], "S3")
         self.assertEqual(log[1]["sin_description"], "S2")
 
     def test_get_sin_log_empty(self):
-        log = sins_tracker.get_sin_log()
+        log = sins_tracker.get_sin_log(conn=self.conn)
         self.assertEqual(len(log), 0)
 
     def test_format_sin_entry_for_display(self):
@@ -0,0 +1,174 @@
+# faith_tracker_app/tests/test_sync.py
+import unittest
+import os
+import sqlite3
+import tempfile
+import time
+
+# Temporarily adjust path to import app modules
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from faith_tracker_app.bible import bible_tracker
+from faith_tracker_app.rosary import rosary_tracker
+from faith_tracker_app.sins import sins_tracker
+from faith_tracker_app.database import archive, connection, sync
+
+
+class TestSync(unittest.TestCase):
+
+    def setUp(self):
+        """Create two database files, "laptop" and "phone"."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.original_database_name = connection.DATABASE_NAME
+        self.laptop = os.path.join(self.tmp_dir.name, "laptop.db")
+        self.phone = os.path.join(self.tmp_dir.name, "phone.db")
+        for path in (self.laptop, self.phone):
+            self.use(path)
+            connection.initialize_database(quiet=True)
+
+    def tearDown(self):
+        connection.DATABASE_NAME = self.original_database_name
+        self.tmp_dir.cleanup()
+
+    def use(self, path):
+        connection.DATABASE_NAME = path
+
+    def rows(self, path, query):
+        conn = sqlite3.connect(path)
+        try:
+            return conn.execute(query).fetchall()
+        finally:
+            conn.close()
+
+    def test_changelog_records_writes(self):
+        self.use(self.laptop)
+        entry_id = sins_tracker.add_sin_entry("Impatience")
+        sins_tracker.mark_sin_as_confessed(entry_id, "2023-10-05")
+        changes = self.rows(self.laptop, "SELECT seq, table_name, operation FROM changelog ORDER BY seq")
+        self.assertEqual([(c[1], c[2]) for c in changes],
+                         [("sins_confession_log", "upsert"), ("sins_confession_log", "upsert")])
+        self.assertLess(changes[0][0], changes[1][0])
+
+    def test_sync_exchanges_only_new_changes(self):
+        self.use(self.laptop)
+        bible_tracker.add_bible_reading("John", 3, 16)
+        rosary_tracker.log_rosary_prayer(prayer_date="2023-10-02")
+        self.use(self.phone)
+        sins_tracker.add_sin_entry("Gossip", occurrence_date="2023-10-03")
+
+        result = sync.sync_databases(self.laptop, self.phone)
+        self.assertEqual(result["pulled"]["applied"], 1)
+        self.assertEqual(result["pushed"]["applied"], 2)
+        for path in (self.laptop, self.phone):
+            self.assertEqual(self.rows(path, "SELECT book, chapter, start_verse FROM bible_reading"), [("John", 3, 16)])
+            self.assertEqual(self.rows(path, "SELECT prayer_date, mysteries FROM rosary_prayers"), [("2023-10-02", "Joyful")])
+            self.assertEqual(self.rows(path, "SELECT sin_description FROM sins_confession_log"), [("Gossip",)])
+
+        sync.sync_databases(self.laptop, self.phone) # Reads back the echoes of its own changes once
+        result = sync.sync_databases(self.laptop, self.phone)
+        self.assertEqual(result["pulled"]["read"], 0)
+        self.assertEqual(result["pushed"]["read"], 0)
+
+        self.use(self.phone)
+        rosary_tracker.log_rosary_prayer(prayer_date="2023-10-04")
+        result = sync.sync_databases(self.laptop, self.phone)
+        self.assertEqual(result["pulled"], {"read": 1, "applied": 1, "skipped": 0})
+        self.assertEqual(len(self.rows(self.laptop, "SELECT id FROM rosary_prayers")), 2)
+
+    def test_conflicts_resolve_to_last_writer(self):
+        self.use(self.laptop)
+        entry_id = sins_tracker.add_sin_entry("Pride")
+        sync.sync_databases(self.laptop, self.phone)
+        (phone_id,) = self.rows(self.phone, "SELECT id FROM sins_confession_log")[0]
+
+        sins_tracker.mark_sin_as_confessed(entry_id, "2023-10-01")
+        time.sleep(0.01)
+        self.use(self.phone)
+        sins_tracker.mark_sin_as_confessed(phone_id, "2023-10-02") # Later change wins
+
+        sync.sync_databases(self.laptop, self.phone)
+        for path in (self.laptop, self.phone):
+            self.assertEqual(self.rows(path, "SELECT confession_date FROM sins_confession_log"), [("2023-10-02",)])
+
+    def test_deletes_are_synced(self):
+        self.use(self.laptop)
+        bible_tracker.add_bible_reading("Acts", 2)
+        sync.sync_databases(self.laptop, self.phone)
+        conn = sqlite3.connect(self.phone)
+        conn.execute("DELETE FROM bible_reading")
+        conn.commit()
+        conn.close()
+
+        sync.sync_databases(self.laptop, self.phone)
+        self.assertEqual(self.rows(self.laptop, "SELECT id FROM bible_reading"), [])
+
+    def test_update_to_a_natural_key_held_locally_is_skipped(self):
+        self.use(self.laptop)
+        sins_tracker.add_sin_entry("Pride", "2023-10-01")
+        sync.sync_databases(self.laptop, self.phone)
+        sins_tracker.add_sin_entry("Vanity", "2023-10-01")
+        # The phone's copy of Pride is edited into Vanity, which the laptop logged separately
+        conn = sqlite3.connect(self.phone)
+        conn.execute("UPDATE sins_confession_log SET sin_description = 'Vanity', content_hash = ?",
+                     (connection.natural_key_hash("Vanity", "2023-10-01"),))
+        conn.commit()
+        conn.close()
+
+        result = sync.sync_databases(self.laptop, self.phone)
+        self.assertEqual(result["pulled"]["skipped"], 1)
+        self.assertEqual(sorted(self.rows(self.laptop, "SELECT sin_description FROM sins_confession_log")),
+                         [("Pride",), ("Vanity",)])
+
+    def test_changes_to_archived_rows_update_the_archive(self):
+        self.use(self.laptop)
+        rosary_tracker.log_rosary_prayer("2020-01-06", notes="Epiphany")
+        sync.sync_databases(self.laptop, self.phone)
+        archive.archive_old_rows()
+        conn = sqlite3.connect(self.phone)
+        conn.execute("UPDATE rosary_prayers SET notes = 'Epiphany, with the family'")
+        conn.commit()
+        conn.close()
+
+        result = sync.sync_databases(self.laptop, self.phone)
+        self.assertEqual(result["pulled"]["applied"], 1)
+        self.assertEqual(self.rows(self.laptop, "SELECT id FROM rosary_prayers"), [])
+        self.assertEqual(self.rows(archive.get_archive_path(self.laptop), "SELECT notes FROM rosary_prayers"),
+                         [("Epiphany, with the family",)])
+
+    def test_deletes_of_archived_rows_reach_the_archive(self):
+        self.use(self.laptop)
+        rosary_tracker.log_rosary_prayer("2020-01-06", notes="Epiphany")
+        sync.sync_databases(self.laptop, self.phone)
+        archive.archive_old_rows()
+        conn = sqlite3.connect(self.phone)
+        conn.execute("DELETE FROM rosary_prayers")
+        conn.commit()
+        conn.close()
+
+        result = sync.sync_databases(self.laptop, self.phone)
+        self.assertEqual(result["pulled"]["applied"], 1)
+        self.assertEqual(self.rows(archive.get_archive_path(self.laptop), "SELECT id FROM rosary_prayers"), [])
+
+    def test_entries_archived_here_are_not_pulled_again(self):
+        self.use(self.laptop)
+        rosary_tracker.log_rosary_prayer("2020-01-06", "Joyful")
+        archive.archive_old_rows()
+        # Logged separately on the phone: another uuid, the same natural key
+        self.use(self.phone)
+        rosary_tracker.log_rosary_prayer("2020-01-06", "Joyful")
+
+        result = sync.sync_databases(self.laptop, self.phone)
+        self.assertEqual(result["pulled"]["skipped"], 1)
+        self.assertEqual(self.rows(self.laptop, "SELECT id FROM rosary_prayers"), [])
+
+    def test_copied_file_is_rejected(self):
+        import shutil
+        copy = os.path.join(self.tmp_dir.name, "copy.db")
+        shutil.copy(self.laptop, copy)
+        with self.assertRaises(ValueError):
+            sync.sync_databases(self.laptop, copy)
+
+
+if __name__ == '__main__':
+    unittest.main()
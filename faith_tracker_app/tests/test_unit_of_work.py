@@ -0,0 +1,117 @@
+# faith_tracker_app/tests/test_unit_of_work.py
+import unittest
+import sqlite3
+import os
+
+# Temporarily adjust path to import app modules
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from faith_tracker_app.database import connection, schema
+from faith_tracker_app.database.unit_of_work import UnitOfWork
+from faith_tracker_app.bible import bible_tracker
+from faith_tracker_app.database import archive
+from faith_tracker_app.rosary import rosary_tracker
+from faith_tracker_app.sins import sins_tracker
+from faith_tracker_app.tests.helpers import TempDatabaseTestCase
+
+
+class TestUnitOfWork(unittest.TestCase):
+    """Repositories sharing one transaction, on an injected in-memory connection."""
+
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.row_factory = sqlite3.Row
+        for table_schema in schema.ALL_TABLE_SCHEMAS:
+            self.conn.execute(table_schema)
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+
+    def _count(self, table):
+        return self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def test_operations_across_trackers_commit_together(self):
+        with UnitOfWork(self.conn) as uow:
+            reading_id, written = uow.bible.add_reading("John", 3, 16, 17)
+            uow.rosary.log_prayer(prayer_date="2024-03-01", mysteries="Joyful")
+            sin_id, _ = uow.sins.add_entry("Impatience", occurrence_date="2024-03-01")
+            self.assertTrue(uow.sins.confess(sin_id, "2024-03-02"))
+            self.assertTrue(self.conn.in_transaction)
+        self.assertFalse(self.conn.in_transaction)
+        self.assertTrue(written)
+
+        self.assertEqual(self._count("bible_reading"), 1)
+        self.assertEqual(self._count("rosary_prayers"), 1)
+        entries = sins_tracker.get_sin_log(conn=self.conn)
+        self.assertEqual(entries[0]["confession_date"], "2024-03-02")
+
+    def test_exception_rolls_back_every_operation(self):
+        with self.assertRaises(sqlite3.IntegrityError):
+            with UnitOfWork(self.conn) as uow:
+                uow.bible.add_reading("Psalm", 23, reading_date="2024-03-01")
+                uow.sins.add_entry("Gossip", occurrence_date="2024-03-01")
+                uow.bible.add_reading("Psalm", 23, reading_date="2024-03-01")  # Duplicate
+        self.assertEqual(self._count("bible_reading"), 0)
+        self.assertEqual(self._count("sins_confession_log"), 0)
+
+    def test_repositories_raise_instead_of_printing(self):
+        with UnitOfWork(self.conn) as uow:
+            with self.assertRaises(ValueError):
+                uow.rosary.log_prayer(prayer_date="01-03-2024")
+            with self.assertRaises(ValueError):
+                uow.bible.list_readings(start_date="March")
+            self.assertIsNone(uow.sins.is_confessed(999))
+
+    def test_duplicate_is_not_written_with_ignore(self):
+        with UnitOfWork(self.conn) as uow:
+            first_id, _ = uow.rosary.log_prayer(prayer_date="2024-03-01", mysteries="Joyful")
+            second_id, written = uow.rosary.log_prayer(prayer_date="2024-03-01", mysteries="joyful",
+                                                       on_conflict="ignore")
+        self.assertEqual(second_id, first_id)
+        self.assertFalse(written)
+
+    def test_injected_connection_is_left_open(self):
+        with UnitOfWork(self.conn):
+            pass
+        self.conn.execute("SELECT 1")
+
+    def test_ties_are_ordered_latest_first(self):
+        # Same reading_date: the later entry comes first
+        bible_tracker.add_bible_reading("Ruth", 1, conn=self.conn)
+        bible_tracker.add_bible_reading("Ruth", 2, conn=self.conn)
+        readings = bible_tracker.get_all_bible_readings(conn=self.conn)
+        self.assertEqual([r["chapter"] for r in readings], [2, 1])
+
+
+class TestUnitOfWorkOwnConnection(TempDatabaseTestCase):
+    """Without an injected connection the unit opens, commits and closes its own."""
+
+    def test_own_connection_is_committed_and_closed(self):
+        with UnitOfWork() as uow:
+            uow.sins.add_entry("Pride")
+            conn = uow.conn
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+        self.assertEqual(len(sins_tracker.get_sin_log()), 1)
+
+    def test_in_memory_connection_ignores_the_app_archive(self):
+        rosary_tracker.log_rosary_prayer("2020-01-06", "Joyful")
+        archive.archive_old_rows()
+        conn = sqlite3.connect(":memory:")
+        conn.row_factory = sqlite3.Row
+        for table_schema in schema.ALL_TABLE_SCHEMAS:
+            conn.execute(table_schema)
+        try:
+            self.assertFalse(archive.attach_archive(conn))
+            with UnitOfWork(conn, write=True) as uow:
+                _, written = uow.rosary.log_prayer("2020-01-06", "Joyful")
+            self.assertTrue(written)
+            self.assertFalse(archive.is_attached(conn))
+        finally:
+            conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,9 @@
 # faith_tracker_app/ui/cli.py
 
-from faith_tracker_app.bible import bible_tracker
+from faith_tracker_app.bible import bible_tracker, reading_plans
 from faith_tracker_app.rosary import rosary_tracker
 from faith_tracker_app.sins import sins_tracker
-from faith_tracker_app.database import connection as db_connection
+from faith_tracker_app.database import backends
 
 def get_user_input(prompt, default_value=None):
     """Gets user input, allowing for a default value if input is empty."""
@@ -45,6 +45,8 @@ def bible_menu():
         print("1. Add New Bible Reading")
         print("2. View All Bible Readings")
         print("3. View Latest Bible Readings (specify N)")
+        print("4. View Reading Plan Progress")
+        print("5. Start a Reading Plan")
         print("0. Back to Main Menu")
         choice = get_user_input("Choose an option")
 
@@ -81,6 +83,21 @@ def bible_menu():
                 print("Showing 0 readings.")
             else:
                 print("Invalid number.")
+        elif choice == '4':
+            print("\n-- Reading Plan Progress --")
+            plans = reading_plans.get_reading_plans(active_only=True)
+            if plans:
+                for plan in plans:
+                    print(reading_plans.format_plan_status_for_display(reading_plans.get_plan_status(plan['id'])))
+            else:
+                print("No active reading plans.")
+        elif choice == '5':
+            print("\n-- Start a Reading Plan --")
+            for key, (name, _, days) in reading_plans.PLAN_PRESETS.items():
+                print(f"  {key}: {name}")
+            preset = get_user_input("Preset")
+            start_date = get_date_input("Start Date (YYYY-MM-DD, leave empty for today)", allow_empty=True)
+            reading_plans.create_reading_plan(preset=preset, start_date=start_date)
         elif choice == '0':
             break
         else:
@@ -92,6 +109,7 @@ def rosary_menu():
         print("1. Log Rosary Prayer")
         print("2. View Rosary Prayer History")
         print("3. View Latest Rosary Prayers (specify N)")
+        print("4. View Rosary Statistics")
         print("0. Back to Main Menu")
         choice = get_user_input("Choose an option")
 
@@ -102,7 +120,8 @@ def rosary_menu():
                 import datetime
                 prayer_date = datetime.date.today().strftime("%Y-%m-%d")
 
-            mysteries = get_user_input("Mysteries (e.g., Joyful, Sorrowful, optional)")
+            scheduled = rosary_tracker.get_scheduled_mysteries(prayer_date).label
+            mysteries = get_user_input(f"Mysteries (e.g., Joyful, Sorrowful, leave empty for {scheduled})")
             notes = get_user_input("Notes (optional)")
             rosary_tracker.log_rosary_prayer(prayer_date=prayer_date if prayer_date else None, mysteries=mysteries if mysteries else None, notes=notes if notes else None)
         elif choice == '2':
@@ -127,6 +146,14 @@ def rosary_menu():
                 print("Showing 0 prayer logs.")
             else:
                 print("Invalid number.")
+        elif choice == '4':
+            print("\n-- Rosary Statistics --")
+            print("Prayers per set of mysteries:")
+            for label, count in rosary_tracker.get_mystery_counts().items():
+                print(f"  {label or 'Other/unspecified'}: {count}")
+            print("Prayers per weekday:")
+            for weekday, count in rosary_tracker.get_weekday_counts().items():
+                print(f"  {weekday}: {count}")
         elif choice == '0':
             break
         else:
@@ -191,9 +218,9 @@ def sins_menu():
 
 
 def main_menu():
-    # Initialize database on startup
+    # Initialize storage on startup
     print("Initializing database...")
-    db_connection.initialize_database()
+    backends.get_backend().initialize()
     print("Welcome to the Faith Tracker App!")
 
     while True:
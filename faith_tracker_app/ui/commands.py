@@ -0,0 +1,648 @@
+# faith_tracker_app/ui/commands.py
+"""
+Non-interactive command-line interface for the Faith Tracker App.
+
+Every tracker operation is exposed as an argparse subcommand, e.g.
+
+    python -m faith_tracker_app.app bible add Genesis 1 --start-verse 1 --end-verse 31
+    python -m faith_tracker_app.app --format json sins list --status unconfessed
+
+The `batch` subcommand reads one command per line (same syntax, without the
+program name) from a file or stdin and applies them over a single connection,
+committing once per chunk instead of once per entry. With `--input jsonl` each
+line is instead a JSON object such as
+
+    {"op": "bible add", "book": "John", "chapter": 3, "start_verse": 16}
+
+whose keys are the parameters of the matching `build_*_row` function; this
+skips command-line parsing entirely and is the fastest way to load bulk data.
+
+Entries whose natural key is already logged are added as separate entries by
+single commands (a second Rosary that day) and skipped by `batch`, so re-running
+a batch file adds nothing twice; either can be changed with `--on-conflict`
+(see schema.CONFLICT_MODES).
+
+Single commands and listings use the configured storage backend (see
+backends.py); the commands in SQLITE_ONLY_COMMANDS need the SQLite database.
+"""
+import argparse
+import contextlib
+import csv
+import functools
+import json
+import shlex
+import sqlite3
+import sys
+
+from faith_tracker_app.bible import bible_tracker, reading_plans
+from faith_tracker_app.liturgy import liturgical_calendar
+from faith_tracker_app.rosary import rosary_tracker
+from faith_tracker_app.sins import backlog, sins_tracker
+from faith_tracker_app.database import connection as db_connection
+from faith_tracker_app.database import archive, backends, importer, maintenance, sync
+from faith_tracker_app.database.concurrency import begin_write, commit_write
+from faith_tracker_app.database.schema import CONFLICT_MODES, INTERACTIVE_CONFLICT_MODE, upsert_sql
+from faith_tracker_app.reminders import scheduler
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# Commands that read or write the SQLite database directly, whatever the storage backend
+SQLITE_ONLY_COMMANDS = {"archive", "backup", "batch", "import", "maintain", "plan", "reminders", "sync"}
+
+# A batch skips what is already logged, errors, or updates notes; it never adds an entry twice
+BATCH_CONFLICT_MODES = [mode for mode in CONFLICT_MODES if mode != "add"]
+
+
+class _BatchArgumentParser(argparse.ArgumentParser):
+    """ArgumentParser that raises instead of exiting, so one bad batch line doesn't stop the run."""
+
+    def error(self, message):
+        raise ValueError(message)
+
+
+def _add_conflict_argument(parser):
+    parser.add_argument("--on-conflict", choices=CONFLICT_MODES, default=None,
+                        help="If the entry is already logged: add it as a separate entry (default), error, "
+                             "ignore, or update its notes; in batch mode the batch's --on-conflict applies")
+
+
+def _add_date_range_arguments(parser):
+    parser.add_argument("--from", dest="start_date", help="Earliest date to list (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end_date", help="Latest date to list (YYYY-MM-DD)")
+    parser.add_argument("--include-archive", action="store_true",
+                        help="Also list archived entries (automatic when --from/--to reach the archive)")
+
+
+def _add_notes_argument(parser):
+    parser.add_argument("--no-notes", dest="with_notes", action="store_false",
+                        help="Leave the notes out of the listing (faster with long notes)")
+
+
+# Listing views -> the projection they fetch (see schema.PROJECTIONS)
+LIST_VIEWS = {"full": "full", "compact": "summary", "ids": "ids"}
+
+
+def _add_view_argument(parser):
+    parser.add_argument("--view", choices=list(LIST_VIEWS), default="full",
+                        help="full: every field; compact: one short line per entry, without notes; "
+                             "ids: ids and dates only, read from an index (default: full)")
+
+
+def _format_ids(date_column):
+    return lambda row: f"{row['id']}\t{row[date_column][:10]}"
+
+
+def build_parser(parser_class=argparse.ArgumentParser):
+    """
+    Builds the argument parser with one subcommand per tracker operation.
+    The leaf parsers are also exposed as `parser.leaf_parsers`, keyed by
+    (tracker, operation), so batch mode can skip the nested dispatch.
+    """
+    parser = parser_class(prog="faith_tracker_app", description="Faith Tracker App command-line interface.")
+    parser.add_argument("--format", choices=["text", "json", "csv"], default="text",
+                        help="Output format for listings and results (default: text).")
+    trackers = parser.add_subparsers(dest="tracker", required=True)
+
+    # Bible
+    bible = trackers.add_parser("bible", help="Bible reading tracker")
+    bible_ops = bible.add_subparsers(dest="operation", required=True)
+    bible_add = bible_ops.add_parser("add", help="Add a Bible reading")
+    bible_add.add_argument("book")
+    bible_add.add_argument("chapter", type=int)
+    bible_add.add_argument("--start-verse", type=int)
+    bible_add.add_argument("--end-verse", type=int)
+    bible_add.add_argument("--notes")
+    _add_conflict_argument(bible_add)
+    bible_list = bible_ops.add_parser("list", help="List Bible readings, most recent first")
+    bible_list.add_argument("--limit", type=int)
+    bible_list.add_argument("--liturgical", action="store_true", help="Show each reading's liturgical season and feast (full view)")
+    bible_list.add_argument("--text", action="store_true", help="Show the verses read, from the offline text store (full view)")
+    _add_date_range_arguments(bible_list)
+    _add_notes_argument(bible_list)
+    _add_view_argument(bible_list)
+
+    # Reading plans
+    plan = trackers.add_parser("plan", help="Bible reading plans")
+    plan_ops = plan.add_subparsers(dest="operation", required=True)
+    plan_create = plan_ops.add_parser("create", help="Create a reading plan from a preset or a list of books")
+    plan_create.add_argument("--preset", choices=sorted(reading_plans.PLAN_PRESETS))
+    plan_create.add_argument("--name")
+    plan_create.add_argument("--books", help="Comma-separated books, in reading order")
+    plan_create.add_argument("--days", type=int)
+    plan_create.add_argument("--start-date", help="Day 1 of the plan (YYYY-MM-DD), defaults to today")
+    plan_ops.add_parser("list", help="List reading plans")
+    plan_status = plan_ops.add_parser("status", help="Show progress and the day's assignment")
+    plan_status.add_argument("id", type=int)
+    plan_status.add_argument("--date", help="Date to report on (YYYY-MM-DD), defaults to today")
+
+    # Rosary
+    rosary = trackers.add_parser("rosary", help="Rosary prayer tracker")
+    rosary_ops = rosary.add_subparsers(dest="operation", required=True)
+    rosary_log = rosary_ops.add_parser("log", help="Log a Rosary prayer")
+    rosary_log.add_argument("--date", help="Prayer date (YYYY-MM-DD), defaults to today")
+    rosary_log.add_argument("--mysteries")
+    rosary_log.add_argument("--notes")
+    _add_conflict_argument(rosary_log)
+    rosary_list = rosary_ops.add_parser("list", help="List Rosary prayers, most recent first")
+    rosary_list.add_argument("--limit", type=int)
+    rosary_list.add_argument("--liturgical", action="store_true", help="Show each prayer's liturgical season and feast (full view)")
+    _add_date_range_arguments(rosary_list)
+    _add_notes_argument(rosary_list)
+    _add_view_argument(rosary_list)
+    rosary_stats = rosary_ops.add_parser("stats", help="Count Rosary prayers per mysteries, weekday, season or feast")
+    rosary_stats.add_argument("--by", choices=["mysteries", "weekday", "season", "feast"], default="mysteries")
+    rosary_stats.add_argument("--year", type=int, help="Liturgical year for --by season (default: the current one)")
+    rosary_stats.add_argument("--marian", action="store_true", help="Only Marian feasts, for --by feast")
+
+    # Sins
+    sins = trackers.add_parser("sins", help="Sin log & confession tracker")
+    sins_ops = sins.add_subparsers(dest="operation", required=True)
+    sins_add = sins_ops.add_parser("add", help="Add a sin entry")
+    sins_add.add_argument("description")
+    sins_add.add_argument("--date", help="Occurrence date (YYYY-MM-DD)")
+    sins_add.add_argument("--notes")
+    _add_conflict_argument(sins_add)
+    sins_confess = sins_ops.add_parser("confess", help="Mark a sin entry as confessed")
+    sins_confess.add_argument("id", type=int)
+    sins_confess.add_argument("--date", help="Confession date (YYYY-MM-DD), defaults to today")
+    sins_list = sins_ops.add_parser("list", help="List sin entries, most recent first")
+    sins_list.add_argument("--status", choices=["all", "confessed", "unconfessed"], default="all")
+    sins_list.add_argument("--limit", type=int)
+    _add_date_range_arguments(sins_list)
+    _add_notes_argument(sins_list)
+    _add_view_argument(sins_list)
+    sins_backlog = sins_ops.add_parser("backlog", help="Unconfessed sins per month and the oldest outstanding")
+    sins_backlog.add_argument("--check", action="store_true",
+                              help="Compare the maintained summary with the sin log instead")
+    sins_backlog.add_argument("--repair", action="store_true", help="With --check, rebuild the summary if it differs")
+
+    # Archive
+    archive_parser = trackers.add_parser("archive", help="Move old entries to the archive database")
+    archive_parser.add_argument("--horizon-days", type=int, default=archive.ARCHIVE_HORIZON_DAYS,
+                                help=f"Archive entries older than this many days (default: {archive.ARCHIVE_HORIZON_DAYS})")
+
+    # Maintenance
+    backup_parser = trackers.add_parser("backup", help="Take an online backup of the database")
+    backup_parser.add_argument("destination", nargs="?", help="Backup file (default: a backups directory next to the database)")
+    maintain_parser = trackers.add_parser("maintain", help="Run due maintenance tasks within a time budget")
+    maintain_parser.add_argument("--budget", type=float, default=maintenance.DEFAULT_TIME_BUDGET,
+                                 help=f"Seconds available (default: {maintenance.DEFAULT_TIME_BUDGET})")
+    maintain_parser.add_argument("--force", action="store_true", help="Run every task, even if it isn't due")
+
+    # Reminders
+    reminders_parser = trackers.add_parser("reminders", help="Send the reminders that are due and show the schedule")
+    reminders_parser.add_argument("--notify-file", help="Append reminders to this file instead of printing them")
+
+    # Import
+    import_parser = trackers.add_parser("import", help="Import a large CSV file of entries")
+    import_parser.add_argument("file", help="CSV file with a header line")
+    import_parser.add_argument("--kind", choices=sorted(importer.IMPORT_KINDS), required=True)
+    import_parser.add_argument("--workers", type=int, help="Validation processes (default: number of CPUs)")
+    import_parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint of an earlier import")
+    import_parser.add_argument("--on-conflict", choices=["ignore", "update"], default="ignore",
+                               help="Entries already in the database: skip them (default) or update their notes")
+
+    # Sync
+    sync_parser = trackers.add_parser("sync", help="Exchange changes with another database file")
+    sync_parser.add_argument("other", help="Path of the other database file")
+
+    # Batch
+    batch = trackers.add_parser("batch", help="Run many commands from a file or stdin")
+    batch.add_argument("file", nargs="?", default="-", help="Command file, one command per line ('-' for stdin)")
+    batch.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                       help=f"Commands per transaction (default: {DEFAULT_CHUNK_SIZE})")
+    batch.add_argument("--input", choices=["commands", "jsonl"], default="commands",
+                       help="Line format of the command file (default: commands)")
+    batch.add_argument("--on-conflict", choices=BATCH_CONFLICT_MODES, default="ignore",
+                       help="If an entry is already logged: ignore it (default), update its notes, or fail the batch")
+
+    parser.leaf_parsers = {
+        ("bible", "add"): bible_add, ("bible", "list"): bible_list,
+        ("rosary", "log"): rosary_log, ("rosary", "list"): rosary_list, ("rosary", "stats"): rosary_stats,
+        ("sins", "add"): sins_add, ("sins", "confess"): sins_confess, ("sins", "list"): sins_list,
+    }
+    return parser
+
+
+# Write operations: (tracker, operation) -> (SQL, row builder, function calling the builder with parsed args,
+# function applied to the written rows in the same transaction or None)
+WRITE_OPERATIONS = {
+    ("bible", "add"): (bible_tracker.INSERT_READING_SQL, bible_tracker.build_reading_row,
+                       lambda a: bible_tracker.build_reading_row(a.book, a.chapter, a.start_verse, a.end_verse, a.notes),
+                       bible_tracker.record_readings_progress),
+    ("rosary", "log"): (rosary_tracker.INSERT_ROSARY_SQL, rosary_tracker.build_rosary_row,
+                        lambda a: rosary_tracker.build_rosary_row(a.date, a.mysteries, a.notes),
+                        None),
+    ("sins", "add"): (sins_tracker.INSERT_SIN_SQL, sins_tracker.build_sin_row,
+                      lambda a: sins_tracker.build_sin_row(a.description, a.date, a.notes),
+                      None),
+    ("sins", "confess"): (sins_tracker.CONFESS_SIN_SQL, sins_tracker.build_confession_row,
+                          lambda a: sins_tracker.build_confession_row(a.id, a.date),
+                          None),
+}
+
+
+def _fetch_listing(args):
+    """Runs a read operation (list or stats) and returns its rows and the display formatter."""
+    if args.tracker == "plan" and args.operation == "status":
+        status = reading_plans.get_plan_status(args.id, args.date)
+        if status is None:
+            raise ValueError(f"Reading plan {args.id} not found.")
+        return [status], reading_plans.format_plan_status_for_display
+    if args.tracker == "plan":
+        plans = reading_plans.get_reading_plans()
+        return plans, lambda p: f"[{p['id']}] {p['name']} - {p['chapters_read']}/{p['total_chapters']} chapters, from {p['start_date']}"
+    if args.tracker == "bible":
+        readings = bible_tracker.get_all_bible_readings(limit=args.limit, start_date=args.start_date,
+                                                        end_date=args.end_date, include_archive=args.include_archive,
+                                                        with_notes=args.with_notes, projection=LIST_VIEWS[args.view])
+        if args.view == "compact":
+            return readings, bible_tracker.format_reading_compact
+        if args.view == "ids":
+            return readings, _format_ids("reading_date")
+        return readings, functools.partial(bible_tracker.format_reading_for_display, liturgical=args.liturgical,
+                                                    with_text=args.text)
+    if args.tracker == "rosary" and args.operation == "stats":
+        if args.by == "weekday":
+            counts = rosary_tracker.get_weekday_counts()
+        elif args.by == "season":
+            counts = liturgical_calendar.season_counts("rosary_prayers", args.year)
+        elif args.by == "feast":
+            counts = liturgical_calendar.feast_counts("rosary_prayers", marian_only=args.marian)
+        else:
+            counts = rosary_tracker.get_mystery_counts()
+        rows = [{args.by: key or "Other", "count": count} for key, count in counts.items()]
+        return rows, lambda row: f"{row[args.by]}: {row['count']}"
+    if args.tracker == "rosary":
+        prayers = rosary_tracker.get_rosary_prayer_history(limit=args.limit, start_date=args.start_date,
+                                                           end_date=args.end_date, include_archive=args.include_archive,
+                                                           with_notes=args.with_notes, projection=LIST_VIEWS[args.view])
+        if args.view == "compact":
+            return prayers, rosary_tracker.format_rosary_log_compact
+        if args.view == "ids":
+            return prayers, _format_ids("prayer_date")
+        return prayers, functools.partial(rosary_tracker.format_rosary_log_for_display, liturgical=args.liturgical)
+    show_all = args.status == "all"
+    show_confessed = args.status == "confessed"
+    entries = sins_tracker.get_sin_log(show_all=show_all, show_confessed=show_confessed, limit=args.limit,
+                                       start_date=args.start_date, end_date=args.end_date,
+                                       include_archive=args.include_archive, with_notes=args.with_notes,
+                                       projection=LIST_VIEWS[args.view])
+    if args.view == "compact":
+        return entries, sins_tracker.format_sin_entry_compact
+    if args.view == "ids":
+        return entries, _format_ids("created_at")
+    return entries, sins_tracker.format_sin_entry_for_display
+
+
+def write_rows(rows, output_format, formatter=None, out=None):
+    """Writes a list of row dictionaries as text, JSON or CSV."""
+    out = out or sys.stdout
+    if output_format == "json":
+        json.dump(rows, out)
+        out.write("\n")
+    elif output_format == "csv":
+        if rows:
+            writer = csv.DictWriter(out, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        for row in rows:
+            out.write((formatter(row) if formatter else str(row)) + "\n")
+
+
+# Tables written by the insert operations, for looking up an existing entry's id
+_INSERT_TABLES = {"bible": "bible_reading", "rosary": "rosary_prayers", "sins": "sins_confession_log"}
+
+
+def _write_sql(args, sql, default_on_conflict):
+    """Returns the SQL for a write operation, with the ON CONFLICT clause for inserts."""
+    if args.operation == "confess":
+        return sql
+    return upsert_sql(sql, args.on_conflict or default_on_conflict)
+
+
+def _needs_sqlite(args):
+    """Returns whether a parsed command needs the SQLite database rather than the storage backend."""
+    if args.tracker in SQLITE_ONLY_COMMANDS:
+        return True
+    if (args.tracker, args.operation) == ("rosary", "stats"):
+        return args.by in ("season", "feast")
+    if (args.tracker, args.operation) == ("sins", "backlog"):
+        return args.check or args.repair
+    return False
+
+
+def _run_single_write(args):
+    """Applies one write operation in a unit of work of the storage backend and returns its result dictionary."""
+    build_row = WRITE_OPERATIONS[(args.tracker, args.operation)][2]
+    on_conflict = getattr(args, "on_conflict", None) or INTERACTIVE_CONFLICT_MODE
+    with backends.unit_of_work(write=True) as uow:
+        repository = getattr(uow, args.tracker)
+        if args.operation == "confess":
+            return {"id": args.id, "confessed": repository.confess(args.id, args.date)}
+        entry_id, written = repository.insert(build_row(args), on_conflict)
+    if on_conflict in ("error", "add"):
+        return {"id": entry_id}
+    return {"id": entry_id, "added": written}
+
+
+def _parse_command_line(parser, line):
+    """Parses one batch line in command syntax into an argparse Namespace."""
+    # shlex is only needed when the line quotes arguments, and it is several times slower than split().
+    tokens = shlex.split(line) if ('"' in line or "'" in line or "\\" in line) else line.split()
+    if len(tokens) < 2 or tuple(tokens[:2]) not in parser.leaf_parsers:
+        if tokens and tokens[0] == "batch":
+            raise ValueError("nested batch commands are not supported")
+        parser.parse_args(tokens)  # Raises ValueError with argparse's message
+        raise ValueError(f"unknown command: {line}")
+    args = parser.leaf_parsers[(tokens[0], tokens[1])].parse_args(tokens[2:])
+    args.tracker, args.operation = tokens[0], tokens[1]
+    return args
+
+
+def _parse_jsonl_line(line):
+    """Parses one JSON Lines batch entry into (tracker, operation, builder kwargs)."""
+    try:
+        fields = json.loads(line)
+        if not isinstance(fields, dict):
+            raise ValueError
+        tracker, operation = fields.pop("op").split()
+    except (json.JSONDecodeError, AttributeError, KeyError, ValueError):
+        raise ValueError('expected a JSON object with an "op" key such as "bible add"')
+    return tracker, operation, fields
+
+
+def run_batch(lines, chunk_size=DEFAULT_CHUNK_SIZE, output_format="text", out=None, err=None, input_format="commands",
+              on_conflict="ignore"):
+    """
+    Runs commands from an iterable of lines over one connection.
+    Consecutive writes of the same kind are applied with executemany, and the
+    transaction is committed every `chunk_size` commands. Invalid lines are
+    reported on `err` and skipped. Entries that are already logged are handled
+    per `on_conflict` (a command's own --on-conflict takes precedence):
+    counted as unchanged when skipped, or reported and counted as failed with
+    "error". Returns a summary dictionary.
+    """
+    if on_conflict not in BATCH_CONFLICT_MODES:
+        raise ValueError(f"on_conflict must be one of: {', '.join(BATCH_CONFLICT_MODES)}.")
+    out = out or sys.stdout
+    err = err or sys.stderr
+    parser = build_parser(_BatchArgumentParser)
+    summary = {"applied": 0, "failed": 0, "unchanged": 0}
+
+    conn = db_connection.get_db_connection()
+    # Entries archived since the batch last ran count as already logged
+    archive.attach_archive(conn)
+    pending_sql = None
+    pending_table = None
+    pending_on_conflict = None
+    pending_after_write = None
+    pending_rows = []
+    pending_lines = []
+    in_chunk = 0
+
+    def apply(rows):
+        """Writes rows of the pending kind and returns how many changed."""
+        kept = archive.without_archived(conn, pending_table, rows, pending_on_conflict) if pending_table else rows
+        cursor = conn.executemany(pending_sql, kept)
+        if pending_after_write:
+            pending_after_write(conn, rows)
+        return cursor.rowcount
+
+    def flush():
+        nonlocal pending_sql, pending_table, pending_on_conflict, pending_after_write, pending_rows, pending_lines
+        if pending_rows:
+            if not conn.in_transaction:
+                begin_write(conn)
+            failed = 0
+            conn.execute("SAVEPOINT batch_rows")
+            try:
+                applied = apply(pending_rows)
+            except sqlite3.IntegrityError:
+                # An entry already logged with --on-conflict error: redo the rows one by one so only it fails
+                conn.execute("ROLLBACK TO batch_rows")
+                applied = 0
+                for line_number, row in zip(pending_lines, pending_rows):
+                    try:
+                        applied += apply([row])
+                    except sqlite3.IntegrityError:
+                        err.write(f"line {line_number}: this entry is already logged\n")
+                        failed += 1
+            conn.execute("RELEASE batch_rows")
+            # UPDATEs (confessions) and skipped duplicates legitimately change no row; count those separately.
+            summary["applied"] += applied
+            summary["failed"] += failed
+            summary["unchanged"] += len(pending_rows) - applied - failed
+        pending_sql, pending_table, pending_on_conflict, pending_after_write = None, None, None, None
+        pending_rows, pending_lines = [], []
+
+    def commit():
+        nonlocal in_chunk
+        flush()
+        commit_write(conn)
+        in_chunk = 0
+
+    try:
+        for line_number, line in enumerate(lines, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                if input_format == "jsonl":
+                    tracker, operation, fields = _parse_jsonl_line(line)
+                    if (tracker, operation) not in WRITE_OPERATIONS:
+                        raise ValueError(f"unsupported op for jsonl input: {tracker} {operation}")
+                    sql, builder, _, after_write = WRITE_OPERATIONS[(tracker, operation)]
+                    table, row_on_conflict = None, on_conflict
+                    if operation != "confess":
+                        sql = upsert_sql(sql, on_conflict)
+                        table = _INSERT_TABLES[tracker]
+                    row = builder(**fields)
+                else:
+                    args = _parse_command_line(parser, line)
+                    operation = WRITE_OPERATIONS.get((args.tracker, args.operation))
+                    if operation is None:
+                        # Listings read through the tracker functions, which use their own connection.
+                        commit()
+                        rows, formatter = _fetch_listing(args)
+                        write_rows(rows, output_format, formatter, out)
+                        continue
+                    sql, _, build_row, after_write = operation
+                    table = None if args.operation == "confess" else _INSERT_TABLES[args.tracker]
+                    row_on_conflict = getattr(args, "on_conflict", None) or on_conflict
+                    if row_on_conflict not in BATCH_CONFLICT_MODES:
+                        raise ValueError(f"--on-conflict {row_on_conflict} is not supported in batch mode")
+                    sql = _write_sql(args, sql, on_conflict)
+                    row = build_row(args)
+            except (ValueError, TypeError) as e:
+                err.write(f"line {line_number}: {e}\n")
+                summary["failed"] += 1
+                continue
+
+            if sql is not pending_sql:
+                flush()
+                pending_sql, pending_after_write = sql, after_write
+                pending_table, pending_on_conflict = table, row_on_conflict
+            pending_rows.append(row)
+            pending_lines.append(line_number)
+            in_chunk += 1
+            if in_chunk >= chunk_size:
+                commit()
+        commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return summary
+
+
+def main(argv=None):
+    """Entry point for the non-interactive CLI. Returns a process exit code."""
+    args = build_parser().parse_args(argv)
+    try:
+        if _needs_sqlite(args):
+            command = " ".join(filter(None, (args.tracker, getattr(args, "operation", None))))
+            backends.require_sqlite(f"'{command}'")
+        backend = backends.get_backend()
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    backend.initialize(quiet=True)
+
+    if args.tracker == "batch":
+        if args.file == "-":
+            summary = run_batch(sys.stdin, args.chunk_size, args.format, input_format=args.input,
+                                on_conflict=args.on_conflict)
+        else:
+            with open(args.file, encoding="utf-8") as f:
+                summary = run_batch(f, args.chunk_size, args.format, input_format=args.input,
+                                    on_conflict=args.on_conflict)
+        if args.format == "text":
+            print(f"Applied {summary['applied']} commands ({summary['unchanged']} unchanged, {summary['failed']} failed).",
+                  file=sys.stderr)
+        elif args.format == "json":
+            print(json.dumps(summary))
+        else:
+            write_rows([summary], args.format)
+        return 1 if summary["failed"] else 0
+
+    if args.tracker == "archive":
+        moved = archive.archive_old_rows(args.horizon_days)
+        write_rows([{"table": table, "archived": count} for table, count in moved.items()], args.format,
+                   lambda r: f"{r['table']}: archived {r['archived']} row(s)")
+        return 0
+
+    if args.tracker == "backup":
+        backup = maintenance.backup_database(args.destination)
+        write_rows([backup], args.format,
+                   lambda r: f"Backed up {r['pages']} pages to {r['path']} in {r['seconds']}s.")
+        return 0
+
+    if args.tracker == "maintain":
+        report = maintenance.run_maintenance(args.budget, args.force)
+        if args.format == "json":
+            print(json.dumps(report))
+        else:
+            write_rows(report["tasks"], args.format,
+                       lambda r: f"{r['task']}: {r['status']} ({r['result']}, {r['duration']}s)")
+            if args.format == "text":
+                print(f"Before: {maintenance.format_stats_for_display(report['before'])}")
+                print(f"After:  {maintenance.format_stats_for_display(report['after'])}")
+        return 0
+
+    if args.tracker == "reminders":
+        notifier = scheduler.FileNotifier(args.notify_file) if args.notify_file else scheduler.StdoutNotifier(sys.stderr)
+        scheduler.ReminderScheduler(notifier).run_due()
+        write_rows(scheduler.get_schedule(), args.format,
+                   lambda r: f"{r['reminder']}: next due {r['due_at'] or 'when needed'} (UTC)")
+        return 0
+
+    if args.tracker == "import":
+        try:
+            summary = importer.import_file(args.file, args.kind, args.workers, restart=args.restart,
+                                           on_conflict=args.on_conflict)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        for line_number, message in summary["errors"]:
+            print(f"Line {line_number}: {message}", file=sys.stderr)
+        summary.pop("errors")
+        write_rows([summary], args.format,
+                   lambda r: f"Imported {r['imported']} entries ({r['duplicates']} already present, "
+                             f"{r['failed']} invalid lines) in {r['seconds']}s.")
+        return 1 if summary["failed"] else 0
+
+    if args.tracker == "sync":
+        result = sync.sync_databases(db_connection.DATABASE_NAME, args.other)
+        rows = [dict(direction=direction, **stats) for direction, stats in result.items()]
+        write_rows(rows, args.format,
+                   lambda r: f"{r['direction'].capitalize()} {r['applied']} change(s), {r['skipped']} skipped.")
+        return 0
+
+    if (args.tracker, args.operation) == ("plan", "create"):
+        books = [book.strip() for book in args.books.split(",")] if args.books else None
+        # create_reading_plan reports progress with print(); keep stdout clean for JSON/CSV
+        with contextlib.redirect_stdout(sys.stderr):
+            plan_id = reading_plans.create_reading_plan(args.name, books, args.days, args.start_date, args.preset)
+        if plan_id is None:
+            return 1
+        if args.format == "text":
+            print(f"Created reading plan ID {plan_id}.")
+        else:
+            write_rows([{"id": plan_id}], args.format)
+        return 0
+
+    if (args.tracker, args.operation) == ("sins", "backlog"):
+        if args.check or args.repair:
+            differences = backlog.check_backlog(args.repair)
+            if differences is None:
+                return 1
+            write_rows(differences, args.format, backlog.format_difference)
+            if args.format == "text" and not differences:
+                print("The confession backlog summary matches the sin log.")
+            return 0 if args.repair or not differences else 1
+        summary = sins_tracker.get_backlog_summary()
+        if args.format == "text":
+            print(sins_tracker.format_backlog_summary(summary))
+        elif args.format == "json":
+            print(json.dumps(summary))
+        else:
+            write_rows([{"month": month, "unconfessed": count} for month, count in summary.get("by_month", {}).items()],
+                       args.format)
+        return 0
+
+    if (args.tracker, args.operation) in WRITE_OPERATIONS:
+        try:
+            result = _run_single_write(args)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        except sqlite3.IntegrityError:
+            print("Error: This entry is already logged (use --on-conflict ignore or update).", file=sys.stderr)
+            return 1
+        if args.format == "text":
+            if args.operation == "confess":
+                print(f"Sin entry ID {args.id} " + ("marked as confessed." if result["confessed"] else "not found or already confessed."))
+            elif result.get("added", True):
+                print(f"Added entry ID {result['id']}.")
+            else:
+                print(f"Entry ID {result['id']} is already logged.")
+        elif args.format == "json":
+            print(json.dumps(result))
+        else:
+            write_rows([result], args.format)
+        return 0 if result.get("confessed", True) else 1
+
+    try:
+        rows, formatter = _fetch_listing(args)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    write_rows(rows, args.format, formatter)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())